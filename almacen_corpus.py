@@ -0,0 +1,445 @@
+# Almacén de Corpus de Fórmulas del Sistema L
+# Contenedor en disco con índice de desplazamientos y ASTs precodificados,
+# leído mediante mmap para acceso aleatorio O(1) por identificador
+
+import contextlib
+import fcntl
+import mmap
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from analizador_sintactico import NodoAST, SIMBOLOS_OPERADOR, analizar_sintacticamente
+
+# Encabezados de los archivos del almacén
+MAGIA_DATOS = b'SLCORP01'
+MAGIA_INDICE = b'SLIDX001'
+
+# Encabezado de cada registro: crc32, longitud del texto, longitud del AST
+FORMATO_REGISTRO = struct.Struct('<III')
+FORMATO_DESPLAZAMIENTO = struct.Struct('<Q')
+FORMATO_LONGITUD_NOMBRE = struct.Struct('<H')
+
+# Códigos de tipo para la codificación binaria del AST (recorrido en preorden)
+CODIGOS_NODO = {
+    'VARIABLE': 1,
+    'CONSTANTE': 2,
+    'NEGACION': 3,
+    'CONJUNCION': 4,
+    'DISYUNCION': 5,
+    'IMPLICACION': 6,
+    'BICONDICIONAL': 7,
+}
+TIPOS_POR_CODIGO = {codigo: tipo for tipo, codigo in CODIGOS_NODO.items()}
+
+# Aridad de cada tipo de nodo (los símbolos están en SIMBOLOS_OPERADOR)
+ARIDAD = {
+    'VARIABLE': 0,
+    'CONSTANTE': 0,
+    'NEGACION': 1,
+    'CONJUNCION': 2,
+    'DISYUNCION': 2,
+    'IMPLICACION': 2,
+    'BICONDICIONAL': 2,
+}
+
+def codificar_ast(ast):
+    """
+    Codifica un árbol sintáctico en bytes recorriéndolo en preorden.
+    Las variables guardan su nombre y las constantes su valor (0 o 1).
+    """
+    salida = bytearray()
+    pila = [ast]
+    while pila:
+        nodo = pila.pop()
+        salida.append(CODIGOS_NODO[nodo.tipo])
+        if nodo.tipo == 'VARIABLE':
+            nombre = str(nodo.valor).encode('utf-8')
+            salida += FORMATO_LONGITUD_NOMBRE.pack(len(nombre))
+            salida += nombre
+        elif nodo.tipo == 'CONSTANTE':
+            salida.append(int(nodo.valor))
+        else:
+            # Los hijos se apilan en orden inverso para conservar el preorden
+            pila.extend(reversed(nodo.hijos))
+    return bytes(salida)
+
+def decodificar_ast(datos, inicio=0, fin=None):
+    """
+    Reconstruye un árbol sintáctico a partir de su codificación binaria.
+    Acepta bytes, memoryview o mmap sin copiar el bloque completo.
+    """
+    if fin is None:
+        fin = len(datos)
+    posicion = inicio
+    raiz = None
+    # Pila de (nodo padre, hijos pendientes)
+    pendientes = []
+    while posicion < fin:
+        tipo = TIPOS_POR_CODIGO.get(datos[posicion])
+        if tipo is None:
+            raise ValueError(f"Código de nodo desconocido {datos[posicion]} en la posición {posicion}")
+        posicion += 1
+        if tipo == 'VARIABLE':
+            (longitud,) = FORMATO_LONGITUD_NOMBRE.unpack_from(datos, posicion)
+            posicion += FORMATO_LONGITUD_NOMBRE.size
+            nombre = bytes(datos[posicion:posicion + longitud]).decode('utf-8')
+            posicion += longitud
+            nodo = NodoAST('VARIABLE', nombre)
+        elif tipo == 'CONSTANTE':
+            nodo = NodoAST('CONSTANTE', datos[posicion])
+            posicion += 1
+        else:
+            nodo = NodoAST(tipo, SIMBOLOS_OPERADOR[tipo])
+
+        if pendientes:
+            padre, restantes = pendientes[-1]
+            padre.hijos.append(nodo)
+            if restantes == 1:
+                pendientes.pop()
+            else:
+                pendientes[-1] = (padre, restantes - 1)
+        elif raiz is None:
+            raiz = nodo
+        else:
+            raise ValueError("Datos sobrantes después del nodo raíz")
+
+        if ARIDAD[tipo]:
+            pendientes.append((nodo, ARIDAD[tipo]))
+
+    if raiz is None or pendientes:
+        raise ValueError("Codificación de AST incompleta")
+    return raiz
+
+class AlmacenCorpus:
+    """
+    Corpus de fórmulas almacenado en dos archivos:
+      - <ruta>      registros (crc32, texto, AST codificado)
+      - <ruta>.idx  desplazamiento de cada registro (uint64)
+    Ambos se leen mediante mmap, de modo que obtener una fórmula por su
+    identificador no requiere cargar el archivo completo. Las escrituras
+    toman un bloqueo exclusivo (flock) sobre el archivo de datos, así que
+    varios procesos pueden agregar al mismo almacén.
+    """
+
+    def __init__(self, ruta, crear=False):
+        self.ruta = ruta
+        self.ruta_indice = ruta + '.idx'
+        self._mapa_datos = None
+        self._mapa_indice = None
+        self._cantidad = 0
+
+        if crear or not os.path.exists(ruta):
+            with open(self.ruta, 'wb') as f:
+                f.write(MAGIA_DATOS)
+            with open(self.ruta_indice, 'wb') as f:
+                f.write(MAGIA_INDICE)
+        else:
+            # Primero se validan los encabezados. Una escritura interrumpida
+            # puede dejar datos sin indexar al final: se descartan al abrir (si
+            # el almacén es de solo lectura o está dañado se deja como está)
+            self._remapear()
+            self._cerrar_mapas()
+            with contextlib.suppress(OSError, ValueError):
+                with self._bloquear_escritura():
+                    pass
+        self._remapear()
+
+    @contextlib.contextmanager
+    def _bloquear_escritura(self):
+        """
+        Abre ambos archivos para escribir con un bloqueo exclusivo sobre los
+        datos y recorta lo que no llegó a indexarse: los bytes de datos
+        después del último registro del índice y una entrada de índice
+        incompleta. Produce (datos, índice, fin de los datos, cantidad de
+        registros), leídos de los archivos y no de los mapas, que pueden ser
+        anteriores a lo agregado por otro proceso.
+        """
+        with open(self.ruta, 'r+b') as datos, open(self.ruta_indice, 'r+b') as indice:
+            fcntl.flock(datos.fileno(), fcntl.LOCK_EX)
+            try:
+                tamano_indice = os.fstat(indice.fileno()).st_size
+                cantidad = (tamano_indice - len(MAGIA_INDICE)) // FORMATO_DESPLAZAMIENTO.size
+                fin = len(MAGIA_DATOS)
+                if cantidad > 0:
+                    indice.seek(len(MAGIA_INDICE) + (cantidad - 1) * FORMATO_DESPLAZAMIENTO.size)
+                    (desplazamiento,) = FORMATO_DESPLAZAMIENTO.unpack(indice.read(FORMATO_DESPLAZAMIENTO.size))
+                    datos.seek(desplazamiento)
+                    encabezado = datos.read(FORMATO_REGISTRO.size)
+                    if len(encabezado) < FORMATO_REGISTRO.size:
+                        raise ValueError(f"El índice de {self.ruta} apunta más allá del final de los datos")
+                    _, largo_texto, largo_ast = FORMATO_REGISTRO.unpack(encabezado)
+                    fin = desplazamiento + FORMATO_REGISTRO.size + largo_texto + largo_ast
+                tamano_datos = os.fstat(datos.fileno()).st_size
+                if fin > tamano_datos:
+                    raise ValueError(f"El índice de {self.ruta} apunta más allá del final de los datos")
+                if tamano_datos > fin:
+                    datos.truncate(fin)
+                if tamano_indice > len(MAGIA_INDICE) + cantidad * FORMATO_DESPLAZAMIENTO.size:
+                    indice.truncate(len(MAGIA_INDICE) + cantidad * FORMATO_DESPLAZAMIENTO.size)
+                yield datos, indice, fin, cantidad
+            finally:
+                fcntl.flock(datos.fileno(), fcntl.LOCK_UN)
+
+    def _remapear(self):
+        """
+        Vuelve a mapear los archivos para reflejar registros agregados
+        """
+        self._cerrar_mapas()
+        with open(self.ruta, 'rb') as f:
+            if f.read(len(MAGIA_DATOS)) != MAGIA_DATOS:
+                raise ValueError(f"{self.ruta} no es un almacén de corpus válido")
+            self._mapa_datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.ruta_indice, 'rb') as f:
+            if f.read(len(MAGIA_INDICE)) != MAGIA_INDICE:
+                raise ValueError(f"{self.ruta_indice} no es un índice de corpus válido")
+            self._mapa_indice = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        tamano_indice = len(self._mapa_indice) - len(MAGIA_INDICE)
+        self._cantidad = tamano_indice // FORMATO_DESPLAZAMIENTO.size
+
+    def _cerrar_mapas(self):
+        if self._mapa_datos is not None:
+            self._mapa_datos.close()
+            self._mapa_datos = None
+        if self._mapa_indice is not None:
+            self._mapa_indice.close()
+            self._mapa_indice = None
+
+    def cerrar(self):
+        self._cerrar_mapas()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __len__(self):
+        return self._cantidad
+
+    def _desplazamiento(self, identificador):
+        if not 0 <= identificador < self._cantidad:
+            raise IndexError(f"Identificador de fórmula fuera de rango: {identificador}")
+        posicion = len(MAGIA_INDICE) + identificador * FORMATO_DESPLAZAMIENTO.size
+        return FORMATO_DESPLAZAMIENTO.unpack_from(self._mapa_indice, posicion)[0]
+
+    def _registro(self, identificador):
+        """
+        Devuelve (inicio del texto, longitud del texto, longitud del AST)
+        """
+        desplazamiento = self._desplazamiento(identificador)
+        _, largo_texto, largo_ast = FORMATO_REGISTRO.unpack_from(self._mapa_datos, desplazamiento)
+        return desplazamiento + FORMATO_REGISTRO.size, largo_texto, largo_ast
+
+    def obtener_texto(self, identificador):
+        """
+        Devuelve el texto original de la fórmula con el identificador dado
+        """
+        inicio, largo_texto, _ = self._registro(identificador)
+        return self._mapa_datos[inicio:inicio + largo_texto].decode('utf-8')
+
+    def obtener_ast(self, identificador):
+        """
+        Decodifica el AST precodificado de la fórmula sin volver a analizarla
+        """
+        inicio, largo_texto, largo_ast = self._registro(identificador)
+        inicio_ast = inicio + largo_texto
+        return decodificar_ast(self._mapa_datos, inicio_ast, inicio_ast + largo_ast)
+
+    def vista_ast(self, identificador):
+        """
+        Devuelve un memoryview (sin copia) sobre los bytes del AST codificado
+        """
+        inicio, largo_texto, largo_ast = self._registro(identificador)
+        inicio_ast = inicio + largo_texto
+        return memoryview(self._mapa_datos)[inicio_ast:inicio_ast + largo_ast]
+
+    def __getitem__(self, identificador):
+        return self.obtener_texto(identificador), self.obtener_ast(identificador)
+
+    def __iter__(self):
+        for identificador in range(self._cantidad):
+            yield self[identificador]
+
+    def agregar_ast(self, texto, ast):
+        """
+        Agrega una fórmula ya analizada al final del corpus y devuelve su identificador
+        """
+        return self.agregar_varios([(texto, ast)])[0]
+
+    def agregar(self, expresion):
+        """
+        Analiza la expresión y la agrega al corpus. Devuelve su identificador,
+        o None si la expresión no es una fórmula bien formada.
+        """
+        ast, _ = analizar_sintacticamente(expresion)
+        if ast is None:
+            return None
+        return self.agregar_ast(expresion, ast)
+
+    def agregar_varios(self, formulas):
+        """
+        Agrega un lote de pares (texto, ast) con una sola reasignación de los mapas
+        """
+        identificadores = []
+        with self._bloquear_escritura() as (datos, indice, desplazamiento, cantidad):
+            datos.seek(desplazamiento)
+            indice.seek(len(MAGIA_INDICE) + cantidad * FORMATO_DESPLAZAMIENTO.size)
+            for texto, ast in formulas:
+                texto_bytes = texto.encode('utf-8')
+                ast_bytes = codificar_ast(ast)
+                crc = zlib.crc32(ast_bytes, zlib.crc32(texto_bytes))
+                datos.write(FORMATO_REGISTRO.pack(crc, len(texto_bytes), len(ast_bytes)))
+                datos.write(texto_bytes)
+                datos.write(ast_bytes)
+                indice.write(FORMATO_DESPLAZAMIENTO.pack(desplazamiento))
+                desplazamiento += FORMATO_REGISTRO.size + len(texto_bytes) + len(ast_bytes)
+                identificadores.append(cantidad + len(identificadores))
+            # Los datos deben llegar a disco antes que el índice que los referencia
+            datos.flush()
+            os.fsync(datos.fileno())
+            indice.flush()
+            os.fsync(indice.fileno())
+        self._remapear()
+        return identificadores
+
+    def verificar_integridad(self):
+        """
+        Comprueba el almacén completo: desplazamientos crecientes y dentro del
+        archivo, crc32 de cada registro, ASTs decodificables y ausencia de
+        bytes no indexados al final. Devuelve (valido, lista_de_errores).
+        """
+        errores = []
+        tamano_datos = len(self._mapa_datos)
+        fin_esperado = len(MAGIA_DATOS)
+
+        resto_indice = (len(self._mapa_indice) - len(MAGIA_INDICE)) % FORMATO_DESPLAZAMIENTO.size
+        if resto_indice:
+            errores.append(f"El índice tiene {resto_indice} bytes sobrantes")
+
+        for identificador in range(self._cantidad):
+            desplazamiento = self._desplazamiento(identificador)
+            if desplazamiento != fin_esperado:
+                errores.append(f"Registro {identificador}: desplazamiento {desplazamiento}, se esperaba {fin_esperado}")
+                break
+            if desplazamiento + FORMATO_REGISTRO.size > tamano_datos:
+                errores.append(f"Registro {identificador}: encabezado truncado")
+                break
+            crc, largo_texto, largo_ast = FORMATO_REGISTRO.unpack_from(self._mapa_datos, desplazamiento)
+            inicio = desplazamiento + FORMATO_REGISTRO.size
+            fin_esperado = inicio + largo_texto + largo_ast
+            if fin_esperado > tamano_datos:
+                errores.append(f"Registro {identificador}: contenido truncado")
+                break
+            contenido = memoryview(self._mapa_datos)[inicio:fin_esperado]
+            try:
+                if zlib.crc32(contenido) != crc:
+                    errores.append(f"Registro {identificador}: crc32 no coincide")
+                    continue
+                try:
+                    decodificar_ast(contenido, largo_texto, len(contenido))
+                except (ValueError, KeyError, struct.error) as e:
+                    errores.append(f"Registro {identificador}: AST inválido ({e})")
+            finally:
+                contenido.release()
+        else:
+            # Solo se revisa la cola si se recorrieron todos los registros
+            if fin_esperado != tamano_datos:
+                errores.append(f"Hay {tamano_datos - fin_esperado} bytes sin indexar al final de {self.ruta}")
+
+        return len(errores) == 0, errores
+
+def crear_corpus(ruta, expresiones):
+    """
+    Crea un almacén nuevo con las expresiones válidas de un iterable.
+    Devuelve el almacén abierto y el número de expresiones descartadas.
+    """
+    almacen = AlmacenCorpus(ruta, crear=True)
+    lote = []
+    descartadas = 0
+    for expresion in expresiones:
+        expresion = expresion.strip()
+        if not expresion:
+            continue
+        ast, _ = analizar_sintacticamente(expresion)
+        if ast is None:
+            descartadas += 1
+            continue
+        lote.append((expresion, ast))
+        if len(lote) >= 10000:
+            almacen.agregar_varios(lote)
+            lote = []
+    if lote:
+        almacen.agregar_varios(lote)
+    return almacen, descartadas
+
+# Almacén abierto en cada proceso trabajador. Cada proceso mapea el mismo
+# archivo en modo lectura, por lo que el sistema operativo comparte las
+# páginas físicas entre todos ellos sin copiar los datos.
+_almacen_trabajador = None
+
+def _inicializar_trabajador(ruta):
+    global _almacen_trabajador
+    _almacen_trabajador = AlmacenCorpus(ruta)
+
+def _aplicar_en_trabajador(argumentos):
+    funcion, identificador = argumentos
+    return funcion(identificador, _almacen_trabajador)
+
+def mapear_en_paralelo(ruta, funcion, identificadores=None, procesos=None, tamano_bloque=256):
+    """
+    Aplica funcion(identificador, almacen) a cada fórmula usando un grupo de
+    procesos que comparten el mapeo del archivo. La función debe poder
+    serializarse (definida a nivel de módulo).
+    """
+    if identificadores is None:
+        with AlmacenCorpus(ruta) as almacen:
+            identificadores = range(len(almacen))
+    with ProcessPoolExecutor(max_workers=procesos,
+                             initializer=_inicializar_trabajador,
+                             initargs=(ruta,)) as grupo:
+        tareas = ((funcion, identificador) for identificador in identificadores)
+        return list(grupo.map(_aplicar_en_trabajador, tareas, chunksize=tamano_bloque))
+
+def _contar_nodos(identificador, almacen):
+    total = 0
+    pila = [almacen.obtener_ast(identificador)]
+    while pila:
+        nodo = pila.pop()
+        total += 1
+        pila.extend(nodo.hijos)
+    return total
+
+if __name__ == "__main__":
+    import tempfile
+    from analizador_sintactico import imprimir_arbol
+
+    expresiones_prueba = [
+        "p",
+        "~~~q",
+        "(p^q)",
+        "(0=>(ros))",
+        "~(p^q)",
+        "(p<=>~p)",
+        "((p=>q)^p)",
+        "(~(p^(qor))os)",
+    ]
+
+    print("=== ALMACÉN DE CORPUS ===")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "corpus.slc")
+        almacen, descartadas = crear_corpus(ruta, expresiones_prueba)
+        print(f"Fórmulas almacenadas: {len(almacen)} (descartadas: {descartadas})")
+
+        identificador = almacen.agregar("((p=>q)=>r)")
+        print(f"Fórmula agregada con identificador {identificador}")
+
+        texto, ast = almacen[6]
+        print(f"\nFórmula 6: {texto}")
+        imprimir_arbol(ast)
+
+        valido, errores = almacen.verificar_integridad()
+        print(f"\nIntegridad: {'correcta' if valido else errores}")
+
+        print(f"Nodos por fórmula (en paralelo): {mapear_en_paralelo(ruta, _contar_nodos, procesos=2)}")
+        almacen.cerrar()
@@ -1,11 +1,16 @@
 # Analizador Léxico para el Sistema Axiomático L
 # Reconoce expresiones del cálculo proposicional
 
+import re
+import sys
+from array import array
+from itertools import compress
 import ply.lex as lex
+from limites_recursos import INTERVALO_RELOJ
 
 # Lista de tokens
 tokens = (
-    'VARIABLE',      # Variables proposicionales: p,q,r,s,t,u,v,w,x,y,z
+    'VARIABLE',      # Variables proposicionales: p,q,...,z con subíndice opcional (p12, x_1043)
     'NEGACION',      # Operador de negación: ~
     'CONJUNCION',    # Operador de conjunción: ^
     'DISYUNCION',    # Operador de disyunción: o
@@ -18,9 +23,10 @@ tokens = (
 
 # Reglas de tokens usando expresiones regulares
 
-# Variables proposicionales (solo letras específicas)
+# Variables proposicionales: una de las letras específicas seguida
+# opcionalmente de un subíndice numérico (p, p12, x_1043)
 def t_VARIABLE(t):
-    r'[pqrstuvwxyz]'
+    r'[pqrstuvwxyz](?:_?[0-9]+)?'
     return t
 
 # Operador bicondicional (debe ir antes que implicación)
@@ -80,8 +86,12 @@ def t_error(t):
 lexer = lex.lex()
 
 # Función para probar el analizador léxico
-def analizar_lexicamente(entrada):
+def analizar_lexicamente(entrada, compacto=False):
+    # Con compacto=True se devuelve un FlujoTokens en lugar de una lista de tuplas
+    if compacto:
+        return FlujoTokens.desde_texto(entrada)
     lexer.input(entrada)
+    lexer.lineno = 1  # input() no reinicia la línea de la entrada anterior
     tokens_encontrados = []
     
     while True:
@@ -92,6 +102,447 @@ def analizar_lexicamente(entrada):
     
     return tokens_encontrados
 
+# Reglas de tokens en el mismo orden en que PLY construye su expresión maestra,
+# para que los analizadores alternativos reconozcan exactamente los mismos tokens
+_funciones_tokens = (t_VARIABLE, t_BICONDICIONAL, t_IMPLICACION, t_NEGACION,
+                     t_CONJUNCION, t_DISYUNCION, t_PARIZQ, t_PARDER, t_CONSTANTE)
+reglas_tokens = [(funcion.__name__[2:], funcion.__doc__) for funcion in _funciones_tokens]
+
+class _ReglasConPresupuesto:
+    """
+    Reglas del lexer de PLY que además cuentan los tokens de una entrada no
+    confiable. lexer.clone(reglas) las enlaza en una copia del lexer, así que
+    el lexer del módulo no paga el conteo. Al llegar al umbral se llama a
+    control.comprobar_tokens (ver limites_recursos.py), que lanza el error de
+    límite o consulta el reloj.
+    """
+
+    def __init__(self, control):
+        self.control = control
+        self.tokens = 0
+        maximo = control.limites.max_tokens
+        self.maximo = sys.maxsize if maximo is None else maximo
+        self.umbral = min(INTERVALO_RELOJ, self.maximo + 1)
+
+    def contar(self):
+        self.control.comprobar_tokens(self.tokens)
+        self.umbral = min(self.tokens + INTERVALO_RELOJ, self.maximo + 1)
+
+def _regla_con_presupuesto(regla):
+    def regla_contada(self, t):
+        self.tokens += 1
+        if self.tokens >= self.umbral:
+            self.contar()
+        return regla(t)
+    # clone() busca cada regla por el nombre de la función original
+    regla_contada.__name__ = regla.__name__
+    return regla_contada
+
+# Se asignan con setattr: PLY rechaza un módulo que vuelve a definir t_newline o t_error
+for _funcion in _funciones_tokens:
+    setattr(_ReglasConPresupuesto, _funcion.__name__, _regla_con_presupuesto(_funcion))
+for _funcion in (t_newline, t_error):
+    setattr(_ReglasConPresupuesto, _funcion.__name__, staticmethod(_funcion))
+
+def lexer_con_presupuesto(control):
+    """
+    Copia del lexer de PLY que comprueba el máximo de tokens y el plazo de
+    la etapa de control mientras el parser le pide tokens
+    """
+    copia = lexer.clone(_ReglasConPresupuesto(control))
+    # clone() reemplaza las tablas de reglas pero no las del estado activo
+    copia.begin(copia.lexstate)
+    return copia
+
+patron_tokens = re.compile(
+    '|'.join(f'(?P<{nombre}>{regla})' for nombre, regla in reglas_tokens)
+    + r'|(?P<SALTO>\n)|(?P<IGNORAR>[' + re.escape(t_ignore) + r']+)|(?P<ERROR>.)',
+    re.DOTALL,
+)
+
+# Caracteres con los que un token puede continuar: letras de variable y
+# dígitos (subíndices), '_' y los prefijos '<' y '=' de '<=>' y '=>'.
+# Después de cualquier otro carácter (espacios, paréntesis, operadores o
+# caracteres ilegales) ningún token continúa: un bloque solo se analiza hasta
+# el último de ellos y el resto pasa al bloque siguiente.
+_continuan_token = frozenset('pqrstuvwxyz0123456789_<=')
+
+def _corte_por_tokens(texto):
+    """
+    Posición de corte para un texto cuya cola no tiene fronteras (como
+    'pppp...' o '1111...'). Ninguna regla mira más de dos caracteres después
+    de su token ('<' espera '=>' y 'p' espera '_1'), así que los tokens que
+    terminan antes de los dos últimos caracteres ya no pueden cambiar; se
+    corta al comienzo del primero que no cumple eso.
+    """
+    limite = len(texto) - 2
+    for coincidencia in patron_tokens.finditer(texto):
+        if coincidencia.end() > limite:
+            return coincidencia.start()
+    return len(texto)
+
+def _tokens_de_bloque(texto, linea):
+    """
+    Analiza un fragmento que termina en una frontera de token y devuelve la
+    lista de eventos (tipo, valor). Los saltos de línea se informan como
+    ('SALTO', None); linea solo se usa para los mensajes de error.
+    """
+    eventos = []
+    for coincidencia in patron_tokens.finditer(texto):
+        tipo = coincidencia.lastgroup
+        if tipo == 'IGNORAR':
+            continue
+        if tipo == 'SALTO':
+            eventos.append(('SALTO', None))
+            linea += 1
+        elif tipo == 'ERROR':
+            print(f"Carácter ilegal '{coincidencia.group()}' en la línea {linea}")
+        elif tipo == 'CONSTANTE':
+            eventos.append((tipo, int(coincidencia.group())))
+        else:
+            eventos.append((tipo, coincidencia.group()))
+    return eventos
+
+# Función para tokenizar un archivo de fórmulas (una por línea) sin cargarlo entero
+def tokenizar_flujo(archivo, tam_bloque=65536):
+    """
+    Generador que lee un archivo de texto por bloques de tam_bloque caracteres
+    y produce los tokens (tipo, valor) de forma perezosa. Al terminar cada
+    fórmula no vacía produce ('FIN_FORMULA', número_de_línea).
+    Los tokens que quedan partidos entre dos bloques (como '<=>') se
+    completan con el bloque siguiente. Lo que pasa al bloque siguiente nunca
+    supera tam_bloque caracteres (salvo un único token más largo), por lo que
+    la memoria usada depende del tamaño del bloque, no del tamaño del archivo.
+    """
+    linea = 1
+    formula_con_tokens = False
+    arrastre = ''
+    while True:
+        bloque = archivo.read(tam_bloque)
+        fin_archivo = not bloque
+        texto = arrastre + bloque
+        corte = len(texto)
+        if not fin_archivo:
+            while corte > 0 and texto[corte - 1] in _continuan_token:
+                corte -= 1
+            # Sin una frontera cercana el arrastre crecería con cada bloque
+            if len(texto) - corte > tam_bloque:
+                corte = _corte_por_tokens(texto)
+        arrastre = texto[corte:]
+
+        for tipo, valor in _tokens_de_bloque(texto[:corte], linea):
+            if tipo == 'SALTO':
+                if formula_con_tokens:
+                    yield ('FIN_FORMULA', linea)
+                    formula_con_tokens = False
+                linea += 1
+            else:
+                formula_con_tokens = True
+                yield (tipo, valor)
+
+        if fin_archivo:
+            if formula_con_tokens:
+                yield ('FIN_FORMULA', linea)
+            return
+
+# Función para agrupar los tokens de un archivo por fórmula
+def formulas_en_flujo(archivo, tam_bloque=65536):
+    """
+    Generador de (número_de_línea, tokens) para cada fórmula del archivo.
+    Solo se mantiene en memoria la lista de tokens de la fórmula actual.
+    """
+    tokens_formula = []
+    for tipo, valor in tokenizar_flujo(archivo, tam_bloque):
+        if tipo == 'FIN_FORMULA':
+            yield valor, tokens_formula
+            tokens_formula = []
+        else:
+            tokens_formula.append((tipo, valor))
+
+# Códigos numéricos de los tipos de token (posición en la tupla tokens)
+codigos_tokens = {nombre: codigo for codigo, nombre in enumerate(tokens)}
+
+# Misma expresión maestra sobre bytes ASCII, para analizar mmap o memoryview sin decodificar
+patron_tokens_bytes = re.compile(patron_tokens.pattern.encode('ascii'), re.DOTALL)
+
+# Código de token por índice de grupo (lastindex); -1 para ignorados, -2 para saltos, -3 para errores
+def _construir_codigos_grupo():
+    especiales = {'IGNORAR': -1, 'SALTO': -2, 'ERROR': -3}
+    codigos = [-1] * (patron_tokens_bytes.groups + 1)
+    for nombre, indice in patron_tokens_bytes.groupindex.items():
+        codigos[indice] = especiales.get(nombre, codigos_tokens.get(nombre, -1))
+    return codigos
+
+_codigo_por_grupo = _construir_codigos_grupo()
+
+def _construir_tablas_rapidas():
+    """
+    Tablas de traducción de bytes para el camino rápido de analizar_bytes,
+    obtenidas aplicando la expresión maestra a cada byte ASCII:
+      - codigo: byte -> código de tipo del token que empieza en ese byte
+      - inicio: byte -> 1 si empieza un token, 0 si no
+      - validos: bytes que pueden aparecer en una entrada sin errores
+      - longitud: código de tipo -> longitud del token (1 salvo '=>' y '<=>')
+    Los operadores de varios caracteres se marcan en su primer carácter.
+    """
+    codigo = bytearray(256)
+    inicio = bytearray(256)
+    longitud = bytearray(b'\x01' * 256)
+    validos = bytearray()
+    for byte in range(128):
+        coincidencia = patron_tokens_bytes.match(bytes([byte]))
+        nombre = coincidencia.lastgroup
+        if nombre in codigos_tokens:
+            codigo[byte] = codigos_tokens[nombre]
+            inicio[byte] = 1
+            validos.append(byte)
+        elif nombre in ('IGNORAR', 'SALTO'):
+            validos.append(byte)
+    for operador in (b'=>', b'<=>'):
+        nombre = patron_tokens_bytes.fullmatch(operador).lastgroup
+        codigo[operador[0]] = codigos_tokens[nombre]
+        inicio[operador[0]] = 1
+        longitud[codigos_tokens[nombre]] = len(operador)
+        validos.extend(byte for byte in operador if byte not in validos)
+    return bytes(codigo), bytes(inicio), bytes(validos), bytes(longitud)
+
+_tabla_codigo, _tabla_inicio, _bytes_validos, _longitud_por_codigo = _construir_tablas_rapidas()
+_bytes_no_token = bytes(byte for byte in _bytes_validos if not _tabla_inicio[byte])
+# Bytes con los que un token puede continuar (ver _continuan_token)
+_continuan_bytes = frozenset(ord(caracter) for caracter in _continuan_token)
+
+# Letra de variable seguida del comienzo de un subíndice (p1, x_2)
+_inicio_variable_indexada = re.compile(rb'[pqrstuvwxyz][_0-9]')
+
+def _bloque_simple(bloque):
+    """
+    Indica si un bloque puede analizarse con el camino rápido: sin caracteres
+    ilegales, sin variables con subíndice (sus tokens ocupan varios bytes) y
+    con todos los '<', '=' y '>' formando parte de '<=>' o '=>'.
+    """
+    if bloque.translate(None, _bytes_validos) or _inicio_variable_indexada.search(bloque):
+        return False
+    implicaciones = bloque.count(b'=>')
+    return (bloque.count(b'<') == bloque.count(b'<=>')
+            and bloque.count(b'=') == implicaciones
+            and bloque.count(b'>') == implicaciones)
+
+def crear_buffers_tokens(capacidad=65536):
+    """
+    Crea los arrays preasignados (tipos, inicios, longitudes) que llena analizar_bytes
+    """
+    return (array('B', bytes(capacidad)),
+            array('Q', bytes(8 * capacidad)),
+            array('I', bytes(4 * capacidad)))
+
+# Función para analizar bytes ASCII sin crear cadenas ni tuplas por token
+def analizar_bytes(buffer, tipos, inicios, longitudes, posicion=0, linea=1):
+    """
+    Analiza un buffer de bytes ASCII (bytes, memoryview o mmap) a partir de
+    'posicion' y escribe cada token como la tripleta (código de tipo,
+    desplazamiento, longitud) en los arrays preasignados.
+    Devuelve (tokens escritos, posición siguiente, línea siguiente).
+    El valor de un token se recupera con buffer[inicio:inicio + longitud].
+
+    Se analiza un bloque de a lo sumo len(tipos) bytes que termina en una
+    frontera de token, así que los tokens caben en los arrays.
+    Los bloques sin errores ni operadores incompletos se resuelven con
+    traducciones de bytes (sin un ciclo de Python por token); los demás se
+    recorren con la expresión maestra directamente sobre el buffer.
+    """
+    capacidad = len(tipos)
+    total = len(buffer)
+    fin = min(total, posicion + capacidad)
+    if fin < total:
+        corte = fin
+        while corte > posicion and buffer[corte - 1] in _continuan_bytes:
+            corte -= 1
+        # Sin frontera en el bloque se recorre con la expresión maestra hasta llenar los arrays
+        fin = corte if corte > posicion else total
+
+    bloque = bytes(buffer[posicion:fin]) if fin - posicion <= capacidad else None
+    if bloque is not None and _bloque_simple(bloque):
+        # Dentro de '<=>' solo el '<' marca el inicio del token
+        marcado = bloque.replace(b'<=>', b'<  ')
+        codigos = marcado.translate(_tabla_codigo, _bytes_no_token)
+        cantidad = len(codigos)
+        tipos[:cantidad] = array('B', codigos)
+        inicios[:cantidad] = array('Q', compress(range(posicion, fin), marcado.translate(_tabla_inicio)))
+        longitudes[:cantidad] = array('I', iter(codigos.translate(_longitud_por_codigo)))
+        return cantidad, fin, linea + bloque.count(b'\n')
+
+    cantidad = 0
+    codigo_por_grupo = _codigo_por_grupo
+    for coincidencia in patron_tokens_bytes.finditer(buffer, posicion, fin):
+        codigo = codigo_por_grupo[coincidencia.lastindex]
+        if codigo >= 0:
+            inicio, final = coincidencia.span()
+            tipos[cantidad] = codigo
+            inicios[cantidad] = inicio
+            longitudes[cantidad] = final - inicio
+            cantidad += 1
+            if cantidad == capacidad:
+                return cantidad, final, linea
+        elif codigo == -2:
+            linea += 1
+        elif codigo == -3:
+            caracter = chr(buffer[coincidencia.start()])
+            print(f"Carácter ilegal '{caracter}' en la línea {linea}")
+    return cantidad, fin, linea
+
+def analizar_bytes_por_bloques(buffer, capacidad=65536):
+    """
+    Generador que recorre un buffer completo reutilizando los mismos arrays.
+    Produce (cantidad, tipos, inicios, longitudes); los arrays se sobrescriben
+    en la siguiente iteración, por lo que deben consumirse antes de avanzar.
+    """
+    tipos, inicios, longitudes = crear_buffers_tokens(capacidad)
+    posicion = 0
+    linea = 1
+    while posicion < len(buffer):
+        cantidad, posicion, linea = analizar_bytes(buffer, tipos, inicios, longitudes, posicion, linea)
+        if cantidad:
+            yield cantidad, tipos, inicios, longitudes
+
+class FlujoTokens:
+    """
+    Secuencia compacta de tokens: un array de códigos de tipo, uno de
+    desplazamientos sobre el texto original y uno de longitudes (para
+    recuperar el lexema sin volver a analizar). Las tuplas (tipo, valor) solo se
+    construyen cuando se accede a ellas; los nombres de tipo son las cadenas
+    internadas de la tupla tokens, de modo que no se duplican.
+    """
+
+    __slots__ = ('texto', 'codigos', 'inicios', 'longitudes')
+
+    def __init__(self, texto, codigos, inicios, longitudes):
+        self.texto = texto
+        self.codigos = codigos
+        self.inicios = inicios
+        self.longitudes = longitudes
+
+    @classmethod
+    def desde_texto(cls, texto, capacidad=65536, control=None):
+        """
+        Analiza el texto completo sin crear objetos por token. Con un
+        ControlRecursos (ver limites_recursos.py) se comprueban la cantidad de
+        tokens y el plazo de la etapa después de cada bloque, y los bloques
+        no superan el máximo de tokens más uno, así que una entrada demasiado
+        larga se rechaza sin analizarla completa.
+        """
+        codigos = array('B')
+        inicios = array('Q')
+        longitudes = array('I')
+        try:
+            datos = texto.encode('ascii')
+        except UnicodeEncodeError:
+            datos = None
+
+        if datos is not None:
+            # Nunca hay más tokens que bytes: en textos cortos se evita preasignar buffers grandes
+            capacidad = max(1, min(capacidad, len(datos)))
+            if control is not None and control.limites.max_tokens is not None:
+                capacidad = min(capacidad, control.limites.max_tokens + 1)
+            for cantidad, tipos, posiciones, largos in analizar_bytes_por_bloques(datos, capacidad):
+                codigos.extend(tipos[:cantidad])
+                inicios.extend(posiciones[:cantidad])
+                longitudes.extend(largos[:cantidad])
+                if control is not None:
+                    control.comprobar_tokens(len(codigos))
+        else:
+            # Con caracteres no ASCII (siempre ilegales) se usa la expresión sobre str
+            linea = 1
+            for coincidencia in patron_tokens.finditer(texto):
+                nombre = coincidencia.lastgroup
+                if nombre in codigos_tokens:
+                    codigos.append(codigos_tokens[nombre])
+                    inicios.append(coincidencia.start())
+                    longitudes.append(len(coincidencia.group()))
+                elif nombre == 'SALTO':
+                    linea += 1
+                elif nombre == 'ERROR':
+                    print(f"Carácter ilegal '{coincidencia.group()}' en la línea {linea}")
+            if control is not None:
+                control.comprobar_tokens(len(codigos))
+        return cls(texto, codigos, inicios, longitudes)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def tipo(self, indice):
+        return tokens[self.codigos[indice]]
+
+    def lexema(self, indice):
+        """
+        Texto del token, recuperado del original a partir de su desplazamiento
+        """
+        inicio = self.inicios[indice]
+        return self.texto[inicio:inicio + self.longitudes[indice]]
+
+    def valor(self, indice):
+        lexema = self.lexema(indice)
+        return int(lexema) if self.codigos[indice] == codigos_tokens['CONSTANTE'] else lexema
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        return (self.tipo(indice), self.valor(indice))
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+    def __eq__(self, otro):
+        if isinstance(otro, FlujoTokens):
+            return list(self) == list(otro)
+        if isinstance(otro, list):
+            return list(self) == otro
+        return NotImplemented
+
+    def __repr__(self):
+        return f"FlujoTokens({len(self)} tokens)"
+
+    def como_lexer(self):
+        """
+        Adaptador con la interfaz de lexer de PLY (input/token) para que el
+        parser consuma el flujo sin volver a analizar el texto
+        """
+        return _LexerDeFlujo(self)
+
+class _LexerDeFlujo:
+    """
+    Entrega los tokens de un FlujoTokens como objetos LexToken
+    """
+
+    def __init__(self, flujo):
+        self.flujo = flujo
+        self.indice = 0
+        self.lineno = 1
+        self._posicion_linea = 0
+
+    def input(self, datos):
+        # El texto ya está analizado; se ignora para mantener la interfaz de PLY
+        self.indice = 0
+
+    def token(self):
+        flujo = self.flujo
+        if self.indice >= len(flujo):
+            return None
+        inicio = flujo.inicios[self.indice]
+        # Número de línea calculado de forma incremental
+        self.lineno += flujo.texto.count('\n', self._posicion_linea, inicio)
+        self._posicion_linea = inicio
+        tok = lex.LexToken()
+        tok.type = flujo.tipo(self.indice)
+        tok.value = flujo.valor(self.indice)
+        tok.lineno = self.lineno
+        tok.lexpos = inicio
+        tok.lexer = self
+        self.indice += 1
+        return tok
+
 if __name__ == "__main__":
     # Pruebas del analizador léxico
     expresiones_prueba = [
@@ -102,7 +553,8 @@ if __name__ == "__main__":
         "~(p^q)",
         "(p<=>~p)",
         "((p=>q)^p)",
-        "(~(p^(qor))os)"
+        "(~(p^(qor))os)",
+        "(p12^x_1043)=>p1"
     ]
     
     print("=== ANÁLISIS LÉXICO ===")
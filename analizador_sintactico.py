@@ -1,26 +1,121 @@
 # Analizador Sintáctico para el Sistema Axiomático L
 # Implementa la gramática del cálculo proposicional
 
+import contextlib
+import hashlib
+import io
+import sys
 import ply.yacc as yacc
-from analizador_lexico import tokens
+from analizador_lexico import tokens, codigos_tokens, lexer, lexer_con_presupuesto, FlujoTokens
+from limites_recursos import ErrorLimiteRecursos
 import networkx as nx
 
+# Tabla de símbolos: asigna a cada nombre de variable un entero denso (0, 1, 2, ...)
+# para que los motores trabajen con índices en lugar de cadenas
+class TablaSimbolos:
+    def __init__(self):
+        self.nombres = []  # símbolo -> nombre (cadena internada)
+        self.simbolos = {} # nombre -> símbolo
+    
+    def internar(self, nombre):
+        simbolo = self.simbolos.get(nombre)
+        if simbolo is None:
+            simbolo = len(self.nombres)
+            nombre = sys.intern(nombre)
+            self.nombres.append(nombre)
+            self.simbolos[nombre] = simbolo
+        return simbolo
+    
+    def nombre(self, simbolo):
+        return self.nombres[simbolo]
+    
+    def __len__(self):
+        return len(self.nombres)
+    
+    def __contains__(self, nombre):
+        return nombre in self.simbolos
+    
+    def truncar(self, longitud):
+        """
+        Olvida los símbolos creados después de que la tabla tuviera
+        `longitud` entradas; los anteriores conservan su número
+        """
+        for nombre in self.nombres[longitud:]:
+            del self.simbolos[nombre]
+        del self.nombres[longitud:]
+
+# Tabla global compartida por el analizador y los demás módulos
+tabla_simbolos = TablaSimbolos()
+
+@contextlib.contextmanager
+def ambito_simbolos():
+    """
+    Ámbito de la tabla de símbolos para un análisis o un corpus: los símbolos
+    creados dentro se olvidan al salir, así un proceso de larga duración (el
+    servicio de validación) no acumula los nombres de entradas no confiables.
+    Los árboles creados dentro conservan el nombre de cada variable en
+    `valor`, pero su `simbolo` deja de ser válido fuera del ámbito;
+    reinternar(ast) lo vuelve a calcular. Los ámbitos pueden anidarse.
+    """
+    longitud = len(tabla_simbolos)
+    try:
+        yield tabla_simbolos
+    finally:
+        tabla_simbolos.truncar(longitud)
+
+# Símbolo de cada operador tal como aparece en las expresiones (es el valor de su NodoAST)
+SIMBOLOS_OPERADOR = {
+    'NEGACION': '~',
+    'CONJUNCION': '^',
+    'DISYUNCION': 'o',
+    'IMPLICACION': '=>',
+    'BICONDICIONAL': '<=>',
+}
+
 # Clase para representar nodos del árbol sintáctico
 class NodoAST:
+    __slots__ = ('tipo', 'valor', 'hijos', 'id', 'simbolo', 'parentesis')
+    
     def __init__(self, tipo, valor=None, hijos=None):
         self.tipo = tipo
         self.valor = valor
         self.hijos = hijos if hijos else []
         self.id = None  # ID único para el grafo
+        self.parentesis = 0  # Pares de paréntesis que la encerraban en el texto
+        # Las variables guardan su símbolo entero; el valor es el nombre internado
+        self.simbolo = None
+        if tipo == 'VARIABLE':
+            self.simbolo = tabla_simbolos.internar(valor)
+            self.valor = tabla_simbolos.nombres[self.simbolo]
     
     def __str__(self):
         if self.valor is not None:
             return f"{self.tipo}({self.valor})"
         return self.tipo
 
+def reinternar(ast):
+    """
+    Vuelve a calcular el símbolo de cada variable a partir de su nombre, para
+    usar con la tabla actual un árbol creado dentro de un ámbito ya cerrado
+    """
+    vistos = set()  # los nodos compartidos se visitan una vez
+    pila = [ast]
+    while pila:
+        nodo = pila.pop()
+        if id(nodo) in vistos:
+            continue
+        vistos.add(id(nodo))
+        if nodo.tipo == 'VARIABLE':
+            nodo.simbolo = tabla_simbolos.internar(nodo.valor)
+        pila.extend(nodo.hijos)
+    return ast
+
 # Variable global para el grafo
 grafo_expresion = None
 contador_nodos = 0
+construir_grafo_activo = True  # Permite omitir el grafo cuando solo se necesita el árbol
+error_sintactico = False       # Se activa en p_error aunque PLY se recupere del error
+control_recursos = None        # ControlRecursos del análisis en curso (ver limites_recursos.py)
 
 # Función para generar IDs únicos para nodos
 def generar_id():
@@ -29,20 +124,30 @@ def generar_id():
     return contador_nodos
 
 # Función para agregar nodo al grafo
+# Recorre el árbol en preorden con una pila explícita (los IDs son los mismos
+# que con el recorrido recursivo y no hay límite de profundidad)
 def agregar_nodo_grafo(nodo):
     global grafo_expresion
     if grafo_expresion is None:
         grafo_expresion = nx.DiGraph()
     
-    nodo.id = generar_id()
-    etiqueta = nodo.valor if nodo.valor is not None else nodo.tipo
-    grafo_expresion.add_node(nodo.id, label=str(etiqueta), tipo=nodo.tipo)
-    
-    # Agregar aristas a los hijos
-    for hijo in nodo.hijos:
-        if hijo.id is None:
-            agregar_nodo_grafo(hijo)
-        grafo_expresion.add_edge(nodo.id, hijo.id)
+    nodo.id = None
+    control = control_recursos
+    if control is not None:
+        control.iniciar_etapa('grafo')
+    pila = [(nodo, None)]
+    while pila:
+        actual, padre = pila.pop()
+        if actual.id is None:
+            actual.id = generar_id()
+            if control is not None:
+                control.avanzar(actual.id)
+            etiqueta = actual.valor if actual.valor is not None else actual.tipo
+            grafo_expresion.add_node(actual.id, label=str(etiqueta), tipo=actual.tipo)
+            pila.extend((hijo, actual) for hijo in reversed(actual.hijos))
+        # Los nodos compartidos que ya tienen ID solo reciben la arista
+        if padre is not None:
+            grafo_expresion.add_edge(padre.id, actual.id)
     
     return nodo
 
@@ -63,46 +168,63 @@ def p_formula(p):
     global grafo_expresion, contador_nodos
     grafo_expresion = None
     contador_nodos = 0
-    p[0] = agregar_nodo_grafo(p[1])
+    p[0] = agregar_nodo_grafo(p[1]) if construir_grafo_activo else p[1]
 
 # Variables proposicionales y constantes son fórmulas bien formadas
 def p_expresion_variable(p):
     '''expresion : VARIABLE'''
     p[0] = NodoAST('VARIABLE', p[1])
+    if control_recursos is not None:
+        control_recursos.registrar_nodo(p[0])
 
 def p_expresion_constante(p):
     '''expresion : CONSTANTE'''
     p[0] = NodoAST('CONSTANTE', p[1])
+    if control_recursos is not None:
+        control_recursos.registrar_nodo(p[0])
 
 # Negación: Si a es una fórmula bien formada, ~a es una fórmula bien formada
 def p_expresion_negacion(p):
     '''expresion : NEGACION expresion %prec NEGACION'''
     p[0] = NodoAST('NEGACION', '~', [p[2]])
+    if control_recursos is not None:
+        control_recursos.registrar_nodo(p[0])
 
 # Operadores binarios: Si a y b son fórmulas bien formadas, entonces a^b, aob, a=>b, a<=>b son fórmulas bien formadas
 def p_expresion_conjuncion(p):
     '''expresion : expresion CONJUNCION expresion'''
     p[0] = NodoAST('CONJUNCION', '^', [p[1], p[3]])
+    if control_recursos is not None:
+        control_recursos.registrar_nodo(p[0])
 
 def p_expresion_disyuncion(p):
     '''expresion : expresion DISYUNCION expresion'''
     p[0] = NodoAST('DISYUNCION', 'o', [p[1], p[3]])
+    if control_recursos is not None:
+        control_recursos.registrar_nodo(p[0])
 
 def p_expresion_implicacion(p):
     '''expresion : expresion IMPLICACION expresion'''
     p[0] = NodoAST('IMPLICACION', '=>', [p[1], p[3]])
+    if control_recursos is not None:
+        control_recursos.registrar_nodo(p[0])
 
 def p_expresion_bicondicional(p):
     '''expresion : expresion BICONDICIONAL expresion'''
     p[0] = NodoAST('BICONDICIONAL', '<=>', [p[1], p[3]])
+    if control_recursos is not None:
+        control_recursos.registrar_nodo(p[0])
 
 # Paréntesis: Si a es una fórmula bien formada, entonces (a) es una fórmula bien formada
 def p_expresion_parentesis(p):
     '''expresion : PARIZQ expresion PARDER'''
     p[0] = p[2]  # Los paréntesis no cambian la estructura del árbol
+    p[0].parentesis += 1
 
 # Manejo de errores sintácticos
 def p_error(p):
+    global error_sintactico
+    error_sintactico = True
     if p:
         print(f"Error sintáctico en el token '{p.value}' (tipo: {p.type}) en la línea {p.lineno}")
     else:
@@ -111,15 +233,203 @@ def p_error(p):
 # Construir el analizador sintáctico
 parser = yacc.yacc()
 
+# Motor Pratt: alternativa escrita a mano al parser LALR de PLY.
+# Usa la misma tabla de precedencia que la gramática; PARIZQ tiene precedencia 0
+# para que ningún operador se reduzca más allá de un paréntesis abierto.
+precedencia_pratt = [0] * len(tokens)
+for _nivel, (_asociatividad, _nombre) in enumerate(precedence, start=1):
+    precedencia_pratt[codigos_tokens[_nombre]] = _nivel
+
+_SIMBOLOS_BINARIOS = {
+    codigos_tokens['CONJUNCION']: ('CONJUNCION', '^'),
+    codigos_tokens['DISYUNCION']: ('DISYUNCION', 'o'),
+    codigos_tokens['IMPLICACION']: ('IMPLICACION', '=>'),
+    codigos_tokens['BICONDICIONAL']: ('BICONDICIONAL', '<=>'),
+}
+
+def _error_pratt(flujo, indice):
+    # Mismo formato de mensaje que p_error
+    if indice is None:
+        print("Error sintáctico: fin de entrada inesperado")
+    else:
+        linea = flujo.texto.count('\n', 0, flujo.inicios[indice]) + 1
+        print(f"Error sintáctico en el token '{flujo.valor(indice)}' (tipo: {flujo.tipo(indice)}) en la línea {linea}")
+    return None
+
+def analizar_pratt(flujo, control=None):
+    """
+    Analiza un FlujoTokens con un parser de precedencia de operadores (Pratt)
+    sin recursión: una pila de operandos y otra de operadores pendientes.
+    Construye los mismos NodoAST que la gramática de PLY:
+    - los operadores binarios asocian a la izquierda (se reduce mientras el
+      operador pendiente tenga precedencia mayor o igual)
+    - la negación es prefija y liga más que cualquier binario
+    - los paréntesis no generan nodo; se cuentan en el atributo parentesis
+    Devuelve el árbol, o None (tras imprimir el error) si la entrada no es válida.
+    Con un ControlRecursos se lanza ErrorLimiteRecursos al superar los límites
+    de nodos, profundidad o tiempo. Los nodos se cuentan en una variable local
+    y la profundidad de cada operando se guarda en una lista paralela a la
+    pila de operandos; el control solo se consulta cada INTERVALO_RELOJ nodos.
+    """
+    VARIABLE = codigos_tokens['VARIABLE']
+    CONSTANTE = codigos_tokens['CONSTANTE']
+    NEGACION = codigos_tokens['NEGACION']
+    PARIZQ = codigos_tokens['PARIZQ']
+    PARDER = codigos_tokens['PARDER']
+    precedencias = precedencia_pratt
+    binarios = _SIMBOLOS_BINARIOS
+    codigos = flujo.codigos
+    inicios = flujo.inicios
+    longitudes = flujo.longitudes
+    texto = flujo.texto
+
+    operandos = []
+    operadores = []
+
+    # Límites: nodos creados, cantidad en la que se vuelve a consultar el
+    # control y profundidad de cada elemento de operandos
+    limitar = control is not None
+    nodos = 0
+    umbral = control.comprobar_nodos(0) if limitar else 0
+    max_profundidad = control.max_profundidad if limitar else 0
+    profundidades = []
+
+    def reducir():
+        nonlocal nodos, umbral
+        codigo = operadores.pop()
+        if codigo == NEGACION:
+            operandos[-1] = NodoAST('NEGACION', '~', [operandos[-1]])
+        else:
+            tipo, simbolo = binarios[codigo]
+            derecha = operandos.pop()
+            operandos[-1] = NodoAST(tipo, simbolo, [operandos[-1], derecha])
+        if limitar:
+            if codigo == NEGACION:
+                profundidad = profundidades[-1] + 1
+            else:
+                profundidad = max(profundidades.pop(), profundidades[-1]) + 1
+            if profundidad > max_profundidad:
+                raise ErrorLimiteRecursos('profundidad', max_profundidad, profundidad, control.etapa)
+            profundidades[-1] = profundidad
+            nodos += 1
+            if nodos >= umbral:
+                umbral = control.comprobar_nodos(nodos)
+
+    esperando_operando = True
+    for indice, codigo in enumerate(codigos):
+        if esperando_operando:
+            if codigo == VARIABLE:
+                inicio = inicios[indice]
+                operandos.append(NodoAST('VARIABLE', texto[inicio:inicio + longitudes[indice]]))
+                esperando_operando = False
+                if limitar:
+                    profundidades.append(1)
+                    nodos += 1
+                    if nodos >= umbral:
+                        umbral = control.comprobar_nodos(nodos)
+            elif codigo == CONSTANTE:
+                operandos.append(NodoAST('CONSTANTE', int(texto[inicios[indice]])))
+                esperando_operando = False
+                if limitar:
+                    profundidades.append(1)
+                    nodos += 1
+                    if nodos >= umbral:
+                        umbral = control.comprobar_nodos(nodos)
+            elif codigo == NEGACION or codigo == PARIZQ:
+                operadores.append(codigo)
+            else:
+                return _error_pratt(flujo, indice)
+        elif codigo in binarios:
+            nivel = precedencias[codigo]
+            while operadores and precedencias[operadores[-1]] >= nivel:
+                reducir()
+            operadores.append(codigo)
+            esperando_operando = True
+        elif codigo == PARDER:
+            while operadores and operadores[-1] != PARIZQ:
+                reducir()
+            if not operadores:
+                return _error_pratt(flujo, indice)
+            operadores.pop()
+            operandos[-1].parentesis += 1
+        else:
+            return _error_pratt(flujo, indice)
+
+    if esperando_operando:
+        return _error_pratt(flujo, None)
+    while operadores:
+        if operadores[-1] == PARIZQ:
+            return _error_pratt(flujo, None)
+        reducir()
+    return operandos[0]
+
+MOTORES = ('ply', 'pratt')
+
 # Función para analizar una expresión
-def analizar_sintacticamente(expresion):
-    global grafo_expresion
+def analizar_sintacticamente(expresion, motor='ply', construir_grafo=True, limites=None):
+    # Acepta texto o un FlujoTokens ya analizado (no se vuelve a tokenizar).
+    # motor='pratt' usa el parser escrito a mano; construir_grafo=False omite
+    # el grafo de networkx y devuelve (ast, None).
+    # Con limites (un LimitesRecursos) la entrada se trata como no confiable y
+    # al superar un límite se lanza ErrorLimiteRecursos en lugar de devolver
+    # (None, None). Pratt tokeniza el texto con FlujoTokens en la etapa
+    # 'lexico'; PLY conserva su lexer, que tokeniza durante el análisis: si el
+    # texto tiene más caracteres que el máximo de tokens usa la copia de
+    # lexer_con_presupuesto, que los cuenta (con menos no puede superarlo).
+    global grafo_expresion, contador_nodos, construir_grafo_activo, error_sintactico, control_recursos
+    if motor not in MOTORES:
+        print(f"Motor de análisis desconocido: {motor}. Disponibles: {', '.join(MOTORES)}")
+        return None, None
+    error_sintactico = False
+    control = None
+    lexer_ply = lexer
+    if limites is not None:
+        control = limites.controlar()
+        if isinstance(expresion, FlujoTokens):
+            control.comprobar_tokens(len(expresion))
+        else:
+            control.comprobar_texto(expresion)
+            if motor == 'pratt':
+                expresion = FlujoTokens.desde_texto(expresion, control=control)
+            elif limites.max_tokens is not None and len(expresion) > limites.max_tokens:
+                lexer_ply = lexer_con_presupuesto(control)
+        control.iniciar_etapa('sintactico')
     try:
-        resultado = parser.parse(expresion)
-        return resultado, grafo_expresion
+        if motor == 'pratt':
+            flujo = expresion if isinstance(expresion, FlujoTokens) else FlujoTokens.desde_texto(expresion)
+            control_recursos = control
+            resultado = analizar_pratt(flujo, control)
+            if resultado is None:
+                return None, None
+            if not construir_grafo:
+                return resultado, None
+            grafo_expresion = None
+            contador_nodos = 0
+            return agregar_nodo_grafo(resultado), grafo_expresion
+
+        construir_grafo_activo = construir_grafo
+        control_recursos = control
+        try:
+            if isinstance(expresion, FlujoTokens):
+                resultado = parser.parse(lexer=expresion.como_lexer())
+            else:
+                resultado = parser.parse(expresion, lexer=lexer_ply)
+        finally:
+            construir_grafo_activo = True
+        if resultado is None or error_sintactico:
+            # El grafo global puede pertenecer a la expresión anterior, y tras un
+            # error PLY puede devolver el árbol de un fragmento recuperado
+            return None, None
+        return resultado, grafo_expresion if construir_grafo else None
+    except ErrorLimiteRecursos:
+        # El grafo global puede haber quedado a medias
+        grafo_expresion = None
+        raise
     except Exception as e:
         print(f"Error durante el análisis sintáctico: {e}")
         return None, None
+    finally:
+        control_recursos = None
 
 # Función para imprimir el árbol sintáctico
 def imprimir_arbol(nodo, nivel=0):
@@ -132,6 +442,104 @@ def imprimir_arbol(nodo, nivel=0):
     for hijo in nodo.hijos:
         imprimir_arbol(hijo, nivel + 1)
 
+# Hash estructural de un nodo a partir de su tipo, su valor y los hashes de sus hijos.
+# Es estable entre ejecuciones, por lo que puede persistirse en índices.
+def hash_nodo(tipo, valor, hashes_hijos=()):
+    h = hashlib.blake2b(f"{tipo}:{valor}".encode('utf-8'), digest_size=8)
+    for hash_hijo in hashes_hijos:
+        h.update(hash_hijo.to_bytes(8, 'little'))
+    return int.from_bytes(h.digest(), 'little')
+
+# Función para calcular el hash estructural de cada subfórmula (postorden iterativo).
+# memo es un diccionario opcional (tipo, valor, hashes de los hijos) -> hash que
+# puede compartirse entre muchas fórmulas para no repetir el cálculo de blake2b.
+def hashes_estructurales(ast, memo=None):
+    hashes = {}
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if visitado:
+            hashes_hijos = tuple([hashes[id(hijo)] for hijo in nodo.hijos])
+        elif id(nodo) in hashes:
+            continue
+        elif nodo.hijos:
+            pila.append((nodo, True))
+            pila.extend([(hijo, False) for hijo in nodo.hijos])
+            continue
+        else:
+            hashes_hijos = ()
+        if memo is None:
+            hashes[id(nodo)] = hash_nodo(nodo.tipo, nodo.valor, hashes_hijos)
+        else:
+            clave = (nodo.tipo, nodo.valor, hashes_hijos)
+            valor = memo.get(clave)
+            if valor is None:
+                valor = memo[clave] = hash_nodo(nodo.tipo, nodo.valor, hashes_hijos)
+            hashes[id(nodo)] = valor
+    return hashes
+
+def hash_estructural(ast):
+    return hashes_estructurales(ast)[id(ast)]
+
+# Identificadores estructurales exactos (hash-consing): cada subfórmula distinta
+# recibe un entero según (tipo, valor, identificadores de los hijos). A diferencia
+# de un hash de 64 bits, dos subfórmulas tienen el mismo identificador solo si son
+# estructuralmente iguales: el diccionario tabla compara las claves completas.
+# tabla debe compartirse entre todas las fórmulas que se quieran comparar.
+def identificadores_estructurales(ast, tabla):
+    identificadores = {}
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if visitado:
+            clave = (nodo.tipo, nodo.valor, *[identificadores[id(hijo)] for hijo in nodo.hijos])
+        elif id(nodo) in identificadores:
+            continue
+        elif nodo.hijos:
+            pila.append((nodo, True))
+            pila.extend([(hijo, False) for hijo in nodo.hijos])
+            continue
+        else:
+            clave = (nodo.tipo, nodo.valor)
+        valor = tabla.get(clave)
+        if valor is None:
+            valor = tabla[clave] = len(tabla)
+        identificadores[id(nodo)] = valor
+    return identificadores
+
+# Prueba diferencial entre motores: ambos deben aceptar las mismas expresiones
+# y producir árboles con el mismo hash estructural
+def comparar_motores(expresiones):
+    """
+    Devuelve (total, lista de discrepancias (expresión, resultado PLY, resultado Pratt)).
+    Cada resultado es el hash estructural del árbol, o None si la expresión es inválida.
+    """
+    discrepancias = []
+    total = 0
+    for expresion in expresiones:
+        total += 1
+        resultados = []
+        for motor in MOTORES:
+            with contextlib.redirect_stdout(io.StringIO()):
+                ast, _ = analizar_sintacticamente(expresion, motor=motor, construir_grafo=False)
+            resultados.append(hash_estructural(ast) if ast is not None else None)
+        if resultados[0] != resultados[1]:
+            discrepancias.append((expresion, *resultados))
+    return total, discrepancias
+
+def mutar_expresion(generador, expresion):
+    """
+    Inserta, borra o duplica un carácter para obtener (casi siempre) una expresión inválida
+    """
+    posicion = generador.randrange(len(expresion) + 1)
+    operacion = generador.choice(('insertar', 'borrar', 'duplicar'))
+    if operacion == 'insertar' or not expresion:
+        return expresion[:posicion] + generador.choice("pq01~^o()=><") + expresion[posicion:]
+    posicion = min(posicion, len(expresion) - 1)
+    if operacion == 'borrar':
+        return expresion[:posicion] + expresion[posicion + 1:]
+    return expresion[:posicion] + expresion[posicion] + expresion[posicion:]
+
 if __name__ == "__main__":
     # Pruebas del analizador sintáctico
     expresiones_prueba = [
@@ -154,4 +562,34 @@ if __name__ == "__main__":
                 print(f"Nodos en el grafo: {list(grafo.nodes(data=True))}")
                 print(f"Aristas en el grafo: {list(grafo.edges())}")
         else:
-            print("Error en el análisis")
\ No newline at end of file
+            print("Error en el análisis")
+
+    # Prueba diferencial PLY vs Pratt sobre un corpus aleatorio y sus mutaciones
+    import random
+    from gramatica_sistema_L import generar_formula_aleatoria
+    generador = random.Random(33)
+    variables = list("pqrstuvwxyz") + ["p1", "q23", "x_7", "z_1043"]
+    corpus = [generar_formula_aleatoria(generador, generador.randint(1, 40), variables=variables,
+                                        prob_parentesis=0.5)
+              for _ in range(3000)]
+    corpus += [mutar_expresion(generador, expr) for expr in corpus]
+    corpus += ["", "()", "p q", "(p", "p)", "p^^q", "~", "p~q", "((p))", "~~p^q<=>r=>sot"]
+    total, discrepancias = comparar_motores(corpus)
+    print(f"\n=== PRUEBA DIFERENCIAL PLY vs PRATT ===")
+    print(f"Expresiones comparadas: {total}")
+    print(f"Discrepancias: {len(discrepancias)}")
+    for expr, hash_ply, hash_pratt in discrepancias[:10]:
+        print(f"  {expr!r}: PLY={hash_ply} Pratt={hash_pratt}")
+
+    # Ámbito de símbolos: los nombres nuevos se olvidan al salir
+    print("\n=== ÁMBITO DE LA TABLA DE SÍMBOLOS ===")
+    antes = len(tabla_simbolos)
+    with ambito_simbolos():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for n in range(10000):
+                analizar_sintacticamente(f"x_{n}^p", motor='pratt', construir_grafo=False)
+        dentro = len(tabla_simbolos)
+        ast, _ = analizar_sintacticamente("x_5000=>x_9999", motor='pratt', construir_grafo=False)
+    print(f"Símbolos: {antes} antes, {dentro} dentro del ámbito, {len(tabla_simbolos)} después")
+    reinternar(ast)
+    print(f"Reinternado: {[tabla_simbolos.nombre(hijo.simbolo) for hijo in ast.hijos]}")
@@ -0,0 +1,318 @@
+# Árbol de Discriminación para Esquemas del Sistema L
+# Indexa esquemas (axiomas, reglas de reescritura, patrones de lemas) en un
+# trie sobre su recorrido en preorden y encuentra de una sola pasada cuáles
+# instancia una fórmula, con la subfórmula que ocupa cada metavariable
+
+import contextlib
+import io
+import sys
+from analizador_sintactico import NodoAST, ambito_simbolos, analizar_sintacticamente, hashes_estructurales
+
+# Arista del trie que representa una metavariable (cualquier subfórmula)
+COMODIN = '*'
+# Clave del trie bajo la que se guardan los esquemas que terminan en ese nodo
+FIN = None
+
+def _simbolo(nodo):
+    """
+    Símbolo de un nodo en el recorrido: el tipo para los operadores, el
+    nombre para las variables y el valor (0 o 1) para las constantes
+    """
+    if nodo.hijos:
+        return nodo.tipo
+    return nodo.valor
+
+def aplanar_formula(ast):
+    """
+    Recorrido en preorden de la fórmula: (nodos, símbolos, saltos), donde
+    saltos[i] es la posición siguiente al subárbol que empieza en i
+    """
+    nodos = []
+    pila = [ast]
+    while pila:
+        nodo = pila.pop()
+        nodos.append(nodo)
+        pila.extend(reversed(nodo.hijos))
+    simbolos = [_simbolo(nodo) for nodo in nodos]
+    saltos = [0] * len(nodos)
+    tamanos = []
+    for i in range(len(nodos) - 1, -1, -1):
+        tamano = 1
+        for _ in nodos[i].hijos:
+            tamano += tamanos.pop()
+        tamanos.append(tamano)
+        saltos[i] = i + tamano
+    return nodos, simbolos, saltos
+
+def emparejar(esquema, ast, metavariables=None, hashes=None):
+    """
+    Emparejamiento directo de un esquema con una fórmula: devuelve el
+    diccionario {metavariable: subfórmula} o None si no es instancia. Sin
+    metavariables explícitas todas las variables del esquema lo son. Sirve
+    de referencia para el índice.
+    """
+    ligaduras = {}
+    pila = [(esquema, ast)]
+    while pila:
+        patron, nodo = pila.pop()
+        if patron.tipo == 'VARIABLE' and (metavariables is None or patron.valor in metavariables):
+            anterior = ligaduras.get(patron.valor)
+            if anterior is None:
+                ligaduras[patron.valor] = nodo
+                continue
+            if hashes is None:
+                hashes = hashes_estructurales(ast)
+            if hashes[id(anterior)] != hashes[id(nodo)]:
+                return None
+            continue
+        if _simbolo(patron) != _simbolo(nodo) or len(patron.hijos) != len(nodo.hijos):
+            return None
+        pila.extend(reversed(list(zip(patron.hijos, nodo.hijos))))
+    return ligaduras
+
+class ArbolDiscriminacion:
+    """
+    Trie de esquemas indexados por su recorrido en preorden, donde cada
+    metavariable se reemplaza por un comodín. Una consulta recorre la
+    fórmula una sola vez: en cada posición sigue la arista del símbolo
+    actual y, si existe, la del comodín, que salta el subárbol completo.
+    Las metavariables repetidas (como B en A1) no se distinguen en el trie;
+    se comprueban en las hojas comparando hashes estructurales, que solo se
+    calculan si algún candidato los necesita.
+    """
+
+    def __init__(self):
+        self.raiz = {}
+        self.esquemas = []  # identificador -> (nombre, ast)
+        self.nodos_trie = 1
+        self.consultas = 0
+        self.candidatos = 0
+        self.coincidencias = 0
+
+    def __len__(self):
+        return len(self.esquemas)
+
+    def agregar(self, esquema, nombre=None, metavariables=None):
+        """
+        Agrega un esquema (NodoAST o texto) y devuelve su identificador, o
+        None si el texto es inválido. Sin metavariables explícitas todas las
+        variables del esquema lo son; las demás deben coincidir literalmente.
+        """
+        if not isinstance(esquema, NodoAST):
+            texto = esquema
+            with contextlib.redirect_stdout(io.StringIO()):
+                esquema, _ = analizar_sintacticamente(texto, motor='pratt', construir_grafo=False)
+            if esquema is None:
+                print(f"Esquema inválido: {texto}")
+                return None
+            if nombre is None:
+                nombre = texto
+        identificador = len(self.esquemas)
+        self.esquemas.append((identificador if nombre is None else nombre, esquema))
+
+        nodo_trie = self.raiz
+        orden = []  # metavariable de cada comodín, en preorden
+        pila = [esquema]
+        while pila:
+            nodo = pila.pop()
+            if nodo.tipo == 'VARIABLE' and (metavariables is None or nodo.valor in metavariables):
+                simbolo = COMODIN
+                orden.append(nodo.valor)
+            else:
+                simbolo = _simbolo(nodo)
+                pila.extend(reversed(nodo.hijos))
+            siguiente = nodo_trie.get(simbolo)
+            if siguiente is None:
+                siguiente = nodo_trie[simbolo] = {}
+                self.nodos_trie += 1
+            nodo_trie = siguiente
+        repetidas = len(set(orden)) != len(orden)
+        nodo_trie.setdefault(FIN, []).append((identificador, tuple(orden), repetidas))
+        return identificador
+
+    def agregar_esquemas(self, esquemas):
+        """
+        Agrega un diccionario {nombre: esquema} o una secuencia de esquemas
+        (las líneas vacías se ignoran). Devuelve cuántos se agregaron.
+        """
+        pares = esquemas.items() if isinstance(esquemas, dict) else ((None, e) for e in esquemas)
+        agregados = 0
+        for nombre, esquema in pares:
+            if isinstance(esquema, str):
+                esquema = esquema.strip()
+                if not esquema:
+                    continue
+            agregados += self.agregar(esquema, nombre) is not None
+        return agregados
+
+    def buscar(self, ast):
+        """
+        Esquemas de los que la fórmula es instancia: lista de pares
+        (nombre, {metavariable: subfórmula}) en orden de identificador
+        """
+        nodos, simbolos, saltos = aplanar_formula(ast)
+        total = len(nodos)
+        hashes = None
+        resultados = []
+        candidatos = 0
+        # (nodo del trie, posición en la fórmula, posiciones ligadas a los comodines)
+        pila = [(self.raiz, 0, ())]
+        while pila:
+            nodo_trie, i, ligadas = pila.pop()
+            if i == total:
+                for identificador, orden, repetidas in nodo_trie.get(FIN, ()):
+                    candidatos += 1
+                    ligaduras = {}
+                    if repetidas:
+                        if hashes is None:
+                            hashes = hashes_estructurales(ast)
+                        for metavariable, posicion in zip(orden, ligadas):
+                            anterior = ligaduras.get(metavariable)
+                            if anterior is None:
+                                ligaduras[metavariable] = nodos[posicion]
+                            elif hashes[id(anterior)] != hashes[id(nodos[posicion])]:
+                                break
+                        else:
+                            resultados.append((identificador, ligaduras))
+                    else:
+                        for metavariable, posicion in zip(orden, ligadas):
+                            ligaduras[metavariable] = nodos[posicion]
+                        resultados.append((identificador, ligaduras))
+                continue
+            comodin = nodo_trie.get(COMODIN)
+            if comodin is not None:
+                pila.append((comodin, saltos[i], ligadas + (i,)))
+            siguiente = nodo_trie.get(simbolos[i])
+            if siguiente is not None:
+                pila.append((siguiente, i + 1, ligadas))
+
+        self.consultas += 1
+        self.candidatos += candidatos
+        self.coincidencias += len(resultados)
+        resultados.sort(key=lambda resultado: resultado[0])
+        return [(self.esquemas[identificador][0], ligaduras) for identificador, ligaduras in resultados]
+
+    def buscar_expresion(self, expresion):
+        """
+        Analiza la expresión y busca sus esquemas; None si es inválida
+        """
+        ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+        if ast is None:
+            return None
+        return self.buscar(ast)
+
+    def buscar_corpus(self, fuente):
+        """
+        Genera (fórmula, coincidencias) para cada fórmula de la fuente:
+        NodoAST, pares (texto, ast) de AlmacenCorpus o texto (las líneas
+        vacías se ignoran y las inválidas dan coincidencias None). Los textos
+        se analizan dentro de ambito_simbolos(): los subárboles ligados en las
+        coincidencias conservan sus nombres, pero no un `simbolo` válido
+        (ver reinternar).
+        """
+        for elemento in fuente:
+            if isinstance(elemento, tuple):
+                elemento = elemento[1]
+            if not isinstance(elemento, NodoAST):
+                elemento = elemento.strip()
+                if not elemento:
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()), ambito_simbolos():
+                    ast, _ = analizar_sintacticamente(elemento, motor='pratt', construir_grafo=False)
+                    coincidencias = None if ast is None else self.buscar(ast)
+                yield elemento, coincidencias
+                continue
+            yield elemento, self.buscar(elemento)
+
+    def estadisticas(self):
+        return {
+            'esquemas': len(self.esquemas),
+            'nodos_trie': self.nodos_trie,
+            'consultas': self.consultas,
+            'candidatos': self.candidatos,
+            'coincidencias': self.coincidencias,
+        }
+
+def indice_axiomas():
+    """
+    Índice con los esquemas A1-A3 (metavariables x, y, z; ver sustitucion.py)
+    """
+    from sustitucion import ESQUEMAS_SUSTITUCION
+
+    indice = ArbolDiscriminacion()
+    indice.agregar_esquemas(ESQUEMAS_SUSTITUCION)
+    return indice
+
+if __name__ == "__main__":
+    import random
+    from gramatica_sistema_L import generar_formula_aleatoria
+    from impresor_formulas import formatear_formula
+    from sustitucion import Sustitucion, generar_instancias_axiomas
+    from verificador_pruebas import esquema_axioma
+
+    if len(sys.argv) >= 3:
+        # Uso: python arbol_discriminacion.py esquemas.txt "fórmula" ["fórmula" ...]
+        indice = ArbolDiscriminacion()
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            indice.agregar_esquemas(f)
+        for expresion, coincidencias in indice.buscar_corpus(sys.argv[2:]):
+            if coincidencias is None:
+                print(f"{expresion}: fórmula inválida")
+                continue
+            print(f"{expresion}: {len(coincidencias)} esquemas")
+            for nombre, ligaduras in coincidencias:
+                detalle = ", ".join(f"{m} := {formatear_formula(f)}" for m, f in ligaduras.items())
+                print(f"  {nombre}  [{detalle}]")
+        sys.exit(0)
+
+    print("=== AXIOMAS ===")
+    indice = indice_axiomas()
+    for expresion in ["(p^q)=>(r=>(p^q))", "(p=>(q=>r))=>((p=>q)=>(p=>r))",
+                      "(~q=>~p)=>((~q=>p)=>q)", "p=>(q=>r)", "p=>(p=>p)"]:
+        coincidencias = indice.buscar_expresion(expresion)
+        print(f"{expresion:32} -> " + ("; ".join(
+            f"{nombre} [" + ", ".join(f"{m} := {formatear_formula(f)}" for m, f in ligaduras.items()) + "]"
+            for nombre, ligaduras in coincidencias) or "ninguno"))
+
+    # Debe reconocer exactamente lo mismo que esquema_axioma
+    generador = random.Random(49)
+    formulas = [analizar_sintacticamente(generar_formula_aleatoria(generador, generador.randint(1, 10), "pqr"),
+                                         motor='pratt', construir_grafo=False)[0] for _ in range(40)]
+    consultas = [instancia for _, instancia in generar_instancias_axiomas(formulas, 1000, semilla=49)]
+    consultas += [Sustitucion({'x': generador.choice(formulas)}).aplicar(instancia)
+                  for instancia in consultas[:500]]
+    consultas += formulas
+    coinciden = sum([nombre for nombre, _ in indice.buscar(ast)] == ([esquema_axioma(ast)] if esquema_axioma(ast) else [])
+                    for ast in consultas)
+    print(f"Coincidencias con esquema_axioma: {coinciden}/{len(consultas)}")
+
+    # Contra el emparejamiento esquema por esquema, con esquemas no lineales
+    # y variables fijas (las que no son metavariables)
+    print("\n=== PRUEBA CONTRA EL EMPAREJAMIENTO LINEAL ===")
+    indice = ArbolDiscriminacion()
+    esquemas = []
+    for _ in range(500):
+        ast, _ = analizar_sintacticamente(generar_formula_aleatoria(generador, generador.randint(1, 9), "pqrs"),
+                                          motor='pratt', construir_grafo=False)
+        metavariables = None if generador.random() < 0.7 else {'p', 'q', 'r'}
+        esquemas.append((indice.agregar(ast, metavariables=metavariables), ast, metavariables))
+    consultas = []
+    for _ in range(3000):
+        _, esquema, metavariables = generador.choice(esquemas)
+        asignaciones = {variable: generador.choice(formulas) for variable in "pqrs"
+                        if metavariables is None or variable in metavariables}
+        ast = Sustitucion(asignaciones).aplicar(esquema) if generador.random() < 0.8 else generador.choice(formulas)
+        if generador.random() < 0.5:
+            # Sin nodos compartidos: las metavariables repetidas ligan subárboles distintos
+            ast, _ = analizar_sintacticamente(formatear_formula(ast), motor='pratt', construir_grafo=False)
+        consultas.append(ast)
+    correctas = 0
+    for ast in consultas:
+        esperado = []
+        for identificador, esquema, metavariables in esquemas:
+            ligaduras = emparejar(esquema, ast, metavariables)
+            if ligaduras is not None:
+                esperado.append((identificador, ligaduras))
+        correctas += indice.buscar(ast) == esperado
+    print(f"Consultas con el mismo resultado: {correctas}/{len(consultas)}")
+    print(f"Estadísticas: {indice.estadisticas()}")
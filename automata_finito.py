@@ -1,75 +1,616 @@
 # Diagrama de Autómata Finito para el Alfabeto del Sistema L
 # Reconoce el alfabeto: variables, operadores, paréntesis y constantes
+# El autómata se construye a partir de las expresiones regulares de los tokens:
+# AFN de Thompson -> AFD por construcción de subconjuntos -> AFD mínimo (Hopcroft)
 
+import contextlib
+import io
+import itertools
+import random
+from array import array
 import networkx as nx
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+from analizador_lexico import tokens, reglas_tokens, t_newline, t_ignore, analizar_lexicamente
+
+# Categorías que no son tokens pero que el autómata también reconoce para
+# poder analizar una entrada completa (se numeran después de los tokens)
+SALTO = len(tokens)
+IGNORAR = len(tokens) + 1
+NOMBRES_ACEPTACION = list(tokens) + ['SALTO', 'IGNORAR']
+
+def reglas_automata():
+    """
+    Reglas (nombre, expresión regular) en el orden de prioridad de PLY,
+    seguidas de los saltos de línea y los caracteres ignorados
+    """
+    ignorados = ''.join('\\' + c if c in '\\]^-' else c for c in t_ignore)
+    return list(reglas_tokens) + [('SALTO', t_newline.__doc__), ('IGNORAR', f'[{ignorados}]+')]
+
+# --- Expresiones regulares -> árbol ---------------------------------------
+
+# Subconjunto de la sintaxis de re suficiente para las reglas t_*: literales,
+# escapes, clases [..] con rangos y negación, '.', |, *, +, ? y grupos (con o sin captura)
+_ESCAPES_CLASE = {
+    'n': {10}, 't': {9}, 'r': {13},
+    'd': set(range(48, 58)),
+    's': {9, 10, 11, 12, 13, 32},
+    'w': set(range(48, 58)) | set(range(65, 91)) | set(range(97, 123)) | {95},
+}
+
+class _LectorRegex:
+    def __init__(self, patron):
+        self.patron = patron
+        self.posicion = 0
+
+    def ver(self):
+        return self.patron[self.posicion] if self.posicion < len(self.patron) else None
+
+    def tomar(self):
+        caracter = self.patron[self.posicion]
+        self.posicion += 1
+        return caracter
+
+    def escape(self):
+        caracter = self.tomar()
+        return set(_ESCAPES_CLASE.get(caracter, {ord(caracter)}))
+
+    def alternativa(self):
+        opciones = [self.concatenacion()]
+        while self.ver() == '|':
+            self.tomar()
+            opciones.append(self.concatenacion())
+        return opciones[0] if len(opciones) == 1 else ('alt', opciones)
+
+    def concatenacion(self):
+        partes = []
+        while self.ver() not in (None, '|', ')'):
+            partes.append(self.repeticion())
+        if not partes:
+            return ('vacio',)
+        return partes[0] if len(partes) == 1 else ('concat', partes)
+
+    def repeticion(self):
+        nodo = self.atomo()
+        while self.ver() in ('*', '+', '?'):
+            nodo = ({'*': 'estrella', '+': 'mas', '?': 'opcional'}[self.tomar()], nodo)
+        return nodo
+
+    def atomo(self):
+        caracter = self.tomar()
+        if caracter == '(':
+            # Los grupos sin captura (?:...) se tratan como grupos normales
+            if self.patron.startswith('?:', self.posicion):
+                self.posicion += 2
+            nodo = self.alternativa()
+            if self.ver() != ')':
+                raise ValueError("paréntesis sin cerrar")
+            self.tomar()
+            return nodo
+        if caracter == '[':
+            return ('simbolos', frozenset(self.clase()))
+        if caracter == '\\':
+            return ('simbolos', frozenset(self.escape()))
+        if caracter == '.':
+            return ('simbolos', frozenset(range(256)) - {10})
+        if caracter in '*+?{}^$)':
+            raise ValueError(f"símbolo no soportado '{caracter}'")
+        if ord(caracter) > 255:
+            raise ValueError(f"solo se admiten caracteres de un byte: '{caracter}'")
+        return ('simbolos', frozenset({ord(caracter)}))
+
+    def clase(self):
+        negada = self.ver() == '^'
+        if negada:
+            self.tomar()
+        conjunto = set()
+        primero = True
+        while self.ver() != ']' or primero:
+            if self.ver() is None:
+                raise ValueError("clase sin cerrar")
+            primero = False
+            caracter = self.tomar()
+            if caracter == '\\':
+                elementos = self.escape()
+            else:
+                elementos = {ord(caracter)}
+            # Rango a-z (el guion al final de la clase es literal)
+            if (self.ver() == '-' and len(elementos) == 1 and self.posicion + 1 < len(self.patron)
+                    and self.patron[self.posicion + 1] != ']'):
+                self.tomar()
+                final = self.tomar()
+                final = min(self.escape()) if final == '\\' else ord(final)
+                elementos = set(range(min(elementos), final + 1))
+            conjunto |= elementos
+        self.tomar()
+        return set(range(256)) - conjunto if negada else conjunto
+
+def parsear_regex(patron):
+    """
+    Convierte una expresión regular en un árbol de tuplas:
+    ('simbolos', bytes), ('concat', [..]), ('alt', [..]), ('estrella', n),
+    ('mas', n), ('opcional', n) o ('vacio',). Devuelve None si no está soportada.
+    """
+    lector = _LectorRegex(patron)
+    try:
+        arbol = lector.alternativa()
+        if lector.ver() is not None:
+            raise ValueError(f"carácter inesperado '{lector.ver()}'")
+    except (ValueError, IndexError) as e:
+        print(f"Expresión regular no soportada {patron!r}: {e}")
+        return None
+    return arbol
+
+# --- AFN de Thompson ------------------------------------------------------
+
+class AFN:
+    """
+    Autómata finito no determinista con transiciones ε.
+    epsilon[e] lista los destinos ε del estado e; arcos[e] lista pares
+    (conjunto de bytes, destino); aceptacion[e] es el índice de la regla que
+    reconoce (su prioridad; el nombre está en nombres) o -1.
+    """
+
+    def __init__(self):
+        self.epsilon = []
+        self.arcos = []
+        self.aceptacion = []
+        self.nombres = []
+        self.inicial = self.nuevo_estado()
+
+    def nuevo_estado(self):
+        self.epsilon.append([])
+        self.arcos.append([])
+        self.aceptacion.append(-1)
+        return len(self.epsilon) - 1
+
+    def fragmento(self, arbol):
+        """
+        Construcción de Thompson: devuelve (inicio, fin) del fragmento que
+        reconoce el árbol de la expresión regular
+        """
+        tipo = arbol[0]
+        if tipo == 'simbolos':
+            inicio, fin = self.nuevo_estado(), self.nuevo_estado()
+            self.arcos[inicio].append((arbol[1], fin))
+            return inicio, fin
+        if tipo == 'vacio':
+            inicio, fin = self.nuevo_estado(), self.nuevo_estado()
+            self.epsilon[inicio].append(fin)
+            return inicio, fin
+        if tipo == 'concat':
+            inicio, fin = self.fragmento(arbol[1][0])
+            for parte in arbol[1][1:]:
+                siguiente_inicio, siguiente_fin = self.fragmento(parte)
+                self.epsilon[fin].append(siguiente_inicio)
+                fin = siguiente_fin
+            return inicio, fin
+        if tipo == 'alt':
+            inicio, fin = self.nuevo_estado(), self.nuevo_estado()
+            for opcion in arbol[1]:
+                opcion_inicio, opcion_fin = self.fragmento(opcion)
+                self.epsilon[inicio].append(opcion_inicio)
+                self.epsilon[opcion_fin].append(fin)
+            return inicio, fin
+        # estrella, mas, opcional
+        interno_inicio, interno_fin = self.fragmento(arbol[1])
+        inicio, fin = self.nuevo_estado(), self.nuevo_estado()
+        self.epsilon[inicio].append(interno_inicio)
+        self.epsilon[interno_fin].append(fin)
+        if tipo in ('estrella', 'opcional'):
+            self.epsilon[inicio].append(fin)
+        if tipo in ('estrella', 'mas'):
+            self.epsilon[interno_fin].append(interno_inicio)
+        return inicio, fin
+
+    def clausura(self, estados):
+        """
+        Clausura ε de un conjunto de estados
+        """
+        resultado = set(estados)
+        pila = list(estados)
+        while pila:
+            for destino in self.epsilon[pila.pop()]:
+                if destino not in resultado:
+                    resultado.add(destino)
+                    pila.append(destino)
+        return frozenset(resultado)
+
+def construir_afn(reglas=None):
+    """
+    AFN que reconoce la unión de las reglas; cada estado final guarda el
+    índice de su regla. Devuelve None si alguna expresión no está soportada.
+    """
+    afn = AFN()
+    for indice, (nombre, patron) in enumerate(reglas or reglas_automata()):
+        arbol = parsear_regex(patron)
+        if arbol is None:
+            return None
+        inicio, fin = afn.fragmento(arbol)
+        afn.epsilon[afn.inicial].append(inicio)
+        afn.aceptacion[fin] = indice
+        afn.nombres.append(nombre)
+    return afn
+
+# --- AFN -> AFD (construcción de subconjuntos) ----------------------------
+
+def determinizar(afn):
+    """
+    Construcción de subconjuntos sobre los 256 valores de byte.
+    Devuelve (transiciones, aceptacion): transiciones[e] es una lista de 256
+    destinos (-1 si no hay transición) y aceptacion[e] el índice de la regla
+    aceptada o -1. Si un subconjunto contiene estados finales de varias
+    reglas gana la primera (el mismo orden de prioridad que PLY).
+    """
+    inicial = afn.clausura([afn.inicial])
+    numero = {inicial: 0}
+    conjuntos = [inicial]
+    transiciones = []
+    aceptacion = []
+    indice = 0
+    while indice < len(conjuntos):
+        conjunto = conjuntos[indice]
+        indice += 1
+        categorias = [afn.aceptacion[e] for e in conjunto if afn.aceptacion[e] >= 0]
+        aceptacion.append(min(categorias) if categorias else -1)
+
+        # Destinos directos por byte
+        destinos = {}
+        for estado in conjunto:
+            for simbolos, destino in afn.arcos[estado]:
+                for byte in simbolos:
+                    destinos.setdefault(byte, set()).add(destino)
+        fila = [-1] * 256
+        for byte, directos in destinos.items():
+            siguiente = afn.clausura(directos)
+            if siguiente not in numero:
+                numero[siguiente] = len(conjuntos)
+                conjuntos.append(siguiente)
+            fila[byte] = numero[siguiente]
+        transiciones.append(fila)
+    return transiciones, aceptacion
+
+# --- Minimización de Hopcroft ---------------------------------------------
+
+def clases_de_bytes(transiciones):
+    """
+    Agrupa los bytes que producen la misma columna en la tabla: el autómata
+    no puede distinguirlos. Devuelve (clase_por_byte, representantes).
+    """
+    clase_por_byte = bytearray(256)
+    columnas = {}
+    representantes = []
+    for byte in range(256):
+        columna = tuple(fila[byte] for fila in transiciones)
+        if columna not in columnas:
+            columnas[columna] = len(representantes)
+            representantes.append(byte)
+        clase_por_byte[byte] = columnas[columna]
+    return bytes(clase_por_byte), representantes
+
+def minimizar_hopcroft(transiciones, aceptacion):
+    """
+    Algoritmo de Hopcroft. La partición inicial separa los estados por lo
+    que aceptan (no solo finales/no finales), de modo que el AFD
+    mínimo sigue distinguiendo los tipos de token. Se añade un estado muerto
+    para completar la función de transición y se elimina al final.
+    Devuelve (transiciones, aceptacion) con el estado inicial en la posición 0
+    y los demás numerados en orden de recorrido en anchura.
+    """
+    clase_por_byte, representantes = clases_de_bytes(transiciones)
+    simbolos = len(representantes)
+    muerto = len(transiciones)
+    total = muerto + 1
+    delta = [[(fila[b] if fila[b] >= 0 else muerto) for b in representantes] for fila in transiciones]
+    delta.append([muerto] * simbolos)
+    categorias = list(aceptacion) + [-1]
+
+    # Transiciones inversas: inversas[c][t] = estados que van a t con el símbolo c
+    inversas = [[[] for _ in range(total)] for _ in range(simbolos)]
+    for estado, fila in enumerate(delta):
+        for simbolo, destino in enumerate(fila):
+            inversas[simbolo][destino].append(estado)
+
+    grupos = {}
+    for estado, categoria in enumerate(categorias):
+        grupos.setdefault(categoria, set()).add(estado)
+    bloques = list(grupos.values())
+    bloque_de = [0] * total
+    for numero, bloque in enumerate(bloques):
+        for estado in bloque:
+            bloque_de[estado] = numero
+    pendientes = set(range(len(bloques)))
+
+    while pendientes:
+        separador = set(bloques[pendientes.pop()])
+        for simbolo in range(simbolos):
+            predecesores = {}
+            for destino in separador:
+                for estado in inversas[simbolo][destino]:
+                    predecesores.setdefault(bloque_de[estado], set()).add(estado)
+            for numero, interseccion in predecesores.items():
+                if len(interseccion) == len(bloques[numero]):
+                    continue
+                resto = bloques[numero] - interseccion
+                nuevo = len(bloques)
+                bloques[numero] = resto
+                bloques.append(interseccion)
+                for estado in interseccion:
+                    bloque_de[estado] = nuevo
+                if numero in pendientes:
+                    pendientes.add(nuevo)
+                else:
+                    pendientes.add(nuevo if len(interseccion) <= len(resto) else numero)
+
+    # Renumerar en anchura desde el inicial, omitiendo el bloque muerto
+    bloque_muerto = bloque_de[muerto]
+    orden = {bloque_de[0]: 0}
+    cola = [bloque_de[0]]
+    for bloque in cola:
+        representante = next(iter(bloques[bloque]))
+        for destino in delta[representante]:
+            destino_bloque = bloque_de[destino]
+            if destino_bloque != bloque_muerto and destino_bloque not in orden:
+                orden[destino_bloque] = len(cola)
+                cola.append(destino_bloque)
+
+    nuevas_transiciones = []
+    nueva_aceptacion = []
+    for bloque in cola:
+        representante = next(iter(bloques[bloque]))
+        fila_original = transiciones[representante]
+        nuevas_transiciones.append([
+            orden[bloque_de[d]] if d >= 0 and bloque_de[d] != bloque_muerto else -1
+            for d in fila_original
+        ])
+        nueva_aceptacion.append(categorias[representante])
+    return nuevas_transiciones, nueva_aceptacion
+
+# --- AFD ejecutable ---------------------------------------------------------
+
+class AutomataFinitoDeterminista:
+    """
+    AFD con tablas compactas:
+      - clase_por_byte: bytes de 256 posiciones, byte -> clase de equivalencia
+      - transiciones: array('i') de estados x clases (-1 = sin transición)
+      - aceptacion: array('b') con la categoría que acepta cada estado (-1 = ninguna)
+    El estado inicial es el 0.
+    """
+
+    def __init__(self, transiciones, aceptacion):
+        self.clase_por_byte, representantes = clases_de_bytes(transiciones)
+        self.representantes = representantes
+        self.num_estados = len(transiciones)
+        self.num_clases = len(representantes)
+        self.transiciones = array('i', (fila[byte] for fila in transiciones for byte in representantes))
+        self.aceptacion = array('b', aceptacion)
+        # Clase de los caracteres fuera de un byte: la de un byte sin transiciones
+        sin_transicion = [c for c in range(self.num_clases)
+                          if all(self.transiciones[e * self.num_clases + c] < 0 for e in range(self.num_estados))]
+        self.clase_ilegal = sin_transicion[0] if sin_transicion else None
+
+    def siguiente(self, estado, byte):
+        return self.transiciones[estado * self.num_clases + self.clase_por_byte[byte]]
+
+    def simbolos_por_clase(self):
+        """
+        Lista de bytes de cada clase de equivalencia
+        """
+        simbolos = [[] for _ in range(self.num_clases)]
+        for byte, clase in enumerate(self.clase_por_byte):
+            simbolos[clase].append(byte)
+        return simbolos
+
+    def transiciones_agrupadas(self):
+        """
+        Produce (origen, destino, bytes) agrupando las clases que van al mismo destino
+        """
+        simbolos = self.simbolos_por_clase()
+        for origen in range(self.num_estados):
+            por_destino = {}
+            for clase in range(self.num_clases):
+                destino = self.transiciones[origen * self.num_clases + clase]
+                if destino >= 0:
+                    por_destino.setdefault(destino, []).extend(simbolos[clase])
+            for destino, bytes_destino in sorted(por_destino.items()):
+                yield origen, destino, sorted(bytes_destino)
+
+    def _clases_texto(self, texto):
+        try:
+            return texto.encode('ascii').translate(self.clase_por_byte)
+        except UnicodeEncodeError:
+            clase_por_byte = self.clase_por_byte
+            ilegal = self.clase_ilegal
+            return [clase_por_byte[ord(c)] if ord(c) < 256 else ilegal for c in texto]
+
+    def reconocer(self, cadena):
+        """
+        Categoría (nombre) si la cadena completa es un único lexema, o None
+        """
+        estado = 0
+        clases = self.num_clases
+        for clase in self._clases_texto(cadena):
+            if clase is None:
+                return None
+            estado = self.transiciones[estado * clases + clase]
+            if estado < 0:
+                return None
+        categoria = self.aceptacion[estado]
+        return NOMBRES_ACEPTACION[categoria] if categoria >= 0 else None
+
+    def analizar(self, texto):
+        """
+        Analizador léxico por simulación del AFD con la regla del lexema más
+        largo. Devuelve la misma lista de (tipo, valor) que analizar_lexicamente
+        e informa los caracteres ilegales con el mismo mensaje.
+        """
+        clases = self._clases_texto(texto)
+        transiciones = self.transiciones
+        aceptacion = self.aceptacion
+        num_clases = self.num_clases
+        constante = tokens.index('CONSTANTE')
+        resultado = []
+        linea = 1
+        total = len(texto)
+        posicion = 0
+        while posicion < total:
+            estado = 0
+            indice = posicion
+            ultima_categoria = -1
+            fin = posicion
+            while indice < total:
+                clase = clases[indice]
+                if clase is None:
+                    break
+                estado = transiciones[estado * num_clases + clase]
+                if estado < 0:
+                    break
+                indice += 1
+                categoria = aceptacion[estado]
+                if categoria >= 0:
+                    ultima_categoria = categoria
+                    fin = indice
+            if ultima_categoria < 0:
+                print(f"Carácter ilegal '{texto[posicion]}' en la línea {linea}")
+                posicion += 1
+                continue
+            if ultima_categoria == SALTO:
+                linea += fin - posicion
+            elif ultima_categoria != IGNORAR:
+                lexema = texto[posicion:fin]
+                resultado.append((tokens[ultima_categoria],
+                                  int(lexema) if ultima_categoria == constante else lexema))
+            posicion = fin
+        return resultado
+
+    def descripcion_estado(self, estado):
+        if estado == 0:
+            return 'Estado Inicial'
+        categoria = self.aceptacion[estado]
+        if categoria >= 0:
+            return f'Acepta {NOMBRES_ACEPTACION[categoria]}'
+        # Estado intermedio: se describe por el prefijo más corto que lo alcanza
+        return f"Prefijo '{self.prefijo_minimo(estado)}'"
+
+    def prefijo_minimo(self, estado):
+        """
+        Cadena más corta (en anchura) que lleva del estado inicial al estado
+        """
+        caminos = {0: ''}
+        cola = [0]
+        for actual in cola:
+            if actual == estado:
+                return caminos[actual]
+            for clase, byte in enumerate(self.representantes):
+                destino = self.transiciones[actual * self.num_clases + clase]
+                if destino >= 0 and destino not in caminos:
+                    caminos[destino] = caminos[actual] + chr(byte)
+                    cola.append(destino)
+        return None
+
+def construir_automata_minimo(reglas=None):
+    """
+    Construye el AFD mínimo de las reglas (por defecto, las de los tokens).
+    Devuelve (afd, estadisticas) con el tamaño de cada etapa, o (None, None).
+    """
+    afn = construir_afn(reglas)
+    if afn is None:
+        return None, None
+    transiciones, reglas_aceptadas = determinizar(afn)
+    estados_afd = len(transiciones)
+    # Índice de regla -> categoría (posición en NOMBRES_ACEPTACION)
+    aceptacion = [NOMBRES_ACEPTACION.index(afn.nombres[regla]) if regla >= 0 else -1
+                  for regla in reglas_aceptadas]
+    transiciones, aceptacion = minimizar_hopcroft(transiciones, aceptacion)
+    afd = AutomataFinitoDeterminista(transiciones, aceptacion)
+    estadisticas = {
+        'estados_afn': len(afn.epsilon),
+        'estados_afd': estados_afd,
+        'estados_minimo': afd.num_estados,
+        'clases_simbolos': afd.num_clases,
+    }
+    return afd, estadisticas
+
+_automata_lexico = None
+
+def automata_lexico():
+    """
+    AFD mínimo de los tokens del Sistema L (se construye una sola vez)
+    """
+    global _automata_lexico
+    if _automata_lexico is None:
+        _automata_lexico, _ = construir_automata_minimo()
+    return _automata_lexico
+
+# --- Equivalencia con el lexer de PLY -----------------------------------------
+
+ALFABETO_PRUEBA = "pqo019_~^()=<> \t\na$"
+
+def verificar_equivalencia(afd=None, longitud_exhaustiva=4, aleatorias=3000, longitud_aleatoria=30, semilla=0):
+    """
+    Compara el AFD con analizar_lexicamente (lexer de PLY) sobre todas las
+    cadenas de hasta longitud_exhaustiva símbolos de ALFABETO_PRUEBA y sobre
+    cadenas aleatorias más largas. Se comparan los tokens y también los
+    mensajes de error. Devuelve (cadenas comparadas, lista de discrepancias).
+    """
+    afd = afd or automata_lexico()
+    generador = random.Random(semilla)
+    cadenas = itertools.chain(
+        (''.join(tupla) for n in range(longitud_exhaustiva + 1)
+         for tupla in itertools.product(ALFABETO_PRUEBA, repeat=n)),
+        (''.join(generador.choice(ALFABETO_PRUEBA + "pqrstuvwxyz01") for _ in range(longitud_aleatoria))
+         for _ in range(aleatorias)),
+        ["ñ~p", "(p€q)"],
+    )
+    discrepancias = []
+    comparadas = 0
+    for cadena in cadenas:
+        comparadas += 1
+        with contextlib.redirect_stdout(io.StringIO()) as salida_ply:
+            esperado = analizar_lexicamente(cadena)
+        with contextlib.redirect_stdout(io.StringIO()) as salida_afd:
+            obtenido = afd.analizar(cadena)
+        if esperado != obtenido or salida_ply.getvalue() != salida_afd.getvalue():
+            discrepancias.append((cadena, esperado, obtenido))
+    return comparadas, discrepancias
+
+# --- Diagrama, tabla y exportación --------------------------------------------
+
+def describir_simbolos(bytes_simbolos):
+    """
+    Texto compacto para un conjunto de bytes: rangos contiguos como 'p-z'
+    """
+    def mostrar(byte):
+        return {9: '\\t', 10: '\\n', 32: 'esp'}.get(byte, chr(byte))
+
+    partes = []
+    for _, grupo in itertools.groupby(enumerate(bytes_simbolos), lambda par: par[1] - par[0]):
+        grupo = [byte for _, byte in grupo]
+        if len(grupo) >= 3:
+            partes.append(f"{mostrar(grupo[0])}-{mostrar(grupo[-1])}")
+        else:
+            partes.extend(mostrar(byte) for byte in grupo)
+    return ','.join(partes)
 
 def crear_automata_alfabeto():
     """
-    Crea el autómata finito para reconocer el alfabeto del sistema L
+    Crea el autómata finito para reconocer el alfabeto del sistema L.
+    Es el AFD mínimo obtenido de las expresiones regulares de los tokens;
+    el grafo guarda el AFD ejecutable en automata.graph['afd'].
     """
-    # Crear grafo dirigido
-    automata = nx.DiGraph()
+    afd = automata_lexico()
+    automata = nx.DiGraph(afd=afd)
     
     # Estados del autómata
-    estados = {
-        'q0': 'Estado Inicial',
-        'q1': 'Variable/Constante',
-        'q2': 'Negación',
-        'q3': 'Conjunción',
-        'q4': 'Disyunción',
-        'q5': 'Paréntesis Izq',
-        'q6': 'Paréntesis Der',
-        'q7': 'Igual (=)',
-        'q8': 'Implicación (=>)',
-        'q9': 'Menor (<)',
-        'q10': 'Bicondicional (<=>)',
-        'qf': 'Estado Final'
-    }
-    
-    # Agregar nodos
+    estados = {f'q{estado}': afd.descripcion_estado(estado) for estado in range(afd.num_estados)}
     for estado, descripcion in estados.items():
-        automata.add_node(estado, label=estado, descripcion=descripcion)
-    
-    # Transiciones del autómata
-    transiciones = [
-        # Desde estado inicial
-        ('q0', 'q1', 'p,q,r,s,t,u,v,w,x,y,z'),  # Variables
-        ('q0', 'q1', '0,1'),                      # Constantes
-        ('q0', 'q2', '~'),                        # Negación
-        ('q0', 'q3', '^'),                        # Conjunción
-        ('q0', 'q4', 'o'),                        # Disyunción
-        ('q0', 'q5', '('),                        # Paréntesis izquierdo
-        ('q0', 'q6', ')'),                        # Paréntesis derecho
-        ('q0', 'q7', '='),                        # Inicio de implicación
-        ('q0', 'q9', '<'),                        # Inicio de bicondicional
-        
-        # Desde q7 (después de '=')
-        ('q7', 'q8', '>'),                        # Completar implicación '=>'
-        
-        # Desde q9 (después de '<')
-        ('q9', 'q7', '='),                        # Ir a '=' para formar '<=>'
-        
-        # Desde q8 (implicación completa)
-        ('q8', 'qf', 'ε'),                        # Aceptar implicación
-        
-        # Completar bicondicional desde q7 cuando viene de q9
-        ('q7', 'q10', '> (desde <)'),             # Completar bicondicional
-        ('q10', 'qf', 'ε'),                       # Aceptar bicondicional
-        
-        # Estados finales para tokens simples
-        ('q1', 'qf', 'ε'),                        # Variables y constantes
-        ('q2', 'qf', 'ε'),                        # Negación
-        ('q3', 'qf', 'ε'),                        # Conjunción
-        ('q4', 'qf', 'ε'),                        # Disyunción
-        ('q5', 'qf', 'ε'),                        # Paréntesis izquierdo
-        ('q6', 'qf', 'ε'),                        # Paréntesis derecho
-    ]
+        numero = int(estado[1:])
+        automata.add_node(estado, label=estado, descripcion=descripcion,
+                          inicial=numero == 0, aceptacion=afd.aceptacion[numero] >= 0)
     
-    # Agregar aristas
-    for origen, destino, simbolo in transiciones:
-        automata.add_edge(origen, destino, label=simbolo)
+    # Transiciones del autómata, agrupadas por destino
+    for origen, destino, bytes_simbolos in afd.transiciones_agrupadas():
+        automata.add_edge(f'q{origen}', f'q{destino}', label=describir_simbolos(bytes_simbolos))
     
     return automata, estados
 
@@ -80,37 +621,19 @@ def visualizar_automata(automata, estados, guardar_archivo=None):
     plt.figure(figsize=(16, 12))
     plt.title("Autómata Finito para el Alfabeto del Sistema L", fontsize=16, fontweight='bold')
     
-    # Layout del grafo
-    pos = nx.spring_layout(automata, k=3, iterations=100, seed=42)
-    
-    # Ajustar posiciones manualmente para mejor visualización
-    pos_ajustadas = {
-        'q0': (0, 0),
-        'q1': (-2, 2),
-        'q2': (-2, 1),
-        'q3': (-2, 0),
-        'q4': (-2, -1),
-        'q5': (-2, -2),
-        'q6': (0, -2),
-        'q7': (2, 0),
-        'q8': (4, 1),
-        'q9': (2, -1),
-        'q10': (4, -1),
-        'qf': (6, 0)
-    }
-    
-    # Usar posiciones ajustadas si están disponibles
+    # Layout por niveles: cada estado en la columna de su distancia al inicial
+    distancias = nx.single_source_shortest_path_length(automata, 'q0')
     for nodo in automata.nodes():
-        if nodo in pos_ajustadas:
-            pos[nodo] = pos_ajustadas[nodo]
+        automata.nodes[nodo]['nivel'] = distancias.get(nodo, max(distancias.values()) + 1)
+    pos = nx.multipartite_layout(automata, subset_key='nivel', align='vertical', scale=6)
     
     # Colores para diferentes tipos de estados
     colores_nodos = []
-    for nodo in automata.nodes():
-        if nodo == 'q0':
+    for nodo, datos in automata.nodes(data=True):
+        if datos.get('inicial'):
             colores_nodos.append('#90EE90')  # Verde claro para inicial
-        elif nodo == 'qf':
-            colores_nodos.append('#FFB6C1')  # Rosa para final
+        elif datos.get('aceptacion'):
+            colores_nodos.append('#FFB6C1')  # Rosa para finales
         else:
             colores_nodos.append('#87CEEB')  # Azul claro para intermedios
     
@@ -122,10 +645,11 @@ def visualizar_automata(automata, estados, guardar_archivo=None):
                           edgecolors='black',
                           linewidths=2)
     
-    # Dibujar etiquetas de nodos
-    labels = {nodo: nodo for nodo in automata.nodes()}
+    # Dibujar etiquetas de nodos: nombre y lo que reconoce
+    labels = {nodo: f"{nodo}\n{estados[nodo].replace('Acepta ', '')}" if nodo != 'q0' else nodo
+              for nodo in automata.nodes()}
     nx.draw_networkx_labels(automata, pos, labels,
-                           font_size=12,
+                           font_size=8,
                            font_weight='bold')
     
     # Dibujar aristas
@@ -136,6 +660,7 @@ def visualizar_automata(automata, estados, guardar_archivo=None):
                           arrowstyle='->',
                           width=1.5,
                           alpha=0.7,
+                          node_size=2000,
                           connectionstyle="arc3,rad=0.1")
     
     # Dibujar etiquetas de aristas
@@ -156,14 +681,15 @@ def visualizar_automata(automata, estados, guardar_archivo=None):
     legend_elements = [
         patches.Patch(color='#90EE90', label='Estado Inicial'),
         patches.Patch(color='#87CEEB', label='Estados Intermedios'),
-        patches.Patch(color='#FFB6C1', label='Estado Final')
+        patches.Patch(color='#FFB6C1', label='Estados Finales')
     ]
-    plt.legend(handles=legend_elements, loc='upper left')
+    plt.legend(handles=legend_elements, loc='lower left')
     
     # Agregar descripción
     descripcion = (
         "Alfabeto del Sistema L:\n"
         "• Variables: p,q,r,s,t,u,v,w,x,y,z\n"
+        "  con subíndice opcional: p12, x_1043\n"
         "• Operadores: ~, ^, o, =>, <=>\n"
         "• Paréntesis: (, )\n"
         "• Constantes: 0, 1"
@@ -184,32 +710,56 @@ def visualizar_automata(automata, estados, guardar_archivo=None):
 
 def generar_tabla_transiciones(automata):
     """
-    Genera la tabla de transiciones del autómata
+    Genera la tabla de transiciones del autómata a partir de las tablas del AFD mínimo
     """
+    afd = automata.graph['afd']
+    simbolos = afd.simbolos_por_clase()
+    # Solo las clases con alguna transición; la de caracteres ilegales se omite
+    columnas = [clase for clase in range(afd.num_clases) if clase != afd.clase_ilegal]
+    encabezados = [describir_simbolos(simbolos[clase]) for clase in columnas]
+    ancho = max(5, *(len(e) for e in encabezados))
+    
     print("\n=== TABLA DE TRANSICIONES DEL AUTÓMATA ===")
-    print("Estado Origen -> Estado Destino [Símbolo]")
-    print("-" * 50)
+    print(f"AFD mínimo: {afd.num_estados} estados, {afd.num_clases} clases de símbolos")
+    print("Estado  " + " ".join(f"{e:>{ancho}}" for e in encabezados) + "  Acepta")
+    print("-" * (8 + (ancho + 1) * len(columnas) + 8))
     
-    for origen, destino, datos in automata.edges(data=True):
-        simbolo = datos.get('label', 'ε')
-        print(f"{origen:>10} -> {destino:<10} [{simbolo}]")
+    for estado in range(afd.num_estados):
+        celdas = []
+        for clase in columnas:
+            destino = afd.transiciones[estado * afd.num_clases + clase]
+            celdas.append(f"{'q' + str(destino) if destino >= 0 else '-':>{ancho}}")
+        categoria = afd.aceptacion[estado]
+        acepta = NOMBRES_ACEPTACION[categoria] if categoria >= 0 else ''
+        marca = '→' if estado == 0 else ('*' if categoria >= 0 else ' ')
+        print(f"{marca}{'q' + str(estado):<6} " + " ".join(celdas) + f"  {acepta}")
 
 def exportar_automata_dot(automata, archivo):
     """
     Exporta el autómata en formato DOT
     """
+    afd = automata.graph['afd']
     with open(archivo, 'w', encoding='utf-8') as f:
-        f.write("// Autómata Finito para el Alfabeto del Sistema L\n")
+        f.write("// Autómata Finito para el Alfabeto del Sistema L (AFD mínimo)\n")
         f.write("digraph Automata {\n")
         f.write("  rankdir=LR;\n")
         f.write("  node [shape=circle];\n")
-        f.write("  q0 [shape=circle, style=filled, fillcolor=lightgreen];\n")
-        f.write("  qf [shape=doublecircle, style=filled, fillcolor=lightpink];\n\n")
+        f.write("  inicio [shape=point];\n")
+        f.write("  inicio -> q0;\n")
+        
+        for estado in range(afd.num_estados):
+            categoria = afd.aceptacion[estado]
+            if estado == 0:
+                f.write("  q0 [style=filled, fillcolor=lightgreen];\n")
+            elif categoria >= 0:
+                f.write(f'  q{estado} [shape=doublecircle, style=filled, fillcolor=lightpink, '
+                        f'xlabel="{NOMBRES_ACEPTACION[categoria]}"];\n')
+        f.write("\n")
         
         # Escribir transiciones
-        for origen, destino, datos in automata.edges(data=True):
-            simbolo = datos.get('label', 'ε')
-            f.write(f'  {origen} -> {destino} [label="{simbolo}"];\n')
+        for origen, destino, bytes_simbolos in afd.transiciones_agrupadas():
+            simbolo = describir_simbolos(bytes_simbolos).replace('\\', '\\\\').replace('"', '\\"')
+            f.write(f'  q{origen} -> q{destino} [label="{simbolo}"];\n')
         
         f.write("}\n")
     
@@ -218,6 +768,12 @@ def exportar_automata_dot(automata, archivo):
 if __name__ == "__main__":
     print("=== AUTÓMATA FINITO PARA EL ALFABETO DEL SISTEMA L ===")
     
+    afd, estadisticas = construir_automata_minimo()
+    print(f"\nAFN de Thompson: {estadisticas['estados_afn']} estados")
+    print(f"AFD por subconjuntos: {estadisticas['estados_afd']} estados")
+    print(f"AFD mínimo (Hopcroft): {estadisticas['estados_minimo']} estados, "
+          f"{estadisticas['clases_simbolos']} clases de símbolos")
+    
     # Crear y visualizar el autómata
     automata, estados = crear_automata_alfabeto()
     
@@ -228,8 +784,16 @@ if __name__ == "__main__":
     # Mostrar tabla de transiciones
     generar_tabla_transiciones(automata)
     
+    # Equivalencia con el lexer de PLY
+    print("\n=== EQUIVALENCIA CON EL LEXER DE PLY ===")
+    comparadas, discrepancias = verificar_equivalencia(afd)
+    print(f"Cadenas comparadas: {comparadas}")
+    print(f"Discrepancias: {len(discrepancias)}")
+    for cadena, esperado, obtenido in discrepancias[:10]:
+        print(f"  {cadena!r}: PLY={esperado} AFD={obtenido}")
+    
     # Visualizar el autómata
     visualizar_automata(automata, estados, "automata_sistema_L.png")
     
     # Exportar en formato DOT
-    exportar_automata_dot(automata, "automata_sistema_L.dot")
\ No newline at end of file
+    exportar_automata_dot(automata, "automata_sistema_L.dot")
@@ -0,0 +1,894 @@
+# Pruebas de Rendimiento del Sistema L
+# Mide tiempos, rendimiento y memoria de los componentes del proyecto
+# Uso: python benchmarks.py [nombre ...]   (sin argumentos ejecuta todos)
+
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from gramatica_sistema_L import generar_formula_aleatoria
+from perfil_memoria import formato_bytes
+
+def cronometrar(funcion, *args, **kwargs):
+    """
+    Ejecuta la función una vez y devuelve (resultado, segundos)
+    """
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+def medir_memoria(funcion, *args, **kwargs):
+    """
+    Ejecuta la función bajo tracemalloc y devuelve (resultado, pico, retenido)
+    en bytes. El retenido incluye lo que sigue vivo en el resultado.
+    """
+    tracemalloc.start()
+    try:
+        resultado = funcion(*args, **kwargs)
+        retenido, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, pico, retenido
+
+def generar_corpus(cantidad, nodos=25, semilla=0, prob_parentesis=0.7):
+    """
+    Lista de fórmulas aleatorias reproducibles
+    """
+    generador = random.Random(semilla)
+    return [generar_formula_aleatoria(generador, nodos, prob_parentesis=prob_parentesis)
+            for _ in range(cantidad)]
+
+def generar_archivo_corpus(ruta, megabytes, nodos=25, semilla=0):
+    """
+    Escribe un archivo de fórmulas aleatorias (una por línea) de al menos el tamaño indicado
+    """
+    generador = random.Random(semilla)
+    objetivo = int(megabytes * 1024 * 1024)
+    escritos = 0
+    with open(ruta, 'w', encoding='ascii') as f:
+        while escritos < objetivo:
+            lineas = "\n".join(generar_formula_aleatoria(generador, nodos, prob_parentesis=0.7)
+                               for _ in range(1000)) + "\n"
+            f.write(lineas)
+            escritos += len(lineas)
+    return escritos
+
+def benchmark_lexico_mmap(megabytes=32, megabytes_muestra=1):
+    """
+    Compara el lexer de PLY (tuplas por token) con el análisis de bytes sobre
+    mmap que escribe tripletas en arrays preasignados
+    """
+    from analizador_lexico import analizar_lexicamente, analizar_bytes_por_bloques
+
+    print("\n=== LÉXICO SOBRE MMAP ===")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "corpus.txt")
+        tamano = generar_archivo_corpus(ruta, megabytes)
+
+        with open(ruta, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            def contar():
+                return sum(cantidad for cantidad, *_ in analizar_bytes_por_bloques(mapa))
+            total, segundos = cronometrar(contar)
+        print(f"Archivo: {formato_bytes(tamano)}, tokens: {total}")
+        print(f"mmap + arrays: {segundos:.2f} s, {tamano / segundos / 1e9:.3f} GB/s")
+
+        # Comparación con PLY sobre una muestra que pueda procesar en poco tiempo
+        with open(ruta, 'rb') as f:
+            muestra = f.read(int(megabytes_muestra * 1024 * 1024))
+        muestra = muestra[:muestra.rfind(b"\n") + 1]
+
+        def con_ply():
+            return analizar_lexicamente(muestra.decode('ascii'))
+
+        def con_arrays():
+            return sum(cantidad for cantidad, *_ in analizar_bytes_por_bloques(memoryview(muestra)))
+
+        tokens_ply, segundos_ply = cronometrar(con_ply)
+        tokens_arrays, segundos_arrays = cronometrar(con_arrays)
+        assert len(tokens_ply) == tokens_arrays, "Los dos analizadores no coinciden"
+        del tokens_ply
+        _, pico_ply, retenido_ply = medir_memoria(con_ply)
+        _, pico_arrays, retenido_arrays = medir_memoria(con_arrays)
+
+        print(f"\nMuestra de {formato_bytes(len(muestra))} ({tokens_arrays} tokens):")
+        for nombre, segundos_muestra, pico, retenido in (
+                ("PLY (tuplas)", segundos_ply, pico_ply, retenido_ply),
+                ("mmap (arrays)", segundos_arrays, pico_arrays, retenido_arrays)):
+            print(f"  {nombre:14} {len(muestra) / segundos_muestra / 1e6:8.2f} MB/s, "
+                  f"pico {formato_bytes(pico)} ({pico / tokens_arrays:.1f} B/token), "
+                  f"retenido {formato_bytes(retenido)}")
+        print(f"  Aceleración: {segundos_ply / segundos_arrays:.0f}x, "
+              f"reducción de memoria pico: {pico_ply / max(pico_arrays, 1):.0f}x")
+
+def benchmark_motores_parser(cantidad=5000, nodos=40):
+    """
+    Rendimiento del parser LALR de PLY (parser.parse) frente al motor Pratt,
+    con y sin construcción del grafo de networkx
+    """
+    from analizador_lexico import FlujoTokens
+    from analizador_sintactico import analizar_sintacticamente, analizar_pratt, parser
+    import analizador_sintactico
+
+    print("\n=== MOTORES DEL ANALIZADOR SINTÁCTICO ===")
+    corpus = generar_corpus(cantidad, nodos, prob_parentesis=0.5)
+    caracteres = sum(len(expr) for expr in corpus)
+    flujos = [FlujoTokens.desde_texto(expr) for expr in corpus]
+    total_tokens = sum(len(flujo) for flujo in flujos)
+    print(f"Corpus: {cantidad} fórmulas, {total_tokens} tokens, {formato_bytes(caracteres)}")
+
+    def ply_solo_parse():
+        # Mismos tokens ya analizados para medir solo el análisis sintáctico
+        analizador_sintactico.construir_grafo_activo = False
+        try:
+            return [parser.parse(lexer=flujo.como_lexer()) for flujo in flujos]
+        finally:
+            analizador_sintactico.construir_grafo_activo = True
+
+    def pratt_solo_parse():
+        return [analizar_pratt(flujo) for flujo in flujos]
+
+    def completo(motor, construir_grafo):
+        return lambda: [analizar_sintacticamente(expr, motor=motor, construir_grafo=construir_grafo)
+                        for expr in corpus]
+
+    casos = [
+        ("parser.parse (tokens)", ply_solo_parse),
+        ("Pratt (tokens)", pratt_solo_parse),
+        ("PLY texto sin grafo", completo('ply', False)),
+        ("Pratt texto sin grafo", completo('pratt', False)),
+        ("PLY texto con grafo", completo('ply', True)),
+        ("Pratt texto con grafo", completo('pratt', True)),
+    ]
+    tiempos = {}
+    for nombre, funcion in casos:
+        resultados, segundos = cronometrar(funcion)
+        assert all(r is not None for r in resultados), f"{nombre}: fórmulas rechazadas"
+        tiempos[nombre] = segundos
+        print(f"  {nombre:24} {segundos:7.3f} s  {cantidad / segundos:9.0f} fórmulas/s  "
+              f"{total_tokens / segundos / 1e6:6.2f} M tokens/s")
+    print(f"  Aceleración Pratt sobre parser.parse: "
+          f"{tiempos['parser.parse (tokens)'] / tiempos['Pratt (tokens)']:.1f}x")
+
+def benchmark_automata(cantidad=3000, nodos=40, repeticiones=20):
+    """
+    Tiempo de cada etapa de construcción del autómata (AFN, subconjuntos,
+    Hopcroft) y rendimiento de la simulación del AFD mínimo frente al lexer
+    de PLY y a la expresión maestra de re
+    """
+    from analizador_lexico import analizar_lexicamente, patron_tokens
+    from automata_finito import (construir_afn, determinizar, minimizar_hopcroft,
+                                 construir_automata_minimo)
+
+    print("\n=== AUTÓMATA FINITO (AFN -> AFD -> MÍNIMO) ===")
+    etapas = {'AFN de Thompson': 0.0, 'Subconjuntos': 0.0, 'Hopcroft': 0.0, 'Completo': 0.0}
+    for _ in range(repeticiones):
+        afn, segundos = cronometrar(construir_afn)
+        etapas['AFN de Thompson'] += segundos
+        (transiciones, aceptacion), segundos = cronometrar(determinizar, afn)
+        etapas['Subconjuntos'] += segundos
+        _, segundos = cronometrar(minimizar_hopcroft, transiciones, aceptacion)
+        etapas['Hopcroft'] += segundos
+        (afd, estadisticas), segundos = cronometrar(construir_automata_minimo)
+        etapas['Completo'] += segundos
+    print(f"Estados: AFN {estadisticas['estados_afn']}, AFD {estadisticas['estados_afd']}, "
+          f"mínimo {estadisticas['estados_minimo']} ({estadisticas['clases_simbolos']} clases de símbolos)")
+    for nombre, segundos in etapas.items():
+        print(f"  {nombre:18} {segundos / repeticiones * 1000:8.3f} ms")
+
+    texto = "\n".join(generar_corpus(cantidad, nodos, prob_parentesis=0.5)) + "\n"
+    casos = [
+        ("Lexer de PLY", lambda: analizar_lexicamente(texto)),
+        ("Simulación AFD", lambda: afd.analizar(texto)),
+        ("re (expresión maestra)", lambda: [c.lastgroup for c in patron_tokens.finditer(texto)
+                                            if c.lastgroup not in ('IGNORAR', 'SALTO')]),
+    ]
+    print(f"\nSimulación sobre {formato_bytes(len(texto))}:")
+    referencia = None
+    for nombre, funcion in casos:
+        resultado, segundos = cronometrar(funcion)
+        if referencia is None:
+            referencia = len(resultado)
+        assert len(resultado) == referencia, f"{nombre}: distinto número de tokens"
+        print(f"  {nombre:24} {segundos:7.3f} s  {len(texto) / segundos / 1e6:6.2f} MB/s  "
+              f"{referencia / segundos / 1e6:5.2f} M tokens/s")
+
+def benchmark_conteo_modelos(tamanos=(10, 25, 50, 100, 200, 400), formulas=20):
+    """
+    Conteo de modelos por DPLL con componentes frente a la enumeración de la
+    tabla de verdad, para fórmulas aleatorias de tamaño creciente
+    """
+    from analizador_sintactico import analizar_sintacticamente
+    from conteo_modelos import contar_modelos, contar_por_tabla_verdad
+    from forma_normal_conjuntiva import variables_formula
+
+    print("\n=== CONTEO DE MODELOS: DPLL CON COMPONENTES vs TABLA DE VERDAD ===")
+    print(f"{'Nodos':>6} {'Variables':>10} {'Tabla de verdad':>16} {'DPLL':>10} {'Aceleración':>12} {'Aciertos caché':>15}")
+    for nodos in tamanos:
+        asts = [analizar_sintacticamente(expr, construir_grafo=False)[0]
+                for expr in generar_corpus(formulas, nodos, semilla=nodos, prob_parentesis=0.5)]
+        variables = sum(len(variables_formula(ast)) for ast in asts) / len(asts)
+        esperados, segundos_tabla = cronometrar(lambda: [contar_por_tabla_verdad(ast) for ast in asts])
+        estadisticas = {}
+        def con_dpll():
+            cuentas = []
+            for ast in asts:
+                parciales = {}
+                cuentas.append(contar_modelos(ast, estadisticas=parciales))
+                for clave in ('aciertos_cache', 'fallos_cache'):
+                    estadisticas[clave] = estadisticas.get(clave, 0) + parciales[clave]
+            return cuentas
+        obtenidos, segundos_dpll = cronometrar(con_dpll)
+        assert obtenidos == esperados, "El contador no coincide con la tabla de verdad"
+        consultas = estadisticas['aciertos_cache'] + estadisticas['fallos_cache']
+        tasa = estadisticas['aciertos_cache'] / consultas if consultas else 0.0
+        print(f"{nodos:>6} {variables:>10.1f} {segundos_tabla * 1000 / formulas:>13.2f} ms "
+              f"{segundos_dpll * 1000 / formulas:>7.2f} ms {segundos_tabla / segundos_dpll:>11.1f}x {tasa:>14.1%}")
+
+def benchmark_variables_indexadas(variables=100000):
+    """
+    Fórmula con 'variables' variables distintas (x_0, x_1, ...): análisis
+    léxico y sintáctico, memoria del árbol, tabla de símbolos, CNF de Tseitin,
+    evaluación por símbolo entero y conteo exacto de modelos
+    """
+    from analizador_lexico import FlujoTokens
+    from analizador_sintactico import analizar_sintacticamente, tabla_simbolos
+    from forma_normal_conjuntiva import cnf_tseitin
+    from conteo_modelos import ContadorModelos, evaluar_formula
+
+    print(f"\n=== FÓRMULA CON {variables} VARIABLES INDEXADAS ===")
+    # Conjunción de bloques independientes ((a o b) => (c ^ ~d)); cada uno tiene 7 de 16 modelos
+    bloques = variables // 4
+    texto = "^".join(f"((x_{4 * i}ox_{4 * i + 1})=>(x_{4 * i + 2}^~x_{4 * i + 3}))" for i in range(bloques))
+    simbolos_antes = len(tabla_simbolos)
+
+    flujo, segundos = cronometrar(FlujoTokens.desde_texto, texto)
+    print(f"Texto: {formato_bytes(len(texto))}, {len(flujo)} tokens")
+    print(f"  Léxico (FlujoTokens)      {segundos:7.3f} s")
+    for motor in ('pratt', 'ply'):
+        (ast, _), segundos = cronometrar(analizar_sintacticamente, flujo, motor=motor, construir_grafo=False)
+        print(f"  Sintáctico ({motor:5})        {segundos:7.3f} s")
+    (ast, _), pico, retenido = medir_memoria(analizar_sintacticamente, flujo, motor='pratt', construir_grafo=False)
+    nodos = 11 * bloques - 1
+    print(f"  Memoria del árbol: {formato_bytes(retenido)} ({retenido / nodos:.0f} B/nodo), "
+          f"pico {formato_bytes(pico)}")
+    print(f"  Símbolos nuevos en la tabla: {len(tabla_simbolos) - simbolos_antes}")
+
+    cnf, segundos = cronometrar(cnf_tseitin, ast)
+    print(f"  CNF de Tseitin            {segundos:7.3f} s  ({cnf.num_variables} variables, {len(cnf.clausulas)} cláusulas)")
+
+    # Evaluación con una asignación densa indexada por símbolo (una lista, sin diccionario de nombres)
+    asignacion = [True] * len(tabla_simbolos)
+    _, segundos = cronometrar(evaluar_formula, ast, asignacion)
+    print(f"  Evaluación (lista densa)  {segundos:7.3f} s")
+
+    contador = ContadorModelos()
+    cuenta, segundos = cronometrar(contador.contar_cnf, cnf.clausulas, cnf.num_variables)
+    assert cuenta == 7 ** bloques, "Conteo de modelos incorrecto"
+    print(f"  Conteo de modelos         {segundos:7.3f} s  (7^{bloques}, {cuenta.bit_length()} bits, "
+          f"{contador.estadisticas['componentes']} componentes)")
+
+def benchmark_verificador(lineas=100000):
+    """
+    Verificación de una prueba larga: pruebas de |- A=>A encadenadas para
+    fórmulas A distintas, con MP numerado y MP con búsqueda de premisas
+    """
+    from verificador_pruebas import verificar_archivo, escribir_prueba, prueba_identidad
+
+    print(f"\n=== VERIFICADOR DE PRUEBAS ({lineas} líneas) ===")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "prueba.txt")
+        pasos = []
+        i = 0
+        while len(pasos) < lineas:
+            # A alterna entre una variable indexada y una fórmula compuesta
+            a = f"x_{i}" if i % 2 else f"(x_{i}^~y_{i})"
+            bloque = prueba_identidad(a, len(pasos))
+            if i % 3 == 0:
+                # Sin números: las premisas se buscan en las tablas hash
+                bloque = [(texto, "MP" if justificacion.startswith("MP") else justificacion)
+                          for texto, justificacion in bloque]
+            pasos.extend(bloque)
+            i += 1
+        escribir_prueba(ruta, pasos)
+        tamano = os.path.getsize(ruta)
+        del pasos
+        resultado, segundos = cronometrar(verificar_archivo, ruta)
+    assert resultado['valida'], resultado['errores']
+    print(f"Archivo: {formato_bytes(tamano)}, {resultado['pasos']} pasos")
+    print(f"Justificaciones: {resultado['justificaciones']}")
+    print(f"Tiempo: {segundos:.2f} s ({resultado['pasos'] / segundos:.0f} pasos/s)")
+
+def benchmark_derivaciones(tamanos=(1000, 5000, 10000, 20000)):
+    """
+    Derivación más a la izquierda: pasos incrementales (reconstruidos en
+    tiempo lineal) frente a materializar cada forma sentencial completa
+    """
+    from analizador_sintactico import analizar_sintacticamente
+    from gramatica_sistema_L import derivacion_izquierda, reconstruir_derivacion, formas_sentenciales
+
+    print("\n=== DERIVACIONES POR LA IZQUIERDA ===")
+    print(f"{'Nodos':>7} {'Pasos':>7} {'Incremental':>12} {'Pico':>10} {'Formas completas':>17} {'Caracteres':>12}")
+    for nodos in tamanos:
+        expresion = generar_corpus(1, nodos=nodos, prob_parentesis=0.5)[0]
+        ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+        final, t_pasos = cronometrar(reconstruir_derivacion, derivacion_izquierda(ast))
+        assert final == expresion, "La derivación no reproduce la expresión"
+        _, pico, _ = medir_memoria(reconstruir_derivacion, derivacion_izquierda(ast))
+
+        inicio = time.perf_counter()
+        pasos = caracteres = 0
+        for forma in formas_sentenciales(derivacion_izquierda(ast)):
+            pasos += 1
+            caracteres += len(forma)
+        t_formas = time.perf_counter() - inicio
+        print(f"{nodos:7} {pasos - 1:7} {t_pasos:11.3f}s {formato_bytes(pico):>10} {t_formas:16.3f}s {caracteres:12}")
+
+def benchmark_impresion(nodos=200000):
+    """
+    Rendimiento del impresor con paréntesis mínimos sobre una fórmula grande:
+    en memoria, a archivo, con saltos de línea, y frente a formula_a_texto
+    (paréntesis completos)
+    """
+    from analizador_sintactico import analizar_sintacticamente, hash_estructural
+    from impresor_formulas import escribir_formula, formatear_formula
+    from verificador_pruebas import formula_a_texto
+
+    print(f"\n=== IMPRESIÓN DE FÓRMULAS ({nodos} nodos) ===")
+    expresion = generar_corpus(1, nodos=nodos, prob_parentesis=0.7)[0]
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+
+    def medir(nombre, funcion, *args):
+        resultado, segundos = cronometrar(funcion, *args)
+        caracteres = resultado if isinstance(resultado, int) else len(resultado)
+        print(f"  {nombre:40} {segundos:7.3f} s  {caracteres:9} caracteres  "
+              f"{caracteres / segundos / 1e6:6.1f} M car/s  {nodos / segundos:10.0f} nodos/s")
+        return resultado
+
+    texto = medir("Mínimos, una línea (memoria)", formatear_formula, ast)
+    medir("Mínimos, ancho 80 (memoria)", formatear_formula, ast, 80)
+    medir("Paréntesis completos (formula_a_texto)", formula_a_texto, ast)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "formula.txt")
+        with open(ruta, 'w', encoding='ascii') as salida:
+            medir("Mínimos, ancho 80 (archivo)", escribir_formula, ast, salida, 80)
+
+    vuelta, _ = analizar_sintacticamente(texto, motor='pratt', construir_grafo=False)
+    assert hash_estructural(vuelta) == hash_estructural(ast), "La impresión no conserva el árbol"
+    print(f"Texto original: {len(expresion)} caracteres; impreso: {len(texto)} (ida y vuelta correcta)")
+
+def benchmark_grafo_dag(niveles=(6, 10, 14), nivel_render=6, cantidad=2000):
+    """
+    Grafo en modo árbol frente a modo DAG: fórmulas con repetición máxima
+    (F_k+1 = F_k => F_k, 2^(k+1)-1 nodos en el árbol) y un corpus aleatorio
+    """
+    import contextlib
+    import io
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from analizador_sintactico import analizar_sintacticamente
+    from generador_grafos import crear_grafo_expresion, escribir_grafo_dot, visualizar_grafo
+
+    def formula_repetitiva(nivel):
+        expresion = "p"
+        for _ in range(nivel):
+            expresion = f"({expresion}=>{expresion})"
+        return expresion
+
+    print("\n=== GRAFO EN MODO ÁRBOL Y MODO DAG ===")
+    print(f"{'Nivel':>5} {'Modo':>6} {'Nodos':>7} {'Aristas':>8} {'Construcción':>13} {'DOT':>10} {'Escritura DOT':>14}")
+    for nivel in niveles:
+        expresion = formula_repetitiva(nivel)
+        ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+        for modo in ('arbol', 'dag'):
+            grafo, t_grafo = cronometrar(crear_grafo_expresion, ast, None, modo)
+            flujo = io.StringIO()
+            _, t_dot = cronometrar(escribir_grafo_dot, grafo, expresion, flujo)
+            print(f"{nivel:5} {modo:>6} {grafo.number_of_nodes():7} {grafo.number_of_edges():8} "
+                  f"{t_grafo:12.4f}s {formato_bytes(len(flujo.getvalue())):>10} {t_dot:13.4f}s")
+
+    expresion = formula_repetitiva(nivel_render)
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+    with tempfile.TemporaryDirectory() as directorio:
+        for modo in ('arbol', 'dag'):
+            grafo = crear_grafo_expresion(ast, modo=modo)
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, segundos = cronometrar(visualizar_grafo, grafo, expresion,
+                                          os.path.join(directorio, f"{modo}.png"))
+            plt.close('all')
+            print(f"Renderizado nivel {nivel_render}, modo {modo:5}: {segundos:.2f} s "
+                  f"({grafo.number_of_nodes()} nodos)")
+
+    # Corpus aleatorio: la reducción depende de cuánto se repitan las subfórmulas
+    nodos = {'arbol': 0, 'dag': 0}
+    for expresion in generar_corpus(cantidad, nodos=40, semilla=41):
+        ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+        for modo in nodos:
+            nodos[modo] += crear_grafo_expresion(ast, modo=modo).number_of_nodes()
+    print(f"Corpus aleatorio ({cantidad} fórmulas): {nodos['arbol']} nodos en modo árbol, "
+          f"{nodos['dag']} en modo DAG ({100 * (1 - nodos['dag'] / nodos['arbol']):.0f}% menos)")
+
+def benchmark_estadisticas(cantidad=5000, nodos=40, nodos_grande=200000):
+    """
+    Estadísticas en un recorrido del árbol frente a construir el grafo de
+    networkx para contar nodos y aristas
+    """
+    from analizador_sintactico import analizar_sintacticamente
+    from estadisticas_formula import estadisticas_formula, estadisticas_corpus
+
+    print(f"\n=== ESTADÍSTICAS DE FÓRMULAS ({cantidad} fórmulas de {nodos} nodos) ===")
+    corpus = generar_corpus(cantidad, nodos=nodos)
+
+    def por_grafo():
+        total = 0
+        for expresion in corpus:
+            _, grafo = analizar_sintacticamente(expresion)
+            total += grafo.number_of_nodes() + grafo.number_of_edges()
+        return total
+
+    def por_recorrido():
+        total = 0
+        for expresion in corpus:
+            ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+            estadisticas = estadisticas_formula(ast)
+            total += estadisticas['nodos'] + estadisticas['aristas']
+        return total
+
+    total_grafo, t_grafo = cronometrar(por_grafo)
+    total_recorrido, t_recorrido = cronometrar(por_recorrido)
+    assert total_grafo == total_recorrido, "Las cuentas no coinciden"
+    resumen, t_corpus = cronometrar(lambda: estadisticas_corpus(corpus).resumen())
+    print(f"  PLY + grafo de networkx      {t_grafo:7.3f} s  (solo nodos y aristas)")
+    print(f"  Pratt + estadisticas_formula {t_recorrido:7.3f} s  (todas las estadísticas, "
+          f"{t_grafo / t_recorrido:.1f}x más rápido)")
+    print(f"  estadisticas_corpus          {t_corpus:7.3f} s  ({resumen['nodos']} nodos agregados)")
+
+    expresion = generar_corpus(1, nodos=nodos_grande)[0]
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+    _, t_grande = cronometrar(estadisticas_formula, ast)
+    _, pico, _ = medir_memoria(estadisticas_formula, ast)
+    print(f"Fórmula de {nodos_grande} nodos: {t_grande:.3f} s, pico de memoria {formato_bytes(pico)}")
+
+def benchmark_exportacion(nodos=1000000, cantidad_corpus=20000):
+    """
+    Exportación en flujo a GraphML y JSON node-link (con y sin gzip) de una
+    fórmula de millones de nodos directamente desde el árbol, y de un corpus
+    a JSON Lines. La salida se valida leyéndola de nuevo en flujo.
+    """
+    import gzip
+    import json
+    import xml.etree.ElementTree as ET
+    from analizador_sintactico import analizar_sintacticamente
+    from generador_grafos import abrir_salida, escribir_grafo_graphml, escribir_grafo_json, exportar_corpus_jsonl
+
+    print(f"\n=== EXPORTACIÓN EN FLUJO ({nodos} nodos) ===")
+    expresion = generar_corpus(1, nodos=nodos, prob_parentesis=0.7)[0]
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+
+    def abrir_lectura(ruta):
+        return gzip.open(ruta, 'rb') if ruta.endswith('.gz') else open(ruta, 'rb')
+
+    def validar_graphml(ruta):
+        # iterparse con limpieza de elementos: la validación tampoco carga el documento
+        contados = {'node': 0, 'edge': 0}
+        with abrir_lectura(ruta) as f:
+            for _, elemento in ET.iterparse(f):
+                etiqueta = elemento.tag.rsplit('}', 1)[-1]
+                if etiqueta in contados:
+                    contados[etiqueta] += 1
+                    elemento.clear()
+        return contados['node'], contados['edge']
+
+    def validar_json(ruta):
+        with abrir_lectura(ruta) as f:
+            datos = json.load(f)
+        return len(datos['nodes']), len(datos['links'])
+
+    print(f"{'Formato':>16} {'Tiempo':>8} {'Tamaño':>10} {'MB/s':>7} {'Nodos/s':>10}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre, escribir, validar in (('graphml', escribir_grafo_graphml, validar_graphml),
+                                          ('json', escribir_grafo_json, validar_json)):
+            for extension in ('', '.gz'):
+                ruta = os.path.join(directorio, f"grafo.{nombre}{extension}")
+                inicio = time.perf_counter()
+                with abrir_salida(ruta) as f:
+                    caracteres = escribir(ast, f, "formula")
+                segundos = time.perf_counter() - inicio
+                assert validar(ruta) == (nodos, nodos - 1), f"Salida {nombre}{extension} inválida"
+                print(f"{nombre + extension:>16} {segundos:7.2f}s {formato_bytes(os.path.getsize(ruta)):>10} "
+                      f"{caracteres / segundos / 1e6:7.1f} {nodos / segundos:10.0f}")
+
+        # Memoria adicional del exportador: no depende del tamaño del árbol
+        for cantidad in (nodos // 10, nodos):
+            arbol = ast
+            if cantidad != nodos:
+                arbol, _ = analizar_sintacticamente(generar_corpus(1, nodos=cantidad)[0],
+                                                    motor='pratt', construir_grafo=False)
+            with abrir_salida(os.path.join(directorio, "memoria.graphml.gz")) as f:
+                _, pico, _ = medir_memoria(escribir_grafo_graphml, arbol, f)
+            print(f"Pico de memoria del exportador GraphML ({cantidad} nodos): {formato_bytes(pico)}")
+
+        ruta = os.path.join(directorio, "corpus.jsonl.gz")
+        corpus = generar_corpus(cantidad_corpus)
+        (validas, _), segundos = cronometrar(exportar_corpus_jsonl, corpus, ruta)
+        print(f"Corpus JSON Lines comprimido: {validas} fórmulas en {segundos:.2f} s "
+              f"({validas / segundos:.0f} fórmulas/s, {formato_bytes(os.path.getsize(ruta))})")
+
+def benchmark_cache(cantidad=200, nodos=60, renderizados=3, nodos_render=20):
+    """
+    Análisis y layout de un corpus, y renderizado a PNG, con la caché en disco
+    vacía frente a con la caché ya llena
+    """
+    import contextlib
+    import io
+    import matplotlib.pyplot as plt
+    from cache_resultados import CacheResultados, obtener_ast, obtener_layout
+    from generador_grafos import crear_grafo_expresion, visualizar_grafo
+
+    print(f"\n=== CACHÉ DE RESULTADOS ({cantidad} fórmulas de {nodos} nodos) ===")
+    corpus = generar_corpus(cantidad, nodos=nodos)
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CacheResultados(os.path.join(directorio, "cache"))
+
+        def analizar_y_distribuir():
+            for expresion in corpus:
+                ast, _ = obtener_ast(cache, expresion)
+                obtener_layout(cache, expresion, crear_grafo_expresion(ast))
+
+        _, t_fria = cronometrar(analizar_y_distribuir)
+        _, t_caliente = cronometrar(analizar_y_distribuir)
+        print(f"  Árbol + layout, caché vacía  {t_fria:7.3f} s")
+        print(f"  Árbol + layout, caché llena  {t_caliente:7.3f} s  ({t_fria / t_caliente:.1f}x más rápido)")
+
+        plt.switch_backend('Agg')
+        imagenes = generar_corpus(renderizados, nodos=nodos_render, semilla=1)
+        destino = os.path.join(directorio, "grafo.png")
+
+        def renderizar():
+            for expresion in imagenes:
+                clave = cache.clave('png', expresion, 'arbol')
+                if not cache.copiar_a(clave, 'png', destino):
+                    ast, _ = obtener_ast(cache, expresion)
+                    grafo = crear_grafo_expresion(ast)
+                    pos, _ = obtener_layout(cache, expresion, grafo)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        visualizar_grafo(grafo, expresion, destino, pos)
+                    plt.close('all')
+                    cache.guardar_archivo(clave, 'png', destino)
+
+        _, t_fria = cronometrar(renderizar)
+        _, t_caliente = cronometrar(renderizar)
+        print(f"  PNG de {nodos_render} nodos, caché vacía  {t_fria / renderizados:7.3f} s por imagen")
+        print(f"  PNG de {nodos_render} nodos, caché llena  {t_caliente / renderizados:7.3f} s por imagen")
+        datos = cache.estadisticas()
+        print(f"Caché: {datos['entradas']} entradas, {formato_bytes(datos['bytes'])}")
+
+def benchmark_svg(cantidad=2000, nodos=15, renderizados=5, nodos_grande=100000):
+    """
+    Escritor SVG directo frente a visualizar_grafo (matplotlib, PNG): imágenes
+    por segundo y bytes por imagen para muchos árboles pequeños
+    """
+    import contextlib
+    import io
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from analizador_sintactico import analizar_sintacticamente
+    from generador_grafos import crear_grafo_expresion, escribir_grafo_svg, visualizar_grafo
+
+    print(f"\n=== RENDERIZADO SVG FRENTE A MATPLOTLIB (árboles de {nodos} nodos) ===")
+    corpus = generar_corpus(cantidad, nodos=nodos, semilla=46)
+    arboles = [analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)[0]
+               for expresion in corpus]
+    with tempfile.TemporaryDirectory() as directorio:
+        def con_matplotlib():
+            total = 0
+            for indice in range(renderizados):
+                ruta = os.path.join(directorio, f"{indice}.png")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    visualizar_grafo(crear_grafo_expresion(arboles[indice]), corpus[indice], ruta)
+                plt.close('all')
+                total += os.path.getsize(ruta)
+            return total
+
+        def con_svg():
+            total = 0
+            for indice, (expresion, ast) in enumerate(zip(corpus, arboles)):
+                ruta = os.path.join(directorio, f"{indice}.svg")
+                with open(ruta, 'w', encoding='utf-8') as f:
+                    escribir_grafo_svg(ast, f, expresion)
+                total += os.path.getsize(ruta)
+            return total
+
+        bytes_png, t_png = cronometrar(con_matplotlib)
+        bytes_svg, t_svg = cronometrar(con_svg)
+    print(f"{'Método':24} {'Imágenes':>9} {'Imágenes/s':>11} {'Bytes/imagen':>13}")
+    print(f"{'visualizar_grafo (PNG)':24} {renderizados:9} {renderizados / t_png:11.2f} "
+          f"{formato_bytes(bytes_png / renderizados):>13}")
+    print(f"{'escribir_grafo_svg':24} {cantidad:9} {cantidad / t_svg:11.0f} "
+          f"{formato_bytes(bytes_svg / cantidad):>13}")
+    print(f"El SVG es {(cantidad / t_svg) / (renderizados / t_png):.0f}x más rápido")
+
+    expresion = generar_corpus(1, nodos=nodos_grande)[0]
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+    with open(os.devnull, 'w', encoding='utf-8') as flujo:
+        caracteres, segundos = cronometrar(escribir_grafo_svg, ast, flujo)
+        _, pico, _ = medir_memoria(escribir_grafo_svg, ast, flujo)
+    print(f"Árbol de {nodos_grande} nodos: {segundos:.2f} s, {formato_bytes(caracteres)}, "
+          f"pico de memoria {formato_bytes(pico)} (layout incluido)")
+
+def benchmark_dimacs(nodos=1500000):
+    """
+    Escritura DIMACS en flujo frente a construir la FormulaCNF en memoria, y
+    lectura de un modelo con una sola línea de millones de literales
+    """
+    from analizador_sintactico import analizar_sintacticamente
+    from forma_normal_conjuntiva import cnf_tseitin
+    from formato_dimacs import escribir_dimacs, leer_modelo
+
+    print(f"\n=== DIMACS (fórmula de {nodos} nodos) ===")
+    expresion = generar_corpus(1, nodos=nodos, semilla=47)[0]
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+
+    cnf, t_memoria = cronometrar(cnf_tseitin, ast)
+    variables, clausulas = cnf.num_variables, len(cnf.clausulas)
+    del cnf
+    _, pico_memoria, _ = medir_memoria(lambda: len(cnf_tseitin(ast).clausulas))
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "formula.cnf")
+        with open(ruta, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            resumen, t_flujo = cronometrar(escribir_dimacs, ast, f)
+        with open(ruta, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            _, pico_flujo, _ = medir_memoria(escribir_dimacs, ast, f)
+        assert (resumen['variables'], resumen['clausulas']) == (variables, clausulas)
+        print(f"{variables} variables, {clausulas} cláusulas, {formato_bytes(os.path.getsize(ruta))} en DIMACS")
+        print(f"  cnf_tseitin en memoria       {t_memoria:7.2f} s  pico {formato_bytes(pico_memoria):>10}")
+        print(f"  escribir_dimacs en flujo     {t_flujo:7.2f} s  pico {formato_bytes(pico_flujo):>10}  "
+              f"({clausulas / t_flujo:.0f} cláusulas/s)")
+
+        # Salida al estilo MiniSat: todo el modelo en una sola línea
+        ruta_modelo = os.path.join(directorio, "modelo.txt")
+        generador = random.Random(0)
+        with open(ruta_modelo, 'w', encoding='utf-8') as f:
+            f.write("SAT\n")
+            for inicio in range(1, variables + 1, 100000):
+                f.write(" ".join(str(v if generador.random() < 0.5 else -v)
+                                 for v in range(inicio, min(inicio + 100000, variables + 1))) + " ")
+            f.write("0\n")
+        mapa = dict(enumerate(resumen['originales'], start=1))
+
+        def leer():
+            with open(ruta_modelo, 'r', encoding='utf-8') as f:
+                return leer_modelo(f, mapa)
+
+        modelo, t_modelo = cronometrar(leer)
+        _, pico_modelo, _ = medir_memoria(leer)
+        print(f"  leer_modelo                  {t_modelo:7.2f} s  pico {formato_bytes(pico_modelo):>10}  "
+              f"({modelo['literales']} literales en una línea de "
+              f"{formato_bytes(os.path.getsize(ruta_modelo))}, {len(modelo['asignacion'])} variables originales)")
+
+def benchmark_sustitucion(cantidad=5000, nodos=40, nodos_reemplazo=20, nodos_grande=200000):
+    """
+    Sustitución con subárboles compartidos y memoización frente a una
+    sustitución ingenua que copia el árbol completo: rendimiento y memoria
+    retenida por los resultados
+    """
+    from analizador_sintactico import NodoAST, analizar_sintacticamente
+    from sustitucion import crear_sustitucion, generar_instancias_axiomas
+
+    def analizar(expresion):
+        return analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)[0]
+
+    def sustituir_copiando(ast, reemplazos):
+        # Copia todos los nodos, y el reemplazo completo en cada aparición
+        valores = []
+        pila = [(ast, False, True)]
+        while pila:
+            nodo, visitado, sustituible = pila.pop()
+            if not visitado:
+                if sustituible and nodo.tipo == 'VARIABLE' and nodo.valor in reemplazos:
+                    pila.append((reemplazos[nodo.valor], False, False))
+                    continue
+                pila.append((nodo, True, sustituible))
+                pila.extend((hijo, False, sustituible) for hijo in nodo.hijos)
+                continue
+            hijos = [valores.pop() for _ in nodo.hijos]
+            valores.append(NodoAST(nodo.tipo, nodo.valor, hijos))
+        return valores[-1]
+
+    print(f"\n=== SUSTITUCIÓN ({cantidad} fórmulas de {nodos} nodos, "
+          f"p y q por fórmulas de {nodos_reemplazo} nodos) ===")
+    corpus = [analizar(expresion) for expresion in generar_corpus(cantidad, nodos=nodos, semilla=48)]
+    reemplazos = dict(zip("pq", generar_corpus(2, nodos=nodos_reemplazo, semilla=480)))
+    asts_reemplazo = {variable: analizar(texto) for variable, texto in reemplazos.items()}
+
+    copias, t_copia = cronometrar(lambda: [sustituir_copiando(ast, asts_reemplazo) for ast in corpus])
+    del copias
+    _, _, retenido_copia = medir_memoria(lambda: [sustituir_copiando(ast, asts_reemplazo) for ast in corpus])
+    sustitucion = crear_sustitucion(reemplazos)
+    _, t_compartida = cronometrar(lambda: list(sustitucion.aplicar_corpus(corpus)))
+    _, _, retenido_compartida = medir_memoria(
+        lambda: list(crear_sustitucion(reemplazos).aplicar_corpus(corpus)))
+    estadisticas = sustitucion.estadisticas()
+    print(f"  copiando el árbol            {t_copia:7.3f} s  ({cantidad / t_copia:8.0f} fórmulas/s)  "
+          f"retenido {formato_bytes(retenido_copia):>10}")
+    print(f"  Sustitucion.aplicar_corpus   {t_compartida:7.3f} s  ({cantidad / t_compartida:8.0f} fórmulas/s)  "
+          f"retenido {formato_bytes(retenido_compartida):>10}")
+    print(f"  {estadisticas['nodos_creados']} nodos nuevos para {estadisticas['nodos_visitados']} visitados, "
+          f"{estadisticas['aciertos_memo']} aciertos de memoización")
+
+    formulas = [analizar(expresion) for expresion in generar_corpus(200, nodos=nodos_reemplazo, semilla=481)]
+    _, t_axiomas = cronometrar(lambda: sum(1 for _ in generar_instancias_axiomas(formulas, cantidad)))
+    print(f"  {cantidad} instancias de A1-A3      {t_axiomas:7.3f} s  ({cantidad / t_axiomas:8.0f} instancias/s)")
+
+    ast = analizar(generar_corpus(1, nodos=nodos_grande, semilla=482)[0])
+    _, t_copia = cronometrar(sustituir_copiando, ast, asts_reemplazo)
+    _, pico_copia, retenido_copia = medir_memoria(sustituir_copiando, ast, asts_reemplazo)
+    _, t_compartida = cronometrar(crear_sustitucion(reemplazos).aplicar, ast)
+    _, pico_compartida, retenido_compartida = medir_memoria(crear_sustitucion(reemplazos).aplicar, ast)
+    print(f"Fórmula de {nodos_grande} nodos:")
+    print(f"  copiando el árbol            {t_copia:7.3f} s  pico {formato_bytes(pico_copia):>10}  "
+          f"retenido {formato_bytes(retenido_copia):>10}")
+    print(f"  Sustitucion.aplicar          {t_compartida:7.3f} s  pico {formato_bytes(pico_compartida):>10}  "
+          f"retenido {formato_bytes(retenido_compartida):>10}")
+
+def benchmark_arbol_discriminacion(esquemas=10000, consultas=1000000, distintas=20000, lineales=100):
+    """
+    Búsqueda de los esquemas que instancia cada fórmula con el árbol de
+    discriminación frente a emparejar la fórmula con cada esquema
+    """
+    from analizador_sintactico import analizar_sintacticamente
+    from arbol_discriminacion import ArbolDiscriminacion, emparejar
+    from sustitucion import Sustitucion
+
+    def analizar(expresion):
+        return analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)[0]
+
+    print(f"\n=== ÁRBOL DE DISCRIMINACIÓN ({esquemas} esquemas, {consultas} consultas) ===")
+    generador = random.Random(49)
+    lista_esquemas = [analizar(generar_formula_aleatoria(generador, generador.randint(5, 15), "pqrs",
+                                                         prob_constante=0.05))
+                      for _ in range(esquemas)]
+    indice = ArbolDiscriminacion()
+    _, t_construccion = cronometrar(lambda: [indice.agregar(esquema) for esquema in lista_esquemas])
+    _, _, retenido = medir_memoria(lambda: [ArbolDiscriminacion().agregar_esquemas(lista_esquemas)])
+    estadisticas = indice.estadisticas()
+    print(f"  construcción                 {t_construccion:7.3f} s  ({estadisticas['nodos_trie']} nodos del trie)")
+
+    # La mitad de las consultas son instancias de algún esquema; el resto, fórmulas al azar
+    relleno = [analizar(texto) for texto in generar_corpus(200, nodos=8, semilla=490)]
+    pool = []
+    for i in range(distintas):
+        if i % 2:
+            pool.append(analizar(generar_formula_aleatoria(generador, generador.randint(10, 60))))
+        else:
+            asignaciones = {variable: generador.choice(relleno) for variable in "pqrs"}
+            pool.append(Sustitucion(asignaciones).aplicar(generador.choice(lista_esquemas)))
+
+    def lineal():
+        total = 0
+        for ast in pool[:lineales]:
+            total += sum(emparejar(esquema, ast) is not None for esquema in lista_esquemas)
+        return total
+
+    total_lineal, t_lineal = cronometrar(lineal)
+    total_indice = sum(len(indice.buscar(ast)) for ast in pool[:lineales])
+    assert total_lineal == total_indice, "Las coincidencias no coinciden"
+
+    def con_indice():
+        total = 0
+        buscar = indice.buscar
+        for i in range(consultas):
+            total += len(buscar(pool[i % distintas]))
+        return total
+
+    total, t_indice = cronometrar(con_indice)
+    aceleracion = (consultas / t_indice) / (lineales / t_lineal)
+    print(f"  emparejamiento lineal        {t_lineal:7.3f} s  ({lineales / t_lineal:8.1f} consultas/s, "
+          f"{lineales} consultas)")
+    print(f"  ArbolDiscriminacion.buscar   {t_indice:7.3f} s  ({consultas / t_indice:8.0f} consultas/s, "
+          f"{aceleracion:.0f}x más rápido)")
+    print(f"  {total} coincidencias, {indice.candidatos} candidatos en las hojas; "
+          f"índice retenido {formato_bytes(retenido)}")
+
+def benchmark_limites(cantidad=5000, nodos=40, profundo=200000, repeticiones=7):
+    """
+    Costo de analizar con límites de recursos sobre fórmulas normales, y
+    tiempo hasta rechazar entradas adversarias frente a analizarlas sin límites.
+    Las variantes se alternan tras una pasada de calentamiento y se informa
+    la mejor de las repeticiones: una sola medición secuencial favorece a la
+    segunda y en una máquina cargada el ruido supera la diferencia.
+    """
+    import contextlib
+    import io
+    from analizador_sintactico import analizar_sintacticamente, MOTORES
+    from limites_recursos import ErrorLimiteRecursos, LimitesRecursos
+
+    def comparar(titulo, corpus, limites, repeticiones):
+        variantes = {
+            'sin límites': lambda expresion: analizar_sintacticamente(expresion, motor=motor,
+                                                                      construir_grafo=False),
+            'con límites': lambda expresion: analizar_sintacticamente(expresion, motor=motor,
+                                                                      construir_grafo=False, limites=limites),
+        }
+
+        def analizar_corpus(variante):
+            for expresion in corpus:
+                variante(expresion)
+
+        print(f"{titulo}; mejor de {repeticiones} pasadas alternadas (entre corchetes, la peor):")
+        for motor in MOTORES:
+            for variante in variantes.values():
+                analizar_corpus(variante)  # calentamiento
+            tiempos = {nombre: [] for nombre in variantes}
+            for _ in range(repeticiones):
+                for nombre, variante in variantes.items():
+                    tiempos[nombre].append(cronometrar(analizar_corpus, variante)[1])
+            base = min(tiempos['sin límites'])
+            print(f"  {motor:5}: " + "   ".join(
+                f"{nombre} {min(t):.3f} s [{max(t):.3f}] ({(min(t) / base - 1) * 100:+.0f}%)"
+                for nombre, t in tiempos.items()))
+
+    print(f"\n=== LÍMITES DE RECURSOS ===")
+    comparar(f"{cantidad} fórmulas de {nodos} nodos",
+             generar_corpus(cantidad, nodos=nodos, semilla=50, prob_parentesis=0.5),
+             LimitesRecursos(), repeticiones)
+    # PLY solo cuenta tokens (lexer_con_presupuesto) cuando el texto tiene más
+    # caracteres que max_tokens; los espacios finales no producen tokens
+    grande = generar_formula_aleatoria(random.Random(50), 20000, prob_parentesis=0.5)
+    grande += " " * (50001 - len(grande))
+    comparar(f"una fórmula de 20000 nodos en {len(grande)} caracteres (PLY cuenta los tokens)", [grande],
+             LimitesRecursos(max_profundidad=None), repeticiones)
+
+    limites = LimitesRecursos()
+    sin_limite_texto = LimitesRecursos(max_caracteres=None, max_tokens=None)
+    adversarias = [
+        ("texto de 10 MB", "p^" * (5 * 1024 * 1024) + "p", limites),
+        (f"{profundo} negaciones", "~" * profundo + "p", sin_limite_texto),
+        (f"cadena de {profundo} conjunciones", "p^" * profundo + "p", sin_limite_texto),
+    ]
+    print("Entradas adversarias (Pratt):")
+    for descripcion, expresion, limites_caso in adversarias:
+        _, t_libre = cronometrar(analizar_sintacticamente, expresion, motor='pratt', construir_grafo=False)
+
+        def rechazar():
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False, limites=limites_caso)
+            except ErrorLimiteRecursos as error:
+                return error.limite
+            return None
+
+        limite, t_rechazo = cronometrar(rechazar)
+        print(f"  {descripcion:32} sin límites {t_libre:7.3f} s   rechazo por {limite} en {t_rechazo:7.3f} s")
+
+BENCHMARKS = {
+    'lexico_mmap': benchmark_lexico_mmap,
+    'motores_parser': benchmark_motores_parser,
+    'automata': benchmark_automata,
+    'conteo_modelos': benchmark_conteo_modelos,
+    'variables_indexadas': benchmark_variables_indexadas,
+    'verificador': benchmark_verificador,
+    'derivaciones': benchmark_derivaciones,
+    'impresion': benchmark_impresion,
+    'grafo_dag': benchmark_grafo_dag,
+    'estadisticas': benchmark_estadisticas,
+    'exportacion': benchmark_exportacion,
+    'cache': benchmark_cache,
+    'svg': benchmark_svg,
+    'dimacs': benchmark_dimacs,
+    'sustitucion': benchmark_sustitucion,
+    'arbol_discriminacion': benchmark_arbol_discriminacion,
+    'limites': benchmark_limites,
+}
+
+if __name__ == "__main__":
+    seleccion = sys.argv[1:] or list(BENCHMARKS)
+    for nombre in seleccion:
+        if nombre not in BENCHMARKS:
+            print(f"Benchmark desconocido: {nombre}. Disponibles: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[nombre]()
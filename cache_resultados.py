@@ -0,0 +1,323 @@
+# Caché de Resultados del Sistema L
+# Caché en disco direccionada por contenido para árboles sintácticos, layouts
+# e imágenes y exportaciones de grafos, con límite de tamaño (LRU) y
+# escrituras atómicas para que varios procesos puedan compartirla
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from perfil_memoria import formato_bytes
+
+# Cambiar la versión invalida todas las entradas anteriores
+VERSION_CACHE = 1
+DIRECTORIO_POR_DEFECTO = os.environ.get('SISTEMA_L_CACHE', '.cache_sistema_L')
+MAX_BYTES_POR_DEFECTO = 256 * 1024 * 1024
+# Al superar el límite se borran las entradas menos usadas hasta esta fracción
+FRACCION_TRAS_RECORTE = 0.9
+# Temporales de escrituras interrumpidas que se pueden borrar
+SEGUNDOS_TEMPORAL_ABANDONADO = 3600
+PREFIJO_TEMPORAL = '.tmp-'
+
+class CacheResultados:
+    """
+    Cada entrada es un archivo directorio/ab/<clave>.<tipo>, donde la clave es
+    un hash de la expresión y de las opciones que afectan al resultado y el
+    tipo indica qué se guarda ('ast', 'layout', 'png', 'svg', 'dot', ...).
+      - Las escrituras van a un temporal del mismo directorio que se renombra
+        con os.replace, así que un lector nunca ve un archivo a medias y dos
+        procesos que escriben la misma clave dejan una copia completa.
+      - La fecha de modificación es la del último uso; cuando el tamaño total
+        supera max_bytes se borran las entradas más antiguas.
+    El directorio se crea con la primera escritura.
+    """
+
+    def __init__(self, directorio=None, max_bytes=MAX_BYTES_POR_DEFECTO):
+        self.directorio = directorio or DIRECTORIO_POR_DEFECTO
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self.eliminadas = 0
+        # Estimación del tamaño total; se recalcula recorriendo el directorio
+        # al recortar, ya que otros procesos también escriben
+        self._tamano = None
+
+    @staticmethod
+    def clave(*partes):
+        """
+        Clave de una entrada: hash de las partes (expresión, modo, formato...)
+        """
+        texto = json.dumps([VERSION_CACHE, *partes], ensure_ascii=False, default=str)
+        return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _ruta(self, clave, tipo):
+        return os.path.join(self.directorio, clave[:2], f"{clave}.{tipo}")
+
+    def _usar(self, ruta):
+        # Marca la entrada como recién usada; si otro proceso acaba de
+        # borrarla se trata como un fallo
+        try:
+            os.utime(ruta)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def leer(self, clave, tipo):
+        """
+        Contenido de la entrada en bytes, o None si no está
+        """
+        ruta = self._ruta(clave, tipo)
+        try:
+            with open(ruta, 'rb') as f:
+                datos = f.read()
+        except FileNotFoundError:
+            self.fallos += 1
+            return None
+        self._usar(ruta)
+        self.aciertos += 1
+        return datos
+
+    def _escribir_atomico(self, clave, tipo, escribir):
+        ruta = self._ruta(clave, tipo)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(prefix=PREFIJO_TEMPORAL, dir=os.path.dirname(ruta))
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                escribir(f)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        self._contabilizar(os.path.getsize(ruta))
+
+    def escribir(self, clave, tipo, datos):
+        """
+        Guarda los bytes como contenido de la entrada
+        """
+        self._escribir_atomico(clave, tipo, lambda f: f.write(datos))
+
+    def guardar_archivo(self, clave, tipo, origen):
+        """
+        Copia un archivo ya generado (imagen, exportación) en la entrada
+        """
+        def copiar(f):
+            with open(origen, 'rb') as entrada:
+                shutil.copyfileobj(entrada, f)
+        self._escribir_atomico(clave, tipo, copiar)
+
+    def copiar_a(self, clave, tipo, destino):
+        """
+        Copia la entrada en destino. Devuelve False si no está en la caché.
+        """
+        ruta = self._ruta(clave, tipo)
+        try:
+            shutil.copyfile(ruta, destino)
+        except FileNotFoundError:
+            if os.path.exists(ruta):
+                raise  # falta el directorio de destino, no la entrada
+            self.fallos += 1
+            return False
+        self._usar(ruta)
+        self.aciertos += 1
+        return True
+
+    def _entradas(self):
+        # (fecha de último uso, tamaño, ruta) de cada entrada; borra de paso
+        # los temporales abandonados
+        entradas = []
+        if not os.path.isdir(self.directorio):
+            return entradas
+        limite_temporal = time.time() - SEGUNDOS_TEMPORAL_ABANDONADO
+        for subdirectorio in os.scandir(self.directorio):
+            if not subdirectorio.is_dir():
+                continue
+            for archivo in os.scandir(subdirectorio.path):
+                try:
+                    datos = archivo.stat()
+                    if archivo.name.startswith(PREFIJO_TEMPORAL):
+                        if datos.st_mtime < limite_temporal:
+                            os.remove(archivo.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                entradas.append((datos.st_mtime, datos.st_size, archivo.path))
+        return entradas
+
+    def _contabilizar(self, tamano):
+        if self._tamano is None:
+            self._tamano = sum(entrada[1] for entrada in self._entradas())
+        else:
+            self._tamano += tamano
+        if self._tamano > self.max_bytes:
+            self.recortar()
+
+    def recortar(self, max_bytes=None):
+        """
+        Borra las entradas usadas hace más tiempo hasta dejar la caché por
+        debajo de FRACCION_TRAS_RECORTE del límite. Devuelve cuántas borró.
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entradas = sorted(self._entradas())
+        total = sum(entrada[1] for entrada in entradas)
+        objetivo = max_bytes * FRACCION_TRAS_RECORTE if total > max_bytes else total
+        borradas = 0
+        for _, tamano, ruta in entradas:
+            if total <= objetivo:
+                break
+            try:
+                os.remove(ruta)
+                borradas += 1
+            except FileNotFoundError:
+                pass  # ya la borró otro proceso
+            total -= tamano
+        self._tamano = total
+        self.eliminadas += borradas
+        return borradas
+
+    def limpiar(self):
+        """
+        Borra todas las entradas
+        """
+        shutil.rmtree(self.directorio, ignore_errors=True)
+        self._tamano = 0
+
+    def estadisticas(self):
+        entradas = self._entradas()
+        return {
+            'directorio': self.directorio,
+            'entradas': len(entradas),
+            'bytes': sum(entrada[1] for entrada in entradas),
+            'max_bytes': self.max_bytes,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'eliminadas': self.eliminadas,
+        }
+
+def obtener_ast(cache, expresion, motor='ply', limites=None):
+    """
+    Árbol sintáctico de la expresión (sin grafo), leído de la caché o
+    analizado y guardado. Devuelve (ast, estaba en caché); ast es None si la
+    expresión es inválida (los errores no se guardan). Con limites (ver
+    limites_recursos.py) la longitud se comprueba antes de consultar la
+    caché y el análisis puede lanzar ErrorLimiteRecursos.
+    """
+    from almacen_corpus import codificar_ast, decodificar_ast
+    from analizador_sintactico import analizar_sintacticamente
+
+    if limites is not None:
+        limites.controlar().comprobar_texto(expresion)
+    clave = cache.clave('ast', expresion)
+    datos = cache.leer(clave, 'ast')
+    if datos is not None:
+        return decodificar_ast(datos), True
+    ast, _ = analizar_sintacticamente(expresion, motor=motor, construir_grafo=False, limites=limites)
+    if ast is not None:
+        cache.escribir(clave, 'ast', codificar_ast(ast))
+    return ast, False
+
+def obtener_layout(cache, expresion, grafo, modo='arbol'):
+    """
+    Posiciones de los nodos del grafo de la expresión (creado con
+    crear_grafo_expresion en el modo indicado), leídas de la caché o
+    calculadas y guardadas. Devuelve (posiciones, estaba en caché).
+    """
+    from generador_grafos import calcular_layout
+
+    clave = cache.clave('layout', expresion, modo)
+    datos = cache.leer(clave, 'layout')
+    if datos is not None:
+        return {int(nodo): tuple(xy) for nodo, xy in json.loads(datos).items()}, True
+    pos = calcular_layout(grafo, expresion)
+    serializado = {str(nodo): [float(x), float(y)] for nodo, (x, y) in pos.items()}
+    cache.escribir(clave, 'layout', json.dumps(serializado).encode('utf-8'))
+    return pos, False
+
+def generar_reporte_cache(cache):
+    """
+    Genera un reporte legible del estado de la caché
+    """
+    datos = cache.estadisticas()
+    consultas = datos['aciertos'] + datos['fallos']
+    reporte = "\n=== CACHÉ DE RESULTADOS ===\n"
+    reporte += f"Directorio: {datos['directorio']}\n"
+    reporte += (f"Entradas: {datos['entradas']} ({formato_bytes(datos['bytes'])} de "
+                f"{formato_bytes(datos['max_bytes'])})\n")
+    if consultas:
+        reporte += (f"Aciertos: {datos['aciertos']}/{consultas} "
+                    f"({100 * datos['aciertos'] / consultas:.1f}%)\n")
+    reporte += f"Entradas eliminadas por tamaño: {datos['eliminadas']}\n"
+    return reporte
+
+def _escribir_concurrente(argumentos):
+    directorio, indice = argumentos
+    cache = CacheResultados(directorio)
+    datos = bytes([indice % 256]) * 200000
+    for _ in range(20):
+        cache.escribir(cache.clave('compartida'), 'bin', datos)
+    return True
+
+if __name__ == "__main__":
+    import sys
+    from concurrent.futures import ProcessPoolExecutor
+
+    if len(sys.argv) >= 2 and sys.argv[1] == '--limpiar':
+        # Uso: python cache_resultados.py --limpiar [directorio]
+        cache = CacheResultados(sys.argv[2] if len(sys.argv) >= 3 else None)
+        cache.limpiar()
+        print(f"Caché borrada: {cache.directorio}")
+        sys.exit(0)
+
+    from generador_grafos import crear_grafo_expresion
+    from gramatica_sistema_L import generar_formula_aleatoria
+    import random
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CacheResultados(directorio)
+        expresiones = [generar_formula_aleatoria(random.Random(i), 40) for i in range(30)]
+
+        print("=== ÁRBOLES Y LAYOUTS ===")
+        for ronda in ('fría', 'caliente'):
+            inicio = time.perf_counter()
+            for expresion in expresiones:
+                ast, _ = obtener_ast(cache, expresion)
+                obtener_layout(cache, expresion, crear_grafo_expresion(ast))
+            print(f"Caché {ronda:8}: {time.perf_counter() - inicio:.3f} s")
+        print(generar_reporte_cache(cache))
+
+        # Las posiciones recuperadas deben ser las mismas que las calculadas
+        ast, _ = obtener_ast(cache, expresiones[0])
+        grafo = crear_grafo_expresion(ast)
+        recuperado, acierto = obtener_layout(cache, expresiones[0], grafo)
+        from generador_grafos import calcular_layout
+        calculado = calcular_layout(grafo, expresiones[0])
+        iguales = acierto and all(tuple(calculado[n]) == recuperado[n] for n in grafo.nodes())
+        print(f"Layout recuperado idéntico al calculado: {iguales}")
+
+        print("\n=== LÍMITE DE TAMAÑO (LRU) ===")
+        pequena = CacheResultados(os.path.join(directorio, 'lru'), max_bytes=1000000)
+        for i in range(30):
+            pequena.escribir(pequena.clave('bloque', i), 'bin', bytes(100000))
+            if i >= 2:
+                pequena.leer(pequena.clave('bloque', 0), 'bin')  # la entrada 0 sigue en uso
+            time.sleep(0.01)
+        datos = pequena.estadisticas()
+        print(f"Entradas tras escribir 30 de 100 KB con límite de 1 MB: {datos['entradas']} "
+              f"({datos['bytes']} bytes), eliminadas {datos['eliminadas']}")
+        print(f"La entrada más usada sigue: {pequena.leer(pequena.clave('bloque', 0), 'bin') is not None}")
+        print(f"La más antigua sin usar se eliminó: {pequena.leer(pequena.clave('bloque', 1), 'bin') is None}")
+
+        print("\n=== ESCRITURAS CONCURRENTES ===")
+        compartida = os.path.join(directorio, 'compartida')
+        with ProcessPoolExecutor(4) as ejecutor:
+            list(ejecutor.map(_escribir_concurrente, [(compartida, i) for i in range(4)]))
+        cache = CacheResultados(compartida)
+        datos = cache.leer(cache.clave('compartida'), 'bin')
+        completa = datos is not None and len(datos) == 200000 and len(set(datos)) == 1
+        temporales = sum(nombre.startswith(PREFIJO_TEMPORAL)
+                         for _, _, nombres in os.walk(compartida) for nombre in nombres)
+        print(f"Entrada íntegra tras 80 escrituras de 4 procesos: {completa}; "
+              f"temporales restantes: {temporales}")
@@ -0,0 +1,223 @@
+# Canonización Sintáctica de Fórmulas del Sistema L
+# Forma canónica para deduplicar corpus: ignora paréntesis redundantes,
+# espacios y el orden de los operandos de operadores conmutativos
+
+import contextlib
+import hashlib
+import heapq
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from analizador_sintactico import SIMBOLOS_OPERADOR, ambito_simbolos, analizar_sintacticamente
+
+# Operadores asociativos y conmutativos: sus cadenas se aplanan y sus
+# operandos se ordenan. La implicación no es conmutativa y se conserva tal cual.
+OPERADORES_CONMUTATIVOS = {tipo: SIMBOLOS_OPERADOR[tipo] for tipo in ('CONJUNCION', 'DISYUNCION', 'BICONDICIONAL')}
+
+def forma_canonica(ast):
+    """
+    Devuelve la forma canónica de un árbol sintáctico como cadena.
+    - Las cadenas de un mismo operador asociativo se aplanan: (p^(q^r)) -> p, q, r
+    - Los operandos de ^, o y <=> se ordenan lexicográficamente por su propia forma canónica
+    - Toda operación binaria queda entre paréntesis, de modo que la cadena
+      resultante es a su vez una fórmula válida del Sistema L
+    """
+    # id(nodo) -> forma canónica; para operadores conmutativos además se
+    # guarda la lista de operandos aplanados para que el padre pueda heredarlos.
+    # Los valores se conservan hasta el final: un nodo compartido (como los
+    # que deja una sustitución) puede tener varios padres.
+    canonicas = {}
+    operandos = {}
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if id(nodo) in canonicas:
+            continue
+        if not visitado:
+            pila.append((nodo, True))
+            pila.extend((hijo, False) for hijo in nodo.hijos)
+            continue
+
+        if nodo.tipo in ('VARIABLE', 'CONSTANTE'):
+            canonicas[id(nodo)] = str(nodo.valor)
+        elif nodo.tipo == 'NEGACION':
+            canonicas[id(nodo)] = '~' + canonicas[id(nodo.hijos[0])]
+        elif nodo.tipo in OPERADORES_CONMUTATIVOS:
+            lista = []
+            for hijo in nodo.hijos:
+                if hijo.tipo == nodo.tipo:
+                    lista.extend(operandos[id(hijo)])
+                else:
+                    lista.append(canonicas[id(hijo)])
+            lista.sort()
+            operandos[id(nodo)] = lista
+            simbolo = OPERADORES_CONMUTATIVOS[nodo.tipo]
+            canonicas[id(nodo)] = '(' + simbolo.join(lista) + ')'
+        else:
+            izquierda, derecha = (canonicas[id(hijo)] for hijo in nodo.hijos)
+            canonicas[id(nodo)] = f"({izquierda}=>{derecha})"
+
+    return canonicas[id(ast)]
+
+def hash_canonico(ast):
+    """
+    Hash de 128 bits (hexadecimal) de la forma canónica
+    """
+    return hashlib.blake2b(forma_canonica(ast).encode('utf-8'), digest_size=16).hexdigest()
+
+def canonizar_expresion(expresion):
+    """
+    Analiza una expresión y devuelve (forma canónica, hash), o (None, None) si es inválida.
+    Usa el motor Pratt sin construir el grafo; los mensajes de error del
+    análisis no se imprimen (deduplicar_archivo cuenta las líneas inválidas).
+    Los nombres de variable no se quedan en la tabla de símbolos, así que la
+    memoria no crece con las líneas de un corpus.
+    """
+    with contextlib.redirect_stdout(io.StringIO()), ambito_simbolos():
+        ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+        if ast is None:
+            return None, None
+        cadena = forma_canonica(ast)
+    return cadena, hashlib.blake2b(cadena.encode('utf-8'), digest_size=16).hexdigest()
+
+def deduplicar_archivo(entrada, salida, particiones=64, directorio_temporal=None):
+    """
+    Elimina las fórmulas repetidas (módulo canonización) de un archivo con una
+    fórmula por línea, conservando la primera aparición y el orden original.
+
+    Usa memoria acotada mediante particionado externo por hash:
+      1. cada línea válida se escribe en la partición que indica su hash
+      2. cada partición se deduplica por separado en memoria
+      3. las sobrevivientes se mezclan por número de línea
+    La memoria máxima es la del conjunto de hashes de una sola partición.
+    Las líneas inválidas (también las que no son UTF-8 válido) se descartan
+    y se cuentan en el resultado.
+    """
+    inicio = time.perf_counter()
+    resultado = {
+        'lineas_leidas': 0,
+        'invalidas': 0,
+        'unicas': 0,
+        'duplicadas': 0,
+        'bytes_leidos': 0,
+    }
+    directorio = tempfile.mkdtemp(prefix='dedup_', dir=directorio_temporal)
+    try:
+        # Fase 1: particionar por hash canónico
+        rutas = [os.path.join(directorio, f"particion_{i:04d}") for i in range(particiones)]
+        archivos = [open(ruta, 'w', encoding='utf-8') for ruta in rutas]
+        try:
+            # Lectura binaria: bytes_leidos cuenta bytes aunque haya caracteres no ASCII
+            with open(entrada, 'rb') as f:
+                for numero, linea in enumerate(f):
+                    resultado['lineas_leidas'] += 1
+                    resultado['bytes_leidos'] += len(linea)
+                    try:
+                        expresion = linea.decode('utf-8').strip()
+                    except UnicodeDecodeError:
+                        # Una línea mal codificada se descarta como inválida
+                        resultado['invalidas'] += 1
+                        continue
+                    if not expresion:
+                        continue
+                    _, clave = canonizar_expresion(expresion)
+                    if clave is None:
+                        resultado['invalidas'] += 1
+                        continue
+                    particion = int(clave[:8], 16) % particiones
+                    archivos[particion].write(f"{numero}\t{clave}\t{expresion}\n")
+        finally:
+            for archivo in archivos:
+                archivo.close()
+
+        # Fase 2: deduplicar cada partición (las líneas ya están en orden de aparición)
+        rutas_unicas = []
+        for ruta in rutas:
+            vistas = set()
+            ruta_unicas = ruta + '.unicas'
+            with open(ruta, 'r', encoding='utf-8') as f, open(ruta_unicas, 'w', encoding='utf-8') as g:
+                for registro in f:
+                    numero, clave, expresion = registro.rstrip('\n').split('\t', 2)
+                    if clave in vistas:
+                        resultado['duplicadas'] += 1
+                        continue
+                    vistas.add(clave)
+                    resultado['unicas'] += 1
+                    g.write(f"{numero}\t{expresion}\n")
+            os.remove(ruta)
+            rutas_unicas.append(ruta_unicas)
+
+        # Fase 3: mezclar las particiones por número de línea original
+        fuentes = [open(ruta, 'r', encoding='utf-8') for ruta in rutas_unicas]
+        try:
+            flujos = [((int(r.split('\t', 1)[0]), r.split('\t', 1)[1]) for r in fuente) for fuente in fuentes]
+            with open(salida, 'w', encoding='utf-8') as g:
+                for _, expresion in heapq.merge(*flujos):
+                    g.write(expresion)
+        finally:
+            for fuente in fuentes:
+                fuente.close()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    segundos = time.perf_counter() - inicio
+    validas = resultado['unicas'] + resultado['duplicadas']
+    resultado['segundos'] = segundos
+    resultado['tasa_deduplicacion'] = resultado['duplicadas'] / validas if validas else 0.0
+    resultado['lineas_por_segundo'] = resultado['lineas_leidas'] / segundos if segundos else 0.0
+    resultado['mb_por_segundo'] = resultado['bytes_leidos'] / 1e6 / segundos if segundos else 0.0
+    return resultado
+
+def generar_reporte_deduplicacion(resultado):
+    """
+    Genera un reporte legible del resultado de deduplicar_archivo
+    """
+    reporte = "\n=== REPORTE DE DEDUPLICACIÓN ===\n"
+    reporte += f"Líneas leídas: {resultado['lineas_leidas']}\n"
+    reporte += f"Líneas inválidas: {resultado['invalidas']}\n"
+    reporte += f"Fórmulas únicas: {resultado['unicas']}\n"
+    reporte += f"Fórmulas duplicadas: {resultado['duplicadas']}\n"
+    reporte += f"Tasa de deduplicación: {resultado['tasa_deduplicacion']:.2%}\n"
+    reporte += f"Tiempo: {resultado['segundos']:.3f} s\n"
+    reporte += f"Rendimiento: {resultado['lineas_por_segundo']:.0f} líneas/s, "
+    reporte += f"{resultado['mb_por_segundo']:.2f} MB/s\n"
+    return reporte
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        # Uso: python canonizacion.py entrada.txt salida.txt
+        print(generar_reporte_deduplicacion(deduplicar_archivo(sys.argv[1], sys.argv[2])))
+        sys.exit(0)
+
+    expresiones_prueba = [
+        "(p^q)",
+        "(q^p)",
+        "((p^q))",
+        "p ^ q",
+        "(p^(q^r))",
+        "((r^q)^p)",
+        "(p<=>~q)",
+        "(~q<=>p)",
+        "(p=>q)",
+        "(q=>p)",
+    ]
+
+    print("=== FORMA CANÓNICA ===")
+    for expr in expresiones_prueba:
+        cadena, clave = canonizar_expresion(expr)
+        print(f"{expr:15} -> {cadena:15} {clave[:12]}")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, "entrada.txt")
+        salida = os.path.join(directorio, "salida.txt")
+        with open(entrada, 'wb') as f:
+            f.write(("\n".join(expresiones_prueba) + "\n").encode('utf-8'))
+            f.write(b"\xff\xfe\n")  # línea que no es UTF-8: se cuenta como inválida
+        print(generar_reporte_deduplicacion(deduplicar_archivo(entrada, salida, particiones=4)))
+        with open(salida, encoding='utf-8') as f:
+            print("Fórmulas conservadas:")
+            for linea in f:
+                print(f"  {linea.rstrip()}")
@@ -0,0 +1,141 @@
+# Generador de Carga para el Servicio de Validación del Sistema L
+# Envía solicitudes concurrentes por un socket Unix y mide la latencia
+# (p50/p99) y el rendimiento del servicio
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+EXPRESIONES_CARGA = [
+    "p",
+    "~~~q",
+    "(p^q)",
+    "(0=>(ros))",
+    "~(p^q)",
+    "(p<=>~p)",
+    "((p=>q)^p)",
+    "(~(p^(qor))os)",
+    "((p=>q)=>((q=>r)=>(p=>r)))",
+    "p^^q",
+]
+
+def percentil(valores_ordenados, porcentaje):
+    """
+    Percentil por el método del rango más cercano sobre una lista ordenada
+    """
+    if not valores_ordenados:
+        return 0.0
+    rango = math.ceil(porcentaje / 100 * len(valores_ordenados))
+    posicion = max(0, min(len(valores_ordenados) - 1, rango - 1))
+    return valores_ordenados[posicion]
+
+async def generar_carga(ruta_socket, total=10000, concurrencia=64, operacion='validate',
+                        expresiones=EXPRESIONES_CARGA):
+    """
+    Envía 'total' solicitudes manteniendo 'concurrencia' solicitudes en vuelo
+    sobre una única conexión y devuelve las métricas de latencia
+    """
+    lector, escritor = await asyncio.open_unix_connection(ruta_socket, limit=1 << 20)
+    enviadas = {}
+    latencias = []
+    errores = 0
+    cupo = asyncio.Semaphore(concurrencia)
+
+    async def leer_respuestas():
+        nonlocal errores
+        for _ in range(total):
+            linea = await lector.readline()
+            if not linea:
+                raise ConnectionError("El servicio cerró la conexión")
+            respuesta = json.loads(linea)
+            latencias.append(time.perf_counter() - enviadas.pop(respuesta['id']))
+            if not respuesta.get('ok'):
+                errores += 1
+            cupo.release()
+
+    lectura = asyncio.create_task(leer_respuestas())
+    inicio = time.perf_counter()
+    ciclo = itertools.cycle(expresiones)
+    for identificador in range(total):
+        await cupo.acquire()
+        solicitud = {'id': identificador, 'op': operacion, 'expresion': next(ciclo)}
+        enviadas[identificador] = time.perf_counter()
+        escritor.write((json.dumps(solicitud) + "\n").encode('utf-8'))
+        await escritor.drain()
+    await lectura
+    duracion = time.perf_counter() - inicio
+    escritor.close()
+    await escritor.wait_closed()
+
+    latencias.sort()
+    return {
+        'solicitudes': total,
+        'concurrencia': concurrencia,
+        'operacion': operacion,
+        'errores': errores,
+        'segundos': duracion,
+        'solicitudes_por_segundo': total / duracion if duracion else 0.0,
+        'p50_ms': percentil(latencias, 50) * 1000,
+        'p99_ms': percentil(latencias, 99) * 1000,
+        'max_ms': latencias[-1] * 1000 if latencias else 0.0,
+    }
+
+def esperar_socket(ruta, tiempo_maximo=30.0):
+    limite = time.monotonic() + tiempo_maximo
+    while not os.path.exists(ruta):
+        if time.monotonic() > limite:
+            raise TimeoutError(f"El servicio no creó el socket {ruta}")
+        time.sleep(0.05)
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Generador de carga del servicio de validación")
+    argumentos.add_argument('--socket', help="socket de un servicio ya iniciado; si se omite se inicia uno temporal")
+    argumentos.add_argument('--total', type=int, default=10000)
+    argumentos.add_argument('--concurrencia', type=int, default=64)
+    argumentos.add_argument('--op', default='validate', choices=['lex', 'parse', 'validate', 'report', 'dot'])
+    argumentos.add_argument('--trabajadores', type=int, default=None)
+    opciones = argumentos.parse_args()
+
+    servidor = None
+    directorio = None
+    ruta = opciones.socket
+    if ruta is None:
+        directorio = tempfile.TemporaryDirectory()
+        ruta = os.path.join(directorio.name, "servicio.sock")
+        comando = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "servicio_validacion.py"),
+                   '--socket', ruta]
+        if opciones.trabajadores:
+            comando += ['--trabajadores', str(opciones.trabajadores)]
+        servidor = subprocess.Popen(comando)
+    try:
+        esperar_socket(ruta)
+        metricas = asyncio.run(generar_carga(ruta, opciones.total, opciones.concurrencia, opciones.op))
+    finally:
+        if servidor is not None:
+            # SIGTERM: el servicio detiene sus trabajadores y borra el socket antes de salir
+            servidor.terminate()
+            try:
+                servidor.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                servidor.kill()
+                servidor.wait()
+            directorio.cleanup()
+
+    print("\n=== CARGA DEL SERVICIO DE VALIDACIÓN ===")
+    print(f"Operación: {metricas['operacion']}")
+    print(f"Solicitudes: {metricas['solicitudes']} (concurrencia {metricas['concurrencia']})")
+    print(f"Respuestas con error: {metricas['errores']}")
+    print(f"Rendimiento: {metricas['solicitudes_por_segundo']:.0f} solicitudes/s")
+    print(f"Latencia p50: {metricas['p50_ms']:.2f} ms")
+    print(f"Latencia p99: {metricas['p99_ms']:.2f} ms")
+    print(f"Latencia máxima: {metricas['max_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
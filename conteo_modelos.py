@@ -0,0 +1,319 @@
+# Conteo de Modelos del Sistema L
+# Cuenta exactamente cuántas asignaciones satisfacen una fórmula mediante DPLL
+# con descomposición en componentes independientes y caché de componentes
+
+from collections import OrderedDict
+from itertools import product
+from analizador_sintactico import analizar_sintacticamente
+from forma_normal_conjuntiva import cnf_tseitin, simbolos_formula
+
+# --- Evaluación directa y tabla de verdad ---------------------------------
+
+def evaluar_formula(ast, asignacion):
+    """
+    Valor de verdad (True/False) del árbol. La asignación se indexa por el
+    símbolo entero de cada variable (un diccionario o una lista de bool).
+    """
+    valores = {}
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if not visitado and nodo.hijos:
+            # Un nodo compartido (p. ej. tras una sustitución) se evalúa una vez
+            if id(nodo) not in valores:
+                pila.append((nodo, True))
+                pila.extend((hijo, False) for hijo in nodo.hijos)
+            continue
+        if nodo.tipo == 'VARIABLE':
+            valor = asignacion[nodo.simbolo]
+        elif nodo.tipo == 'CONSTANTE':
+            valor = nodo.valor == 1
+        elif nodo.tipo == 'NEGACION':
+            valor = not valores[id(nodo.hijos[0])]
+        else:
+            a, b = (valores[id(hijo)] for hijo in nodo.hijos)
+            if nodo.tipo == 'CONJUNCION':
+                valor = a and b
+            elif nodo.tipo == 'DISYUNCION':
+                valor = a or b
+            elif nodo.tipo == 'IMPLICACION':
+                valor = (not a) or b
+            else:
+                valor = a == b
+        valores[id(nodo)] = valor
+    return valores[id(ast)]
+
+def contar_por_tabla_verdad(ast):
+    """
+    Cuenta los modelos enumerando las 2^n filas de la tabla de verdad
+    """
+    simbolos = simbolos_formula(ast)
+    modelos = 0
+    for valores in product((False, True), repeat=len(simbolos)):
+        if evaluar_formula(ast, dict(zip(simbolos, valores))):
+            modelos += 1
+    return modelos
+
+# --- Contador DPLL con componentes ----------------------------------------
+
+def _condicionar(clausulas, literal):
+    """
+    Asigna el literal como verdadero. Devuelve las cláusulas restantes o None
+    si aparece una cláusula vacía (conflicto).
+    """
+    resultado = []
+    for clausula in clausulas:
+        if literal in clausula:
+            continue
+        if -literal in clausula:
+            clausula = tuple(l for l in clausula if l != -literal)
+            if not clausula:
+                return None
+        resultado.append(clausula)
+    return resultado
+
+def _propagar_unitarias(clausulas):
+    """
+    Propagación unitaria con listas de ocurrencias: al asignar un literal solo
+    se revisan las cláusulas que contienen su negación. Devuelve (cláusulas
+    simplificadas, variables asignadas) o (None, 0) si hay conflicto.
+    """
+    pendientes = [clausula[0] for clausula in clausulas if len(clausula) == 1]
+    if not pendientes:
+        return clausulas, 0
+    ocurrencias = {}
+    for indice, clausula in enumerate(clausulas):
+        for literal in clausula:
+            ocurrencias.setdefault(literal, []).append(indice)
+
+    verdaderos = set()
+    while pendientes:
+        literal = pendientes.pop()
+        if literal in verdaderos:
+            continue
+        if -literal in verdaderos:
+            return None, 0
+        verdaderos.add(literal)
+        for indice in ocurrencias.get(-literal, ()):
+            libres = 0
+            for otro in clausulas[indice]:
+                if otro in verdaderos:
+                    break
+                if -otro not in verdaderos:
+                    libres += 1
+                    ultimo_libre = otro
+            else:
+                if libres == 0:
+                    return None, 0
+                if libres == 1:
+                    pendientes.append(ultimo_libre)
+
+    falsos = {-literal for literal in verdaderos}
+    restantes = []
+    for clausula in clausulas:
+        if not verdaderos.isdisjoint(clausula):
+            continue
+        if not falsos.isdisjoint(clausula):
+            clausula = tuple(literal for literal in clausula if literal not in falsos)
+        restantes.append(clausula)
+    return restantes, len(verdaderos)
+
+def _variables_de(clausulas):
+    return {abs(literal) for clausula in clausulas for literal in clausula}
+
+def _componentes(clausulas):
+    """
+    Separa las cláusulas en grupos que no comparten variables (unión-búsqueda)
+    """
+    padre = {}
+
+    def raiz(variable):
+        while padre[variable] != variable:
+            padre[variable] = padre[padre[variable]]
+            variable = padre[variable]
+        return variable
+
+    for clausula in clausulas:
+        primera = abs(clausula[0])
+        padre.setdefault(primera, primera)
+        for literal in clausula[1:]:
+            variable = abs(literal)
+            padre.setdefault(variable, variable)
+            a, b = raiz(primera), raiz(variable)
+            if a != b:
+                padre[b] = a
+
+    grupos = {}
+    for clausula in clausulas:
+        grupos.setdefault(raiz(abs(clausula[0])), []).append(clausula)
+    return list(grupos.values())
+
+class ContadorModelos:
+    """
+    Contador exacto de modelos de una CNF (#SAT):
+      - propagación unitaria en cada nodo de la búsqueda
+      - las cláusulas que no comparten variables se cuentan por separado y
+        los resultados se multiplican
+      - cada componente se guarda en una caché LRU de tamaño máximo
+        max_cache; al llenarse se desaloja el componente usado hace más tiempo
+    La búsqueda usa una pila explícita, por lo que no depende del límite de
+    recursión de Python.
+    """
+
+    def __init__(self, max_cache=100000):
+        self.max_cache = max_cache
+        self.cache = OrderedDict()
+        self.estadisticas = {
+            'decisiones': 0,
+            'componentes': 0,
+            'aciertos_cache': 0,
+            'fallos_cache': 0,
+            'desalojos': 0,
+        }
+
+    def _consultar_cache(self, clave):
+        cuenta = self.cache.get(clave)
+        if cuenta is not None:
+            self.cache.move_to_end(clave)
+            self.estadisticas['aciertos_cache'] += 1
+        else:
+            self.estadisticas['fallos_cache'] += 1
+        return cuenta
+
+    def _guardar_cache(self, clave, cuenta):
+        self.cache[clave] = cuenta
+        if len(self.cache) > self.max_cache:
+            self.cache.popitem(last=False)
+            self.estadisticas['desalojos'] += 1
+
+    def _contar_formula(self, clausulas, num_variables):
+        """
+        Cuenta los modelos de las cláusulas sobre num_variables variables.
+        Es un generador: produce los subproblemas (componentes) y recibe sus
+        cuentas, para que el ciclo de contar_cnf lo ejecute sin recursión.
+        """
+        clausulas, asignadas = _propagar_unitarias(clausulas)
+        if clausulas is None:
+            return 0
+        # Las variables que ya no aparecen en ninguna cláusula pueden tomar cualquier valor
+        libres = num_variables - asignadas - len(_variables_de(clausulas))
+        cuenta = 1 << libres
+        for componente in _componentes(clausulas):
+            self.estadisticas['componentes'] += 1
+            cuenta *= yield componente
+            if cuenta == 0:
+                return 0
+        return cuenta
+
+    def _contar_componente(self, clausulas):
+        clave = frozenset(clausulas)
+        cuenta = self._consultar_cache(clave)
+        if cuenta is not None:
+            return cuenta
+
+        # Decisión sobre la variable que aparece en más cláusulas
+        apariciones = {}
+        for clausula in clausulas:
+            for literal in clausula:
+                apariciones[abs(literal)] = apariciones.get(abs(literal), 0) + 1
+        variable = max(apariciones, key=apariciones.get)
+        restantes = len(apariciones) - 1
+        self.estadisticas['decisiones'] += 1
+
+        cuenta = 0
+        for literal in (variable, -variable):
+            condicionadas = _condicionar(clausulas, literal)
+            if condicionadas is not None:
+                cuenta += yield (condicionadas, restantes)
+        self._guardar_cache(clave, cuenta)
+        return cuenta
+
+    def contar_cnf(self, clausulas, num_variables):
+        """
+        Número exacto de asignaciones de las variables 1..num_variables que
+        satisfacen todas las cláusulas
+        """
+        pila = [self._contar_formula([tuple(c) for c in clausulas], num_variables)]
+        resultado = None
+        while pila:
+            try:
+                subproblema = pila[-1].send(resultado)
+            except StopIteration as fin:
+                pila.pop()
+                resultado = fin.value
+                continue
+            resultado = None
+            # Los componentes llegan como lista; las ramas de una decisión como (cláusulas, variables)
+            if isinstance(subproblema, list):
+                pila.append(self._contar_componente(subproblema))
+            else:
+                pila.append(self._contar_formula(*subproblema))
+        return resultado
+
+def contar_modelos(ast, max_cache=100000, estadisticas=None):
+    """
+    Número de asignaciones de las variables de la fórmula que la satisfacen.
+    Cuenta sobre la CNF de Tseitin: como cada asignación original se extiende
+    de forma única a las variables auxiliares, la cuenta es exacta.
+    Si se pasa un diccionario en estadisticas se rellena con las del contador.
+    """
+    cnf = cnf_tseitin(ast)
+    contador = ContadorModelos(max_cache)
+    cuenta = contador.contar_cnf(cnf.clausulas, cnf.num_variables)
+    if estadisticas is not None:
+        estadisticas.update(contador.estadisticas)
+        estadisticas['variables'] = cnf.num_originales
+        estadisticas['variables_cnf'] = cnf.num_variables
+        estadisticas['clausulas'] = len(cnf.clausulas)
+    return cuenta
+
+def contar_modelos_expresion(expresion, max_cache=100000):
+    """
+    Analiza la expresión y devuelve (modelos, número de variables), o (None, None) si es inválida
+    """
+    ast, _ = analizar_sintacticamente(expresion, construir_grafo=False)
+    if ast is None:
+        return None, None
+    return contar_modelos(ast, max_cache), len(simbolos_formula(ast))
+
+def probabilidad_satisfaccion(ast):
+    """
+    Probabilidad de que la fórmula sea verdadera si cada variable es
+    verdadera con probabilidad 1/2 e independiente de las demás
+    """
+    return contar_modelos(ast) / (1 << len(simbolos_formula(ast)))
+
+if __name__ == "__main__":
+    import random
+    from gramatica_sistema_L import generar_formula_aleatoria
+
+    expresiones_prueba = [
+        "p",
+        "~~~q",
+        "(p^q)",
+        "(poq)",
+        "(p<=>~p)",
+        "((p=>q)^p)",
+        "((p=>q)=>((q=>r)=>(p=>r)))",
+        "((p^q)o(r^s))",
+        "(0op)",
+        "1",
+    ]
+
+    print("=== CONTEO DE MODELOS ===")
+    for expr in expresiones_prueba:
+        modelos, variables = contar_modelos_expresion(expr)
+        print(f"{expr:30} {modelos:4} de {1 << variables:4} asignaciones")
+
+    # Verificación contra la tabla de verdad sobre fórmulas aleatorias
+    generador = random.Random(35)
+    errores = 0
+    pruebas = 500
+    for _ in range(pruebas):
+        expr = generar_formula_aleatoria(generador, generador.randint(1, 60), prob_parentesis=0.5)
+        ast, _ = analizar_sintacticamente(expr, construir_grafo=False)
+        # Caché diminuta para ejercitar también los desalojos
+        if contar_modelos(ast, max_cache=4) != contar_por_tabla_verdad(ast):
+            errores += 1
+            print(f"  Discrepancia en {expr}")
+    print(f"\nVerificación contra la tabla de verdad: {pruebas - errores}/{pruebas} correctas")
@@ -0,0 +1,678 @@
+# Demostrador Automático del Sistema Axiomático L
+# Busca pruebas al estilo de Hilbert (axiomas A1-A3 y modus ponens) de una fórmula
+#
+# La búsqueda trabaja sobre secuentes Γ |- G (hipótesis y objetivo) con estas reglas:
+#   - G es una hipótesis o una instancia de A1, A2 o A3
+#   - G = A=>B: se prueba Γ, A |- B y se aplica el teorema de la deducción
+#   - encadenamiento hacia atrás: si Γ contiene A1=>(A2=>...=>G) (o su doble
+#     negación) se prueban A1, ..., An
+#   - reducción al absurdo con A3: se prueban Γ, ~G |- B y Γ, ~G |- ~B para algún B
+# Las pruebas encontradas se traducen a pasos de L (eliminando las aplicaciones
+# del teorema de la deducción) y se vuelven a comprobar con verificador_pruebas.
+
+import random
+import sys
+import time
+from analizador_sintactico import analizar_sintacticamente, tabla_simbolos
+from conteo_modelos import contar_modelos
+from forma_normal_conjuntiva import simbolos_formula
+from verificador_pruebas import verificar_prueba, escribir_prueba
+
+# --- Fórmulas como tuplas -------------------------------------------------
+#
+# Durante la búsqueda las fórmulas son tuplas inmutables y comparables:
+# ('v', simbolo), ('~', A) y ('=>', A, B), con el símbolo de la variable en
+# tabla_simbolos. Sirven directamente como claves de los diccionarios de
+# memoización. Los demás conectivos son abreviaturas en L (Mendelson):
+# A^B = ~(A=>~B), AoB = ~A=>B, A<=>B = (A=>B)^(B=>A).
+
+def forma_desde_ast(ast, unicas=None):
+    """
+    Tupla equivalente al árbol con ^, o y <=> expandidas como abreviaturas.
+    Devuelve None si la fórmula contiene constantes, que no existen en L.
+
+    Las subfórmulas iguales se construyen una sola vez (consultando unicas,
+    que puede compartirse entre varias fórmulas): así las comparaciones de
+    tuplas terminan en cuanto los hijos son el mismo objeto y no recorren
+    fórmulas profundas con la recursión de Python.
+    """
+    if unicas is None:
+        unicas = {}
+
+    def unica(*forma):
+        # Clave superficial: etiqueta e identidad de los hijos ya únicos
+        clave = tuple(id(parte) if isinstance(parte, tuple) else parte for parte in forma)
+        existente = unicas.get(clave)
+        if existente is None:
+            existente = unicas[clave] = forma
+        return existente
+
+    # id(nodo) -> forma; se conservan todas porque un nodo compartido (como
+    # los que deja una sustitución) puede tener varios padres
+    formas = {}
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if id(nodo) in formas:
+            continue
+        if not visitado and nodo.hijos:
+            pila.append((nodo, True))
+            pila.extend((hijo, False) for hijo in nodo.hijos)
+            continue
+        if nodo.tipo == 'VARIABLE':
+            forma = unica('v', nodo.simbolo)
+        elif nodo.tipo == 'CONSTANTE':
+            return None
+        elif nodo.tipo == 'NEGACION':
+            forma = unica('~', formas[id(nodo.hijos[0])])
+        else:
+            a, b = (formas[id(hijo)] for hijo in nodo.hijos)
+            if nodo.tipo == 'IMPLICACION':
+                forma = unica('=>', a, b)
+            elif nodo.tipo == 'CONJUNCION':
+                forma = unica('~', unica('=>', a, unica('~', b)))
+            elif nodo.tipo == 'DISYUNCION':
+                forma = unica('=>', unica('~', a), b)
+            else:  # BICONDICIONAL
+                forma = unica('~', unica('=>', unica('=>', a, b), unica('~', unica('=>', b, a))))
+        formas[id(nodo)] = forma
+    return formas[id(ast)]
+
+def texto_forma(forma, cache=None):
+    """
+    Texto de la fórmula en el formato de verificador_pruebas (paréntesis en
+    toda implicación salvo la exterior). Postorden con pila explícita.
+    """
+    if cache is None:
+        cache = {}
+    texto = cache.get(forma)
+    if texto is not None:
+        return texto
+    pila = [(forma, False)]
+    while pila:
+        actual, visitado = pila.pop()
+        if actual[0] == 'v':
+            cache[actual] = tabla_simbolos.nombre(actual[1])
+            continue
+        if not visitado:
+            if actual not in cache:
+                pila.append((actual, True))
+                pila.extend((hijo, False) for hijo in actual[1:])
+            continue
+        partes = [f"({cache[hijo]})" if hijo[0] == '=>' else cache[hijo] for hijo in actual[1:]]
+        cache[actual] = '~' + partes[0] if actual[0] == '~' else f"{partes[0]}=>{partes[1]}"
+    return cache[forma]
+
+def _implicacion(a, b):
+    return ('=>', a, b)
+
+def _negacion(a):
+    return ('~', a)
+
+def esquema_forma(forma):
+    """
+    'A1', 'A2' o 'A3' si la tupla es instancia de ese esquema de axioma, o None
+    """
+    if forma[0] != '=>':
+        return None
+    _, izquierda, derecha = forma
+    if derecha[0] != '=>':
+        return None
+    # A1: B => (C => B)
+    if derecha[2] == izquierda:
+        return 'A1'
+    # A2: (B => (C => D)) => ((B => C) => (B => D))
+    if (izquierda[0] == '=>' and izquierda[2][0] == '=>'
+            and derecha[1][0] == '=>' and derecha[2][0] == '=>'):
+        b, (_, c, d) = izquierda[1], izquierda[2]
+        if derecha[1] == ('=>', b, c) and derecha[2] == ('=>', b, d):
+            return 'A2'
+    # A3: (~C => ~B) => ((~C => B) => C)
+    if (izquierda[0] == '=>' and izquierda[1][0] == '~' and izquierda[2][0] == '~'
+            and derecha[1][0] == '=>'):
+        c, b = izquierda[1][1], izquierda[2][1]
+        if derecha[1] == ('=>', ('~', c), b) and derecha[2] == c:
+            return 'A3'
+    return None
+
+# --- Traducción a pasos de L ----------------------------------------------
+#
+# Una prueba encontrada es un árbol de tuplas:
+#   ('HIP', G)  ('AX', nombre, G)  ('MP', prueba de A, prueba de A=>G, G)
+#   ('DED', A, prueba de B con la hipótesis A, A=>B)
+# y se traduce a una lista de pasos (fórmula, justificación) donde la
+# justificación de MP nombra las fórmulas premisa en lugar de números.
+
+def _pasos_identidad(a):
+    """
+    Los cinco pasos de |- A=>A
+    """
+    aa = _implicacion(a, a)
+    a_aa = _implicacion(a, aa)
+    a_aa_a = _implicacion(a, _implicacion(aa, a))
+    paso_3 = _implicacion(a_aa, aa)
+    return [
+        (_implicacion(a_aa_a, paso_3), ('A2',)),
+        (a_aa_a, ('A1',)),
+        (paso_3, ('MP', a_aa_a, _implicacion(a_aa_a, paso_3))),
+        (a_aa, ('A1',)),
+        (aa, ('MP', a_aa, paso_3)),
+    ]
+
+def _eliminar_hipotesis(pasos, a):
+    """
+    Teorema de la deducción: convierte una prueba de Γ, A |- B en una de Γ |- A=>B.
+    Los pasos que no dependen de A se conservan tal cual y solo se elevan a
+    A=>C (con A1) cuando un paso dependiente los necesita.
+    """
+    resultado = []
+    dependientes = set()
+    elevadas = set()
+
+    def elevar(formula):
+        # C, C=>(A=>C) por A1 y A=>C por MP
+        if formula not in elevadas:
+            elevadas.add(formula)
+            levantada = _implicacion(formula, _implicacion(a, formula))
+            resultado.append((levantada, ('A1',)))
+            resultado.append((levantada[2], ('MP', formula, levantada)))
+
+    for formula, justificacion in pasos:
+        if formula == a:
+            dependientes.add(formula)
+            resultado.extend(_pasos_identidad(a))
+            continue
+        if justificacion[0] != 'MP' or not dependientes.intersection(justificacion[1:]):
+            resultado.append((formula, justificacion))
+            continue
+        # Desde A=>P y A=>(P=>C) con A2: (A=>(P=>C))=>((A=>P)=>(A=>C))
+        dependientes.add(formula)
+        premisa, implicacion = justificacion[1], justificacion[2]
+        for necesaria in (premisa, implicacion):
+            if necesaria not in dependientes:
+                elevar(necesaria)
+        a_formula = _implicacion(a, formula)
+        a_premisa = _implicacion(a, premisa)
+        a_implicacion = _implicacion(a, implicacion)
+        intermedia = _implicacion(a_premisa, a_formula)
+        axioma = _implicacion(a_implicacion, intermedia)
+        resultado.append((axioma, ('A2',)))
+        resultado.append((intermedia, ('MP', a_implicacion, axioma)))
+        resultado.append((a_formula, ('MP', a_premisa, intermedia)))
+
+    conclusion = pasos[-1][0]
+    if conclusion not in dependientes:
+        elevar(conclusion)
+    return resultado
+
+def _pasos_de_arbol(arbol):
+    """
+    Pasos de L de un árbol de prueba (postorden con pila explícita; las
+    subpruebas reutilizadas de la memoización se traducen cada vez)
+    """
+    valores = []  # pasos de las subpruebas ya traducidas
+    pila = [(arbol, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        regla = nodo[0]
+        if regla == 'HIP':
+            valores.append([(nodo[1], ('HIP',))])
+        elif regla == 'AX':
+            valores.append([(nodo[2], (nodo[1],))])
+        elif not visitado:
+            pila.append((nodo, True))
+            if regla == 'MP':
+                # La prueba de la premisa queda arriba: se traduce primero
+                pila.extend(((nodo[2], False), (nodo[1], False)))
+            else:
+                pila.append((nodo[2], False))
+        elif regla == 'MP':
+            _, prueba_premisa, prueba_implicacion, formula = nodo
+            de_implicacion = valores.pop()
+            pasos = valores.pop()
+            pasos.extend(de_implicacion)
+            pasos.append((formula, ('MP', prueba_premisa[-1], prueba_implicacion[-1])))
+            valores.append(pasos)
+        else:
+            valores.append(_eliminar_hipotesis(valores.pop(), nodo[1]))
+    return valores[0]
+
+def pasos_de_prueba(arbol):
+    """
+    Lista final de pasos (texto, justificación) lista para escribir_prueba:
+    se quitan las fórmulas repetidas (queda la primera aparición), se
+    descartan los pasos que no contribuyen a la conclusión y las
+    justificaciones de MP se numeran.
+    """
+    pasos = _pasos_de_arbol(arbol)
+    objetivo = arbol[-1]
+    primera = {}
+    unicos = []
+    for formula, justificacion in pasos:
+        if formula not in primera:
+            primera[formula] = len(unicos)
+            unicos.append((formula, justificacion))
+    unicos = unicos[:primera[objetivo] + 1]
+
+    # Pasos necesarios: recorrido hacia atrás desde la conclusión
+    necesarios = {len(unicos) - 1}
+    pendientes = [len(unicos) - 1]
+    while pendientes:
+        justificacion = unicos[pendientes.pop()][1]
+        if justificacion[0] == 'MP':
+            for premisa in justificacion[1:]:
+                indice = primera[premisa]
+                if indice not in necesarios:
+                    necesarios.add(indice)
+                    pendientes.append(indice)
+
+    numero = {}
+    textos = {}
+    resultado = []
+    for indice, (formula, justificacion) in enumerate(unicos):
+        if indice not in necesarios:
+            continue
+        numero[formula] = len(resultado) + 1
+        if justificacion[0] == 'MP':
+            etiqueta = f"MP {numero[justificacion[1]]},{numero[justificacion[2]]}"
+        else:
+            etiqueta = 'Hip' if justificacion[0] == 'HIP' else justificacion[0]
+        resultado.append((texto_forma(formula, textos), etiqueta))
+    return resultado
+
+# --- Búsqueda -------------------------------------------------------------
+
+class _LimiteAlcanzado(Exception):
+    pass
+
+class Demostrador:
+    """
+    Búsqueda de pruebas con profundización iterativa: cada ronda es una
+    búsqueda en profundidad en la que las reglas de encadenamiento y de
+    reducción al absurdo consumen un nivel de profundidad. La frontera (la
+    pila de subobjetivos abiertos) queda acotada por la profundidad máxima y
+    cada objetivo prueba como mucho max_candidatos fórmulas B para el absurdo.
+
+    Los subobjetivos se memorizan por (hipótesis, objetivo): las pruebas
+    encontradas se reutilizan y los fracasos se recuerdan con la profundidad
+    a la que fallaron. max_nodos y max_segundos detienen la búsqueda.
+    """
+
+    def __init__(self, max_profundidad=8, max_nodos=200000, max_segundos=10.0, max_candidatos=12):
+        self.max_profundidad = max_profundidad
+        self.max_nodos = max_nodos
+        self.max_segundos = max_segundos
+        self.max_candidatos = max_candidatos
+        self.probados = {}    # (hipótesis, objetivo) -> árbol de prueba
+        self.fallidos = {}    # (hipótesis, objetivo) -> mayor profundidad sin éxito
+        self.en_curso = set()
+        self.estadisticas = {
+            'nodos': 0,
+            'aciertos_memo': 0,
+            'podas_memo': 0,
+            'ciclos': 0,
+            'profundidad': 0,
+            'frontera_maxima': 0,
+        }
+
+    def _candidatos_absurdo(self, hipotesis, objetivo):
+        """
+        Fórmulas B para probar B y ~B: primero las negadas entre las hipótesis
+        (basta probar B), luego el resto de hipótesis (basta probar ~B) y por
+        último las subfórmulas del objetivo
+        """
+        vistos = {}
+        for formula in hipotesis:
+            if formula[0] == '~':
+                vistos.setdefault(formula[1], None)
+        for formula in hipotesis:
+            if formula[0] != '~':
+                vistos.setdefault(formula, None)
+        pila = [objetivo]
+        while pila:
+            formula = pila.pop()
+            vistos.setdefault(formula, None)
+            if formula[0] != 'v':
+                pila.extend(formula[1:])
+        return list(vistos)[:self.max_candidatos]
+
+    def _probar(self, hipotesis, objetivo, profundidad):
+        """
+        Árbol de prueba de hipotesis |- objetivo usando como mucho
+        `profundidad` niveles de encadenamiento o absurdo, o None.
+
+        La búsqueda no usa la pila de Python: cada subobjetivo en expansión
+        es un marco (generador de _expandir, clave, profundidad, ciclo previo)
+        de una pila explícita. El generador pide subobjetivos con yield y
+        recibe sus árboles (o None) con send.
+        """
+        marcos = []
+        arbol = self._abrir(marcos, hipotesis, objetivo, profundidad)
+        try:
+            while marcos:
+                expansion, clave, profundidad_marco, ciclo_previo = marcos[-1]
+                try:
+                    solicitud = expansion.send(arbol)
+                except StopIteration as fin:
+                    marcos.pop()
+                    arbol = self._cerrar(fin.value, clave, profundidad_marco, ciclo_previo)
+                    continue
+                # Si el subobjetivo necesita expandirse, su marco queda arriba y
+                # recibe None para empezar; si no, su árbol va al marco actual
+                arbol = self._abrir(marcos, *solicitud)
+        except BaseException:
+            for _, clave, _, _ in marcos:
+                self.en_curso.discard(clave)
+            raise
+        return arbol
+
+    def _abrir(self, marcos, hipotesis, objetivo, profundidad):
+        """
+        Resuelve el subobjetivo si es una hipótesis, un axioma o está en la
+        memoización y devuelve su árbol (o None si se descarta). En otro caso
+        apila su marco de expansión y devuelve None.
+        """
+        estadisticas = self.estadisticas
+        estadisticas['nodos'] += 1
+        if estadisticas['nodos'] >= self.max_nodos or time.perf_counter() > self.limite_tiempo:
+            raise _LimiteAlcanzado
+
+        if objetivo in hipotesis:
+            return ('HIP', objetivo)
+        esquema = esquema_forma(objetivo)
+        if esquema:
+            return ('AX', esquema, objetivo)
+
+        clave = (hipotesis, objetivo)
+        arbol = self.probados.get(clave)
+        if arbol is not None:
+            estadisticas['aciertos_memo'] += 1
+            return arbol
+        if self.fallidos.get(clave, -1) >= profundidad:
+            estadisticas['podas_memo'] += 1
+            return None
+        if clave in self.en_curso:
+            estadisticas['ciclos'] += 1
+            self.ciclo_cortado = True
+            return None
+
+        self.en_curso.add(clave)
+        estadisticas['frontera_maxima'] = max(estadisticas['frontera_maxima'], len(self.en_curso))
+        marcos.append((self._expandir(hipotesis, objetivo, profundidad), clave, profundidad, self.ciclo_cortado))
+        self.ciclo_cortado = False
+        return None
+
+    def _cerrar(self, arbol, clave, profundidad, ciclo_previo):
+        """
+        Memoriza el resultado de una expansión terminada y lo devuelve
+        """
+        self.en_curso.discard(clave)
+        if arbol is not None:
+            self.probados[clave] = arbol
+        elif not self.ciclo_cortado:
+            # Un fracaso por ciclo depende del camino actual: no se memoriza
+            self.fallidos[clave] = profundidad
+        self.ciclo_cortado = self.ciclo_cortado or ciclo_previo
+        return arbol
+
+    def _expandir(self, hipotesis, objetivo, profundidad):
+        # Generador: cada subobjetivo se pide con yield (hipótesis, objetivo,
+        # profundidad) y _probar devuelve su árbol o None.
+        # Teorema de la deducción (sin coste de profundidad); si falla se
+        # intentan las demás reglas, por ejemplo obtener A=>B de ~~(A=>B)
+        if objetivo[0] == '=>':
+            antecedente, consecuente = objetivo[1], objetivo[2]
+            subprueba = yield hipotesis | {antecedente}, consecuente, profundidad
+            if subprueba:
+                return ('DED', antecedente, subprueba, objetivo)
+
+        if profundidad == 0:
+            return None
+
+        # Encadenamiento hacia atrás desde hipótesis A1=>(A2=>...=>objetivo);
+        # una hipótesis ~~F también sirve como F (probándola antes por el absurdo)
+        for formula in hipotesis:
+            doble_negacion = formula[0] == '~' and formula[1][0] == '~'
+            fuente = formula[1][1] if doble_negacion else formula
+            antecedentes = []
+            cola = fuente
+            while cola[0] == '=>' and cola != objetivo:
+                antecedentes.append(cola[1])
+                cola = cola[2]
+            if cola != objetivo or not (antecedentes or doble_negacion):
+                continue
+            arbol = (yield hipotesis, fuente, profundidad - 1) if doble_negacion else ('HIP', formula)
+            if arbol is None:
+                continue
+            for antecedente in antecedentes:
+                prueba = yield hipotesis, antecedente, profundidad - 1
+                if prueba is None:
+                    break
+                arbol = ('MP', prueba, arbol, arbol[-1][2])
+            else:
+                return arbol
+
+        # Reducción al absurdo con A3: (~C=>~B)=>((~C=>B)=>C)
+        negado = _negacion(objetivo)
+        ampliadas = hipotesis | {negado}
+        for b in self._candidatos_absurdo(ampliadas, objetivo):
+            prueba_b = yield ampliadas, b, profundidad - 1
+            if prueba_b is None:
+                continue
+            prueba_no_b = yield ampliadas, _negacion(b), profundidad - 1
+            if prueba_no_b is None:
+                continue
+            no_c_no_b = _implicacion(negado, _negacion(b))
+            no_c_b = _implicacion(negado, b)
+            intermedia = _implicacion(no_c_b, objetivo)
+            axioma = ('AX', 'A3', _implicacion(no_c_no_b, intermedia))
+            paso = ('MP', ('DED', negado, prueba_no_b, no_c_no_b), axioma, intermedia)
+            return ('MP', ('DED', negado, prueba_b, no_c_b), paso, objetivo)
+        return None
+
+    def demostrar(self, objetivo, hipotesis=()):
+        """
+        Árbol de prueba de hipotesis |- objetivo (tuplas), o None si no se
+        encuentra dentro de los límites. estadisticas['limite'] indica si la
+        búsqueda se detuvo por nodos o por tiempo.
+        """
+        inicio = time.perf_counter()
+        self.limite_tiempo = inicio + self.max_segundos
+        self.ciclo_cortado = False
+        hipotesis = frozenset(hipotesis)
+        arbol = None
+        self.estadisticas['limite'] = None
+        try:
+            for profundidad in range(self.max_profundidad + 1):
+                self.estadisticas['profundidad'] = profundidad
+                arbol = self._probar(hipotesis, objetivo, profundidad)
+                if arbol is not None:
+                    break
+        except _LimiteAlcanzado:
+            self.estadisticas['limite'] = ('nodos' if self.estadisticas['nodos'] >= self.max_nodos
+                                           else 'tiempo')
+        except RecursionError:
+            self.estadisticas['limite'] = 'recursion'
+        self.estadisticas['segundos'] = time.perf_counter() - inicio
+        return arbol
+
+def _analizar_forma(expresion, unicas=None):
+    ast, _ = analizar_sintacticamente(expresion, construir_grafo=False)
+    if ast is None:
+        return None, None
+    return ast, forma_desde_ast(ast, unicas)
+
+def demostrar(expresion, hipotesis=None, max_profundidad=8, max_nodos=200000, max_segundos=10.0):
+    """
+    Busca una prueba en L de hipotesis |- expresion.
+
+    Antes de buscar se comprueba semánticamente (conteo de modelos) que la
+    fórmula es consecuencia de las hipótesis; si no lo es, no existe prueba
+    y la búsqueda no se intenta. La prueba encontrada se vuelve a comprobar
+    con verificar_prueba.
+
+    Devuelve None si alguna fórmula es inválida o, en otro caso, un
+    diccionario con 'demostrado', 'motivo', 'teorema' (texto en L, con las
+    abreviaturas ^, o y <=> expandidas), 'pasos' (lista de (texto,
+    justificación) para escribir_prueba), 'verificacion' y 'estadisticas'.
+    Las fórmulas demasiado anidadas para las comparaciones de tuplas de
+    Python se informan en 'motivo' en lugar de lanzar RecursionError.
+    """
+    hipotesis = list(hipotesis or [])
+    unicas = {}  # subfórmulas compartidas entre el objetivo y las hipótesis
+    ast, objetivo = _analizar_forma(expresion, unicas)
+    if ast is None:
+        return None
+    formas_hipotesis = []
+    for texto in hipotesis:
+        ast_hipotesis, forma = _analizar_forma(texto, unicas)
+        if ast_hipotesis is None:
+            return None
+        formas_hipotesis.append(forma)
+
+    resultado = {
+        'demostrado': False,
+        'motivo': None,
+        'teorema': None,
+        'pasos': [],
+        'verificacion': None,
+        'estadisticas': {},
+    }
+    if objetivo is None or None in formas_hipotesis:
+        resultado['motivo'] = "las constantes 0 y 1 no forman parte del sistema L"
+        return resultado
+    try:
+        resultado['teorema'] = texto_forma(objetivo)
+
+        # Prefiltro semántico: H1=>(H2=>...=>G) debe ser una tautología
+        consecuencia = objetivo
+        for forma in reversed(formas_hipotesis):
+            consecuencia = _implicacion(forma, consecuencia)
+        ast_consecuencia, _ = analizar_sintacticamente(texto_forma(consecuencia), construir_grafo=False)
+        modelos = contar_modelos(ast_consecuencia)
+        asignaciones = 1 << len(simbolos_formula(ast_consecuencia))
+        if modelos != asignaciones:
+            resultado['motivo'] = (f"no es una tautología ({modelos} de {asignaciones} asignaciones)"
+                                   if not hipotesis else "no es consecuencia semántica de las hipótesis")
+            return resultado
+
+        demostrador = Demostrador(max_profundidad, max_nodos, max_segundos)
+        arbol = demostrador.demostrar(objetivo, formas_hipotesis)
+        resultado['estadisticas'] = demostrador.estadisticas
+        if arbol is None:
+            limite = demostrador.estadisticas['limite']
+            resultado['motivo'] = (f"límite de {limite} alcanzado" if limite
+                                   else f"sin prueba hasta la profundidad {max_profundidad}")
+            return resultado
+
+        pasos = pasos_de_prueba(arbol)
+        textos_hipotesis = [texto_forma(forma) for forma in formas_hipotesis]
+        verificacion = verificar_prueba((f"{texto} ; {justificacion}" for texto, justificacion in pasos),
+                                        hipotesis=textos_hipotesis)
+        resultado['pasos'] = pasos
+        resultado['verificacion'] = verificacion
+        resultado['demostrado'] = verificacion['valida']
+        if not verificacion['valida']:
+            resultado['motivo'] = "la prueba generada no supera la verificación"
+        return resultado
+    except RecursionError:
+        resultado['demostrado'] = False
+        resultado['pasos'] = []
+        resultado['motivo'] = "la fórmula es demasiado profunda para el demostrador (límite de recursión)"
+    return resultado
+
+def generar_reporte_demostracion(resultado, mostrar_pasos=True):
+    """
+    Genera un reporte legible del resultado de demostrar
+    """
+    reporte = "\n=== DEMOSTRACIÓN AUTOMÁTICA ===\n"
+    if resultado['teorema']:
+        reporte += f"Teorema en L: {resultado['teorema']}\n"
+    if resultado['demostrado']:
+        reporte += f"Prueba encontrada: {len(resultado['pasos'])} pasos (verificada)\n"
+        if mostrar_pasos:
+            for numero, (texto, justificacion) in enumerate(resultado['pasos'], start=1):
+                reporte += f"  {numero:3}. {texto} ; {justificacion}\n"
+    else:
+        reporte += f"Sin prueba: {resultado['motivo']}\n"
+    estadisticas = resultado['estadisticas']
+    if estadisticas:
+        reporte += (f"Búsqueda: {estadisticas['nodos']} nodos, profundidad {estadisticas['profundidad']}, "
+                    f"frontera máxima {estadisticas['frontera_maxima']}, "
+                    f"memo {estadisticas['aciertos_memo']} aciertos / {estadisticas['podas_memo']} podas, "
+                    f"{estadisticas['ciclos']} ciclos, {estadisticas['segundos']:.3f} s\n")
+    return reporte
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2:
+        # Uso: python demostrador.py "formula" [hipótesis ...] [--salida prueba.txt]
+        argumentos = sys.argv[1:]
+        salida = None
+        if '--salida' in argumentos:
+            posicion = argumentos.index('--salida')
+            salida = argumentos[posicion + 1] if posicion + 1 < len(argumentos) else None
+            del argumentos[posicion:posicion + 2]
+        resultado = demostrar(argumentos[0], argumentos[1:])
+        if resultado is None:
+            sys.exit(2)
+        print(generar_reporte_demostracion(resultado))
+        if salida and resultado['demostrado']:
+            escribir_prueba(salida, resultado['pasos'], f"|- {resultado['teorema']}")
+            print(f"Prueba escrita en {salida}")
+        sys.exit(0 if resultado['demostrado'] else 1)
+
+    teoremas = [
+        "p=>p",
+        "~~p=>p",
+        "p=>~~p",
+        "~p=>(p=>q)",
+        "(~q=>~p)=>(p=>q)",
+        "(p=>q)=>(~q=>~p)",
+        "(p=>q)=>((q=>r)=>(p=>r))",
+        "(~p=>p)=>p",
+        "((p=>q)=>p)=>p",
+        "(p=>q)=>((~p=>q)=>q)",
+        "(p^q)=>p",
+        "po~p",
+    ]
+    print("=== DEMOSTRACIÓN DE TEOREMAS DEL SISTEMA L ===")
+    encontrados = 0
+    for expr in teoremas:
+        resultado = demostrar(expr)
+        estadisticas = resultado['estadisticas']
+        estado = (f"{len(resultado['pasos']):4} pasos" if resultado['demostrado']
+                  else f"sin prueba ({resultado['motivo']})")
+        print(f"{expr:28} {estado}  [{estadisticas.get('nodos', 0)} nodos, "
+              f"{estadisticas.get('segundos', 0):.3f} s]")
+        encontrados += resultado['demostrado']
+    print(f"\nTeoremas demostrados y verificados: {encontrados}/{len(teoremas)}")
+
+    print(generar_reporte_demostracion(demostrar("~~p=>p")))
+    print(generar_reporte_demostracion(demostrar("r", ["p", "p=>q", "q=>r"])))
+
+    # Tautologías aleatorias: toda prueba encontrada debe superar la verificación
+    from gramatica_sistema_L import generar_formula_aleatoria
+    generador = random.Random(38)
+    intentos = encontradas = 0
+    while intentos < 100:
+        expr = generar_formula_aleatoria(generador, generador.randint(3, 20), prob_parentesis=0.5)
+        ast, forma = _analizar_forma(expr)
+        if forma is None or contar_modelos(ast) != 1 << len(simbolos_formula(ast)):
+            continue
+        intentos += 1
+        resultado = demostrar(expr, max_segundos=2.0)
+        encontradas += resultado['demostrado']
+    print(f"Tautologías aleatorias demostradas y verificadas: {encontradas}/{intentos}\n")
+
+    # Fórmulas muy anidadas: la búsqueda y la traducción no usan la pila de Python
+    print("--- Fórmulas profundas ---")
+    for expr in ["~" * 2000 + "p=>" + "~" * 2000 + "p", "(p=>" * 300 + "p" + ")" * 300]:
+        resultado = demostrar(expr)
+        estado = (f"{len(resultado['pasos'])} pasos" if resultado['demostrado']
+                  else f"sin prueba ({resultado['motivo']})")
+        print(f"{len(expr)} caracteres: {estado}")
+    print()
+
+    print("--- Fórmulas sin prueba ---")
+    for expr in ["p=>q", "(p=>q)=>p", "1=>p"]:
+        print(generar_reporte_demostracion(demostrar(expr)))
@@ -0,0 +1,246 @@
+# Estadísticas de Fórmulas del Sistema L
+# Tamaño, profundidad, anchura por nivel, operadores, variables y cadenas de
+# negaciones en un único recorrido iterativo del árbol, sin construir grafos
+
+import contextlib
+import io
+import sys
+from analizador_sintactico import NodoAST, ambito_simbolos, analizar_sintacticamente
+
+def estadisticas_formula(ast):
+    """
+    Estadísticas del árbol en un solo recorrido con pila explícita:
+      - nodos, aristas (nodos - 1, como el grafo del árbol) y hojas
+      - profundidad (la raíz está en el nivel 0) y anchura de cada nivel
+      - histograma de operadores por símbolo y de constantes por valor
+      - apariciones de cada variable, en orden de primera aparición
+      - histograma de longitudes de las cadenas maximales de negaciones (~~~p
+        es una cadena de longitud 3)
+    """
+    nodos = hojas = 0
+    anchura = []
+    operadores = {}
+    constantes = {}
+    variables = {}
+    cadenas_negacion = {}
+    # (nodo, nivel, negaciones consecutivas justo encima del nodo)
+    pila = [(ast, 0, 0)]
+    while pila:
+        nodo, nivel, negaciones = pila.pop()
+        nodos += 1
+        if nivel == len(anchura):
+            anchura.append(0)
+        anchura[nivel] += 1
+        hijos = nodo.hijos
+        if not hijos:
+            hojas += 1
+            if nodo.tipo == 'VARIABLE':
+                variables[nodo.valor] = variables.get(nodo.valor, 0) + 1
+            else:
+                constantes[nodo.valor] = constantes.get(nodo.valor, 0) + 1
+        else:
+            operadores[nodo.valor] = operadores.get(nodo.valor, 0) + 1
+        if nodo.tipo == 'NEGACION':
+            negaciones += 1
+            if hijos[0].tipo != 'NEGACION':
+                cadenas_negacion[negaciones] = cadenas_negacion.get(negaciones, 0) + 1
+        else:
+            negaciones = 0
+        for hijo in reversed(hijos):
+            pila.append((hijo, nivel + 1, negaciones))
+
+    return {
+        'nodos': nodos,
+        'aristas': nodos - 1,
+        'hojas': hojas,
+        'profundidad': len(anchura) - 1,
+        'anchura_por_nivel': anchura,
+        'anchura_maxima': max(anchura),
+        'operadores': operadores,
+        'constantes': constantes,
+        'variables': variables,
+        'cadenas_negacion': dict(sorted(cadenas_negacion.items())),
+    }
+
+def estadisticas_expresion(expresion):
+    """
+    Analiza la expresión (motor Pratt, sin grafo) y devuelve sus estadísticas,
+    o None si es inválida
+    """
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+    if ast is None:
+        return None
+    return estadisticas_formula(ast)
+
+def _sumar(destino, origen):
+    for clave, cantidad in origen.items():
+        destino[clave] = destino.get(clave, 0) + cantidad
+
+class EstadisticasCorpus:
+    """
+    Acumula las estadísticas de muchas fórmulas sin guardarlas: solo se
+    conservan totales, extremos e histogramas, así que la memoria no crece
+    con el tamaño del corpus.
+    """
+
+    def __init__(self):
+        self.formulas = 0
+        self.invalidas = 0
+        self.nodos = 0
+        self.nodos_minimo = None
+        self.nodos_maximo = 0
+        self.profundidad_maxima = 0
+        self.profundidades = {}     # profundidad -> número de fórmulas
+        self.anchura_por_nivel = [] # suma de anchuras de cada nivel
+        self.operadores = {}
+        self.constantes = {}
+        self.variables = {}
+        self.cadenas_negacion = {}
+
+    def agregar(self, estadisticas):
+        """
+        Incorpora las estadísticas de una fórmula (o None si era inválida)
+        """
+        if estadisticas is None:
+            self.invalidas += 1
+            return
+        nodos = estadisticas['nodos']
+        profundidad = estadisticas['profundidad']
+        self.formulas += 1
+        self.nodos += nodos
+        self.nodos_minimo = nodos if self.nodos_minimo is None else min(self.nodos_minimo, nodos)
+        self.nodos_maximo = max(self.nodos_maximo, nodos)
+        self.profundidad_maxima = max(self.profundidad_maxima, profundidad)
+        self.profundidades[profundidad] = self.profundidades.get(profundidad, 0) + 1
+        anchura = self.anchura_por_nivel
+        for nivel, cantidad in enumerate(estadisticas['anchura_por_nivel']):
+            if nivel == len(anchura):
+                anchura.append(0)
+            anchura[nivel] += cantidad
+        _sumar(self.operadores, estadisticas['operadores'])
+        _sumar(self.constantes, estadisticas['constantes'])
+        _sumar(self.variables, estadisticas['variables'])
+        _sumar(self.cadenas_negacion, estadisticas['cadenas_negacion'])
+
+    def resumen(self):
+        """
+        Diccionario con los agregados del corpus
+        """
+        return {
+            'formulas': self.formulas,
+            'invalidas': self.invalidas,
+            'nodos': self.nodos,
+            'nodos_minimo': self.nodos_minimo,
+            'nodos_maximo': self.nodos_maximo,
+            'nodos_promedio': self.nodos / self.formulas if self.formulas else 0,
+            'profundidad_maxima': self.profundidad_maxima,
+            'profundidades': dict(sorted(self.profundidades.items())),
+            'anchura_media_por_nivel': [cantidad / self.formulas for cantidad in self.anchura_por_nivel],
+            'operadores': self.operadores,
+            'constantes': self.constantes,
+            'variables': self.variables,
+            'cadenas_negacion': dict(sorted(self.cadenas_negacion.items())),
+        }
+
+def estadisticas_corpus(fuente):
+    """
+    Recorre un corpus en flujo y devuelve su EstadisticasCorpus. Cada elemento
+    puede ser el texto de una fórmula (por ejemplo, las líneas de un archivo;
+    se ignoran las vacías), un NodoAST o un par (texto, ast) como los que
+    produce AlmacenCorpus al iterarlo. Los textos se analizan dentro de
+    ambito_simbolos(): sus nombres de variable no se acumulan en la tabla.
+    """
+    corpus = EstadisticasCorpus()
+    for elemento in fuente:
+        if isinstance(elemento, tuple):
+            elemento = elemento[1]
+        if isinstance(elemento, NodoAST):
+            corpus.agregar(estadisticas_formula(elemento))
+            continue
+        elemento = elemento.strip()
+        if not elemento:
+            continue
+        # Los errores de las líneas inválidas solo se cuentan
+        with contextlib.redirect_stdout(io.StringIO()), ambito_simbolos():
+            estadisticas = estadisticas_expresion(elemento)
+        corpus.agregar(estadisticas)
+    return corpus
+
+def estadisticas_archivo(ruta):
+    """
+    Estadísticas de un archivo de fórmulas (una por línea) leído línea a línea
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return estadisticas_corpus(f)
+
+def _histograma(conteos):
+    return ", ".join(f"{clave}: {cantidad}" for clave, cantidad in conteos.items()) or "-"
+
+def generar_reporte_estadisticas(estadisticas, expresion=None):
+    """
+    Genera un reporte legible de las estadísticas de una fórmula
+    """
+    reporte = "\n=== ESTADÍSTICAS DE LA FÓRMULA ===\n"
+    if expresion:
+        reporte += f"Expresión: {expresion}\n"
+    reporte += f"Nodos: {estadisticas['nodos']}  Aristas: {estadisticas['aristas']}  Hojas: {estadisticas['hojas']}\n"
+    reporte += f"Profundidad: {estadisticas['profundidad']}  Anchura máxima: {estadisticas['anchura_maxima']}\n"
+    reporte += "Anchura por nivel: " + " ".join(str(a) for a in estadisticas['anchura_por_nivel']) + "\n"
+    reporte += f"Operadores: {_histograma(estadisticas['operadores'])}\n"
+    reporte += f"Constantes: {_histograma(estadisticas['constantes'])}\n"
+    reporte += f"Variables: {_histograma(estadisticas['variables'])}\n"
+    reporte += f"Cadenas de negaciones (longitud: cantidad): {_histograma(estadisticas['cadenas_negacion'])}\n"
+    return reporte
+
+def generar_reporte_corpus(corpus):
+    """
+    Genera un reporte legible de un EstadisticasCorpus
+    """
+    resumen = corpus.resumen()
+    reporte = "\n=== ESTADÍSTICAS DEL CORPUS ===\n"
+    reporte += f"Fórmulas: {resumen['formulas']} válidas, {resumen['invalidas']} inválidas\n"
+    reporte += (f"Nodos: {resumen['nodos']} en total, mínimo {resumen['nodos_minimo']}, "
+                f"máximo {resumen['nodos_maximo']}, promedio {resumen['nodos_promedio']:.1f}\n")
+    reporte += f"Profundidad máxima: {resumen['profundidad_maxima']}\n"
+    reporte += f"Operadores: {_histograma(resumen['operadores'])}\n"
+    reporte += f"Constantes: {_histograma(resumen['constantes'])}\n"
+    reporte += f"Variables distintas: {len(resumen['variables'])}\n"
+    reporte += f"Cadenas de negaciones (longitud: cantidad): {_histograma(resumen['cadenas_negacion'])}\n"
+    return reporte
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2:
+        # Uso: python estadisticas_formula.py corpus.txt
+        print(generar_reporte_corpus(estadisticas_archivo(sys.argv[1])))
+        sys.exit(0)
+
+    expresiones_prueba = [
+        "p",
+        "~~~q",
+        "(p^q)",
+        "(0=>(ros))",
+        "~(p^~~q)",
+        "((p=>q)^p)",
+        "(x_1^x_2)=>x_10",
+    ]
+    for expr in expresiones_prueba:
+        print(generar_reporte_estadisticas(estadisticas_expresion(expr), expr))
+
+    # Las cuentas deben coincidir con las del grafo de networkx
+    import random
+    from gramatica_sistema_L import generar_formula_aleatoria
+
+    generador = random.Random(42)
+    corpus = EstadisticasCorpus()
+    coincidencias = pruebas = 0
+    for _ in range(500):
+        expr = generar_formula_aleatoria(generador, generador.randint(1, 80), prob_parentesis=0.5)
+        ast, grafo = analizar_sintacticamente(expr)
+        estadisticas = estadisticas_formula(ast)
+        corpus.agregar(estadisticas)
+        pruebas += 1
+        coincidencias += (estadisticas['nodos'] == grafo.number_of_nodes()
+                          and estadisticas['aristas'] == grafo.number_of_edges()
+                          and sum(estadisticas['anchura_por_nivel']) == estadisticas['nodos'])
+    print(f"Coincidencias con el grafo de networkx: {coincidencias}/{pruebas}")
+    print(generar_reporte_corpus(corpus))
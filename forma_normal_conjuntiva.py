@@ -0,0 +1,191 @@
+# Forma Normal Conjuntiva para el Sistema L
+# Transformación de Tseitin de un árbol sintáctico a cláusulas (estilo DIMACS)
+
+from analizador_sintactico import analizar_sintacticamente, tabla_simbolos
+
+class FormulaCNF:
+    """
+    Conjunto de cláusulas sobre variables numeradas desde 1. Cada cláusula es
+    una tupla de literales (entero positivo o negativo, como en DIMACS).
+    Las variables de la fórmula original ocupan los primeros números y las
+    auxiliares de Tseitin los siguientes.
+    """
+
+    def __init__(self):
+        self.clausulas = []
+        self.variables = {}   # nombre de variable proposicional -> número
+        self.por_simbolo = {} # símbolo de la tabla de símbolos -> número
+        self.nombres = [None] # número -> nombre (None para las auxiliares)
+        self.raiz = None      # literal equivalente a la fórmula completa
+
+    @property
+    def num_variables(self):
+        return len(self.nombres) - 1
+
+    @property
+    def num_originales(self):
+        return len(self.variables)
+
+    def nueva_variable(self, nombre=None):
+        self.nombres.append(nombre)
+        return len(self.nombres) - 1
+
+    def agregar_clausula(self, literales):
+        clausula = normalizar_clausula(literales)
+        if clausula is not None:
+            self.clausulas.append(clausula)
+
+    def __repr__(self):
+        return (f"FormulaCNF({self.num_variables} variables "
+                f"({self.num_originales} originales), {len(self.clausulas)} cláusulas)")
+
+def normalizar_clausula(literales):
+    """
+    Cláusula como tupla ordenada por variable sin literales repetidos, o None
+    si es una tautología (contiene un literal y su opuesto)
+    """
+    clausula = tuple(sorted(set(literales), key=abs))
+    if any(-literal in clausula for literal in clausula):
+        return None
+    return clausula
+
+def simbolos_formula(ast):
+    """
+    Símbolos (enteros de la tabla de símbolos) de las variables del árbol en orden de aparición
+    """
+    vistos = {}
+    pila = [ast]
+    while pila:
+        nodo = pila.pop()
+        if nodo.tipo == 'VARIABLE':
+            vistos.setdefault(nodo.simbolo, None)
+        pila.extend(reversed(nodo.hijos))
+    return list(vistos)
+
+def variables_formula(ast):
+    """
+    Nombres de las variables proposicionales del árbol en orden de aparición
+    """
+    return [tabla_simbolos.nombres[simbolo] for simbolo in simbolos_formula(ast)]
+
+def cnf_tseitin(ast):
+    """
+    Transformación de Tseitin: cada subfórmula binaria recibe una variable
+    auxiliar g con las cláusulas de g <=> (a op b); la negación no necesita
+    variable (se usa el literal opuesto). Las subfórmulas estructuralmente
+    iguales comparten su variable auxiliar.
+    Como las definiciones son equivalencias, cada asignación de las variables
+    originales se extiende de forma única a las auxiliares: la CNF tiene tantos
+    modelos como la fórmula y es equisatisfacible con ella.
+    """
+    cnf = FormulaCNF()
+    for simbolo in simbolos_formula(ast):
+        nombre = tabla_simbolos.nombres[simbolo]
+        cnf.variables[nombre] = cnf.por_simbolo[simbolo] = cnf.nueva_variable(nombre)
+    cnf.clausulas.extend(clausulas_tseitin(ast, cnf))
+    return cnf
+
+def clausulas_tseitin(ast, cnf):
+    """
+    Genera una a una las cláusulas de Tseitin del árbol (ya normalizadas, la
+    última es la cláusula unitaria de la raíz) sin guardarlas. cnf solo
+    necesita por_simbolo con el número de cada variable original,
+    nueva_variable() para las auxiliares y el atributo raiz, que se asigna al
+    terminar; sirve una FormulaCNF o cualquier objeto equivalente.
+    """
+    # Las subfórmulas se identifican por (tipo, valor, claves de los hijos),
+    # con una clave entera por subfórmula distinta; los hijos dejan su
+    # (clave, literal) en una pila de valores, así que la memoria solo crece
+    # con la profundidad y con el número de subfórmulas distintas
+    subformulas = {}  # (tipo, valor, claves de los hijos) -> (clave, literal)
+    valores = []
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if not visitado and nodo.hijos:
+            pila.append((nodo, True))
+            pila.extend((hijo, False) for hijo in nodo.hijos)
+            continue
+
+        # Los hijos se apilan de izquierda a derecha y se procesan de derecha
+        # a izquierda: en la pila de valores el izquierdo queda arriba
+        if not nodo.hijos:
+            identificador = (nodo.tipo, nodo.simbolo if nodo.tipo == 'VARIABLE' else nodo.valor)
+        elif nodo.tipo == 'NEGACION':
+            clave_a, a = valores.pop()
+            identificador = (nodo.tipo, clave_a)
+        else:
+            clave_a, a = valores.pop()
+            clave_b, b = valores.pop()
+            identificador = (nodo.tipo, clave_a, clave_b)
+        conocida = subformulas.get(identificador)
+        if conocida is not None:
+            valores.append(conocida)
+            continue
+
+        if nodo.tipo == 'VARIABLE':
+            literal = cnf.por_simbolo[nodo.simbolo]
+        elif nodo.tipo == 'CONSTANTE':
+            literal = cnf.nueva_variable()
+            yield (literal if nodo.valor == 1 else -literal,)
+        elif nodo.tipo == 'NEGACION':
+            literal = -a
+        else:
+            g = literal = cnf.nueva_variable()
+            if nodo.tipo == 'CONJUNCION':
+                definicion = [(-g, a), (-g, b), (g, -a, -b)]
+            elif nodo.tipo == 'DISYUNCION':
+                definicion = [(g, -a), (g, -b), (-g, a, b)]
+            elif nodo.tipo == 'IMPLICACION':
+                definicion = [(g, a), (g, -b), (-g, -a, b)]
+            else:  # BICONDICIONAL
+                definicion = [(-g, -a, b), (-g, a, -b), (g, a, b), (g, -a, -b)]
+            for clausula in definicion:
+                clausula = normalizar_clausula(clausula)
+                if clausula is not None:
+                    yield clausula
+        subformulas[identificador] = (len(subformulas), literal)
+        valores.append(subformulas[identificador])
+
+    cnf.raiz = valores.pop()[1]
+    yield (cnf.raiz,)
+
+def cnf_expresion(expresion):
+    """
+    Analiza una expresión y devuelve su FormulaCNF, o None si es inválida
+    """
+    ast, _ = analizar_sintacticamente(expresion, construir_grafo=False)
+    if ast is None:
+        return None
+    return cnf_tseitin(ast)
+
+def formatear_clausulas(cnf):
+    """
+    Representación legible de las cláusulas con los nombres de las variables
+    (las auxiliares se muestran como g<número>)
+    """
+    def literal_texto(literal):
+        nombre = cnf.nombres[abs(literal)] or f"g{abs(literal)}"
+        return f"~{nombre}" if literal < 0 else nombre
+
+    return "\n".join("(" + " o ".join(literal_texto(l) for l in clausula) + ")"
+                     for clausula in cnf.clausulas)
+
+if __name__ == "__main__":
+    expresiones_prueba = [
+        "p",
+        "~~~q",
+        "(p^q)",
+        "(p<=>~p)",
+        "((p=>q)^p)",
+        "((p^q)o(p^q))",
+        "(1=>p)",
+        "(x_1^x_2)=>x_10",
+    ]
+
+    print("=== FORMA NORMAL CONJUNTIVA (TSEITIN) ===")
+    for expr in expresiones_prueba:
+        cnf = cnf_expresion(expr)
+        print(f"\n--- Expresión: {expr} ---")
+        print(cnf)
+        print(formatear_clausulas(cnf))
@@ -0,0 +1,351 @@
+# Formato DIMACS para el Sistema L
+# Escritura en flujo de la CNF de Tseitin en formato DIMACS (con un archivo de
+# mapa de variables) y lectura de los modelos que devuelven los resolutores SAT
+
+import gzip
+import sys
+from analizador_sintactico import NodoAST, analizar_sintacticamente, tabla_simbolos
+from forma_normal_conjuntiva import clausulas_tseitin, simbolos_formula
+
+# Ancho fijo de los números del encabezado: se escribe relleno y se corrige al final
+ANCHO_ENCABEZADO = 20
+LINEAS_POR_BLOQUE = 4096
+TAM_BLOQUE_LECTURA = 1 << 20
+
+ESTADOS_RESOLUTOR = {
+    'SATISFIABLE': 'SATISFACIBLE',
+    'SAT': 'SATISFACIBLE',
+    'UNSATISFIABLE': 'INSATISFACIBLE',
+    'UNSAT': 'INSATISFACIBLE',
+    'UNKNOWN': 'DESCONOCIDO',
+    'INDET': 'DESCONOCIDO',
+}
+
+class _Numeracion:
+    # Numeración de variables para clausulas_tseitin sin guardar las cláusulas
+    # ni un nombre por cada variable auxiliar
+    def __init__(self, ast):
+        self.nombres = []
+        self.por_simbolo = {}
+        for simbolo in simbolos_formula(ast):
+            self.nombres.append(tabla_simbolos.nombres[simbolo])
+            self.por_simbolo[simbolo] = len(self.nombres)
+        self.num_variables = len(self.nombres)
+        self.raiz = None
+
+    def nueva_variable(self):
+        self.num_variables += 1
+        return self.num_variables
+
+def _encabezado(variables, clausulas):
+    return f"p cnf {variables:>{ANCHO_ENCABEZADO}} {clausulas:>{ANCHO_ENCABEZADO}}\n"
+
+def _escribir_clausulas(flujo, clausulas):
+    bloque = []
+    cantidad = 0
+    for clausula in clausulas:
+        bloque.append(" ".join(map(str, clausula)) + " 0\n")
+        cantidad += 1
+        if len(bloque) >= LINEAS_POR_BLOQUE:
+            flujo.write("".join(bloque))
+            bloque.clear()
+    flujo.write("".join(bloque))
+    return cantidad
+
+def escribir_dimacs(ast, flujo, comentarios=(), dos_pasadas=None):
+    """
+    Escribe la CNF de Tseitin del árbol en formato DIMACS sobre un flujo de
+    texto, generando las cláusulas una a una sin guardarlas. Las variables
+    originales son 1..k en orden de aparición y las auxiliares las siguientes.
+    El número de variables y cláusulas solo se conoce al terminar:
+      - si el flujo admite volver atrás, se escribe un encabezado de ancho fijo
+        y se corrige al final
+      - si no (gzip, salida estándar) o con dos_pasadas=True, se generan las
+        cláusulas dos veces: la primera solo para contarlas
+    Devuelve {'variables', 'clausulas', 'originales' (nombres de 1..k), 'raiz'}.
+    """
+    if dos_pasadas is None:
+        dos_pasadas = not flujo.seekable()
+    for comentario in comentarios:
+        flujo.write(f"c {comentario}\n")
+
+    if dos_pasadas:
+        numeracion = _Numeracion(ast)
+        cantidad = sum(1 for _ in clausulas_tseitin(ast, numeracion))
+        flujo.write(_encabezado(numeracion.num_variables, cantidad))
+        numeracion = _Numeracion(ast)
+        _escribir_clausulas(flujo, clausulas_tseitin(ast, numeracion))
+    else:
+        numeracion = _Numeracion(ast)
+        posicion = flujo.tell()
+        flujo.write(_encabezado(0, 0))
+        cantidad = _escribir_clausulas(flujo, clausulas_tseitin(ast, numeracion))
+        final = flujo.tell()
+        flujo.seek(posicion)
+        flujo.write(_encabezado(numeracion.num_variables, cantidad))
+        flujo.seek(final)
+
+    return {
+        'variables': numeracion.num_variables,
+        'clausulas': cantidad,
+        'originales': numeracion.nombres,
+        'raiz': numeracion.raiz,
+    }
+
+def escribir_mapa_variables(originales, flujo):
+    """
+    Mapa de variables: una línea "número nombre" por variable original
+    """
+    flujo.write("c variable DIMACS -> variable proposicional del Sistema L\n")
+    for numero, nombre in enumerate(originales, start=1):
+        flujo.write(f"{numero} {nombre}\n")
+
+def _abrir(archivo, modo, comprimir=None):
+    if comprimir is None:
+        comprimir = archivo.endswith('.gz')
+    if comprimir:
+        return gzip.open(archivo, modo + 't', encoding='utf-8', compresslevel=6), True
+    return open(archivo, modo, encoding='utf-8', buffering=1 << 20), False
+
+def exportar_dimacs(fuente, archivo, archivo_mapa=None, comprimir=None):
+    """
+    Exporta la CNF de una expresión (texto o NodoAST) a un archivo DIMACS,
+    comprimido con gzip si termina en .gz, y su mapa de variables a
+    archivo_mapa (por defecto archivo + '.map'). Devuelve el resumen de
+    escribir_dimacs, o None si la expresión es inválida.
+    """
+    expresion = None
+    if isinstance(fuente, NodoAST):
+        ast = fuente
+    else:
+        expresion = fuente
+        ast, _ = analizar_sintacticamente(fuente, motor='pratt', construir_grafo=False)
+        if ast is None:
+            return None
+    comentarios = ["CNF de Tseitin generada por el Sistema L"]
+    if expresion is not None and len(expresion) <= 200:
+        comentarios.append(f"expresion: {expresion}")
+
+    flujo, comprimido = _abrir(archivo, 'w', comprimir)
+    with flujo:
+        resumen = escribir_dimacs(ast, flujo, comentarios, dos_pasadas=comprimido)
+    archivo_mapa = archivo_mapa or archivo + '.map'
+    with open(archivo_mapa, 'w', encoding='utf-8') as f:
+        escribir_mapa_variables(resumen['originales'], f)
+    print(f"CNF exportada en formato DIMACS: {archivo} "
+          f"({resumen['variables']} variables, {resumen['clausulas']} cláusulas)")
+    print(f"Mapa de variables: {archivo_mapa}")
+    return resumen
+
+def leer_mapa_variables(archivo_mapa):
+    """
+    Lee un mapa de variables: {número DIMACS: nombre}
+    """
+    mapa = {}
+    with open(archivo_mapa, 'r', encoding='utf-8') as f:
+        for linea in f:
+            partes = linea.split()
+            if len(partes) == 2 and partes[0] != 'c':
+                mapa[int(partes[0])] = partes[1]
+    return mapa
+
+def _tokens(flujo, tam_bloque=TAM_BLOQUE_LECTURA):
+    """
+    Genera (token, es el primero de su línea) leyendo por bloques, de modo que
+    una línea con millones de literales no se carga entera en memoria
+    """
+    resto = ''
+    inicio = True
+    while True:
+        bloque = flujo.read(tam_bloque)
+        if not bloque:
+            break
+        texto = resto + bloque
+        # El último token puede continuar en el bloque siguiente
+        corte = len(texto)
+        while corte and not texto[corte - 1].isspace():
+            corte -= 1
+        resto = texto[corte:]
+        piezas = texto[:corte].split('\n')
+        for indice, pieza in enumerate(piezas):
+            if indice:
+                inicio = True
+            for token in pieza.split():
+                yield token, inicio
+                inicio = False
+    for token in resto.split():
+        yield token, inicio
+        inicio = False
+
+def leer_dimacs(flujo):
+    """
+    Genera las cláusulas (tuplas de literales) de un archivo DIMACS abierto
+    """
+    clausula = []
+    comentario = False
+    for token, inicio in _tokens(flujo):
+        if inicio:
+            comentario = token in ('c', 'p')
+        if comentario:
+            continue
+        literal = int(token)
+        if literal == 0:
+            yield tuple(clausula)
+            clausula = []
+        else:
+            clausula.append(literal)
+
+def leer_modelo(flujo, mapa, tam_bloque=TAM_BLOQUE_LECTURA):
+    """
+    Lee la salida de un resolutor SAT y devuelve el modelo con los nombres del
+    Sistema L. Acepta el formato de las competiciones SAT ("s SATISFIABLE" y
+    líneas "v ... 0") y el de MiniSat ("SAT" y una línea de literales).
+    Solo se guardan los valores de las variables del mapa (las auxiliares de
+    Tseitin se descartan al leerlas), así que la memoria no depende del número
+    de literales. Devuelve {'estado', 'asignacion': {nombre: bool},
+    'literales': literales leídos}, o None si la salida no es válida.
+    """
+    estado = 'DESCONOCIDO'
+    asignacion = {}
+    literales = 0
+    linea = None
+    for token, inicio in _tokens(flujo, tam_bloque):
+        if inicio:
+            mayusculas = token.upper()
+            if token in ('c', 's', 'v'):
+                linea = token
+                continue
+            if mayusculas in ESTADOS_RESOLUTOR:
+                estado = ESTADOS_RESOLUTOR[mayusculas]
+                linea = None
+                continue
+            # Línea de literales sin prefijo (MiniSat)
+            linea = 'v'
+        if linea == 's':
+            estado = ESTADOS_RESOLUTOR.get(token.upper(), estado)
+        elif linea == 'v':
+            try:
+                literal = int(token)
+            except ValueError:
+                print(f"Literal inválido en la salida del resolutor: {token!r}")
+                return None
+            if literal:
+                literales += 1
+                nombre = mapa.get(abs(literal))
+                if nombre is not None:
+                    asignacion[nombre] = literal > 0
+    return {'estado': estado, 'asignacion': asignacion, 'literales': literales}
+
+def leer_modelo_archivo(archivo_modelo, archivo_mapa):
+    """
+    Lee el modelo de un archivo de salida del resolutor usando el mapa de variables
+    """
+    mapa = leer_mapa_variables(archivo_mapa)
+    flujo, _ = _abrir(archivo_modelo, 'r')
+    with flujo:
+        return leer_modelo(flujo, mapa)
+
+def generar_reporte_modelo(modelo, max_variables=50):
+    """
+    Genera un reporte legible de un modelo leído
+    """
+    reporte = "\n=== MODELO DEL RESOLUTOR ===\n"
+    reporte += f"Estado: {modelo['estado']}\n"
+    if modelo['estado'] == 'SATISFACIBLE':
+        reporte += (f"Literales leídos: {modelo['literales']}, "
+                    f"variables del Sistema L: {len(modelo['asignacion'])}\n")
+        for indice, (nombre, valor) in enumerate(modelo['asignacion'].items()):
+            if indice == max_variables:
+                reporte += f"  ... ({len(modelo['asignacion']) - max_variables} más)\n"
+                break
+            reporte += f"  {nombre} = {1 if valor else 0}\n"
+    return reporte
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2:
+        if sys.argv[1] == '--modelo' and len(sys.argv) == 4:
+            # Uso: python formato_dimacs.py --modelo formula.cnf.map salida_resolutor.txt
+            modelo = leer_modelo_archivo(sys.argv[3], sys.argv[2])
+            if modelo is None:
+                sys.exit(1)
+            print(generar_reporte_modelo(modelo))
+            sys.exit(0)
+        if len(sys.argv) == 3:
+            # Uso: python formato_dimacs.py "expresión" formula.cnf[.gz]
+            sys.exit(0 if exportar_dimacs(sys.argv[1], sys.argv[2]) else 1)
+        print("Uso: python formato_dimacs.py \"expresión\" formula.cnf | "
+              "--modelo formula.cnf.map salida_resolutor.txt")
+        sys.exit(1)
+
+    import contextlib
+    import io
+    import os
+    import random
+    import tempfile
+    from conteo_modelos import evaluar_formula
+    from forma_normal_conjuntiva import cnf_tseitin
+    from gramatica_sistema_L import generar_formula_aleatoria
+
+    print("=== EXPORTACIÓN DIMACS ===")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "formula.cnf")
+        exportar_dimacs("((p=>q)^p)=>q", ruta)
+        with open(ruta, encoding='utf-8') as f:
+            print(f.read())
+        with open(ruta + '.map', encoding='utf-8') as f:
+            print(f.read())
+
+        # Lo escrito (con el encabezado corregido y en dos pasadas con gzip)
+        # debe ser exactamente la CNF de cnf_tseitin
+        generador = random.Random(47)
+        pruebas = correctas = 0
+        for indice in range(300):
+            expr = generar_formula_aleatoria(generador, generador.randint(1, 80), prob_parentesis=0.5)
+            ast, _ = analizar_sintacticamente(expr, motor='pratt', construir_grafo=False)
+            cnf = cnf_tseitin(ast)
+            ruta = os.path.join(directorio, "prueba.cnf" + (".gz" if indice % 2 else ""))
+            with contextlib.redirect_stdout(io.StringIO()):
+                exportar_dimacs(ast, ruta)
+            flujo, _ = _abrir(ruta, 'r')
+            with flujo:
+                encabezado = [linea for linea in flujo if linea.startswith('p ')][0].split()
+                flujo.seek(0)
+                clausulas = list(leer_dimacs(flujo))
+            pruebas += 1
+            correctas += (clausulas == cnf.clausulas
+                          and encabezado == ['p', 'cnf', str(cnf.num_variables), str(len(cnf.clausulas))]
+                          and leer_mapa_variables(ruta + '.map') == {
+                              numero: nombre for nombre, numero in cnf.variables.items()})
+        print(f"Archivos DIMACS idénticos a cnf_tseitin: {correctas}/{pruebas}")
+
+    print("\n=== LECTURA DE MODELOS ===")
+    # Salidas simuladas de un resolutor para asignaciones que satisfacen la
+    # fórmula, con variables auxiliares de relleno y bloques de lectura
+    # diminutos para partir los literales entre bloques
+    generador = random.Random(7)
+    pruebas = correctas = 0
+    while pruebas < 200:
+        expr = generar_formula_aleatoria(generador, generador.randint(1, 30))
+        ast, _ = analizar_sintacticamente(expr, motor='pratt', construir_grafo=False)
+        cnf = cnf_tseitin(ast)
+        valores = {numero: generador.random() < 0.5 for numero in range(1, cnf.num_variables + 1)}
+        por_simbolo = {simbolo: valores[numero] for simbolo, numero in cnf.por_simbolo.items()}
+        if not evaluar_formula(ast, por_simbolo):
+            continue
+        literales = [numero if valores[numero] else -numero for numero in valores]
+        if pruebas % 2:
+            texto = "c resolutor\ns SATISFIABLE\n" + "".join(
+                "v " + " ".join(map(str, literales[i:i + 5])) + "\n"
+                for i in range(0, len(literales), 5)) + "v 0\n"
+        else:
+            texto = "SAT\n" + " ".join(map(str, literales)) + " 0\n"
+        mapa = {numero: nombre for nombre, numero in cnf.variables.items()}
+        modelo = leer_modelo(io.StringIO(texto), mapa, tam_bloque=generador.randint(1, 9))
+        pruebas += 1
+        asignacion = {simbolo: modelo['asignacion'][tabla_simbolos.nombres[simbolo]]
+                      for simbolo in cnf.por_simbolo}
+        correctas += (modelo['estado'] == 'SATISFACIBLE' and modelo['literales'] == len(literales)
+                      and evaluar_formula(ast, asignacion))
+    print(f"Modelos leídos que satisfacen la fórmula: {correctas}/{pruebas}")
+    print(leer_modelo(io.StringIO("s UNSATISFIABLE\n"), {}))
+    print(generar_reporte_modelo(leer_modelo(io.StringIO("SAT\n1 -2 3 -4 0\n"), {1: 'p', 2: 'q', 3: 'r'})))
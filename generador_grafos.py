@@ -1,33 +1,174 @@
 # Generador de Grafos Dirigidos para Expresiones del Sistema L
-# Utiliza NetworkX para crear y visualizar grafos
+# Utiliza NetworkX para crear y visualizar grafos; matplotlib solo se carga
+# al visualizar (la exportación, incluida la SVG, no lo necesita)
 
+import gzip
 import hashlib
+import json
+from xml.sax.saxutils import escape
 import networkx as nx
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch
 
-def crear_grafo_expresion(ast, grafo_nx):
+# Colores de los nodos según su tipo (los mismos en matplotlib y en SVG)
+COLOR_VARIABLE = '#87CEEB'   # Azul claro
+COLOR_CONSTANTE = '#98FB98'  # Verde claro
+COLOR_OPERADOR = '#FFB6C1'   # Rosa claro
+COLOR_DESCONOCIDO = '#D3D3D3'  # Gris claro
+TIPOS_OPERADOR = ('NEGACION', 'CONJUNCION', 'DISYUNCION', 'IMPLICACION', 'BICONDICIONAL')
+
+def color_nodo(tipo):
+    if tipo == 'VARIABLE':
+        return COLOR_VARIABLE
+    if tipo == 'CONSTANTE':
+        return COLOR_CONSTANTE
+    if tipo in TIPOS_OPERADOR:
+        return COLOR_OPERADOR
+    return COLOR_DESCONOCIDO
+
+MODOS_GRAFO = ('arbol', 'dag')
+
+def apariciones_nodos(ast):
     """
-    Crea un grafo dirigido a partir del árbol sintáctico
+    id(nodo) -> número de veces que el nodo aparece en el árbol. Un objeto
+    compartido (como los que deja una sustitución) aparece una vez por cada
+    camino desde la raíz; el conteo se propaga de padres a hijos en orden
+    topológico sin expandir el DAG.
     """
-    if grafo_nx is None:
+    # Postorden sobre los objetos distintos; invertido, cada padre va antes que sus hijos
+    orden = []
+    vistos = set()
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if visitado:
+            orden.append(nodo)
+            continue
+        if id(nodo) in vistos:
+            continue
+        vistos.add(id(nodo))
+        pila.append((nodo, True))
+        pila.extend((hijo, False) for hijo in nodo.hijos)
+    apariciones = {id(ast): 1}
+    for nodo in reversed(orden):
+        cantidad = apariciones[id(nodo)]
+        for hijo in nodo.hijos:
+            apariciones[id(hijo)] = apariciones.get(id(hijo), 0) + cantidad
+    return apariciones
+
+def crear_grafo_expresion(ast, grafo_nx=None, modo='arbol', control=None):
+    """
+    Crea un grafo dirigido a partir del árbol sintáctico.
+    - 'arbol': un nodo del grafo por cada nodo del árbol. Si se pasa el grafo
+      que construyó el analizador sintáctico se devuelve ese mismo.
+    - 'dag': las subfórmulas estructuralmente iguales (mismo hash estructural)
+      se fusionan en un único nodo con varias aristas de entrada. Es un
+      nx.MultiDiGraph para conservar las dos aristas de p^p; cada arista
+      lleva su 'posicion' (0 izquierda, 1 derecha) y cada nodo el número de
+      'apariciones' de la subfórmula en el árbol.
+    Los IDs de los nodos siguen el orden de primera aparición en preorden.
+    Con un ControlRecursos (ver limites_recursos.py) empieza la etapa 'grafo'
+    y se comprueba su plazo mientras se recorre el árbol.
+    """
+    from analizador_sintactico import hashes_estructurales
+
+    if modo not in MODOS_GRAFO:
+        print(f"Modo de grafo desconocido: {modo}. Disponibles: {', '.join(MODOS_GRAFO)}")
         return None
-    
-    return grafo_nx
+    if ast is None:
+        return None
+    if modo == 'arbol' and grafo_nx is not None:
+        return grafo_nx
+
+    if control is not None:
+        control.iniciar_etapa('grafo')
+    hashes = apariciones = None
+    if modo == 'dag':
+        hashes = hashes_estructurales(ast)
+        apariciones = {}
+        for nodo_id, cantidad in apariciones_nodos(ast).items():
+            clave = hashes[nodo_id]
+            apariciones[clave] = apariciones.get(clave, 0) + cantidad
+
+    grafo = nx.DiGraph() if modo == 'arbol' else nx.MultiDiGraph()
+    ids = {}
+    pila = [(ast, None, 0)]
+    while pila:
+        nodo, padre, posicion = pila.pop()
+        # En modo árbol cada visita es un nodo distinto (aunque el objeto esté
+        # compartido, como tras una sustitución); en modo DAG se identifica por su hash
+        clave = len(ids) if modo == 'arbol' else hashes[id(nodo)]
+        nuevo = clave not in ids
+        if nuevo:
+            ids[clave] = len(ids) + 1
+            if control is not None:
+                control.avanzar(ids[clave])
+            etiqueta = nodo.valor if nodo.valor is not None else nodo.tipo
+            grafo.add_node(ids[clave], label=str(etiqueta), tipo=nodo.tipo,
+                           apariciones=apariciones[hashes[id(nodo)]] if modo == 'dag' else 1)
+        if padre is not None:
+            grafo.add_edge(padre, ids[clave], posicion=posicion)
+        if nuevo:
+            pila.extend((hijo, ids[clave], indice)
+                        for indice, hijo in reversed(list(enumerate(nodo.hijos))))
+    return grafo
 
-def visualizar_grafo(grafo, expresion, guardar_archivo=None):
+def comparar_modos_grafo(ast):
     """
-    Visualiza el grafo dirigido usando matplotlib
+    Número de nodos y aristas del grafo en cada modo: {'arbol': (n, m), 'dag': (n, m)}.
+    No construye los grafos: basta con los hashes estructurales.
+    """
+    from analizador_sintactico import hashes_estructurales
+
+    hashes = hashes_estructurales(ast)
+    nodos_arbol = sum(apariciones_nodos(ast).values())
+    distintos = {}
+    pila = [ast]
+    while pila:
+        nodo = pila.pop()
+        clave = hashes[id(nodo)]
+        if clave not in distintos:
+            distintos[clave] = len(nodo.hijos)
+            pila.extend(nodo.hijos)
+    return {
+        'arbol': (nodos_arbol, nodos_arbol - 1),
+        'dag': (len(distintos), sum(distintos.values())),
+    }
+
+def generar_reporte_modos(ast):
+    """
+    Resumen del tamaño del grafo en modo árbol y en modo DAG
+    """
+    conteos = comparar_modos_grafo(ast)
+    (nodos_arbol, aristas_arbol), (nodos_dag, aristas_dag) = conteos['arbol'], conteos['dag']
+    reporte = "Tamaño del grafo por modo:\n"
+    reporte += f"  Árbol: {nodos_arbol} nodos, {aristas_arbol} aristas\n"
+    reporte += (f"  DAG:   {nodos_dag} nodos, {aristas_dag} aristas "
+                f"({100 * (1 - nodos_dag / nodos_arbol):.0f}% menos nodos)\n")
+    return reporte
+
+def calcular_layout(grafo, expresion):
+    """
+    Posiciones de los nodos para dibujar el grafo (spring layout)
     """
-    if grafo is None or len(grafo.nodes()) == 0:
-        print("No hay grafo para visualizar")
-        return
-    
     # Configurar el layout del grafo de forma determinística
     # Usar un seed basado en la expresión para consistencia
     seed = int(hashlib.md5(expresion.encode()).hexdigest()[:8], 16) % (2**32)
-    pos = nx.spring_layout(grafo, k=2, iterations=50, seed=seed)
+    return nx.spring_layout(grafo, k=2, iterations=50, seed=seed)
+
+def visualizar_grafo(grafo, expresion, guardar_archivo=None, pos=None):
+    """
+    Visualiza el grafo dirigido usando matplotlib. Se pueden pasar las
+    posiciones ya calculadas (por ejemplo, recuperadas de la caché); si no,
+    se calculan con calcular_layout. Devuelve las posiciones usadas.
+    """
+    if grafo is None or len(grafo.nodes()) == 0:
+        print("No hay grafo para visualizar")
+        return None
+    
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+    
+    if pos is None:
+        pos = calcular_layout(grafo, expresion)
     
     # Crear la figura
     plt.figure(figsize=(12, 8))
@@ -50,17 +191,7 @@ def visualizar_grafo(grafo, expresion, guardar_archivo=None):
     tipos = nx.get_node_attributes(grafo, 'tipo')
     
     # Definir colores según el tipo de nodo
-    colores_nodos = []
-    for nodo in grafo.nodes():
-        tipo = tipos.get(nodo, 'UNKNOWN')
-        if tipo == 'VARIABLE':
-            colores_nodos.append('#87CEEB')  # Azul claro
-        elif tipo == 'CONSTANTE':
-            colores_nodos.append('#98FB98')  # Verde claro
-        elif tipo in ['NEGACION', 'CONJUNCION', 'DISYUNCION', 'IMPLICACION', 'BICONDICIONAL']:
-            colores_nodos.append('#FFB6C1')  # Rosa claro
-        else:
-            colores_nodos.append('#D3D3D3')  # Gris claro
+    colores_nodos = [color_nodo(tipos.get(nodo, 'UNKNOWN')) for nodo in grafo.nodes()]
     
     # Dibujar los nodos
     nx.draw_networkx_nodes(grafo, pos, 
@@ -78,9 +209,9 @@ def visualizar_grafo(grafo, expresion, guardar_archivo=None):
     
     # Agregar leyenda
     legend_elements = [
-        patches.Patch(color='#87CEEB', label='Variables'),
-        patches.Patch(color='#98FB98', label='Constantes'),
-        patches.Patch(color='#FFB6C1', label='Operadores')
+        patches.Patch(color=COLOR_VARIABLE, label='Variables'),
+        patches.Patch(color=COLOR_CONSTANTE, label='Constantes'),
+        patches.Patch(color=COLOR_OPERADOR, label='Operadores')
     ]
     plt.legend(handles=legend_elements, loc='upper right')
     
@@ -94,6 +225,7 @@ def visualizar_grafo(grafo, expresion, guardar_archivo=None):
         print(f"Grafo guardado en: {guardar_archivo}")
     
     plt.show()
+    return pos
 
 def generar_reporte_grafo(grafo, expresion):
     """
@@ -104,6 +236,8 @@ def generar_reporte_grafo(grafo, expresion):
     
     reporte = f"\n=== REPORTE DEL GRAFO ===\n"
     reporte += f"Expresión analizada: {expresion}\n"
+    if grafo.is_multigraph():
+        reporte += "Modo: DAG (subfórmulas repetidas compartidas)\n"
     reporte += f"Número de nodos: {grafo.number_of_nodes()}\n"
     reporte += f"Número de aristas: {grafo.number_of_edges()}\n\n"
     
@@ -111,7 +245,11 @@ def generar_reporte_grafo(grafo, expresion):
     for nodo, datos in grafo.nodes(data=True):
         etiqueta = datos.get('label', 'Sin etiqueta')
         tipo = datos.get('tipo', 'Sin tipo')
-        reporte += f"  Nodo {nodo}: {etiqueta} (Tipo: {tipo})\n"
+        reporte += f"  Nodo {nodo}: {etiqueta} (Tipo: {tipo})"
+        # En modo DAG un nodo representa todas las apariciones de la subfórmula
+        if datos.get('apariciones', 1) > 1:
+            reporte += f" x{datos['apariciones']}"
+        reporte += "\n"
     
     reporte += "\nAristas del grafo (Padre -> Hijo):\n"
     for padre, hijo in grafo.edges():
@@ -121,6 +259,38 @@ def generar_reporte_grafo(grafo, expresion):
     
     return reporte
 
+def escribir_grafo_dot(grafo, expresion, flujo):
+    """
+    Escribe el grafo en formato DOT sobre un flujo de texto abierto
+    """
+    flujo.write(f"// Grafo dirigido para la expresión: {expresion}\n")
+    flujo.write("digraph G {\n")
+    flujo.write("  rankdir=TB;\n")
+    flujo.write("  node [shape=circle, style=filled];\n\n")
+    
+    # Escribir nodos
+    for nodo, datos in grafo.nodes(data=True):
+        etiqueta = datos.get('label', str(nodo))
+        tipo = datos.get('tipo', 'UNKNOWN')
+        
+        # Asignar colores según el tipo
+        if tipo == 'VARIABLE':
+            color = 'lightblue'
+        elif tipo == 'CONSTANTE':
+            color = 'lightgreen'
+        else:
+            color = 'lightpink'
+        
+        flujo.write(f'  {nodo} [label="{etiqueta}", fillcolor={color}];\n')
+    
+    flujo.write("\n")
+    
+    # Escribir aristas
+    for padre, hijo in grafo.edges():
+        flujo.write(f"  {padre} -> {hijo};\n")
+    
+    flujo.write("}\n")
+
 def exportar_grafo_dot(grafo, expresion, archivo):
     """
     Exporta el grafo en formato DOT para Graphviz
@@ -129,36 +299,309 @@ def exportar_grafo_dot(grafo, expresion, archivo):
         return
     
     with open(archivo, 'w', encoding='utf-8') as f:
-        f.write(f"// Grafo dirigido para la expresión: {expresion}\n")
-        f.write("digraph G {\n")
-        f.write("  rankdir=TB;\n")
-        f.write("  node [shape=circle, style=filled];\n\n")
-        
-        # Escribir nodos
-        for nodo, datos in grafo.nodes(data=True):
-            etiqueta = datos.get('label', str(nodo))
-            tipo = datos.get('tipo', 'UNKNOWN')
-            
-            # Asignar colores según el tipo
-            if tipo == 'VARIABLE':
-                color = 'lightblue'
-            elif tipo == 'CONSTANTE':
-                color = 'lightgreen'
-            else:
-                color = 'lightpink'
-            
-            f.write(f'  {nodo} [label="{etiqueta}", fillcolor={color}];\n')
-        
-        f.write("\n")
-        
-        # Escribir aristas
-        for padre, hijo in grafo.edges():
-            f.write(f"  {padre} -> {hijo};\n")
-        
-        f.write("}\n")
+        escribir_grafo_dot(grafo, expresion, f)
     
     print(f"Grafo exportado en formato DOT: {archivo}")
 
+# --- Exportación en flujo: GraphML, JSON node-link y JSON Lines ----------
+#
+# Los exportadores aceptan un NodoAST o un grafo de networkx. Desde el árbol
+# no se construye ningún grafo: los nodos se numeran en preorden (los mismos
+# IDs que asigna el analizador sintáctico) y se escriben a medida que se
+# recorren, por bloques, así que la memoria adicional no depende del tamaño.
+
+FRAGMENTOS_POR_BLOQUE = 4096
+
+def _es_grafo(fuente):
+    return isinstance(fuente, nx.Graph)
+
+def _nodos_fuente(fuente):
+    """
+    Genera (id, etiqueta, tipo) de cada nodo
+    """
+    if _es_grafo(fuente):
+        for nodo, datos in fuente.nodes(data=True):
+            yield nodo, datos.get('label', str(nodo)), datos.get('tipo', 'UNKNOWN')
+        return
+    contador = 0
+    pila = [fuente]
+    while pila:
+        nodo = pila.pop()
+        contador += 1
+        etiqueta = nodo.valor if nodo.valor is not None else nodo.tipo
+        yield contador, str(etiqueta), nodo.tipo
+        pila.extend(reversed(nodo.hijos))
+
+def _aristas_fuente(fuente):
+    """
+    Genera (origen, destino, posición del hijo o None) de cada arista
+    """
+    if _es_grafo(fuente):
+        for origen, destino, datos in fuente.edges(data=True):
+            yield origen, destino, datos.get('posicion')
+        return
+    contador = 0
+    pila = [(fuente, None, None)]
+    while pila:
+        nodo, padre, posicion = pila.pop()
+        contador += 1
+        if padre is not None:
+            yield padre, contador, posicion
+        pila.extend((hijo, contador, indice) for indice, hijo in reversed(list(enumerate(nodo.hijos))))
+
+def abrir_salida(archivo, comprimir=None):
+    """
+    Abre un archivo de texto para escribir; con comprimir=True (o si el
+    nombre termina en .gz) se escribe comprimido con gzip
+    """
+    if comprimir is None:
+        comprimir = archivo.endswith('.gz')
+    if comprimir:
+        return gzip.open(archivo, 'wt', encoding='utf-8', compresslevel=6)
+    return open(archivo, 'w', encoding='utf-8', buffering=1 << 20)
+
+def _escribir_por_bloques(flujo, fragmentos):
+    """
+    Escribe los fragmentos de texto agrupados en bloques; devuelve los caracteres escritos
+    """
+    bloque = []
+    escritos = 0
+    for fragmento in fragmentos:
+        bloque.append(fragmento)
+        if len(bloque) >= FRAGMENTOS_POR_BLOQUE:
+            texto = "".join(bloque)
+            flujo.write(texto)
+            escritos += len(texto)
+            bloque.clear()
+    texto = "".join(bloque)
+    flujo.write(texto)
+    return escritos + len(texto)
+
+def _fragmentos_graphml(fuente, expresion):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield ('<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+           'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+           'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+           'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n')
+    yield '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+    yield '  <key id="tipo" for="node" attr.name="tipo" attr.type="string"/>\n'
+    yield '  <key id="posicion" for="edge" attr.name="posicion" attr.type="int"/>\n'
+    yield '  <graph id="G" edgedefault="directed">\n'
+    if expresion is not None:
+        yield f'    <desc>{escape(expresion)}</desc>\n'
+    for nodo, etiqueta, tipo in _nodos_fuente(fuente):
+        yield (f'    <node id="{nodo}"><data key="label">{escape(etiqueta)}</data>'
+               f'<data key="tipo">{tipo}</data></node>\n')
+    for origen, destino, posicion in _aristas_fuente(fuente):
+        if posicion is None:
+            yield f'    <edge source="{origen}" target="{destino}"/>\n'
+        else:
+            yield (f'    <edge source="{origen}" target="{destino}">'
+                   f'<data key="posicion">{posicion}</data></edge>\n')
+    yield '  </graph>\n</graphml>\n'
+
+def escribir_grafo_graphml(fuente, flujo, expresion=None):
+    """
+    Escribe el árbol o grafo en formato GraphML sobre un flujo de texto abierto.
+    Devuelve el número de caracteres escritos.
+    """
+    return _escribir_por_bloques(flujo, _fragmentos_graphml(fuente, expresion))
+
+def _json_id(nodo):
+    return str(nodo) if isinstance(nodo, int) else json.dumps(nodo)
+
+def _fragmentos_json(fuente, expresion):
+    multigrafo = _es_grafo(fuente) and fuente.is_multigraph()
+    yield '{"directed": true, "multigraph": %s, "graph": {"expresion": %s}, "nodes": [' % (
+        'true' if multigrafo else 'false', json.dumps(expresion, ensure_ascii=False))
+    # Las etiquetas se repiten mucho (operadores y variables): se codifican una vez
+    etiquetas = {}
+    separador = '\n'
+    for nodo, etiqueta, tipo in _nodos_fuente(fuente):
+        codificada = etiquetas.get(etiqueta)
+        if codificada is None:
+            codificada = etiquetas[etiqueta] = json.dumps(etiqueta)
+        yield f'{separador}{{"id": {_json_id(nodo)}, "label": {codificada}, "tipo": "{tipo}"}}'
+        separador = ',\n'
+    yield '], "links": ['
+    separador = '\n'
+    for origen, destino, posicion in _aristas_fuente(fuente):
+        if posicion is None:
+            yield f'{separador}{{"source": {_json_id(origen)}, "target": {_json_id(destino)}}}'
+        else:
+            yield (f'{separador}{{"source": {_json_id(origen)}, "target": {_json_id(destino)}, '
+                   f'"posicion": {posicion}}}')
+        separador = ',\n'
+    yield ']}\n'
+
+def escribir_grafo_json(fuente, flujo, expresion=None):
+    """
+    Escribe el árbol o grafo en formato JSON node-link (el de
+    networkx.node_link_data, con las aristas en "links") sobre un flujo de
+    texto abierto. Devuelve el número de caracteres escritos.
+    """
+    return _escribir_por_bloques(flujo, _fragmentos_json(fuente, expresion))
+
+def layout_arbol(fuente):
+    """
+    Posiciones del dibujo en árbol: cada hoja ocupa la siguiente columna de
+    izquierda a derecha y cada operador se centra sobre sus hijos; la fila es
+    la profundidad. En modo DAG un nodo compartido se coloca donde aparece
+    por primera vez. Devuelve ({id: (columna, fila)}, columnas, filas).
+    """
+    hijos = {}
+    con_padre = set()
+    for origen, destino, posicion in _aristas_fuente(fuente):
+        hijos.setdefault(origen, []).append((posicion, destino))
+        con_padre.add(destino)
+    raices = [nodo for nodo, _, _ in _nodos_fuente(fuente) if nodo not in con_padre]
+    for lista in hijos.values():
+        if lista[0][0] is not None:
+            lista.sort(key=lambda par: par[0])
+
+    posiciones = {}
+    columnas = filas = 0
+    for raiz in raices:
+        pila = [(raiz, 0, False)]
+        while pila:
+            nodo, fila, visitado = pila.pop()
+            if not visitado:
+                if nodo in posiciones:
+                    continue
+                posiciones[nodo] = None
+                pila.append((nodo, fila, True))
+                pila.extend((hijo, fila + 1, False) for _, hijo in reversed(hijos.get(nodo, ())))
+                continue
+            propios = hijos.get(nodo)
+            if propios:
+                columna = (posiciones[propios[0][1]][0] + posiciones[propios[-1][1]][0]) / 2
+            else:
+                columna = columnas
+                columnas += 1
+            posiciones[nodo] = (columna, fila)
+            filas = max(filas, fila + 1)
+    return posiciones, columnas, filas
+
+def _fragmentos_svg(fuente, expresion, separacion, altura_fila, radio):
+    posiciones, columnas, filas = layout_arbol(fuente)
+    margen = radio + 10
+    # Título (si hay expresión) y leyenda en una fila encima del árbol
+    y_leyenda = 34 if expresion is not None else 8
+    encabezado = y_leyenda + 22
+    ancho = max(columnas * separacion, 360) + 2 * margen - separacion
+    alto = encabezado + max(filas - 1, 0) * altura_fila + 2 * margen
+    coordenadas = {nodo: (margen + columna * separacion, encabezado + margen + fila * altura_fila)
+                   for nodo, (columna, fila) in posiciones.items()}
+
+    yield (f'<svg xmlns="http://www.w3.org/2000/svg" width="{ancho:g}" height="{alto:g}" '
+           f'viewBox="0 0 {ancho:g} {alto:g}" font-family="sans-serif">\n')
+    yield ('<defs><marker id="flecha" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="7" '
+           'markerHeight="7" orient="auto"><path d="M0,0L10,5L0,10z"/></marker></defs>\n')
+    yield ('<style>line{stroke:#000;stroke-width:2;stroke-opacity:.7;marker-end:url(#flecha)}'
+           'circle{stroke:#000;stroke-width:2;fill-opacity:.9}'
+           'text{font-size:14px;font-weight:bold;text-anchor:middle;dominant-baseline:central}'
+           f'.v{{fill:{COLOR_VARIABLE}}}.c{{fill:{COLOR_CONSTANTE}}}'
+           f'.o{{fill:{COLOR_OPERADOR}}}.x{{fill:{COLOR_DESCONOCIDO}}}</style>\n')
+    if expresion is not None:
+        caracteres = int(ancho // 9)
+        titulo = expresion if len(expresion) <= caracteres else expresion[:caracteres - 1] + '…'
+        yield f'<title>{escape(expresion)}</title>\n'
+        yield f'<text x="{ancho / 2:g}" y="20">{escape(titulo)}</text>\n'
+    for indice, (clase, nombre) in enumerate((('v', 'Variables'), ('c', 'Constantes'), ('o', 'Operadores'))):
+        x = margen + indice * 110
+        yield (f'<rect class="{clase}" x="{x}" y="{y_leyenda}" width="12" height="12"/>'
+               f'<text x="{x + 16}" y="{y_leyenda + 6}" style="text-anchor:start;font-size:11px;'
+               f'font-weight:normal">{nombre}</text>\n')
+
+    # Aristas debajo de los nodos, recortadas al borde de los círculos
+    for origen, destino, _ in _aristas_fuente(fuente):
+        x1, y1 = coordenadas[origen]
+        x2, y2 = coordenadas[destino]
+        dx, dy = x2 - x1, y2 - y1
+        longitud = (dx * dx + dy * dy) ** 0.5 or 1.0
+        ux, uy = dx / longitud * radio, dy / longitud * radio
+        yield (f'<line x1="{x1 + ux:.1f}" y1="{y1 + uy:.1f}" '
+               f'x2="{x2 - ux:.1f}" y2="{y2 - uy:.1f}"/>\n')
+
+    clases = {'VARIABLE': 'v', 'CONSTANTE': 'c'}
+    for nodo, etiqueta, tipo in _nodos_fuente(fuente):
+        x, y = coordenadas[nodo]
+        clase = clases.get(tipo) or ('o' if tipo in TIPOS_OPERADOR else 'x')
+        yield (f'<circle class="{clase}" cx="{x:g}" cy="{y:g}" r="{radio}"/>'
+               f'<text x="{x:g}" y="{y:g}">{escape(etiqueta)}</text>\n')
+    yield '</svg>\n'
+
+def escribir_grafo_svg(fuente, flujo, expresion=None, separacion=50, altura_fila=70, radio=18):
+    """
+    Dibuja el árbol (o el grafo de una expresión, también en modo DAG) como
+    SVG sobre un flujo de texto abierto, sin matplotlib: layout en árbol
+    (layout_arbol), aristas con flecha, nodos coloreados por tipo con los
+    colores de visualizar_grafo, etiquetas y leyenda.
+    Devuelve el número de caracteres escritos.
+    """
+    return _escribir_por_bloques(flujo, _fragmentos_svg(fuente, expresion, separacion, altura_fila, radio))
+
+FORMATOS_EXPORTACION = {
+    'graphml': escribir_grafo_graphml,
+    'json': escribir_grafo_json,
+    'svg': escribir_grafo_svg,
+}
+
+def exportar_grafo(fuente, expresion, archivo, formato='graphml', comprimir=None):
+    """
+    Exporta el árbol o grafo a un archivo GraphML, JSON node-link o SVG,
+    opcionalmente comprimido con gzip
+    """
+    if fuente is None:
+        return
+    if formato not in FORMATOS_EXPORTACION:
+        print(f"Formato desconocido: {formato}. Disponibles: {', '.join(FORMATOS_EXPORTACION)}")
+        return
+    with abrir_salida(archivo, comprimir) as f:
+        FORMATOS_EXPORTACION[formato](fuente, f, expresion)
+    print(f"Grafo exportado en formato {formato}: {archivo}")
+
+def exportar_corpus_jsonl(expresiones, archivo, comprimir=None):
+    """
+    Escribe un corpus en JSON Lines: una línea por fórmula con su expresión y
+    su árbol en formato node-link (o un campo "error" si es inválida).
+    Las fórmulas se analizan y escriben de una en una, sin dejar sus nombres
+    de variable en la tabla de símbolos.
+    Devuelve (fórmulas válidas, inválidas).
+    """
+    import contextlib
+    import io
+    from analizador_sintactico import ambito_simbolos, analizar_sintacticamente
+
+    validas = invalidas = 0
+    with abrir_salida(archivo, comprimir) as f:
+        bloque = []
+        for indice, expresion in enumerate(expresiones):
+            expresion = expresion.strip()
+            if not expresion:
+                continue
+            with contextlib.redirect_stdout(io.StringIO()), ambito_simbolos():
+                ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+                if ast is None:
+                    invalidas += 1
+                    linea = json.dumps({'id': indice, 'expresion': expresion, 'error': 'expresión inválida'},
+                                       ensure_ascii=False)
+                else:
+                    validas += 1
+                    nodos = [{'id': nodo, 'label': etiqueta, 'tipo': tipo}
+                             for nodo, etiqueta, tipo in _nodos_fuente(ast)]
+                    enlaces = [{'source': origen, 'target': destino, 'posicion': posicion}
+                               for origen, destino, posicion in _aristas_fuente(ast)]
+                    linea = json.dumps({'id': indice, 'expresion': expresion, 'nodes': nodos, 'links': enlaces},
+                                       ensure_ascii=False)
+            bloque.append(linea)
+            if len(bloque) >= 256:
+                f.write("\n".join(bloque) + "\n")
+                bloque.clear()
+        if bloque:
+            f.write("\n".join(bloque) + "\n")
+    return validas, invalidas
+
 if __name__ == "__main__":
     # Ejemplo de uso
     from analizador_sintactico import analizar_sintacticamente
@@ -171,4 +614,59 @@ if __name__ == "__main__":
         print(generar_reporte_grafo(grafo, expresion))
         visualizar_grafo(grafo, expresion)
     else:
-        print("Error al generar el grafo")
\ No newline at end of file
+        print("Error al generar el grafo")
+
+    # Modo DAG sobre una fórmula con subfórmulas repetidas
+    expresion = "((p=>q)^(p=>q))=>((p=>q)^(p=>q))"
+    ast, _ = analizar_sintacticamente(expresion, construir_grafo=False)
+    print(generar_reporte_modos(ast))
+    print(generar_reporte_grafo(crear_grafo_expresion(ast, modo='dag'), expresion))
+    # Exportación en flujo: networkx debe leer lo mismo que se escribió
+    import os
+    import tempfile
+    from networkx.readwrite import json_graph
+
+    print("\n=== EXPORTACIÓN GRAPHML / JSON ===")
+    with tempfile.TemporaryDirectory() as directorio:
+        for fuente, descripcion in ((ast, "árbol"), (crear_grafo_expresion(ast, modo='dag'), "DAG")):
+            esperado = comparar_modos_grafo(ast)['arbol' if descripcion == "árbol" else 'dag']
+            ruta = os.path.join(directorio, "grafo.graphml.gz")
+            exportar_grafo(fuente, expresion, ruta)
+            leido = nx.read_graphml(ruta)
+            print(f"  GraphML ({descripcion}): {leido.number_of_nodes()} nodos, "
+                  f"{leido.number_of_edges()} aristas (esperado {esperado[0]}, {esperado[1]})")
+            ruta = os.path.join(directorio, "grafo.json")
+            exportar_grafo(fuente, expresion, ruta, formato='json')
+            with open(ruta, encoding='utf-8') as f:
+                leido = json_graph.node_link_graph(json.load(f), edges='links')
+            print(f"  JSON ({descripcion}): {leido.number_of_nodes()} nodos, "
+                  f"{leido.number_of_edges()} aristas (esperado {esperado[0]}, {esperado[1]})")
+        ruta = os.path.join(directorio, "corpus.jsonl.gz")
+        validas, invalidas = exportar_corpus_jsonl(["p", "(p^q)", "p^", "~~(p<=>q)"], ruta)
+        with gzip.open(ruta, 'rt', encoding='utf-8') as f:
+            lineas = [json.loads(linea) for linea in f]
+        print(f"  JSON Lines: {validas} válidas, {invalidas} inválidas, {len(lineas)} líneas leídas")
+
+        # SVG sin matplotlib: un círculo por nodo, una línea por arista y cada
+        # operador centrado entre sus hijos y una fila por encima
+        import xml.etree.ElementTree as ET
+
+        print("\n=== EXPORTACIÓN SVG ===")
+        espacio = '{http://www.w3.org/2000/svg}'
+        for fuente, descripcion in ((ast, "árbol"), (crear_grafo_expresion(ast, modo='dag'), "DAG")):
+            esperado = comparar_modos_grafo(ast)['arbol' if descripcion == "árbol" else 'dag']
+            ruta = os.path.join(directorio, "grafo.svg")
+            exportar_grafo(fuente, expresion, ruta, formato='svg')
+            raiz = ET.parse(ruta).getroot()
+            circulos = len(raiz.findall(f'{espacio}circle'))
+            lineas = len(raiz.findall(f'{espacio}line'))
+            print(f"  SVG ({descripcion}): {circulos} nodos, {lineas} aristas "
+                  f"(esperado {esperado[0]}, {esperado[1]}), {os.path.getsize(ruta)} bytes")
+        posiciones, columnas, filas = layout_arbol(ast)
+        hijos = {}
+        for origen, destino, _ in _aristas_fuente(ast):
+            hijos.setdefault(origen, []).append(destino)
+        correcto = all(posiciones[lista[0]][0] <= posiciones[nodo][0] <= posiciones[lista[-1]][0]
+                       and all(posiciones[hijo][1] == posiciones[nodo][1] + 1 for hijo in lista)
+                       for nodo, lista in hijos.items())
+        print(f"  Layout en árbol: {columnas} columnas, {filas} filas, operadores centrados: {correcto}")
@@ -10,6 +10,7 @@ def mostrar_gramatica_formal():
 
 1. ALFABETO DE L:
    • Variables proposicionales: {p, q, r, s, t, u, v, w, x, y, z}
+     con subíndice opcional: p12, x_1043 ([pqrstuvwxyz](_?[0-9]+)?)
    • Operadores lógicos: {~, ^, o, =>, <=>}
    • Signos de puntuación: {(, )}
    • Constantes: {0, 1}
@@ -28,7 +29,7 @@ def mostrar_gramatica_formal():
 
    P2: E → VARIABLE
        (Las variables proposicionales son fórmulas bien formadas)
-       donde VARIABLE ∈ {p, q, r, s, t, u, v, w, x, y, z}
+       donde VARIABLE ∈ {p, q, r, s, t, u, v, w, x, y, z} o una de ellas con subíndice
 
    P3: E → CONSTANTE
        (Las constantes son fórmulas bien formadas)
@@ -68,47 +69,130 @@ def mostrar_gramatica_formal():
 """
     return gramatica
 
-def generar_ejemplos_derivaciones():
-    """
-    Genera ejemplos de derivaciones usando la gramática
-    """
-    ejemplos = """
-=== EJEMPLOS DE DERIVACIONES ===
-
-1. Derivación de "p":
-   F → E → VARIABLE → p
-
-2. Derivación de "~p":
-   F → E → ~E → ~VARIABLE → ~p
+# Lado derecho de la producción aplicada a cada tipo de nodo (P2 y P3 usan el lexema)
+_PRODUCCIONES = {
+    'NEGACION': ('P4', '~E'),
+    'CONJUNCION': ('P5', 'E^E'),
+    'DISYUNCION': ('P6', 'EoE'),
+    'IMPLICACION': ('P7', 'E=>E'),
+    'BICONDICIONAL': ('P8', 'E<=>E'),
+}
 
-3. Derivación de "(p^q)":
-   F → E → (E) → (E^E) → (VARIABLE^VARIABLE) → (p^q)
+EJEMPLOS_DERIVACIONES = ["p", "~p", "(p^q)", "p=>q", "((p=>q)^p)", "~(p^q)", "(p<=>~p)"]
 
-4. Derivación de "p=>q":
-   F → E → E=>E → VARIABLE=>VARIABLE → p=>q
+def derivacion_izquierda(ast):
+    """
+    Generador de la derivación más a la izquierda del árbol, paso a paso.
+    Cada paso es (producción, posición, reemplazo): la forma sentencial
+    siguiente se obtiene sustituyendo el no terminal (F o E, un carácter)
+    de la posición dada por el reemplazo. Las variables y constantes se
+    escriben directamente con su lexema (E → p) y los paréntesis del texto
+    original (atributo parentesis del nodo) aparecen como pasos E → (E).
+
+    Solo se mantiene la pila de lo que queda a la derecha del no terminal
+    más a la izquierda y la longitud del prefijo ya terminal, así que cada
+    paso cuesta O(1) y la derivación completa es lineal en el tamaño del árbol.
+    """
+    yield ('P1', 0, 'E')
+    posicion = 0
+    # Pila del sufijo pendiente: (nodo, paréntesis por abrir) o texto terminal
+    pila = [(ast, ast.parentesis)]
+    while pila:
+        elemento = pila.pop()
+        if isinstance(elemento, str):
+            posicion += len(elemento)
+            continue
+        nodo, parentesis = elemento
+        if parentesis:
+            yield ('P9', posicion, '(E)')
+            pila.append(')')
+            pila.append((nodo, parentesis - 1))
+            posicion += 1
+        elif not nodo.hijos:
+            lexema = str(nodo.valor)
+            yield ('P2' if nodo.tipo == 'VARIABLE' else 'P3', posicion, lexema)
+            posicion += len(lexema)
+        elif nodo.tipo == 'NEGACION':
+            yield ('P4', posicion, '~E')
+            hijo = nodo.hijos[0]
+            pila.append((hijo, hijo.parentesis))
+            posicion += 1
+        else:
+            produccion, reemplazo = _PRODUCCIONES[nodo.tipo]
+            yield (produccion, posicion, reemplazo)
+            izquierda, derecha = nodo.hijos
+            pila.append((derecha, derecha.parentesis))
+            pila.append(reemplazo[1:-1])
+            pila.append((izquierda, izquierda.parentesis))
+
+def reconstruir_derivacion(pasos):
+    """
+    Aplica los pasos de una derivación desde F en tiempo lineal y devuelve
+    la cadena final, o None si algún paso no reescribe el no terminal más
+    a la izquierda (es decir, si la derivación no es por la izquierda)
+    """
+    prefijo = []
+    sufijo = ['F']  # invertido: el final de la lista es el siguiente símbolo
+    for _, posicion, reemplazo in pasos:
+        while sufijo and sufijo[-1] not in 'FE':
+            prefijo.append(sufijo.pop())
+        if not sufijo or posicion != len(prefijo):
+            return None
+        sufijo.pop()
+        sufijo.extend(reversed(reemplazo))
+    while sufijo and sufijo[-1] not in 'FE':
+        prefijo.append(sufijo.pop())
+    return None if sufijo else "".join(prefijo)
+
+def formas_sentenciales(pasos):
+    """
+    Formas sentenciales de la derivación, empezando por F. Cada forma es una
+    cadena nueva, así que solo conviene para fórmulas pequeñas (para fórmulas
+    grandes se consumen directamente los pasos).
+    """
+    forma = 'F'
+    yield forma
+    for _, posicion, reemplazo in pasos:
+        forma = forma[:posicion] + reemplazo + forma[posicion + 1:]
+        yield forma
 
-5. Derivación de "((p=>q)^p)":
-   F → E → (E) → (E^E) → ((E)^E) → ((E=>E)^E) → 
-   ((VARIABLE=>VARIABLE)^VARIABLE) → ((p=>q)^p)
+def derivacion_texto(expresion, formas_por_linea=6):
+    """
+    Derivación más a la izquierda de la expresión como texto "F → E → ...",
+    o None si la expresión no es válida
+    """
+    from analizador_sintactico import analizar_sintacticamente
 
-6. Derivación de "~(p^q)":
-   F → E → ~E → ~(E) → ~(E^E) → ~(VARIABLE^VARIABLE) → ~(p^q)
+    ast, _ = analizar_sintacticamente(expresion, construir_grafo=False)
+    if ast is None:
+        return None
+    formas = list(formas_sentenciales(derivacion_izquierda(ast)))
+    lineas = [" → ".join(formas[i:i + formas_por_linea])
+              for i in range(0, len(formas), formas_por_linea)]
+    return " →\n   ".join(lineas)
 
-7. Derivación de "(p<=>~p)":
-   F → E → (E) → (E<=>E) → (VARIABLE<=>E) → 
-   (VARIABLE<=>~E) → (VARIABLE<=>~VARIABLE) → (p<=>~p)
-"""
+def generar_ejemplos_derivaciones(expresiones=None):
+    """
+    Genera las derivaciones más a la izquierda de las expresiones dadas
+    (por defecto, EJEMPLOS_DERIVACIONES)
+    """
+    ejemplos = "\n=== EJEMPLOS DE DERIVACIONES ===\n"
+    for numero, expresion in enumerate(expresiones or EJEMPLOS_DERIVACIONES, start=1):
+        derivacion = derivacion_texto(expresion)
+        ejemplos += f'\n{numero}. Derivación de "{expresion}":\n'
+        ejemplos += f"   {derivacion}\n" if derivacion else "   Expresión inválida\n"
     return ejemplos
 
-def validar_expresion_gramatica(expresion):
+def validar_expresion_gramatica(expresion, limites=None):
     """
-    Valida si una expresión puede ser generada por la gramática
+    Valida si una expresión puede ser generada por la gramática. Con limites
+    (ver limites_recursos.py) una entrada que los supera se da por inválida.
     """
     # Importar el analizador sintáctico
     try:
         from analizador_sintactico import analizar_sintacticamente
         
-        ast, grafo = analizar_sintacticamente(expresion)
+        ast, grafo = analizar_sintacticamente(expresion, limites=limites)
         if ast is not None:
             return True, "Expresión válida según la gramática del Sistema L"
         else:
@@ -156,7 +240,15 @@ def generar_bnf():
               | <expresion> "<=>" <expresion>
               | "(" <expresion> ")"
 
-<variable> ::= "p" | "q" | "r" | "s" | "t" | "u" | "v" | "w" | "x" | "y" | "z"
+<variable> ::= <letra> | <letra> <subindice>
+
+<letra> ::= "p" | "q" | "r" | "s" | "t" | "u" | "v" | "w" | "x" | "y" | "z"
+
+<subindice> ::= <digitos> | "_" <digitos>
+
+<digitos> ::= <digito> | <digito> <digitos>
+
+<digito> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
 
 <constante> ::= "0" | "1"
 """
@@ -180,12 +272,54 @@ expresion = variable
           | expresion "<=>" expresion
           | "(" expresion ")" ;
 
-variable = "p" | "q" | "r" | "s" | "t" | "u" | "v" | "w" | "x" | "y" | "z" ;
+variable = letra [ [ "_" ] digito { digito } ] ;
+
+letra = "p" | "q" | "r" | "s" | "t" | "u" | "v" | "w" | "x" | "y" | "z" ;
+
+digito = "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9" ;
 
 constante = "0" | "1" ;
 """
     return ebnf
 
+def generar_formula_aleatoria(generador, nodos=15, variables="pqrstuvwxyz",
+                              prob_constante=0.1, prob_negacion=0.2, prob_parentesis=1.0):
+    """
+    Genera una fórmula bien formada aleatoria aplicando las producciones
+    P2-P9 hasta alcanzar aproximadamente el número de nodos indicado.
+    Las operaciones binarias se encierran entre paréntesis con probabilidad
+    prob_parentesis; con valores menores se ejercita la precedencia.
+    Es iterativa, por lo que sirve para fórmulas de cualquier tamaño.
+    """
+    operadores = ["^", "o", "=>", "<=>"]
+    partes = []
+    # Pila de tareas: ('E', nodos restantes) expande una expresión; ('T', texto) emite texto
+    pila = [('E', max(1, nodos))]
+    while pila:
+        clase, dato = pila.pop()
+        if clase == 'T':
+            partes.append(dato)
+        elif dato == 1:
+            if generador.random() < prob_constante:
+                partes.append(generador.choice("01"))
+            else:
+                partes.append(generador.choice(variables))
+        elif dato == 2 or generador.random() < prob_negacion:
+            pila.append(('E', dato - 1))
+            pila.append(('T', "~"))
+        else:
+            izquierda = generador.randint(1, dato - 2)
+            derecha = dato - 1 - izquierda
+            parentesis = generador.random() < prob_parentesis
+            if parentesis:
+                pila.append(('T', ")"))
+            pila.append(('E', derecha))
+            pila.append(('T', generador.choice(operadores)))
+            pila.append(('E', izquierda))
+            if parentesis:
+                pila.append(('T', "("))
+    return "".join(partes)
+
 if __name__ == "__main__":
     print(mostrar_gramatica_formal())
     print("\n" + "="*60)
@@ -217,4 +351,33 @@ if __name__ == "__main__":
     for expr in expresiones_prueba:
         valida, mensaje = validar_expresion_gramatica(expr)
         estado = "✓" if valida else "✗"
-        print(f"{estado} {expr:15} - {mensaje}")
\ No newline at end of file
+        print(f"{estado} {expr:15} - {mensaje}")
+    # Derivaciones automáticas: la cadena final debe coincidir con la expresión
+    # (sin espacios) con ambos motores de análisis
+    import contextlib
+    import io
+    import random
+    from analizador_sintactico import analizar_sintacticamente
+
+    print("\n" + "="*60)
+    print("=== VERIFICACIÓN DE DERIVACIONES ===")
+    generador = random.Random(39)
+    correctas = total = 0
+    for _ in range(500):
+        expr = generar_formula_aleatoria(generador, generador.randint(1, 40),
+                                         prob_parentesis=generador.random())
+        if generador.random() < 0.2:
+            # Paréntesis redundantes alrededor de toda la fórmula
+            extra = generador.randint(1, 3)
+            expr = "(" * extra + expr + ")" * extra
+        for motor in ('ply', 'pratt'):
+            with contextlib.redirect_stdout(io.StringIO()):
+                ast, _ = analizar_sintacticamente(expr, motor=motor, construir_grafo=False)
+            total += 1
+            correctas += ast is not None and reconstruir_derivacion(derivacion_izquierda(ast)) == expr
+    print(f"Derivaciones que reproducen la expresión: {correctas}/{total}")
+
+    expr = generar_formula_aleatoria(random.Random(0), 10000, prob_parentesis=0.5)
+    ast, _ = analizar_sintacticamente(expr, motor='pratt', construir_grafo=False)
+    pasos = sum(1 for _ in derivacion_izquierda(ast))
+    print(f"Fórmula de 10000 nodos ({len(expr)} caracteres): {pasos} pasos en la derivación")
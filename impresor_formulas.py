@@ -0,0 +1,207 @@
+# Impresor de Fórmulas del Sistema L
+# Convierte un árbol sintáctico de nuevo en texto con los paréntesis mínimos
+# según la tabla de precedencia y asociatividad del analizador sintáctico
+
+import io
+import sys
+from analizador_sintactico import precedence, analizar_sintacticamente
+
+# tipo de nodo -> (nivel de precedencia, asociatividad), de la misma tabla que usa PLY
+NIVELES = {nombre: (nivel, asociatividad)
+           for nivel, (asociatividad, nombre) in enumerate(precedence, start=1)}
+
+def necesita_parentesis(tipo_padre, hijo, es_derecho):
+    """
+    Indica si el hijo debe ir entre paréntesis bajo un operador de tipo
+    tipo_padre. El operando de la negación cuenta como hijo derecho.
+    """
+    if not hijo.hijos:
+        return False
+    nivel_padre, asociatividad = NIVELES[tipo_padre]
+    nivel_hijo = NIVELES[hijo.tipo][0]
+    if nivel_hijo != nivel_padre:
+        return nivel_hijo < nivel_padre
+    # Mismo nivel: solo se omiten en el lado hacia el que asocia el operador
+    return es_derecho if asociatividad == 'left' else not es_derecho
+
+def longitudes_planas(ast):
+    """
+    id(nodo) -> longitud del texto mínimo del subárbol en una sola línea
+    (incluidos los paréntesis que le pone su padre)
+    """
+    longitudes = {}
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if not visitado and nodo.hijos:
+            pila.append((nodo, True))
+            pila.extend((hijo, False) for hijo in nodo.hijos)
+            continue
+        if not nodo.hijos:
+            longitud = len(str(nodo.valor))
+        elif nodo.tipo == 'NEGACION':
+            hijo = nodo.hijos[0]
+            longitud = 1 + longitudes[id(hijo)] + 2 * necesita_parentesis('NEGACION', hijo, True)
+        else:
+            izquierda, derecha = nodo.hijos
+            longitud = (len(nodo.valor) + longitudes[id(izquierda)] + longitudes[id(derecha)]
+                        + 2 * necesita_parentesis(nodo.tipo, izquierda, False)
+                        + 2 * necesita_parentesis(nodo.tipo, derecha, True))
+        longitudes[id(nodo)] = longitud
+    return longitudes
+
+def escribir_formula(ast, salida, ancho=None, sangria=2, tam_bloque=8192):
+    """
+    Escribe la fórmula en el flujo de texto salida con los paréntesis mínimos.
+    Sin ancho se escribe en una sola línea. Con ancho, una operación binaria
+    que no cabe en lo que queda de línea se parte antes de su operador y la
+    continuación se sangra según el nivel de paréntesis (hasta la mitad del
+    ancho). El analizador léxico ignora los saltos y los espacios, así que el
+    texto se vuelve a leer igual.
+    Es iterativa y escribe por bloques de tam_bloque fragmentos.
+    Devuelve el número de caracteres escritos.
+    """
+    longitudes = longitudes_planas(ast) if ancho else None
+    bloque = []
+    escritos = 0
+    columna = 0
+    # Elementos de la pila: texto, o (nodo, entre paréntesis, nivel de sangría, en una línea)
+    pila = [(ast, False, 0, not ancho)]
+    while pila:
+        elemento = pila.pop()
+        if isinstance(elemento, str):
+            bloque.append(elemento)
+            escritos += len(elemento)
+            columna = len(elemento) - elemento.rfind('\n') - 1 if '\n' in elemento else columna + len(elemento)
+            if len(bloque) >= tam_bloque:
+                salida.write("".join(bloque))
+                bloque.clear()
+            continue
+
+        nodo, parentesis, nivel, plano = elemento
+        if not plano:
+            plano = not nodo.hijos or columna + longitudes[id(nodo)] + 2 * parentesis <= ancho
+        if parentesis:
+            pila.append(')')
+            nivel += 1
+        if not nodo.hijos:
+            pila.append(str(nodo.valor))
+        elif nodo.tipo == 'NEGACION':
+            hijo = nodo.hijos[0]
+            pila.append((hijo, necesita_parentesis('NEGACION', hijo, True), nivel, plano))
+            pila.append('~')
+        else:
+            izquierda, derecha = nodo.hijos
+            pila.append((derecha, necesita_parentesis(nodo.tipo, derecha, True), nivel, plano))
+            if plano:
+                pila.append(nodo.valor)
+            else:
+                pila.append("\n" + " " * min(sangria * nivel, ancho // 2) + nodo.valor + " ")
+            pila.append((izquierda, necesita_parentesis(nodo.tipo, izquierda, False), nivel, plano))
+        if parentesis:
+            pila.append('(')
+
+    if bloque:
+        salida.write("".join(bloque))
+    return escritos
+
+def formatear_formula(ast, ancho=None, sangria=2):
+    """
+    Texto de la fórmula con los paréntesis mínimos (ver escribir_formula)
+    """
+    salida = io.StringIO()
+    escribir_formula(ast, salida, ancho, sangria)
+    return salida.getvalue()
+
+def formatear_expresion(expresion, ancho=None):
+    """
+    Analiza la expresión y la devuelve con los paréntesis mínimos, o None si es inválida
+    """
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+    if ast is None:
+        return None
+    return formatear_formula(ast, ancho)
+
+def pares_parentesis(texto):
+    """
+    Posiciones (apertura, cierre) de cada par de paréntesis del texto
+    """
+    abiertos = []
+    pares = []
+    for posicion, caracter in enumerate(texto):
+        if caracter == '(':
+            abiertos.append(posicion)
+        elif caracter == ')':
+            pares.append((abiertos.pop(), posicion))
+    return pares
+
+if __name__ == "__main__":
+    import contextlib
+    import random
+    from analizador_sintactico import hash_estructural
+    from gramatica_sistema_L import generar_formula_aleatoria
+
+    if len(sys.argv) >= 2:
+        # Uso: python impresor_formulas.py "expresión" [ancho]
+        ancho = int(sys.argv[2]) if len(sys.argv) >= 3 else None
+        texto = formatear_expresion(sys.argv[1], ancho)
+        if texto is None:
+            sys.exit(1)
+        print(texto)
+        sys.exit(0)
+
+    expresiones_prueba = [
+        "((p^q))",
+        "(p^q)^r",
+        "p^(q^r)",
+        "~(~p)",
+        "(~p)^q",
+        "~(p^q)",
+        "((p=>q)=>r)<=>(p=>(q=>r))",
+        "(p o q) ^ (r o s)",
+        "((x_1^x_2)=>x_10)",
+    ]
+    print("=== IMPRESIÓN CON PARÉNTESIS MÍNIMOS ===")
+    for expr in expresiones_prueba:
+        print(f"{expr:30} -> {formatear_expresion(expr)}")
+
+    print("\n--- Con saltos de línea (ancho 30) ---")
+    expr = generar_formula_aleatoria(random.Random(1), 40, prob_parentesis=0.8)
+    print(formatear_expresion(expr, ancho=30))
+
+    def analizar(texto, motor):
+        with contextlib.redirect_stdout(io.StringIO()):
+            ast, _ = analizar_sintacticamente(texto, motor=motor, construir_grafo=False)
+        return ast
+
+    # Ida y vuelta: el texto impreso debe analizarse al mismo árbol con ambos
+    # motores, volver a imprimirse igual y no tener ningún par de paréntesis
+    # que pueda quitarse sin cambiar el árbol
+    print("\n=== PRUEBA DE IDA Y VUELTA ===")
+    generador = random.Random(40)
+    pruebas = errores = pares_revisados = 0
+    for _ in range(1000):
+        expr = generar_formula_aleatoria(generador, generador.randint(1, 60),
+                                         prob_parentesis=generador.random())
+        ast = analizar(expr, 'pratt')
+        ancho = generador.choice((None, 10, 40, 80))
+        texto = formatear_formula(ast, ancho)
+        pruebas += 1
+        esperado = hash_estructural(ast)
+        correcto = all(
+            (nuevo := analizar(texto, motor)) is not None
+            and hash_estructural(nuevo) == esperado
+            and formatear_formula(nuevo, ancho) == texto
+            for motor in ('ply', 'pratt'))
+        if correcto and len(texto) < 200:
+            for apertura, cierre in pares_parentesis(texto):
+                pares_revisados += 1
+                sin_par = texto[:apertura] + texto[apertura + 1:cierre] + texto[cierre + 1:]
+                reducido = analizar(sin_par, 'pratt')
+                if reducido is not None and hash_estructural(reducido) == esperado:
+                    correcto = False
+        if not correcto:
+            errores += 1
+            print(f"  Error con {expr!r} (ancho {ancho}): {texto!r}")
+    print(f"Fórmulas correctas: {pruebas - errores}/{pruebas} "
+          f"({pares_revisados} pares de paréntesis comprobados como necesarios)")
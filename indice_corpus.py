@@ -0,0 +1,363 @@
+# Índice Invertido sobre un Corpus de Fórmulas del Sistema L
+# Listas de apariciones por variable, operador y subfórmula, con índices de
+# profundidad y tamaño para consultas estructurales
+
+import os
+import pickle
+import tempfile
+import uuid
+from array import array
+from analizador_sintactico import SIMBOLOS_OPERADOR, analizar_sintacticamente, hash_estructural, hash_nodo, tabla_simbolos
+
+def caracteristicas_formula(ast):
+    """
+    Recorre el AST una sola vez (postorden iterativo) y devuelve las
+    características que indexa el corpus:
+      (símbolos de variable, operadores, hashes de subfórmulas, profundidad, tamaño)
+    La profundidad cuenta niveles: una variable aislada tiene profundidad 1.
+    """
+    variables = set()
+    operadores = set()
+    subformulas = set()
+    # id(nodo) -> (hash, profundidad)
+    calculados = {}
+    tamano = 0
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if not visitado:
+            pila.append((nodo, True))
+            pila.extend((hijo, False) for hijo in nodo.hijos)
+            continue
+        tamano += 1
+        if nodo.tipo == 'VARIABLE':
+            variables.add(nodo.simbolo)
+        elif nodo.tipo in SIMBOLOS_OPERADOR:
+            operadores.add(SIMBOLOS_OPERADOR[nodo.tipo])
+        hijos = [calculados[id(hijo)] for hijo in nodo.hijos]
+        hash_actual = hash_nodo(nodo.tipo, nodo.valor, [h for h, _ in hijos])
+        profundidad = 1 + max((p for _, p in hijos), default=0)
+        calculados[id(nodo)] = (hash_actual, profundidad)
+        subformulas.add(hash_actual)
+    _, profundidad = calculados[id(ast)]
+    return variables, operadores, subformulas, profundidad, tamano
+
+def _intersectar(listas):
+    """
+    Intersecta listas de identificadores empezando por la más corta
+    """
+    if not listas:
+        return set()
+    listas = sorted(listas, key=len)
+    resultado = set(listas[0])
+    for lista in listas[1:]:
+        if not resultado:
+            break
+        resultado.intersection_update(lista)
+    return resultado
+
+class IndiceCorpus:
+    """
+    Índice invertido de un corpus. Cada lista de apariciones es un
+    array('I') de identificadores en orden creciente, porque los documentos
+    se indexan siempre en orden de identificador.
+
+    En memoria las variables se indexan por su símbolo en tabla_simbolos;
+    en el archivo se guardan por nombre, porque los símbolos solo valen
+    dentro del proceso que los creó.
+    """
+
+    def __init__(self):
+        self.por_variable = {}
+        self.por_operador = {}
+        self.por_subformula = {}
+        self.por_profundidad = {}
+        self.por_tamano = {}
+        self.documentos = 0
+        # Identifica el índice en la cabecera de su archivo
+        self.identificador = uuid.uuid4().hex
+        # Apariciones agregadas desde la última vez que se guardó el índice
+        self._pendiente = self._segmento_vacio()
+        # (ruta, tamaño) del archivo con el que el índice está sincronizado
+        self._sincronizado = None
+
+    @staticmethod
+    def _segmento_vacio():
+        return {
+            'por_variable': {},
+            'por_operador': {},
+            'por_subformula': {},
+            'por_profundidad': {},
+            'por_tamano': {},
+        }
+
+    @staticmethod
+    def _segmento_en_disco(segmento):
+        """
+        Copia superficial del segmento con las variables indexadas por nombre
+        """
+        en_disco = dict(segmento)
+        en_disco['por_variable'] = {tabla_simbolos.nombre(simbolo): lista
+                                    for simbolo, lista in segmento['por_variable'].items()}
+        return en_disco
+
+    @staticmethod
+    def _agregar_aparicion(tabla, clave, identificador):
+        lista = tabla.get(clave)
+        if lista is None:
+            lista = tabla[clave] = array('I')
+        lista.append(identificador)
+
+    def indexar_formula(self, identificador, ast):
+        """
+        Agrega una fórmula al índice. Los identificadores deben llegar en orden
+        creciente y sin huecos, igual que en el almacén de corpus.
+        """
+        if identificador != self.documentos:
+            raise ValueError(f"Se esperaba el identificador {self.documentos}, se recibió {identificador}")
+        variables, operadores, subformulas, profundidad, tamano = caracteristicas_formula(ast)
+        claves = (
+            ('por_variable', variables),
+            ('por_operador', operadores),
+            ('por_subformula', subformulas),
+            ('por_profundidad', (profundidad,)),
+            ('por_tamano', (tamano,)),
+        )
+        for nombre, valores in claves:
+            tabla = getattr(self, nombre)
+            pendiente = self._pendiente[nombre]
+            for valor in valores:
+                self._agregar_aparicion(tabla, valor, identificador)
+                self._agregar_aparicion(pendiente, valor, identificador)
+        self.documentos += 1
+
+    def actualizar(self, almacen):
+        """
+        Indexa solo las fórmulas del almacén que aún no están en el índice.
+        Devuelve la cantidad de fórmulas nuevas.
+        """
+        inicio = self.documentos
+        for identificador in range(inicio, len(almacen)):
+            self.indexar_formula(identificador, almacen.obtener_ast(identificador))
+        return self.documentos - inicio
+
+    def indexar_expresiones(self, expresiones):
+        """
+        Analiza e indexa expresiones de texto. Las inválidas se omiten y no
+        consumen identificador. Devuelve la lista de (identificador, expresión).
+        """
+        indexadas = []
+        for expresion in expresiones:
+            ast, _ = analizar_sintacticamente(expresion)
+            if ast is not None:
+                indexadas.append((self.documentos, expresion))
+                self.indexar_formula(self.documentos, ast)
+        return indexadas
+
+    @staticmethod
+    def _rango(tabla, minimo, maximo):
+        """
+        Une las listas de apariciones cuyas claves caen en [minimo, maximo]
+        """
+        resultado = set()
+        for valor, lista in tabla.items():
+            if (minimo is None or valor >= minimo) and (maximo is None or valor <= maximo):
+                resultado.update(lista)
+        return resultado
+
+    def consultar(self, variables=(), operadores=(), subformulas=(),
+                  profundidad_min=None, profundidad_max=None,
+                  tamano_min=None, tamano_max=None):
+        """
+        Devuelve la lista ordenada de identificadores que cumplen todos los
+        criterios. Las subfórmulas se dan como texto, por ejemplo "(p=>q)".
+        Sin criterios devuelve todo el corpus.
+        """
+        listas = []
+        vacio = array('I')
+        for variable in variables:
+            simbolo = tabla_simbolos.simbolos.get(variable)
+            listas.append(vacio if simbolo is None else self.por_variable.get(simbolo, vacio))
+        for operador in operadores:
+            listas.append(self.por_operador.get(operador, vacio))
+        for subformula in subformulas:
+            ast, _ = analizar_sintacticamente(subformula)
+            if ast is None:
+                raise ValueError(f"Subfórmula inválida en la consulta: {subformula}")
+            listas.append(self.por_subformula.get(hash_estructural(ast), vacio))
+
+        # Los criterios más selectivos se intersectan primero; los rangos
+        # solo se calculan si aún quedan candidatos
+        candidatos = _intersectar(listas) if listas else None
+        if candidatos is not None and not candidatos:
+            return []
+        if profundidad_min is not None or profundidad_max is not None:
+            rango = self._rango(self.por_profundidad, profundidad_min, profundidad_max)
+            candidatos = rango if candidatos is None else candidatos & rango
+        if tamano_min is not None or tamano_max is not None:
+            rango = self._rango(self.por_tamano, tamano_min, tamano_max)
+            candidatos = rango if candidatos is None else candidatos & rango
+        if candidatos is None:
+            return list(range(self.documentos))
+        return sorted(candidatos)
+
+    @staticmethod
+    def _estado_archivo(ruta):
+        return os.path.realpath(ruta), os.path.getsize(ruta)
+
+    @staticmethod
+    def _identificador_archivo(ruta):
+        """
+        Identificador de la cabecera del archivo, o None si no tiene
+        (archivo de otro formato o de una versión anterior)
+        """
+        try:
+            with open(ruta, 'rb') as f:
+                registro = pickle.load(f)
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError, ValueError):
+            return None
+        return registro.get('identificador') if isinstance(registro, dict) else None
+
+    def guardar(self, ruta):
+        """
+        Persiste el índice de forma incremental: si el archivo es el que este
+        índice cargó o guardó por última vez (y nadie lo cambió), solo se le
+        agrega un segmento con las apariciones nuevas; si no existe se escribe
+        completo. Si pertenece a otro índice se lanza ValueError (compactar
+        lo reemplaza); si es de este índice pero no está sincronizado, se
+        reescribe completo.
+        """
+        if not os.path.exists(ruta):
+            self.compactar(ruta)
+            return
+        if self._sincronizado != self._estado_archivo(ruta):
+            if self._identificador_archivo(ruta) != self.identificador:
+                raise ValueError(f"El archivo {ruta} contiene otro índice; use compactar para reemplazarlo")
+            self.compactar(ruta)
+            return
+        if not any(self._pendiente.values()):
+            return
+        with open(ruta, 'ab') as f:
+            pickle.dump({'documentos': self.documentos, 'segmento': self._segmento_en_disco(self._pendiente)},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        self._pendiente = self._segmento_vacio()
+        self._sincronizado = self._estado_archivo(ruta)
+
+    def compactar(self, ruta):
+        """
+        Reescribe el archivo del índice como una cabecera y un único segmento
+        (escritura atómica)
+        """
+        segmento = self._segmento_en_disco({nombre: getattr(self, nombre) for nombre in self._segmento_vacio()})
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                pickle.dump({'identificador': self.identificador}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump({'documentos': self.documentos, 'segmento': segmento},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, ruta)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+        self._pendiente = self._segmento_vacio()
+        self._sincronizado = self._estado_archivo(ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un índice reproduciendo todos sus segmentos en orden
+        """
+        indice = cls()
+        with open(ruta, 'rb') as f:
+            while True:
+                try:
+                    registro = pickle.load(f)
+                except EOFError:
+                    break
+                if 'segmento' not in registro:
+                    # Cabecera (los archivos de versiones anteriores no la tienen)
+                    indice.identificador = registro['identificador']
+                    continue
+                for nombre, tabla_segmento in registro['segmento'].items():
+                    tabla = getattr(indice, nombre)
+                    for clave, lista in tabla_segmento.items():
+                        if nombre == 'por_variable':
+                            clave = tabla_simbolos.internar(clave)
+                        if clave in tabla:
+                            tabla[clave].extend(lista)
+                        else:
+                            tabla[clave] = array('I', lista)
+                indice.documentos = registro['documentos']
+        indice._sincronizado = cls._estado_archivo(ruta)
+        return indice
+
+    def resumen(self):
+        return {
+            'documentos': self.documentos,
+            'variables': len(self.por_variable),
+            'operadores': len(self.por_operador),
+            'subformulas_distintas': len(self.por_subformula),
+            'profundidades': len(self.por_profundidad),
+            'tamanos': len(self.por_tamano),
+        }
+
+if __name__ == "__main__":
+    from almacen_corpus import crear_corpus
+
+    expresiones_prueba = [
+        "p",
+        "~~~q",
+        "(p^q)",
+        "(0=>(ros))",
+        "~(p^q)",
+        "(p<=>~p)",
+        "((p=>q)^p)",
+        "(~(p^(qor))os)",
+        "((p=>q)<=>r)",
+        "(r<=>(s^t))",
+    ]
+
+    print("=== ÍNDICE INVERTIDO DEL CORPUS ===")
+    with tempfile.TemporaryDirectory() as directorio:
+        almacen, _ = crear_corpus(os.path.join(directorio, "corpus.slc"), expresiones_prueba[:6])
+        ruta_indice = os.path.join(directorio, "corpus.sli")
+
+        indice = IndiceCorpus()
+        print(f"Fórmulas indexadas: {indice.actualizar(almacen)}")
+        indice.guardar(ruta_indice)
+
+        # Actualización incremental: solo se indexan las fórmulas nuevas
+        almacen.agregar_varios((e, analizar_sintacticamente(e)[0]) for e in expresiones_prueba[6:])
+        indice = IndiceCorpus.cargar(ruta_indice)
+        print(f"Fórmulas nuevas indexadas: {indice.actualizar(almacen)}")
+        indice.guardar(ruta_indice)
+        indice = IndiceCorpus.cargar(ruta_indice)
+        print(f"Resumen: {indice.resumen()}")
+
+        # Un índice distinto no agrega segmentos al archivo de otro
+        otro = IndiceCorpus()
+        otro.indexar_expresiones(["(p^q)"])
+        try:
+            otro.guardar(ruta_indice)
+            print("❌ Se agregó un segmento de otro índice")
+        except ValueError as e:
+            print(f"✅ {e}")
+        print(f"Documentos tras recargar: {IndiceCorpus.cargar(ruta_indice).documentos}")
+
+        consultas = [
+            ("usan r y <=> con profundidad <= 6",
+             dict(variables=['r'], operadores=['<=>'], profundidad_max=6)),
+            ("contienen (p=>q)", dict(subformulas=['(p=>q)'])),
+            ("tienen tamaño entre 4 y 5", dict(tamano_min=4, tamano_max=5)),
+        ]
+        for descripcion, criterios in consultas:
+            resultado = indice.consultar(**criterios)
+            print(f"\nFórmulas que {descripcion}:")
+            for identificador in resultado:
+                print(f"  {identificador}: {almacen.obtener_texto(identificador)}")
+        almacen.cerrar()
@@ -0,0 +1,275 @@
+# Límites de Recursos para Entradas No Confiables
+# Presupuestos de longitud, tokens, profundidad, nodos y tiempo por etapa que
+# el lexer, los motores del parser y la construcción del grafo comprueban
+# mientras trabajan, para abortar en cuanto se superan
+
+import sys
+import time
+
+# Etapas con presupuesto de tiempo propio (segundos de reloj)
+TIEMPOS_PREDETERMINADOS = {
+    'lexico': 1.0,
+    'sintactico': 2.0,
+    'grafo': 5.0,
+    'renderizado': 30.0,
+}
+
+DESCRIPCIONES_LIMITE = {
+    'caracteres': "longitud de la entrada",
+    'tokens': "cantidad de tokens",
+    'profundidad': "profundidad de anidamiento",
+    'nodos': "cantidad de nodos",
+    'nodos_renderizado': "nodos para dibujar",
+    'tiempo': "tiempo",
+}
+
+# Cada cuántos nodos se consulta el reloj
+INTERVALO_RELOJ = 1024
+
+class ErrorLimiteRecursos(Exception):
+    """
+    Se lanza cuando una entrada supera uno de los límites. Los atributos
+    describen cuál (limite), su valor máximo, el valor alcanzado y la etapa
+    en la que se detectó; a_diccionario() los devuelve listos para JSON.
+    """
+
+    def __init__(self, limite, maximo, valor, etapa):
+        self.limite = limite
+        self.maximo = maximo
+        self.valor = valor
+        self.etapa = etapa
+        if limite == 'tiempo':
+            detalle = f"{valor:.3f} s > {maximo} s"
+        else:
+            detalle = f"{valor} > {maximo}"
+        super().__init__(f"Límite de {DESCRIPCIONES_LIMITE[limite]} superado en la etapa {etapa}: {detalle}")
+
+    def a_diccionario(self):
+        return {
+            'limite': self.limite,
+            'maximo': self.maximo,
+            'valor': self.valor,
+            'etapa': self.etapa,
+        }
+
+class LimitesRecursos:
+    """
+    Configuración de los presupuestos. Un límite en None no se comprueba.
+    La profundidad cuenta niveles del árbol (una variable tiene 1); con el
+    valor predeterminado las funciones recursivas como imprimir_arbol no
+    alcanzan el límite de recursión de Python.
+    """
+
+    def __init__(self, max_caracteres=100000, max_tokens=50000, max_profundidad=500,
+                 max_nodos=50000, max_nodos_renderizado=300, tiempos=None):
+        self.max_caracteres = max_caracteres
+        self.max_tokens = max_tokens
+        self.max_profundidad = max_profundidad
+        self.max_nodos = max_nodos
+        self.max_nodos_renderizado = max_nodos_renderizado
+        self.tiempos = dict(TIEMPOS_PREDETERMINADOS)
+        if tiempos:
+            self.tiempos.update(tiempos)
+
+    def controlar(self):
+        """
+        Nuevo control para analizar una entrada con estos límites
+        """
+        return ControlRecursos(self)
+
+class ControlRecursos:
+    """
+    Estado de una entrada durante su análisis: etapa actual, plazo de esa
+    etapa, nodos creados y profundidad de los subárboles que aún no tienen
+    padre. Las reglas de PLY llaman a registrar_nodo por cada NodoAST que
+    crean; la profundidad de cada hijo se retira del diccionario al
+    registrarse el padre, así que su tamaño no pasa del de la pila del
+    parser. Las hojas (profundidad 1) no se guardan. El motor Pratt lleva
+    esas cuentas en variables propias y solo llama a comprobar_nodos.
+    """
+
+    __slots__ = ('limites', 'etapa', 'inicio', 'plazo', 'nodos', 'profundidades',
+                 'max_nodos', 'max_profundidad')
+
+    def __init__(self, limites):
+        self.limites = limites
+        self.nodos = 0
+        self.profundidades = {}
+        # Límites desactivados como enteros inalcanzables: una comparación por nodo
+        self.max_nodos = sys.maxsize if limites.max_nodos is None else limites.max_nodos
+        self.max_profundidad = sys.maxsize if limites.max_profundidad is None else limites.max_profundidad
+        self.iniciar_etapa('lexico')
+
+    def iniciar_etapa(self, etapa):
+        self.etapa = etapa
+        self.inicio = time.perf_counter()
+        maximo = self.limites.tiempos.get(etapa)
+        self.plazo = None if maximo is None else self.inicio + maximo
+
+    def comprobar_tiempo(self):
+        if self.plazo is not None:
+            ahora = time.perf_counter()
+            if ahora > self.plazo:
+                raise ErrorLimiteRecursos('tiempo', self.limites.tiempos[self.etapa],
+                                          ahora - self.inicio, self.etapa)
+
+    def comprobar_texto(self, texto):
+        maximo = self.limites.max_caracteres
+        if maximo is not None and len(texto) > maximo:
+            raise ErrorLimiteRecursos('caracteres', maximo, len(texto), self.etapa)
+
+    def comprobar_tokens(self, cantidad):
+        maximo = self.limites.max_tokens
+        if maximo is not None and cantidad > maximo:
+            raise ErrorLimiteRecursos('tokens', maximo, cantidad, self.etapa)
+        self.comprobar_tiempo()
+
+    def registrar_nodo(self, nodo):
+        """
+        Cuenta un nodo recién creado (sus hijos ya registrados) y comprueba
+        los límites de nodos y de profundidad, y el reloj cada INTERVALO_RELOJ nodos
+        """
+        self.nodos += 1
+        if self.nodos > self.max_nodos:
+            raise ErrorLimiteRecursos('nodos', self.max_nodos, self.nodos, self.etapa)
+        if not self.nodos % INTERVALO_RELOJ:
+            self.comprobar_tiempo()
+        hijos = nodo.hijos
+        if not hijos:
+            return
+        profundidades = self.profundidades
+        profundidad = profundidades.pop(id(hijos[0]), 1) + 1
+        if len(hijos) == 2:
+            derecha = profundidades.pop(id(hijos[1]), 1) + 1
+            if derecha > profundidad:
+                profundidad = derecha
+        if profundidad > self.max_profundidad:
+            raise ErrorLimiteRecursos('profundidad', self.max_profundidad, profundidad, self.etapa)
+        profundidades[id(nodo)] = profundidad
+
+    def comprobar_nodos(self, nodos):
+        """
+        Para los motores que cuentan sus nodos en una variable local: comprueba
+        el límite de nodos y el reloj, y devuelve la cantidad de nodos con la
+        que deben volver a llamar (a lo sumo INTERVALO_RELOJ nodos después)
+        """
+        self.nodos = nodos
+        if nodos > self.max_nodos:
+            raise ErrorLimiteRecursos('nodos', self.max_nodos, nodos, self.etapa)
+        if nodos:
+            self.comprobar_tiempo()
+        return min(nodos + INTERVALO_RELOJ, self.max_nodos + 1)
+
+    def avanzar(self, cantidad):
+        """
+        Para los recorridos que visitan nodos ya registrados (construcción
+        del grafo): consulta el reloj cada INTERVALO_RELOJ visitas
+        """
+        if not cantidad % INTERVALO_RELOJ:
+            self.comprobar_tiempo()
+
+    def comprobar_renderizado(self, nodos):
+        """
+        Empieza la etapa 'renderizado' y rechaza los grafos demasiado grandes
+        para dibujarlos. El dibujo de matplotlib no puede interrumpirse, así
+        que su plazo solo se comprueba entre el layout y el dibujo.
+        """
+        self.iniciar_etapa('renderizado')
+        maximo = self.limites.max_nodos_renderizado
+        if maximo is not None and nodos > maximo:
+            raise ErrorLimiteRecursos('nodos_renderizado', maximo, nodos, self.etapa)
+
+# Límites usados por main.py y por el servicio de validación
+LIMITES_PREDETERMINADOS = LimitesRecursos()
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    from analizador_sintactico import analizar_sintacticamente, hash_estructural, MOTORES
+    from gramatica_sistema_L import generar_formula_aleatoria
+    from generador_grafos import crear_grafo_expresion
+    import random
+    # El analizador usa las clases del módulo importado, no las de __main__
+    from limites_recursos import ErrorLimiteRecursos, LimitesRecursos
+
+    def intentar(expresion, limites, motor, construir_grafo=False):
+        """
+        Analiza con límites y devuelve (resultado, segundos), donde resultado
+        es el error de límite o 'válida'/'inválida'
+        """
+        inicio = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                ast, _ = analizar_sintacticamente(expresion, motor=motor, construir_grafo=construir_grafo,
+                                                  limites=limites)
+            resultado = 'válida' if ast is not None else 'inválida'
+        except ErrorLimiteRecursos as error:
+            resultado = error
+        return resultado, time.perf_counter() - inicio
+
+    limites = LimitesRecursos()
+    print("=== ENTRADAS ADVERSARIAS ===")
+    profundo = 200000
+    adversarias = [
+        ("texto de 10 MB", "p" * (10 * 1024 * 1024), limites, 'caracteres'),
+        # PLY tokeniza mientras analiza: sin desactivar los demás límites la
+        # profundidad de la cadena se superaría antes que los tokens
+        ("60 000 tokens", "p^" * 30000 + "p",
+         LimitesRecursos(max_caracteres=None, max_profundidad=None, max_nodos=None), 'tokens'),
+        (f"{profundo} negaciones", "~" * profundo + "p",
+         LimitesRecursos(max_caracteres=None, max_tokens=None), 'profundidad'),
+        (f"{profundo} paréntesis", "(" * profundo + "p" + ")" * profundo,
+         LimitesRecursos(max_caracteres=None, max_tokens=None), None),
+        ("implicaciones anidadas a la derecha", "p=>(" * 5000 + "p" + ")" * 5000,
+         LimitesRecursos(max_caracteres=None, max_tokens=None), 'profundidad'),
+        ("cadena de 40 000 conjunciones", "p^" * 40000 + "p",
+         LimitesRecursos(max_caracteres=None, max_tokens=None), 'profundidad'),
+        ("fórmula ancha de 200 000 nodos", generar_formula_aleatoria(random.Random(50), 200000),
+         LimitesRecursos(max_caracteres=None, max_tokens=None, max_profundidad=None), 'nodos'),
+        ("plazo sintáctico de 1 ms", generar_formula_aleatoria(random.Random(50), 200000),
+         LimitesRecursos(max_caracteres=None, max_tokens=None, max_profundidad=None, max_nodos=None,
+                         tiempos={'sintactico': 0.001}), 'tiempo'),
+    ]
+    correctas = 0
+    for descripcion, expresion, limites_caso, esperado in adversarias:
+        for motor in MOTORES:
+            resultado, segundos = intentar(expresion, limites_caso, motor)
+            obtenido = resultado.limite if isinstance(resultado, ErrorLimiteRecursos) else None
+            correcta = obtenido == esperado and (esperado is not None or resultado == 'válida')
+            correctas += correcta
+            print(f"{'✅' if correcta else '❌'} {descripcion:36} {motor:5} {segundos * 1000:8.1f} ms  {resultado}")
+    print(f"Casos correctos: {correctas}/{2 * len(adversarias)}")
+
+    # Construcción del grafo y dibujo
+    ast, _ = analizar_sintacticamente(generar_formula_aleatoria(random.Random(50), 5000), motor='pratt',
+                                      construir_grafo=False)
+    control = LimitesRecursos(tiempos={'grafo': 0.0}).controlar()
+    try:
+        crear_grafo_expresion(ast, control=control)
+        print("❌ El grafo debió superar su plazo")
+    except ErrorLimiteRecursos as error:
+        print(f"✅ {error}")
+    try:
+        limites.controlar().comprobar_renderizado(5000)
+        print("❌ El dibujo debió rechazarse")
+    except ErrorLimiteRecursos as error:
+        print(f"✅ {error}")
+        print(f"   {error.a_diccionario()}")
+
+    # Con límites holgados el resultado es el mismo que sin límites
+    print("\n=== FÓRMULAS NORMALES ===")
+    generador = random.Random(50)
+    iguales = total = 0
+    for _ in range(300):
+        expresion = generar_formula_aleatoria(generador, generador.randint(1, 200), prob_parentesis=0.5)
+        if generador.random() < 0.2:
+            expresion = expresion[:generador.randint(0, len(expresion))]  # a veces inválida
+        for motor in MOTORES:
+            with contextlib.redirect_stdout(io.StringIO()):
+                libre, _ = analizar_sintacticamente(expresion, motor=motor)
+                limitado, _ = analizar_sintacticamente(expresion, motor=motor, limites=limites)
+            total += 1
+            iguales += ((libre is None and limitado is None) or
+                        (libre is not None and limitado is not None
+                         and hash_estructural(libre) == hash_estructural(limitado)))
+    print(f"Mismo resultado con y sin límites: {iguales}/{total}")
@@ -5,9 +5,21 @@
 import sys
 import os
 import re
+import hashlib
 from analizador_lexico import analizar_lexicamente, lexer
 from analizador_sintactico import analizar_sintacticamente, imprimir_arbol
-from generador_grafos import visualizar_grafo, generar_reporte_grafo, exportar_grafo_dot
+from generador_grafos import (
+    visualizar_grafo,
+    generar_reporte_grafo,
+    exportar_grafo_dot,
+    exportar_grafo,
+    crear_grafo_expresion,
+    comparar_modos_grafo,
+    generar_reporte_modos,
+    FORMATOS_EXPORTACION
+)
+from cache_resultados import CacheResultados, obtener_ast, obtener_layout
+from limites_recursos import ErrorLimiteRecursos, LIMITES_PREDETERMINADOS
 from automata_finito import crear_automata_alfabeto, visualizar_automata, generar_tabla_transiciones
 from gramatica_sistema_L import (
     mostrar_gramatica_formal, 
@@ -16,6 +28,12 @@ from gramatica_sistema_L import (
     validar_expresion_gramatica
 )
 
+# Caché en disco de árboles, layouts, imágenes y exportaciones (ver cache_resultados.py)
+cache = CacheResultados()
+
+# Presupuestos para las expresiones que escribe el usuario (ver limites_recursos.py)
+limites = LIMITES_PREDETERMINADOS
+
 def limpiar_nombre_archivo(expresion):
     """
     Limpia una expresión para usarla como nombre de archivo válido
@@ -33,9 +51,12 @@ def limpiar_nombre_archivo(expresion):
     # Remover caracteres no válidos para nombres de archivo
     nombre = re.sub(r'[<>:"/\\|?*]', '_', nombre)
     
-    # Limitar la longitud del nombre
+    # Limitar la longitud del nombre; al recortar se añade un hash de la
+    # expresión completa para que dos expresiones con el mismo prefijo no
+    # compartan archivo
     if len(nombre) > 50:
-        nombre = nombre[:50]
+        resumen = hashlib.blake2b(expresion.encode('utf-8'), digest_size=4).hexdigest()
+        nombre = nombre[:41] + '_' + resumen
     
     return nombre
 
@@ -73,6 +94,8 @@ def analizar_expresion_completa(expresion):
     # 1. Análisis Léxico
     print("\n1. ANÁLISIS LÉXICO:")
     print("-" * 30)
+    control = limites.controlar()
+    control.comprobar_texto(expresion)
     tokens = analizar_lexicamente(expresion)
     if tokens:
         print("Tokens encontrados:")
@@ -85,13 +108,14 @@ def analizar_expresion_completa(expresion):
     # 2. Análisis Sintáctico
     print("\n2. ANÁLISIS SINTÁCTICO:")
     print("-" * 30)
-    ast, grafo = analizar_sintacticamente(expresion)
+    ast, en_cache = obtener_ast(cache, expresion, limites=limites)
     
     if ast is None:
         print("❌ Error en el análisis sintáctico")
         return False
     
-    print("✅ Expresión sintácticamente correcta")
+    print("✅ Expresión sintácticamente correcta" + (" (árbol recuperado de la caché)" if en_cache else ""))
+    grafo = crear_grafo_expresion(ast, control=control)
     print("\nÁrbol Sintáctico:")
     imprimir_arbol(ast)
     
@@ -100,13 +124,31 @@ def analizar_expresion_completa(expresion):
     print("-" * 30)
     if grafo:
         print(generar_reporte_grafo(grafo, expresion))
+        print(generar_reporte_modos(ast))
         
         # Preguntar si mostrar el grafo
         respuesta = input("\n¿Desea visualizar el grafo? (s/n): ").lower().strip()
         if respuesta in ['s', 'si', 'sí', 'y', 'yes']:
+            # Con subfórmulas repetidas se ofrece el modo DAG, más pequeño
+            modo = 'arbol'
+            conteos = comparar_modos_grafo(ast)
+            if conteos['dag'][0] < conteos['arbol'][0]:
+                respuesta = input("¿Compartir las subfórmulas repetidas (modo DAG)? (s/n): ").lower().strip()
+                if respuesta in ['s', 'si', 'sí', 'y', 'yes']:
+                    modo = 'dag'
+                    grafo = crear_grafo_expresion(ast, modo=modo, control=control)
             try:
+                control.comprobar_renderizado(grafo.number_of_nodes())
                 nombre_archivo = f"grafo_{limpiar_nombre_archivo(expresion)}.png"
-                visualizar_grafo(grafo, expresion, nombre_archivo)
+                pos, _ = obtener_layout(cache, expresion, grafo, modo)
+                control.comprobar_tiempo()
+                clave = cache.clave('png', expresion, modo)
+                if cache.copiar_a(clave, 'png', nombre_archivo):
+                    print(f"Grafo guardado en: {nombre_archivo} (desde la caché)")
+                    visualizar_grafo(grafo, expresion, None, pos)
+                else:
+                    visualizar_grafo(grafo, expresion, nombre_archivo, pos)
+                    cache.guardar_archivo(clave, 'png', nombre_archivo)
             except Exception as e:
                 print(f"Error al visualizar el grafo: {e}")
     else:
@@ -189,7 +231,7 @@ def validar_multiples_expresiones():
     print(f"{'='*60}")
     
     for i, expr in enumerate(expresiones, 1):
-        valida, mensaje = validar_expresion_gramatica(expr)
+        valida, mensaje = validar_expresion_gramatica(expr, limites)
         estado = "✅" if valida else "❌"
         print(f"{i:2d}. {estado} {expr:20} - {mensaje}")
 
@@ -203,6 +245,7 @@ def mostrar_ayuda():
 ╠══════════════════════════════════════════════════════════════╣
 ║ ALFABETO DEL SISTEMA L:                                      ║
 ║ • Variables: p, q, r, s, t, u, v, w, x, y, z                 ║
+║   con subíndice opcional: p12, x_1043                        ║
 ║ • Operadores: ~ (negación), ^ (conjunción), o (disyunción)  ║
 ║              => (implicación), <=> (bicondicional)           ║
 ║ • Paréntesis: ( )                                            ║
@@ -215,6 +258,9 @@ def mostrar_ayuda():
 ║ 4. => (implicación)                                          ║
 ║ 5. <=> (bicondicional)                                       ║
 ║                                                              ║
+║ LÍMITES: 100000 caracteres, 50000 tokens y nodos,            ║
+║ profundidad 500, grafos de hasta 300 nodos para dibujar      ║
+║                                                              ║
 ║ EJEMPLOS VÁLIDOS:                                            ║
 ║ • p                                                          ║
 ║ • ~q                                                         ║
@@ -227,6 +273,7 @@ def mostrar_ayuda():
 ║ • grafo_[expresion].png - Visualización del grafo           ║
 ║ • automata_sistema_L.png - Diagrama del autómata            ║
 ║ • *.dot - Archivos en formato DOT para Graphviz             ║
+║ • .cache_sistema_L/ - Caché de resultados                   ║
 ╚══════════════════════════════════════════════════════════════╝
 """
     print(ayuda)
@@ -262,6 +309,7 @@ def main():
                 expresion = input("\nIngrese la expresión para análisis léxico: ").strip()
                 if expresion:
                     print(f"\nAnálisis léxico de: {expresion}")
+                    limites.controlar().comprobar_texto(expresion)
                     tokens = analizar_lexicamente(expresion)
                     if tokens:
                         for i, (tipo, valor) in enumerate(tokens, 1):
@@ -273,7 +321,7 @@ def main():
                 expresion = input("\nIngrese la expresión para análisis sintáctico: ").strip()
                 if expresion:
                     print(f"\nAnálisis sintáctico de: {expresion}")
-                    ast, grafo = analizar_sintacticamente(expresion)
+                    ast, grafo = analizar_sintacticamente(expresion, limites=limites)
                     if ast:
                         print("✅ Expresión sintácticamente correcta")
                         print("\nÁrbol sintáctico:")
@@ -307,10 +355,23 @@ def main():
             elif opcion == '8':
                 expresion = input("\nIngrese la expresión para exportar: ").strip()
                 if expresion:
-                    ast, grafo = analizar_sintacticamente(expresion)
-                    if grafo:
-                        archivo = f"grafo_{limpiar_nombre_archivo(expresion)}.dot"
-                        exportar_grafo_dot(grafo, expresion, archivo)
+                    ast, _ = obtener_ast(cache, expresion, limites=limites)
+                    if ast is not None:
+                        modo = input("Modo del grafo (arbol/dag) [arbol]: ").strip().lower() or 'arbol'
+                        formato = input("Formato (dot/graphml/json/svg) [dot]: ").strip().lower() or 'dot'
+                        archivo = f"grafo_{limpiar_nombre_archivo(expresion)}.{formato}"
+                        clave = cache.clave('exportacion', expresion, modo, formato)
+                        if cache.copiar_a(clave, formato, archivo):
+                            print(f"Grafo exportado en: {archivo} (desde la caché)")
+                        else:
+                            grafo = crear_grafo_expresion(ast, modo=modo, control=limites.controlar())
+                            if grafo is not None:
+                                if formato == 'dot':
+                                    exportar_grafo_dot(grafo, expresion, archivo)
+                                else:
+                                    exportar_grafo(grafo, expresion, archivo, formato)
+                                if formato == 'dot' or formato in FORMATOS_EXPORTACION:
+                                    cache.guardar_archivo(clave, formato, archivo)
                     else:
                         print("❌ No se pudo generar el grafo")
             
@@ -323,10 +384,35 @@ def main():
         except KeyboardInterrupt:
             print("\n\nPrograma interrumpido por el usuario.")
             break
+        except ErrorLimiteRecursos as e:
+            print(f"❌ {e}")
         except Exception as e:
             print(f"❌ Error inesperado: {e}")
         
         input("\nPresione Enter para continuar...")
 
+def perfilar_desde_linea_comandos(argumentos):
+    """
+    Modo sin menú: python main.py --perfil-memoria "expresión" [salida.json] [--sin-render]
+    Mide la memoria de cada etapa del análisis de la expresión
+    """
+    from perfil_memoria import perfilar_expresion, generar_reporte_memoria
+
+    renderizar = '--sin-render' not in argumentos
+    argumentos = [a for a in argumentos if a != '--sin-render']
+    if not argumentos:
+        print("Uso: python main.py --perfil-memoria \"expresión\" [salida.json] [--sin-render]")
+        return 1
+    perfil = perfilar_expresion(argumentos[0], renderizar=renderizar)
+    if perfil is None:
+        print("❌ Expresión inválida")
+        return 1
+    print(generar_reporte_memoria(perfil))
+    if len(argumentos) >= 2:
+        perfil.exportar_json(argumentos[1])
+    return 0
+
 if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == '--perfil-memoria':
+        sys.exit(perfilar_desde_linea_comandos(sys.argv[2:]))
     main()
\ No newline at end of file
@@ -0,0 +1,39 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftBICONDICIONALleftIMPLICACIONleftDISYUNCIONleftCONJUNCIONrightNEGACIONBICONDICIONAL CONJUNCION CONSTANTE DISYUNCION IMPLICACION NEGACION PARDER PARIZQ VARIABLEformula : expresionexpresion : VARIABLEexpresion : CONSTANTEexpresion : NEGACION expresion %prec NEGACIONexpresion : expresion CONJUNCION expresionexpresion : expresion DISYUNCION expresionexpresion : expresion IMPLICACION expresionexpresion : expresion BICONDICIONAL expresionexpresion : PARIZQ expresion PARDER'
+    
+_lr_action_items = {'VARIABLE':([0,5,6,7,8,9,10,],[3,3,3,3,3,3,3,]),'CONSTANTE':([0,5,6,7,8,9,10,],[4,4,4,4,4,4,4,]),'NEGACION':([0,5,6,7,8,9,10,],[5,5,5,5,5,5,5,]),'PARIZQ':([0,5,6,7,8,9,10,],[6,6,6,6,6,6,6,]),'$end':([1,2,3,4,11,13,14,15,16,17,],[0,-1,-2,-3,-4,-5,-6,-7,-8,-9,]),'CONJUNCION':([2,3,4,11,12,13,14,15,16,17,],[7,-2,-3,-4,7,-5,7,7,7,-9,]),'DISYUNCION':([2,3,4,11,12,13,14,15,16,17,],[8,-2,-3,-4,8,-5,-6,8,8,-9,]),'IMPLICACION':([2,3,4,11,12,13,14,15,16,17,],[9,-2,-3,-4,9,-5,-6,-7,9,-9,]),'BICONDICIONAL':([2,3,4,11,12,13,14,15,16,17,],[10,-2,-3,-4,10,-5,-6,-7,-8,-9,]),'PARDER':([3,4,11,12,13,14,15,16,17,],[-2,-3,-4,17,-5,-6,-7,-8,-9,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'formula':([0,],[1,]),'expresion':([0,5,6,7,8,9,10,],[2,11,12,13,14,15,16,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> formula","S'",1,None,None,None),
+  ('formula -> expresion','formula',1,'p_formula','analizador_sintactico.py',62),
+  ('expresion -> VARIABLE','expresion',1,'p_expresion_variable','analizador_sintactico.py',70),
+  ('expresion -> CONSTANTE','expresion',1,'p_expresion_constante','analizador_sintactico.py',74),
+  ('expresion -> NEGACION expresion','expresion',2,'p_expresion_negacion','analizador_sintactico.py',79),
+  ('expresion -> expresion CONJUNCION expresion','expresion',3,'p_expresion_conjuncion','analizador_sintactico.py',84),
+  ('expresion -> expresion DISYUNCION expresion','expresion',3,'p_expresion_disyuncion','analizador_sintactico.py',88),
+  ('expresion -> expresion IMPLICACION expresion','expresion',3,'p_expresion_implicacion','analizador_sintactico.py',92),
+  ('expresion -> expresion BICONDICIONAL expresion','expresion',3,'p_expresion_bicondicional','analizador_sintactico.py',96),
+  ('expresion -> PARIZQ expresion PARDER','expresion',3,'p_expresion_parentesis','analizador_sintactico.py',101),
+]
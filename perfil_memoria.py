@@ -0,0 +1,226 @@
+# Perfil de Memoria del Sistema L
+# Mide con tracemalloc la memoria de cada etapa del análisis (léxico,
+# sintáctico, grafo, reporte y renderizado) y desglosa por tipo de objeto
+# lo que retiene el resultado de cada una
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+ETAPAS = ('lexico', 'sintactico', 'grafo', 'reporte', 'renderizado')
+
+def formato_bytes(cantidad):
+    """
+    Cantidad de bytes legible (B, KB, MB o GB con un decimal)
+    """
+    for unidad in ('B', 'KB', 'MB', 'GB'):
+        if abs(cantidad) < 1024 or unidad == 'GB':
+            return f"{cantidad:.1f} {unidad}"
+        cantidad /= 1024
+
+# Objetos compartidos por todo el programa: no se cuentan en el desglose
+_TIPOS_COMPARTIDOS = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                      types.MethodType, types.CodeType, types.FrameType)
+
+def desglose_por_tipo(raiz, max_objetos=1000000):
+    """
+    Recorre los objetos alcanzables desde raiz (con gc.get_referents, sin
+    recursión) y suma sys.getsizeof por tipo. No entra en módulos, clases ni
+    funciones. Devuelve ({tipo: (objetos, bytes)} ordenado por bytes, objetos
+    visitados, True si se alcanzó max_objetos).
+    """
+    vistos = set()
+    por_tipo = {}
+    pila = [raiz]
+    while pila and len(vistos) < max_objetos:
+        objeto = pila.pop()
+        if id(objeto) in vistos or isinstance(objeto, _TIPOS_COMPARTIDOS):
+            continue
+        vistos.add(id(objeto))
+        nombre = type(objeto).__name__
+        cantidad, total = por_tipo.get(nombre, (0, 0))
+        por_tipo[nombre] = (cantidad + 1, total + sys.getsizeof(objeto))
+        pila.extend(gc.get_referents(objeto))
+    ordenado = dict(sorted(por_tipo.items(), key=lambda par: par[1][1], reverse=True))
+    return ordenado, len(vistos), bool(pila)
+
+class PerfilMemoria:
+    """
+    Registro de memoria por etapa. Cada llamada a medir() ejecuta una función
+    bajo tracemalloc y guarda:
+      - pico: máximo de memoria asignada durante la etapa por encima de la
+        que había al empezarla
+      - retenido: memoria que sigue asignada al terminar (lo que conserva el
+        resultado y cualquier caché)
+      - archivos: los archivos de código que más memoria retienen
+      - tipos: desglose por tipo de objeto de lo alcanzable desde el resultado
+    Se usa como gestor de contexto; tracemalloc se detiene al salir si lo
+    inició el perfil.
+    """
+
+    def __init__(self, desglose=True, max_objetos=1000000, top_archivos=5, top_tipos=8):
+        self.desglose = desglose
+        self.max_objetos = max_objetos
+        self.top_archivos = top_archivos
+        self.top_tipos = top_tipos
+        self.etapas = []
+        self._inicio_tracemalloc = False
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._inicio_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        if self._inicio_tracemalloc:
+            tracemalloc.stop()
+            self._inicio_tracemalloc = False
+
+    def _instantanea(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def medir(self, etapa, funcion, *args, **kwargs):
+        """
+        Ejecuta funcion(*args, **kwargs) como la etapa indicada y devuelve su resultado
+        """
+        if not tracemalloc.is_tracing():
+            self.__enter__()
+        antes = self._instantanea() if self.top_archivos else None
+        tracemalloc.reset_peak()
+        actual_antes, _ = tracemalloc.get_traced_memory()
+        inicio = time.perf_counter()
+        resultado = funcion(*args, **kwargs)
+        segundos = time.perf_counter() - inicio
+        actual, pico = tracemalloc.get_traced_memory()
+
+        registro = {
+            'etapa': etapa,
+            'segundos': segundos,
+            'pico': pico - actual_antes,
+            'retenido': actual - actual_antes,
+            'archivos': [],
+            'tipos': {},
+        }
+        if antes is not None:
+            diferencias = self._instantanea().compare_to(antes, 'filename')
+            registro['archivos'] = [
+                (os.path.basename(d.traceback[0].filename), d.size_diff)
+                for d in diferencias[:self.top_archivos] if d.size_diff > 0
+            ]
+        if self.desglose and resultado is not None:
+            tipos, visitados, truncado = desglose_por_tipo(resultado, self.max_objetos)
+            registro['tipos'] = {nombre: {'objetos': cantidad, 'bytes': total}
+                                 for nombre, (cantidad, total) in list(tipos.items())[:self.top_tipos]}
+            registro['objetos_visitados'] = visitados
+            registro['desglose_truncado'] = truncado
+        self.etapas.append(registro)
+        return resultado
+
+    def a_diccionario(self):
+        return {
+            'etapas': self.etapas,
+            'pico_maximo': max((e['pico'] for e in self.etapas), default=0),
+            'retenido_total': sum(e['retenido'] for e in self.etapas),
+        }
+
+    def exportar_json(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.a_diccionario(), f, indent=2, ensure_ascii=False)
+        print(f"Perfil de memoria exportado en: {ruta}")
+
+def perfilar_expresion(expresion, renderizar=True, motor='ply', archivo_imagen=None, desglose=True):
+    """
+    Ejecuta el análisis completo de una expresión etapa por etapa y devuelve
+    su PerfilMemoria, o None si la expresión es inválida. Para renderizar se
+    cambia matplotlib al backend Agg (no se abre ninguna ventana); la imagen
+    se guarda en archivo_imagen o en un archivo temporal que luego se borra.
+    """
+    import contextlib
+    import io
+    from analizador_lexico import analizar_lexicamente
+    from analizador_sintactico import analizar_sintacticamente
+    from generador_grafos import crear_grafo_expresion, generar_reporte_grafo
+
+    with PerfilMemoria(desglose=desglose) as perfil:
+        perfil.medir('lexico', analizar_lexicamente, expresion)
+        ast, _ = perfil.medir('sintactico', analizar_sintacticamente, expresion,
+                              motor=motor, construir_grafo=False)
+        if ast is None:
+            return None
+        grafo = perfil.medir('grafo', crear_grafo_expresion, ast)
+        perfil.medir('reporte', generar_reporte_grafo, grafo, expresion)
+
+        if renderizar:
+            import matplotlib.pyplot as plt
+            from generador_grafos import visualizar_grafo
+
+            plt.switch_backend('Agg')
+            temporal = None
+            if archivo_imagen is None:
+                descriptor, temporal = tempfile.mkstemp(suffix='.png')
+                os.close(descriptor)
+            try:
+                def renderizar_grafo():
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        visualizar_grafo(grafo, expresion, archivo_imagen or temporal)
+                    return plt.gcf()
+                figura = perfil.medir('renderizado', renderizar_grafo)
+                plt.close(figura)
+            finally:
+                if temporal:
+                    os.remove(temporal)
+    return perfil
+
+def generar_reporte_memoria(perfil):
+    """
+    Genera un reporte legible de un PerfilMemoria
+    """
+    reporte = "\n=== PERFIL DE MEMORIA POR ETAPA ===\n"
+    reporte += f"{'Etapa':12} {'Tiempo':>9} {'Pico':>11} {'Retenido':>11}\n"
+    for etapa in perfil.etapas:
+        reporte += (f"{etapa['etapa']:12} {etapa['segundos']:8.3f}s {formato_bytes(etapa['pico']):>11} "
+                    f"{formato_bytes(etapa['retenido']):>11}\n")
+    for etapa in perfil.etapas:
+        reporte += f"\n[{etapa['etapa']}]\n"
+        if etapa['archivos']:
+            reporte += "  Archivos: " + ", ".join(
+                f"{archivo} {formato_bytes(cantidad)}" for archivo, cantidad in etapa['archivos']) + "\n"
+        if etapa['tipos']:
+            truncado = " (desglose truncado)" if etapa.get('desglose_truncado') else ""
+            reporte += f"  Tipos del resultado{truncado}:\n"
+            for nombre, datos in etapa['tipos'].items():
+                reporte += f"    {nombre:24} {datos['objetos']:9} objetos {formato_bytes(datos['bytes']):>11}\n"
+    return reporte
+
+if __name__ == "__main__":
+    # Uso: python perfil_memoria.py "expresión" [salida.json] [--sin-render]
+    argumentos = [a for a in sys.argv[1:] if a != '--sin-render']
+    renderizar = '--sin-render' not in sys.argv
+    if argumentos and argumentos[0]:
+        expresion = argumentos[0]
+    else:
+        from gramatica_sistema_L import generar_formula_aleatoria
+        import random
+        expresion = generar_formula_aleatoria(random.Random(44), 300, prob_parentesis=0.7)
+        print(f"Expresión de ejemplo de 300 nodos: {expresion[:60]}...")
+
+    perfil = perfilar_expresion(expresion, renderizar=renderizar)
+    if perfil is None:
+        print("Expresión inválida")
+        sys.exit(1)
+    print(generar_reporte_memoria(perfil))
+    if len(argumentos) >= 2:
+        perfil.exportar_json(argumentos[1])
@@ -0,0 +1,392 @@
+# Servicio Local de Validación para el Sistema L
+# Servidor asyncio de larga duración que atiende solicitudes JSON por líneas
+# sobre un socket Unix o la entrada/salida estándar, agrupándolas en lotes
+# que se procesan en un grupo de procesos trabajadores
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import stat
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from analizador_lexico import analizar_lexicamente
+from analizador_sintactico import analizar_sintacticamente, ambito_simbolos
+from generador_grafos import generar_reporte_grafo, escribir_grafo_dot
+from gramatica_sistema_L import validar_expresion_gramatica
+from limites_recursos import ErrorLimiteRecursos, LIMITES_PREDETERMINADOS
+
+# Límite de tamaño de una línea de solicitud (bytes)
+LIMITE_LINEA = 1 << 20
+
+# Presupuestos de cada expresión (ver limites_recursos.py)
+LIMITES_SERVICIO = LIMITES_PREDETERMINADOS
+
+def ast_a_diccionario(ast):
+    """
+    Convierte un árbol sintáctico en diccionarios anidados serializables a JSON
+    """
+    raiz = {}
+    pila = [(ast, raiz)]
+    while pila:
+        nodo, destino = pila.pop()
+        destino['tipo'] = nodo.tipo
+        destino['valor'] = nodo.valor
+        destino['hijos'] = [{} for _ in nodo.hijos]
+        pila.extend(zip(nodo.hijos, destino['hijos']))
+    return raiz
+
+def _operacion_lex(expresion):
+    return [[tipo, valor] for tipo, valor in analizar_lexicamente(expresion)]
+
+def _operacion_parse(expresion):
+    ast, _ = analizar_sintacticamente(expresion, limites=LIMITES_SERVICIO)
+    if ast is None:
+        raise ValueError("Expresión sintácticamente incorrecta")
+    return ast_a_diccionario(ast)
+
+def _operacion_validate(expresion):
+    valida, mensaje = validar_expresion_gramatica(expresion, LIMITES_SERVICIO)
+    return {'valida': valida, 'mensaje': mensaje}
+
+def _operacion_report(expresion):
+    ast, grafo = analizar_sintacticamente(expresion, limites=LIMITES_SERVICIO)
+    if ast is None or grafo is None:
+        raise ValueError("No se pudo generar el grafo")
+    return generar_reporte_grafo(grafo, expresion)
+
+def _operacion_dot(expresion):
+    ast, grafo = analizar_sintacticamente(expresion, limites=LIMITES_SERVICIO)
+    if ast is None or grafo is None:
+        raise ValueError("No se pudo generar el grafo")
+    flujo = io.StringIO()
+    escribir_grafo_dot(grafo, expresion, flujo)
+    return flujo.getvalue()
+
+OPERACIONES = {
+    'lex': _operacion_lex,
+    'parse': _operacion_parse,
+    'validate': _operacion_validate,
+    'report': _operacion_report,
+    'dot': _operacion_dot,
+}
+
+def procesar_solicitud(solicitud):
+    """
+    Atiende una solicitud ya decodificada y devuelve la respuesta. Los
+    mensajes que imprimen el lexer y el parser se capturan y se devuelven
+    en el campo 'mensajes' para no mezclarlos con el protocolo. Si la
+    expresión supera algún límite de recursos, la respuesta de error incluye
+    el campo 'limite' con sus detalles.
+    """
+    respuesta = {'id': solicitud.get('id')}
+    op = solicitud.get('op')
+    # Un 'op' que no es texto (lista, objeto) no puede buscarse en el diccionario
+    operacion = OPERACIONES.get(op) if isinstance(op, str) else None
+    expresion = solicitud.get('expresion')
+    if operacion is None:
+        respuesta.update(ok=False, error=f"Operación desconocida: {op}")
+        return respuesta
+    if not isinstance(expresion, str):
+        respuesta.update(ok=False, error="Falta el campo 'expresion'")
+        return respuesta
+
+    salida = io.StringIO()
+    # Los nombres de variable de la solicitud no quedan en la tabla de símbolos del trabajador
+    with contextlib.redirect_stdout(salida), ambito_simbolos():
+        try:
+            # La longitud se comprueba para todas las operaciones, incluso las que no analizan
+            LIMITES_SERVICIO.controlar().comprobar_texto(expresion)
+            respuesta.update(ok=True, resultado=operacion(expresion))
+        except ErrorLimiteRecursos as e:
+            respuesta.update(ok=False, error=str(e), limite=e.a_diccionario())
+        except Exception as e:
+            respuesta.update(ok=False, error=str(e))
+    mensajes = salida.getvalue().strip()
+    if mensajes:
+        respuesta['mensajes'] = mensajes.splitlines()
+    return respuesta
+
+def procesar_lote(solicitudes):
+    """
+    Punto de entrada de los procesos trabajadores: atiende un lote completo
+    en una sola llamada para amortizar el costo de comunicación
+    """
+    return [procesar_solicitud(solicitud) for solicitud in solicitudes]
+
+def _calentar_trabajador():
+    # Construir las tablas de PLY antes de recibir la primera solicitud
+    with contextlib.redirect_stdout(io.StringIO()):
+        analizar_sintacticamente("p")
+
+class ServicioValidacion:
+    """
+    Servicio de validación con agrupación de solicitudes en lotes.
+
+    - Las solicitudes entran a una cola acotada; cuando se llena, los lectores
+      dejan de leer de sus conexiones (contrapresión).
+    - Un despachador agrupa hasta max_lote solicitudes, esperando como máximo
+      espera_lote segundos, y envía el lote a un proceso trabajador.
+    - Como mucho hay un lote en vuelo por trabajador.
+    - Cada solicitud tiene un tiempo límite; si vence se responde con error
+      aunque el lote siga ejecutándose en el trabajador.
+    """
+
+    def __init__(self, trabajadores=None, max_lote=64, espera_lote=0.002,
+                 max_pendientes=1024, tiempo_limite=5.0):
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.max_lote = max_lote
+        self.espera_lote = espera_lote
+        self.max_pendientes = max_pendientes
+        self.tiempo_limite = tiempo_limite
+        self._cola = None
+        self._grupo = None
+        self._lotes_en_vuelo = None
+        self._despachador = None
+        self._tareas_lote = set()
+        self.estadisticas = {'solicitudes': 0, 'lotes': 0, 'tiempos_agotados': 0}
+
+    async def iniciar(self):
+        self._cola = asyncio.Queue(self.max_pendientes)
+        self._lotes_en_vuelo = asyncio.Semaphore(self.trabajadores)
+        self._grupo = ProcessPoolExecutor(max_workers=self.trabajadores,
+                                          initializer=_calentar_trabajador)
+        self._despachador = asyncio.create_task(self._despachar())
+
+    async def detener(self):
+        if self._despachador is not None:
+            self._despachador.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._despachador
+        if self._grupo is not None:
+            # Esperar a los trabajadores (sus tareas están acotadas por los límites)
+            # para no dejar procesos huérfanos al salir
+            await asyncio.to_thread(self._grupo.shutdown, wait=True, cancel_futures=True)
+
+    async def _despachar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._cola.get()]
+            limite = loop.time() + self.espera_lote
+            while len(lote) < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            await self._lotes_en_vuelo.acquire()
+            self.estadisticas['lotes'] += 1
+            tarea = asyncio.create_task(self._ejecutar_lote(lote))
+            self._tareas_lote.add(tarea)
+            tarea.add_done_callback(self._tareas_lote.discard)
+
+    async def _ejecutar_lote(self, lote):
+        loop = asyncio.get_running_loop()
+        try:
+            solicitudes = [solicitud for solicitud, _ in lote]
+            respuestas = await loop.run_in_executor(self._grupo, procesar_lote, solicitudes)
+            for (_, futuro), respuesta in zip(lote, respuestas):
+                if not futuro.done():
+                    futuro.set_result(respuesta)
+        except Exception as e:
+            for solicitud, futuro in lote:
+                if not futuro.done():
+                    futuro.set_result({'id': solicitud.get('id'), 'ok': False,
+                                       'error': f"Error del trabajador: {e}"})
+        finally:
+            self._lotes_en_vuelo.release()
+
+    async def encolar(self, solicitud):
+        """
+        Encola una solicitud y devuelve el futuro de su respuesta. Si la cola
+        está llena, esta espera frena a quien la llama (contrapresión).
+        """
+        self.estadisticas['solicitudes'] += 1
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((solicitud, futuro))
+        return futuro
+
+    async def esperar_respuesta(self, solicitud, futuro):
+        """
+        Espera la respuesta de una solicitud encolada respetando su tiempo
+        límite. Un 'tiempo_limite' que no sea un número positivo se ignora y
+        se usa el del servicio.
+        """
+        tiempo_limite = solicitud.get('tiempo_limite')
+        if (isinstance(tiempo_limite, bool) or not isinstance(tiempo_limite, (int, float))
+                or not 0 < tiempo_limite < float('inf')):
+            tiempo_limite = self.tiempo_limite
+        try:
+            return await asyncio.wait_for(asyncio.shield(futuro), tiempo_limite)
+        except asyncio.TimeoutError:
+            self.estadisticas['tiempos_agotados'] += 1
+            return {'id': solicitud.get('id'), 'ok': False,
+                    'error': f"Tiempo límite agotado ({tiempo_limite} s)"}
+
+    async def atender(self, solicitud):
+        return await self.esperar_respuesta(solicitud, await self.encolar(solicitud))
+
+    async def atender_conexion(self, lector, escritor):
+        """
+        Lee solicitudes JSON (una por línea) y escribe las respuestas en el
+        orden en que terminan; el campo 'id' permite asociarlas.
+        """
+        tareas = set()
+        bloqueo_escritura = asyncio.Lock()
+
+        async def responder(solicitud, futuro):
+            # Toda solicitud recibe respuesta, aunque falle la espera
+            try:
+                respuesta = await self.esperar_respuesta(solicitud, futuro)
+            except Exception as e:
+                respuesta = {'id': solicitud.get('id'), 'ok': False, 'error': f"Error del servicio: {e}"}
+            linea = (json.dumps(respuesta, ensure_ascii=False) + "\n").encode('utf-8')
+            async with bloqueo_escritura:
+                escritor.write(linea)
+                await escritor.drain()
+
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    # Línea más larga que el límite del lector
+                    escritor.write(b'{"id": null, "ok": false, "error": "Solicitud demasiado larga"}\n')
+                    break
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                try:
+                    solicitud = json.loads(linea)
+                    if not isinstance(solicitud, dict):
+                        raise ValueError("La solicitud debe ser un objeto JSON")
+                except ValueError as e:
+                    respuesta = {'id': None, 'ok': False, 'error': f"JSON inválido: {e}"}
+                    async with bloqueo_escritura:
+                        escritor.write((json.dumps(respuesta, ensure_ascii=False) + "\n").encode('utf-8'))
+                    continue
+                # Mientras la cola esté llena no se lee la siguiente línea
+                futuro = await self.encolar(solicitud)
+                tarea = asyncio.create_task(responder(solicitud, futuro))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        except asyncio.CancelledError:
+            # El servicio se está deteniendo (Ctrl+C o SIGTERM): la conexión termina sin más
+            pass
+        finally:
+            with contextlib.suppress(Exception):
+                await escritor.drain()
+                escritor.close()
+
+def _cancelar_con_sigterm():
+    """
+    SIGTERM cancela la tarea actual como Ctrl+C, para que sus bloques finally
+    detengan los trabajadores y borren el socket antes de salir
+    """
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+async def servir_socket(ruta, **opciones):
+    """
+    Atiende conexiones sobre un socket de dominio Unix hasta ser cancelado
+    (o recibir SIGTERM)
+    """
+    _cancelar_con_sigterm()
+    servicio = ServicioValidacion(**opciones)
+    await servicio.iniciar()
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    servidor = await asyncio.start_unix_server(servicio.atender_conexion, path=ruta, limit=LIMITE_LINEA)
+    print(f"Servicio de validación escuchando en {ruta}", file=sys.stderr)
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servicio.detener()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(ruta)
+
+class _LectorEstandar:
+    """
+    Lector de líneas sobre un archivo regular redirigido a la entrada estándar.
+    Usa un hilo para leer porque asyncio no sabe vigilar archivos regulares;
+    su lectura nunca se bloquea, así que el hilo no retrasa la salida.
+    """
+
+    def __init__(self, flujo):
+        self._flujo = flujo
+
+    async def readline(self):
+        linea = await asyncio.to_thread(self._flujo.readline, LIMITE_LINEA + 1)
+        if len(linea) > LIMITE_LINEA:
+            raise ValueError("Línea demasiado larga")
+        return linea
+
+class _EscritorEstandar:
+    """
+    Escritor sobre la salida estándar con la misma interfaz que StreamWriter
+    """
+
+    def __init__(self, flujo):
+        self._flujo = flujo
+
+    def write(self, datos):
+        self._flujo.write(datos)
+
+    async def drain(self):
+        self._flujo.flush()
+
+    def close(self):
+        self._flujo.flush()
+
+async def servir_stdio(**opciones):
+    """
+    Atiende una única conexión sobre la entrada y salida estándar
+    """
+    _cancelar_con_sigterm()
+    if stat.S_ISREG(os.fstat(sys.stdin.fileno()).st_mode):
+        lector = _LectorEstandar(sys.stdin.buffer)
+    else:
+        # Tubería o terminal: un hilo bloqueado en la lectura impediría salir tras SIGTERM
+        lector = asyncio.StreamReader(limit=LIMITE_LINEA)
+        await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(lector), sys.stdin)
+    servicio = ServicioValidacion(**opciones)
+    await servicio.iniciar()
+    try:
+        await servicio.atender_conexion(lector, _EscritorEstandar(sys.stdout.buffer))
+    finally:
+        await servicio.detener()
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Servicio de validación del Sistema L")
+    transporte = argumentos.add_mutually_exclusive_group(required=True)
+    transporte.add_argument('--socket', help="ruta del socket Unix")
+    transporte.add_argument('--stdio', action='store_true', help="usar entrada y salida estándar")
+    argumentos.add_argument('--trabajadores', type=int, default=None)
+    argumentos.add_argument('--max-lote', type=int, default=64)
+    argumentos.add_argument('--espera-lote', type=float, default=0.002, help="segundos")
+    argumentos.add_argument('--max-pendientes', type=int, default=1024)
+    argumentos.add_argument('--tiempo-limite', type=float, default=5.0, help="segundos por solicitud")
+    opciones = argumentos.parse_args()
+
+    configuracion = dict(trabajadores=opciones.trabajadores, max_lote=opciones.max_lote,
+                         espera_lote=opciones.espera_lote, max_pendientes=opciones.max_pendientes,
+                         tiempo_limite=opciones.tiempo_limite)
+    try:
+        if opciones.stdio:
+            asyncio.run(servir_stdio(**configuracion))
+        else:
+            asyncio.run(servir_socket(opciones.socket, **configuracion))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+if __name__ == "__main__":
+    main()
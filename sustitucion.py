@@ -0,0 +1,277 @@
+# Sustitución de Variables en el Sistema L
+# Aplica sustituciones σ: variable -> fórmula a árboles sintácticos compartiendo
+# los subárboles que no cambian, con memoización de las subfórmulas repetidas
+# y aplicación de una misma sustitución a todo un corpus
+
+import contextlib
+import io
+import random
+import re
+import sys
+from analizador_sintactico import NodoAST, ambito_simbolos, analizar_sintacticamente, tabla_simbolos
+from verificador_pruebas import ESQUEMAS_AXIOMAS
+
+# Las metavariables B, C y D de los axiomas no son símbolos del Sistema L; para
+# analizar los esquemas se escriben con las variables x, y, z
+METAVARIABLES = {'B': 'x', 'C': 'y', 'D': 'z'}
+ESQUEMAS_SUSTITUCION = {
+    nombre: re.sub('[BCD]', lambda m: METAVARIABLES[m.group()], esquema)
+    for nombre, esquema in ESQUEMAS_AXIOMAS.items()
+}
+
+class Sustitucion:
+    """
+    Sustitución simultánea de variables por fórmulas. El resultado comparte
+    nodos en lugar de copiarlos:
+      - un subárbol sin variables sustituidas se devuelve tal cual
+      - cada aparición de una variable sustituida apunta al mismo árbol de
+        reemplazo
+      - las subfórmulas estructuralmente iguales (en la misma fórmula o en
+        otras del corpus) se sustituyen una sola vez y comparten resultado
+    Por eso los árboles devueltos son DAG y no deben modificarse en sitio;
+    los recorridos del proyecto (impresión, canonización, hashes, grafos,
+    conteo de modelos, demostrador) los aceptan tal cual.
+    La memoización se identifica por (tipo, valor, claves de los hijos) y se
+    vacía al superar max_memo entradas. Las variables entran en ella por su
+    nombre y no por su símbolo, que puede reutilizarse al cerrar un
+    ambito_simbolos() (aplicar_corpus analiza cada texto dentro de uno).
+    """
+
+    def __init__(self, reemplazos, max_memo=1000000):
+        # nombre de variable -> NodoAST; se indexa por el símbolo entero
+        self.reemplazos = {tabla_simbolos.internar(nombre): ast for nombre, ast in reemplazos.items()}
+        self.max_memo = max_memo
+        self._memo = {}  # identificador -> (clave, resultado, cambiado)
+        self._siguiente_clave = 0
+        self.formulas = 0
+        self.nodos_visitados = 0
+        self.nodos_creados = 0
+        self.aciertos_memo = 0
+
+    def aplicar(self, ast):
+        """
+        Árbol resultante de aplicar la sustitución (postorden iterativo)
+        """
+        if len(self._memo) > self.max_memo:
+            self._memo.clear()
+        memo = self._memo
+        reemplazos = self.reemplazos
+        valores = []  # (clave, resultado, cambiado) de los hijos ya procesados
+        pila = [(ast, False)]
+        visitados = creados = aciertos = 0
+        while pila:
+            nodo, visitado = pila.pop()
+            hijos = nodo.hijos
+            if not visitado and hijos:
+                pila.append((nodo, True))
+                pila.extend((hijo, False) for hijo in hijos)
+                continue
+            visitados += 1
+
+            # Los hijos se procesan de derecha a izquierda: el izquierdo queda arriba
+            if not hijos:
+                identificador = (nodo.tipo, nodo.valor)
+            elif len(hijos) == 1:
+                izquierdo = valores.pop()
+                identificador = (nodo.tipo, izquierdo[0])
+            else:
+                izquierdo = valores.pop()
+                derecho = valores.pop()
+                identificador = (nodo.tipo, izquierdo[0], derecho[0])
+            conocido = memo.get(identificador)
+            if conocido is not None:
+                aciertos += 1
+                valores.append(conocido)
+                continue
+
+            if not hijos:
+                reemplazo = reemplazos.get(nodo.simbolo) if nodo.tipo == 'VARIABLE' else None
+                cambiado = reemplazo is not None
+                resultado = reemplazo if cambiado else nodo
+            elif len(hijos) == 1:
+                cambiado = izquierdo[2]
+                resultado = NodoAST(nodo.tipo, nodo.valor, [izquierdo[1]]) if cambiado else nodo
+            else:
+                cambiado = izquierdo[2] or derecho[2]
+                resultado = (NodoAST(nodo.tipo, nodo.valor, [izquierdo[1], derecho[1]])
+                             if cambiado else nodo)
+            creados += cambiado and bool(hijos)
+            entrada = (self._siguiente_clave, resultado, cambiado)
+            self._siguiente_clave += 1
+            memo[identificador] = entrada
+            valores.append(entrada)
+
+        self.formulas += 1
+        self.nodos_visitados += visitados
+        self.nodos_creados += creados
+        self.aciertos_memo += aciertos
+        return valores[-1][1]
+
+    def aplicar_corpus(self, fuente):
+        """
+        Aplica la sustitución a cada fórmula de la fuente y genera los
+        resultados en orden, compartiendo la memoización entre todas. Cada
+        elemento puede ser un NodoAST, un par (texto, ast) como los de
+        AlmacenCorpus o el texto de una fórmula (se ignoran las líneas vacías;
+        las inválidas producen None). Los textos se analizan dentro de
+        ambito_simbolos(), así que las variables nuevas de sus resultados
+        conservan el nombre pero no un `simbolo` válido (ver reinternar).
+        """
+        for elemento in fuente:
+            if isinstance(elemento, tuple):
+                elemento = elemento[1]
+            if isinstance(elemento, NodoAST):
+                yield self.aplicar(elemento)
+                continue
+            elemento = elemento.strip()
+            if not elemento:
+                continue
+            with contextlib.redirect_stdout(io.StringIO()), ambito_simbolos():
+                ast, _ = analizar_sintacticamente(elemento, motor='pratt', construir_grafo=False)
+                resultado = None if ast is None else self.aplicar(ast)
+            yield resultado
+
+    def estadisticas(self):
+        return {
+            'formulas': self.formulas,
+            'nodos_visitados': self.nodos_visitados,
+            'nodos_creados': self.nodos_creados,
+            'aciertos_memo': self.aciertos_memo,
+            'entradas_memo': len(self._memo),
+        }
+
+def crear_sustitucion(asignaciones, max_memo=1000000):
+    """
+    Crea una Sustitucion a partir de {variable: fórmula}, donde cada fórmula
+    puede ser texto o un NodoAST. Devuelve None si algún texto es inválido.
+    """
+    reemplazos = {}
+    for nombre, formula in asignaciones.items():
+        if not isinstance(formula, NodoAST):
+            texto = formula
+            formula, _ = analizar_sintacticamente(texto, motor='pratt', construir_grafo=False)
+            if formula is None:
+                print(f"Fórmula inválida para la variable {nombre}: {texto}")
+                return None
+        reemplazos[nombre] = formula
+    return Sustitucion(reemplazos, max_memo)
+
+def sustituir(ast, asignaciones):
+    """
+    Aplica una sola vez la sustitución {variable: fórmula} al árbol
+    """
+    sustitucion = crear_sustitucion(asignaciones)
+    if sustitucion is None:
+        return None
+    return sustitucion.aplicar(ast)
+
+def sustituir_expresion(expresion, asignaciones):
+    """
+    Analiza la expresión y le aplica la sustitución; None si algo es inválido
+    """
+    ast, _ = analizar_sintacticamente(expresion, motor='pratt', construir_grafo=False)
+    if ast is None:
+        return None
+    return sustituir(ast, asignaciones)
+
+def instanciar_esquema(esquema, asignaciones):
+    """
+    Instancia un esquema de axioma ('A1', 'A2', 'A3') o cualquier fórmula
+    usada como esquema. Para los axiomas, las metavariables pueden darse
+    como B, C, D o como las variables x, y, z que las representan.
+    """
+    texto = ESQUEMAS_SUSTITUCION.get(esquema, esquema)
+    asignaciones = {METAVARIABLES.get(nombre, nombre): formula for nombre, formula in asignaciones.items()}
+    return sustituir_expresion(texto, asignaciones)
+
+def generar_instancias_axiomas(formulas, cantidad, semilla=0):
+    """
+    Genera cantidad pares (axioma, instancia) eligiendo al azar el esquema y
+    las fórmulas (NodoAST) que ocupan el lugar de cada metavariable. Los
+    esquemas se analizan una sola vez.
+    """
+    generador = random.Random(semilla)
+    esquemas = {}
+    for nombre, texto in ESQUEMAS_SUSTITUCION.items():
+        ast, _ = analizar_sintacticamente(texto, motor='pratt', construir_grafo=False)
+        esquemas[nombre] = ast
+    nombres = list(esquemas)
+    for _ in range(cantidad):
+        nombre = generador.choice(nombres)
+        asignaciones = {metavariable: generador.choice(formulas) for metavariable in METAVARIABLES.values()}
+        yield nombre, Sustitucion(asignaciones).aplicar(esquemas[nombre])
+
+if __name__ == "__main__":
+    from analizador_sintactico import hash_estructural
+    from gramatica_sistema_L import generar_formula_aleatoria
+    from impresor_formulas import formatear_formula
+    from verificador_pruebas import esquema_axioma
+
+    if len(sys.argv) >= 3:
+        # Uso: python sustitucion.py "expresión" "p=fórmula" ["q=fórmula" ...]
+        asignaciones = dict(argumento.split('=', 1) for argumento in sys.argv[2:])
+        resultado = sustituir_expresion(sys.argv[1], asignaciones)
+        if resultado is None:
+            sys.exit(1)
+        print(formatear_formula(resultado))
+        sys.exit(0)
+
+    print("=== SUSTITUCIÓN ===")
+    ejemplos = [
+        ("p=>q", {'p': "r^s"}),
+        ("(p=>q)^(q=>p)", {'p': "q", 'q': "p"}),   # simultánea: intercambia p y q
+        ("~p o (q<=>p)", {'p': "~~r"}),
+        ("(x_1^x_2)=>x_10", {'x_2': "0", 'x_10': "x_1 o x_2"}),
+    ]
+    for expresion, asignaciones in ejemplos:
+        resultado = sustituir_expresion(expresion, asignaciones)
+        print(f"{expresion:22} {asignaciones} -> {formatear_formula(resultado)}")
+
+    ast, _ = analizar_sintacticamente("(p=>q)^((r o s)=>p)", motor='pratt', construir_grafo=False)
+    resultado = sustituir(ast, {'q': "t"})
+    print(f"Subárbol sin cambios compartido: {resultado.hijos[1] is ast.hijos[1]}")
+
+    # Los recorridos del proyecto aceptan los DAG resultantes y dan lo mismo
+    # que sobre el árbol sin compartir que se obtiene al volver a analizar el texto
+    from canonizacion import forma_canonica
+    from demostrador import forma_desde_ast
+    from generador_grafos import comparar_modos_grafo, crear_grafo_expresion
+    from verificador_pruebas import formula_a_texto
+    compartido = sustituir_expresion("(p^p)=>~p", {'p': "q^(r o q)"})
+    copia, _ = analizar_sintacticamente(formula_a_texto(compartido), motor='pratt', construir_grafo=False)
+    consumidores = [forma_canonica, forma_desde_ast, comparar_modos_grafo,
+                    lambda arbol: sorted(crear_grafo_expresion(arbol, modo='dag').nodes(data='apariciones'))]
+    iguales = sum(consumidor(compartido) == consumidor(copia) for consumidor in consumidores)
+    print(f"Recorridos con nodos compartidos iguales al árbol copiado: {iguales}/{len(consumidores)}")
+
+    print("\n=== INSTANCIAS DE AXIOMAS ===")
+    for nombre in ESQUEMAS_SUSTITUCION:
+        instancia = instanciar_esquema(nombre, {'B': "p^q", 'C': "~r", 'D': "p o r"})
+        print(f"{nombre}: {formatear_formula(instancia)}  (reconocido como {esquema_axioma(instancia)})")
+    formulas = [analizar_sintacticamente(generar_formula_aleatoria(random.Random(i), 15), motor='pratt',
+                                         construir_grafo=False)[0] for i in range(50)]
+    instancias = list(generar_instancias_axiomas(formulas, 1000, semilla=48))
+    reconocidas = sum(esquema_axioma(instancia) is not None for _, instancia in instancias)
+    print(f"Instancias generadas reconocidas por el verificador: {reconocidas}/{len(instancias)}")
+
+    # El resultado debe ser el mismo árbol que se obtiene sustituyendo sobre
+    # el texto (cada variable por su fórmula entre paréntesis) y volviendo a analizar
+    print("\n=== PRUEBA CONTRA LA SUSTITUCIÓN TEXTUAL ===")
+    generador = random.Random(48)
+    variables = "pqrst"
+    pruebas = correctas = 0
+    for _ in range(300):
+        reemplazos = {variable: generar_formula_aleatoria(generador, generador.randint(1, 12), variables)
+                      for variable in generador.sample(variables, 2)}
+        sustitucion = crear_sustitucion(reemplazos)
+        corpus = [generar_formula_aleatoria(generador, generador.randint(1, 40), variables,
+                                            prob_parentesis=0.5) for _ in range(5)]
+        for expresion, resultado in zip(corpus, sustitucion.aplicar_corpus(corpus)):
+            textual = re.sub(r'[pqrstuvwxyz](?:_?[0-9]+)?',
+                             lambda m: f"({reemplazos[m.group()]})" if m.group() in reemplazos else m.group(),
+                             expresion)
+            esperado, _ = analizar_sintacticamente(textual, motor='pratt', construir_grafo=False)
+            pruebas += 1
+            correctas += hash_estructural(resultado) == hash_estructural(esperado)
+    print(f"Coincidencias: {correctas}/{pruebas}")
+    print(f"Estadísticas de la última sustitución: {sustitucion.estadisticas()}")
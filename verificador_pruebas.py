@@ -0,0 +1,317 @@
+# Verificador de Pruebas del Sistema Axiomático L
+# Comprueba pruebas al estilo de Hilbert: instancias de los esquemas de axiomas
+# A1-A3 (Mendelson) y aplicaciones de modus ponens
+#
+# Formato del archivo de prueba: un paso por línea
+#     formula ; justificación
+# donde la justificación es A1, A2, A3, Hip (hipótesis) o MP i,j (modus ponens
+# con los pasos i y j, numerados desde 1). "MP" sin números busca las premisas
+# automáticamente. Las líneas vacías y las que empiezan con '#' se ignoran.
+
+import re
+import sys
+import time
+from analizador_sintactico import analizar_sintacticamente, identificadores_estructurales
+
+ESQUEMAS_AXIOMAS = {
+    'A1': "B => (C => B)",
+    'A2': "(B => (C => D)) => ((B => C) => (B => D))",
+    'A3': "(~C => ~B) => ((~C => B) => C)",
+}
+
+_patron_justificacion = re.compile(r'^(A[123]|MP|HIP)\s*(?:(\d+)\s*,\s*(\d+))?$', re.IGNORECASE)
+
+def _partes_implicacion(nodo):
+    return nodo.hijos if nodo.tipo == 'IMPLICACION' else None
+
+def esquema_axioma(ast, identificadores=None):
+    """
+    Devuelve 'A1', 'A2' o 'A3' si la fórmula es instancia de ese esquema, o None.
+    Las metavariables B, C y D pueden ser cualquier subfórmula: las apariciones
+    repetidas de una misma metavariable se comparan por identificador
+    estructural (identificadores es el resultado de identificadores_estructurales),
+    que a diferencia de un hash no admite colisiones.
+    """
+    if identificadores is None:
+        identificadores = identificadores_estructurales(ast, {})
+    partes = _partes_implicacion(ast)
+    if not partes:
+        return None
+    izquierda, derecha = partes
+    izquierda_id = identificadores[id(izquierda)]
+    d = _partes_implicacion(derecha)
+
+    # A1: B => (C => B)
+    if d and identificadores[id(d[1])] == izquierda_id:
+        return 'A1'
+
+    i = _partes_implicacion(izquierda)
+    if not (i and d):
+        return None
+
+    # A2: (B => (C => D)) => ((B => C) => (B => D))
+    i_derecha = _partes_implicacion(i[1])
+    d_izquierda = _partes_implicacion(d[0])
+    d_derecha = _partes_implicacion(d[1])
+    if i_derecha and d_izquierda and d_derecha:
+        b, c, dd = (identificadores[id(n)] for n in (i[0], i_derecha[0], i_derecha[1]))
+        if (identificadores[id(d_izquierda[0])] == b and identificadores[id(d_izquierda[1])] == c
+                and identificadores[id(d_derecha[0])] == b and identificadores[id(d_derecha[1])] == dd):
+            return 'A2'
+
+    # A3: (~C => ~B) => ((~C => B) => C)
+    if i[0].tipo == 'NEGACION' and i[1].tipo == 'NEGACION' and d_izquierda:
+        c = identificadores[id(i[0].hijos[0])]
+        b = identificadores[id(i[1].hijos[0])]
+        if (d_izquierda[0].tipo == 'NEGACION' and identificadores[id(d_izquierda[0].hijos[0])] == c
+                and identificadores[id(d_izquierda[1])] == b and identificadores[id(d[1])] == c):
+            return 'A3'
+    return None
+
+def formula_a_texto(ast):
+    """
+    Texto de la fórmula con paréntesis en toda operación binaria salvo la
+    exterior; al volver a analizarlo se obtiene el mismo árbol. Acepta
+    árboles con nodos compartidos.
+    """
+    textos = {}
+    pila = [(ast, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if id(nodo) in textos:
+            continue
+        if not visitado and nodo.hijos:
+            pila.append((nodo, True))
+            pila.extend((hijo, False) for hijo in nodo.hijos)
+            continue
+        if not nodo.hijos:
+            texto = str(nodo.valor)
+        elif nodo.tipo == 'NEGACION':
+            hijo = nodo.hijos[0]
+            interno = textos[id(hijo)]
+            texto = '~' + (f"({interno})" if len(hijo.hijos) == 2 else interno)
+        else:
+            izquierda, derecha = nodo.hijos
+            partes = []
+            for hijo in (izquierda, derecha):
+                interno = textos[id(hijo)]
+                partes.append(f"({interno})" if len(hijo.hijos) == 2 else interno)
+            texto = f"{partes[0]}{nodo.valor}{partes[1]}"
+        textos[id(nodo)] = texto
+    return textos[id(ast)]
+
+def _analizar_formula(texto, tabla):
+    """
+    (identificador, identificador del antecedente, identificador del
+    consecuente, esquema de axioma) de una fórmula; los de las partes son None
+    si no es una implicación. Los identificadores son los de
+    identificadores_estructurales con la tabla dada.
+    """
+    ast, _ = analizar_sintacticamente(texto, motor='pratt', construir_grafo=False)
+    if ast is None:
+        return None
+    identificadores = identificadores_estructurales(ast, tabla)
+    partes = _partes_implicacion(ast)
+    antecedente = identificadores[id(partes[0])] if partes else None
+    consecuente = identificadores[id(partes[1])] if partes else None
+    return identificadores[id(ast)], antecedente, consecuente, esquema_axioma(ast, identificadores)
+
+def verificar_prueba(lineas, hipotesis=None, max_errores=20):
+    """
+    Verifica una prueba dada como iterable de líneas en el formato del módulo.
+
+    Las premisas de modus ponens se resuelven con diccionarios indexados por
+    el identificador estructural de las fórmulas (no se recorren los pasos
+    anteriores):
+      - por_formula: identificador de fórmula -> primer paso en que se obtuvo
+      - por_consecuente: identificador del consecuente -> identificadores de
+        los antecedentes de las implicaciones ya probadas con ese consecuente
+    Los identificadores salen de una tabla de hash-consing compartida por
+    todas las líneas y las hipótesis: dos fórmulas tienen el mismo solo si
+    son iguales, así que una coincidencia nunca es una colisión. Las líneas
+    con el mismo texto se analizan una sola vez.
+    Si se da la lista hipotesis, las líneas Hip deben ser una de ellas.
+
+    Devuelve un diccionario con 'valida', 'pasos', 'teorema', 'hipotesis'
+    (las usadas), 'justificaciones' (conteo por tipo), 'errores' (lista de
+    (paso, línea del archivo, mensaje)) y 'segundos'.
+    """
+    inicio = time.perf_counter()
+    tabla = {}  # hash-consing de las subfórmulas de toda la prueba
+    hipotesis_permitidas = None
+    if hipotesis is not None:
+        hipotesis_permitidas = set()
+        for texto in hipotesis:
+            analisis = _analizar_formula(texto, tabla)
+            if analisis is not None:
+                hipotesis_permitidas.add(analisis[0])
+
+    analisis_por_texto = {}
+    pasos = []           # paso -> (identificador, antecedente, consecuente) o None si es incorrecto
+    por_formula = {}
+    por_consecuente = {}
+    errores = []
+    justificaciones = {'A1': 0, 'A2': 0, 'A3': 0, 'MP': 0, 'HIP': 0}
+    hipotesis_usadas = []
+    teorema = None
+
+    for numero_linea, linea in enumerate(lineas, start=1):
+        linea = linea.strip()
+        if not linea or linea.startswith('#'):
+            continue
+        paso = len(pasos) + 1
+        pasos.append(None)
+
+        def error(mensaje):
+            if len(errores) < max_errores:
+                errores.append((paso, numero_linea, mensaje))
+
+        if ';' not in linea:
+            error("falta la justificación ('formula ; justificación')")
+            continue
+        texto, justificacion = (parte.strip() for parte in linea.rsplit(';', 1))
+        coincidencia = _patron_justificacion.match(justificacion)
+        if not coincidencia:
+            error(f"justificación desconocida '{justificacion}'")
+            continue
+        regla = coincidencia.group(1).upper()
+
+        analisis = analisis_por_texto.get(texto)
+        if analisis is None:
+            analisis = analisis_por_texto[texto] = _analizar_formula(texto, tabla)
+        if analisis is None:
+            error(f"fórmula mal formada '{texto}'")
+            continue
+        clave, antecedente, consecuente, esquema = analisis
+
+        if regla in ESQUEMAS_AXIOMAS:
+            if esquema != regla:
+                error(f"no es instancia de {regla}" + (f" (es instancia de {esquema})" if esquema else ""))
+                continue
+        elif regla == 'HIP':
+            if hipotesis_permitidas is not None and clave not in hipotesis_permitidas:
+                error("la hipótesis no está entre las permitidas")
+                continue
+            hipotesis_usadas.append(texto)
+        else:
+            if coincidencia.group(2):
+                i, j = int(coincidencia.group(2)), int(coincidencia.group(3))
+                if not (1 <= i < paso and 1 <= j < paso):
+                    error(f"MP {i},{j} hace referencia a pasos que no son anteriores")
+                    continue
+                premisa_i, premisa_j = pasos[i - 1], pasos[j - 1]
+                if premisa_i is None or premisa_j is None:
+                    error(f"MP {i},{j} usa un paso incorrecto")
+                    continue
+                # Cualquiera de los dos puede ser la implicación
+                correcto = any(
+                    implicacion[1] == menor[0] and implicacion[2] == clave
+                    for menor, implicacion in ((premisa_i, premisa_j), (premisa_j, premisa_i)))
+                if not correcto:
+                    error(f"los pasos {i} y {j} no permiten obtener la fórmula por modus ponens")
+                    continue
+            elif not any(a in por_formula for a in por_consecuente.get(clave, ())):
+                error("no hay premisas anteriores A y A=>fórmula para modus ponens")
+                continue
+
+        justificaciones[regla] += 1
+        pasos[-1] = (clave, antecedente, consecuente)
+        por_formula.setdefault(clave, paso)
+        if consecuente is not None:
+            por_consecuente.setdefault(consecuente, []).append(antecedente)
+        teorema = texto
+
+    total_errores = sum(1 for p in pasos if p is None)
+    return {
+        'valida': bool(pasos) and total_errores == 0,
+        'pasos': len(pasos),
+        'teorema': teorema if total_errores == 0 else None,
+        'hipotesis': hipotesis_usadas,
+        'justificaciones': justificaciones,
+        'errores': errores,
+        'total_errores': total_errores,
+        'segundos': time.perf_counter() - inicio,
+    }
+
+def verificar_archivo(ruta, hipotesis=None, max_errores=20):
+    """
+    Verifica un archivo de prueba leyéndolo línea a línea
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return verificar_prueba(f, hipotesis, max_errores)
+
+def escribir_prueba(ruta, pasos, comentario=None):
+    """
+    Escribe una lista de pasos (texto de la fórmula, justificación) en el formato del módulo
+    """
+    with open(ruta, 'w', encoding='utf-8') as f:
+        if comentario:
+            f.write(f"# {comentario}\n")
+        for texto, justificacion in pasos:
+            f.write(f"{texto} ; {justificacion}\n")
+
+def prueba_identidad(variable='p', desplazamiento=0):
+    """
+    Pasos de la prueba clásica de |- A=>A para una variable; desplazamiento es
+    el número de pasos anteriores (para numerar las referencias de MP)
+    """
+    a = variable
+    n = desplazamiento
+    return [
+        (f"({a}=>(({a}=>{a})=>{a}))=>(({a}=>({a}=>{a}))=>({a}=>{a}))", "A2"),
+        (f"{a}=>(({a}=>{a})=>{a})", "A1"),
+        (f"({a}=>({a}=>{a}))=>({a}=>{a})", f"MP {n + 2},{n + 1}"),
+        (f"{a}=>({a}=>{a})", "A1"),
+        (f"{a}=>{a}", f"MP {n + 4},{n + 3}"),
+    ]
+
+def generar_reporte_verificacion(resultado):
+    """
+    Genera un reporte legible del resultado de verificar_prueba
+    """
+    reporte = "\n=== VERIFICACIÓN DE LA PRUEBA ===\n"
+    reporte += f"Pasos: {resultado['pasos']}\n"
+    reporte += "Justificaciones: " + ", ".join(
+        f"{regla}={cantidad}" for regla, cantidad in resultado['justificaciones'].items()) + "\n"
+    if resultado['valida']:
+        premisas = ", ".join(resultado['hipotesis'])
+        reporte += f"Prueba correcta: {premisas + ' ' if premisas else ''}|- {resultado['teorema']}\n"
+    else:
+        reporte += f"Prueba incorrecta: {resultado['total_errores']} pasos con errores\n"
+        for paso, linea, mensaje in resultado['errores']:
+            reporte += f"  Paso {paso} (línea {linea}): {mensaje}\n"
+    reporte += f"Tiempo: {resultado['segundos']:.3f} s\n"
+    return reporte
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2:
+        # Uso: python verificador_pruebas.py prueba.txt [hipótesis ...]
+        resultado = verificar_archivo(sys.argv[1], sys.argv[2:] or None)
+        print(generar_reporte_verificacion(resultado))
+        sys.exit(0 if resultado['valida'] else 1)
+
+    print("=== ESQUEMAS DE AXIOMAS DEL SISTEMA L ===")
+    for nombre, esquema in ESQUEMAS_AXIOMAS.items():
+        print(f"  {nombre}: {esquema}")
+
+    print("\n--- Prueba de |- p=>p ---")
+    pasos = prueba_identidad('p')
+    for numero, (texto, justificacion) in enumerate(pasos, start=1):
+        print(f"  {numero}. {texto} ; {justificacion}")
+    print(generar_reporte_verificacion(verificar_prueba(f"{t} ; {j}" for t, j in pasos)))
+
+    print("--- Prueba con hipótesis: p, p=>q |- q (MP sin números) ---")
+    lineas = ["p ; Hip", "p=>q ; Hip", "q ; MP"]
+    print(generar_reporte_verificacion(verificar_prueba(lineas, hipotesis=["p", "p=>q"])))
+
+    print("--- Prueba incorrecta ---")
+    lineas = [
+        "p=>(q=>p) ; A1",
+        "p=>(q=>q) ; A1",
+        "(~q=>~p)=>((~q=>p)=>q) ; A3",
+        "q ; MP 1,2",
+        "r ; MP",
+        "p^ ; A1",
+        "p ; Regla",
+    ]
+    print(generar_reporte_verificacion(verificar_prueba(lineas)))